@@ -8,6 +8,7 @@ from typing import List, Dict, Any, Optional, Tuple, Union, Literal
 
 from utils.logger import logger
 from utils.libvirt_server import LibvirtServer
+from utils.metrics import instrument_tools, add_metrics_route
 
 
 # Create libvirt mcp server
@@ -491,6 +492,10 @@ for tool in mcp._tool_manager.list_tools():
 
 logger.info(f"Total registered tools: {tool_count}")
 
+# 工具延迟直方图，与 SSH/libvirt 调用、XML 解析的直方图一起以 Prometheus 文本格式暴露在 /metrics
+instrument_tools(mcp._tool_manager)
+add_metrics_route(mcp)
+
 
 if __name__ == "__main__":
     try:
@@ -1,9 +1,10 @@
-import time
 import libvirt
 import functools
 import paramiko
 from utils.logger import logger
 from utils.env_utils import get_env_var
+# timeit 由 metrics 提供：记录直方图，METRICS_ENABLED=false 时不做包装
+from utils.metrics import timeit, backend_timer
 from typing import Callable, Any, Optional, Union, Tuple
 
 def handle_libvirt_error(func: Callable[..., Any]) -> Callable[..., bool]:
@@ -29,7 +30,8 @@ def handle_libvirt_error(func: Callable[..., Any]) -> Callable[..., bool]:
                 logger.error("No domain could be resolved from parameters")
                 return False
 
-            result = func(self, domain, *args, **kwargs)
+            with backend_timer("libvirt", func.__name__):
+                result = func(self, domain, *args, **kwargs)
             
             if isinstance(result, dict):
                 logger.info(f"Domain {domain.name()} {func.__name__} successfully")
@@ -53,17 +55,6 @@ def handle_libvirt_error(func: Callable[..., Any]) -> Callable[..., bool]:
     return wrapper
 
 
-def timeit(func):
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        start = time.time()
-        result = func(*args, **kwargs)
-        duration = time.time() - start
-        logger.info(f"{func.__name__} took {duration:.2f} seconds")
-        return result
-
-    return wrapper
-
 @timeit
 def run_cmd(
     cmd: Optional[str] = None,
@@ -87,10 +78,11 @@ def run_cmd(
     try:
         ssh = paramiko.SSHClient()
         ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        ssh.connect(hostname=hostname, username=username)
-        
-        _, stdout, stderr = ssh.exec_command(cmd)
-        exit_status = stdout.channel.recv_exit_status()
+        with backend_timer("ssh", (cmd or "").split(" ", 1)[0]):
+            ssh.connect(hostname=hostname, username=username)
+
+            _, stdout, stderr = ssh.exec_command(cmd)
+            exit_status = stdout.channel.recv_exit_status()
         
     except Exception as e:
        logger.error(f"Remote connect or command excute failed：{str(e)}")
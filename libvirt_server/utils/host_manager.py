@@ -4,6 +4,7 @@ from xml.dom import minidom
 from utils.connect import LibvirtConnector
 from utils.logger import logger
 from utils.functions import timeit
+from utils.metrics import phase_timer
 from lxml import etree
 
 
@@ -97,7 +98,8 @@ class HostManager:
             return {}
 
         try:
-            caps_root = etree.fromstring(caps_xml.encode())
+            with phase_timer("parse_xml"):
+                caps_root = etree.fromstring(caps_xml.encode())
             node_elements = caps_root.xpath("//cells/cell")
             node_ids = [int(cell.attrib["id"]) for cell in node_elements]
 
@@ -115,7 +117,8 @@ class HostManager:
             doms_numa_binding = {}
             for dom in doms_strict:
                 dom_xml = dom.XMLDesc()
-                dom_root = etree.fromstring(dom_xml.encode())
+                with phase_timer("parse_xml"):
+                    dom_root = etree.fromstring(dom_xml.encode())
 
                 binding_info = {}
                 memory_node = dom_root.find("memory")
@@ -0,0 +1,174 @@
+import bisect
+import contextlib
+import functools
+import threading
+import time
+
+from typing import Any, Dict, List, Tuple, Callable, Iterator
+
+from utils.logger import logger
+from utils.env_utils import get_env_var
+
+
+# METRICS_ENABLED=false 时装饰器直接返回原函数，计时上下文为共享的空上下文，几乎没有额外开销
+ENABLED = get_env_var("METRICS_ENABLED", "true").strip().lower() == "true"
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_NOOP = contextlib.nullcontext()
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Histogram:
+    """按标签值分组的直方图，输出 Prometheus 文本格式"""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...], buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # 标签值 -> [各桶计数..., +Inf 计数, 总和]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += seconds
+
+    @contextlib.contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+
+        for labels, values in sorted(series.items()):
+            pairs = [f'{k}="{_escape(v)}"' for k, v in zip(self.labelnames, labels)]
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), values[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{",".join(pairs + [f"le=\"{le}\""])}}} {int(cumulative)}')
+            label_str = "{" + ",".join(pairs) + "}" if pairs else ""
+            lines.append(f"{self.name}_sum{label_str} {values[-1]:.6f}")
+            lines.append(f"{self.name}_count{label_str} {int(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.histograms: Dict[str, Histogram] = {}
+
+    def histogram(self, name: str, help: str, labelnames: Tuple[str, ...], buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        if name not in self.histograms:
+            self.histograms[name] = Histogram(name, help, labelnames, buckets)
+        return self.histograms[name]
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for histogram in self.histograms.values():
+            lines.extend(histogram.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+TOOL_DURATION = registry.histogram(
+    "mcp_tool_duration_seconds", "MCP tool call latency", ("tool", "status")
+)
+BACKEND_DURATION = registry.histogram(
+    "mcp_backend_call_duration_seconds", "Backend call latency (SSH, libvirt, subprocess)", ("backend", "operation")
+)
+FUNCTION_DURATION = registry.histogram(
+    "mcp_function_duration_seconds", "Latency of functions decorated with timeit", ("function",)
+)
+PHASE_DURATION = registry.histogram(
+    "mcp_phase_duration_seconds", "Latency of parse/serialize phases", ("phase",)
+)
+
+
+def observe_backend(backend: str, operation: str, seconds: float) -> None:
+    if ENABLED:
+        BACKEND_DURATION.observe(seconds, backend, operation)
+
+
+def backend_timer(backend: str, operation: str) -> contextlib.AbstractContextManager:
+    """后端调用计时，如 backend_timer("ssh", "brctl")"""
+    return BACKEND_DURATION.time(backend, operation) if ENABLED else _NOOP
+
+
+def phase_timer(phase: str) -> contextlib.AbstractContextManager:
+    """解析/序列化阶段计时，如 phase_timer("project")"""
+    return PHASE_DURATION.time(phase) if ENABLED else _NOOP
+
+
+def timeit(func: Callable[..., Any]) -> Callable[..., Any]:
+    """记录函数耗时（单调时钟）到 mcp_function_duration_seconds，并以 DEBUG 级别输出"""
+    if not ENABLED:
+        return func
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            FUNCTION_DURATION.observe(duration, name)
+            logger.debug(f"{name} took {duration:.3f} seconds")
+
+    return wrapper
+
+
+def _failed(result: Any) -> bool:
+    # 工具以 "[tool] Failed: ..." 表示失败
+    return isinstance(result, str) and result.startswith("[") and "] Failed: " in result[:200]
+
+
+def instrument_tools(tool_manager: Any) -> None:
+    """为 FastMCP 的全部工具调用记录 mcp_tool_duration_seconds（含参数校验与结果转换）"""
+    if not ENABLED:
+        return
+    call_tool = tool_manager.call_tool
+
+    @functools.wraps(call_tool)
+    async def wrapper(name: str, arguments: Dict[str, Any], *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        status = "error"
+        try:
+            result = await call_tool(name, arguments, *args, **kwargs)
+            status = "failed" if _failed(result) else "ok"
+            return result
+        finally:
+            TOOL_DURATION.observe(time.perf_counter() - start, name, status)
+
+    tool_manager.call_tool = wrapper
+
+
+def add_metrics_route(mcp: Any, path: str = "/metrics") -> None:
+    """在 MCP 的 HTTP 服务上暴露 Prometheus 文本格式的指标"""
+    if not ENABLED:
+        return
+    from starlette.requests import Request
+    from starlette.responses import PlainTextResponse
+
+    @mcp.custom_route(path, methods=["GET"])
+    async def metrics(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+    logger.info(f"Metrics exposed on {path}")
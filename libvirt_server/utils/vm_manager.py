@@ -7,6 +7,7 @@ from utils.logger import logger
 from utils.details import VM_STATES, NET_STATES, BLOCK_STATES
 from utils.env_utils import get_env_var
 from utils.functions import timeit, handle_libvirt_error
+from utils.metrics import backend_timer, phase_timer
 from utils.logger import logger
 from typing import Dict, Optional, List, Tuple
 from lxml import etree
@@ -47,8 +48,9 @@ class VMManager:
                 raise RuntimeError("Command qemu-img not found, please install it and try again later")
             
             cmd = f"ssh root@{get_env_var("LIBVIRT_HOST")} qemu-img info '{disk_path}'"
-            proc = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            stdout, stderr = proc.communicate()
+            with backend_timer("subprocess", "qemu-img info"):
+                proc = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                stdout, stderr = proc.communicate()
             if stderr:
                 raise RuntimeError(f"{stderr.decode().strip()}")
             
@@ -93,7 +95,10 @@ class VMManager:
         result = []
 
         try:
-            root = etree.fromstring(domain.XMLDesc(0).encode())
+            with backend_timer("libvirt", "XMLDesc"):
+                xml = domain.XMLDesc(0)
+            with phase_timer("parse_xml"):
+                root = etree.fromstring(xml.encode())
             for d in root.xpath("/domain/devices/*"):
                 dtype = d.tag
                 if dtype not in include_types:
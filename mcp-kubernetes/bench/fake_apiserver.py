@@ -0,0 +1,699 @@
+"""本地 Kubernetes API Server 替身，用于在没有真实集群时压测 mcp-kubernetes 的工具
+
+按给定规模生成合成集群（namespace、node、deployment、replicaset、pod、service、event），
+支持 list（limit/continue、label/field 选择器、Table 格式）、get、watch、create、patch、
+server-side apply、scale 子资源、delete 以及 pod 日志。
+
+对象以序列化后的 JSON 保存，只额外保留选择器用到的字段，10 万 pod 约占用 300MB 内存。
+
+    python -m bench.fake_apiserver --pods 10000 --port 18080
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.parse
+
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Any, Dict, List, Tuple, Iterator
+
+
+TABLE_MARKER = "as=Table"
+CHUNK_SIZE = 65536
+
+# (group, version, resource, kind, namespaced, 短名称)
+RESOURCES: List[Tuple[str, str, str, str, bool, List[str]]] = [
+    ("", "v1", "namespaces", "Namespace", False, ["ns"]),
+    ("", "v1", "nodes", "Node", False, ["no"]),
+    ("", "v1", "pods", "Pod", True, ["po"]),
+    ("", "v1", "services", "Service", True, ["svc"]),
+    ("", "v1", "configmaps", "ConfigMap", True, ["cm"]),
+    ("", "v1", "secrets", "Secret", True, []),
+    ("", "v1", "events", "Event", True, ["ev"]),
+    ("apps", "v1", "deployments", "Deployment", True, ["deploy"]),
+    ("apps", "v1", "replicasets", "ReplicaSet", True, ["rs"]),
+    ("apps", "v1", "statefulsets", "StatefulSet", True, ["sts"]),
+    ("apps", "v1", "daemonsets", "DaemonSet", True, ["ds"]),
+]
+KINDS = {r[2]: r for r in RESOURCES}
+
+_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _ts(seconds: float = 0) -> str:
+    return (_EPOCH + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _merge(target: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON merge patch，同时作为 strategic merge patch 与 apply 的近似实现"""
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        elif isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+    return target
+
+
+class Entry:
+    """已序列化的对象，以及选择器需要的字段"""
+
+    __slots__ = ("data", "labels", "fields")
+
+    def __init__(self, obj: Dict[str, Any]) -> None:
+        self.data = json.dumps(obj, separators=(",", ":")).encode()
+        metadata = obj.get("metadata", {})
+        self.labels: Dict[str, str] = metadata.get("labels") or {}
+        self.fields = {
+            "metadata.name": metadata.get("name"),
+            "metadata.namespace": metadata.get("namespace"),
+            "spec.nodeName": obj.get("spec", {}).get("nodeName"),
+            "status.phase": obj.get("status", {}).get("phase"),
+            "involvedObject.uid": obj.get("involvedObject", {}).get("uid"),
+        }
+
+    @property
+    def obj(self) -> Dict[str, Any]:
+        return json.loads(self.data)
+
+
+def _match_labels(labels: Dict[str, str], selector: Optional[str]) -> bool:
+    """支持 k=v、k==v、k!=v、k、!k 以及 k in (a,b)、k notin (a,b)"""
+    if not selector:
+        return True
+    requirements: List[str] = []
+    depth, current = 0, ""
+    for ch in selector:
+        depth += ch == "("
+        depth -= ch == ")"
+        if ch == "," and depth == 0:
+            requirements.append(current)
+            current = ""
+        else:
+            current += ch
+    requirements.append(current)
+
+    for req in (r.strip() for r in requirements):
+        if not req:
+            continue
+        if " notin " in req or " in " in req:
+            key, op, values = req.replace("(", " ").replace(")", " ").split(None, 2)
+            allowed = {v.strip() for v in values.split(",")}
+            if (op == "in") != (labels.get(key) in allowed):
+                return False
+        elif "!=" in req:
+            key, value = req.split("!=", 1)
+            if labels.get(key.strip()) == value.strip():
+                return False
+        elif "=" in req:
+            key, value = req.replace("==", "=").split("=", 1)
+            if labels.get(key.strip()) != value.strip():
+                return False
+        elif req.startswith("!"):
+            if req[1:] in labels:
+                return False
+        elif req not in labels:
+            return False
+    return True
+
+
+def _match_fields(fields: Dict[str, Any], selector: Optional[str]) -> bool:
+    if not selector:
+        return True
+    for req in selector.split(","):
+        negate = "!=" in req
+        key, value = req.replace("!=", "=").replace("==", "=").split("=", 1)
+        if (str(fields.get(key.strip())) == value.strip()) == negate:
+            return False
+    return True
+
+
+class SyntheticCluster:
+    """合成集群：pod 均匀分布在各 namespace 与 node 上，每 pods_per_deployment 个 pod 属于一个 deployment"""
+
+    def __init__(
+        self,
+        pods: int = 1000,
+        namespaces: int = 10,
+        nodes: Optional[int] = None,
+        pods_per_deployment: int = 10,
+        log_lines: int = 1000,
+        log_rate: float = 0.0
+    ) -> None:
+        self.log_line_count = log_lines
+        # 启动后每秒追加的日志行数，用于模拟持续输出日志的容器
+        self.log_rate = log_rate
+        self.started = time.monotonic()
+        self.lock = threading.Condition()
+        self.rv = 1
+        self.uid = 0
+        self.stores: Dict[str, Dict[Tuple[Optional[str], str], Entry]] = {r: {} for r in KINDS}
+        self.events: List[Tuple[int, str, Entry, bytes]] = []
+
+        ns_names = ["default"] + [f"bench-{i}" for i in range(1, namespaces)]
+        node_count = nodes or max(3, pods // 100)
+        deployments = max(1, pods // pods_per_deployment)
+
+        for name in ns_names:
+            self._put("namespaces", self._namespace(name))
+        for i in range(node_count):
+            self._put("nodes", self._node(f"node-{i:04d}"))
+        for d in range(deployments):
+            ns = ns_names[d % len(ns_names)]
+            name = f"app-{d:05d}"
+            # 余数 pod 归入最后一个 deployment
+            replicas = pods_per_deployment if d < deployments - 1 else pods - d * pods_per_deployment
+            deploy = self._put("deployments", self._deployment(ns, name, replicas))
+            rs = self._put("replicasets", self._replicaset(ns, name, replicas, deploy))
+            self._put("services", self._service(ns, name))
+            for r in range(replicas):
+                pod = self._put("pods", self._pod(ns, name, r, f"node-{(d * pods_per_deployment + r) % node_count:04d}", rs))
+                if r == 0:
+                    self._put("events", self._event(ns, pod))
+        # 初始对象不进入 watch 事件流
+        self.events.clear()
+
+    # ---------- 对象生成 ----------
+
+    def _meta(self, name: str, namespace: Optional[str] = None, labels: Optional[Dict[str, str]] = None, **extra: Any) -> Dict[str, Any]:
+        self.uid += 1
+        metadata = {
+            "name": name,
+            "uid": f"00000000-0000-0000-0000-{self.uid:012d}",
+            "resourceVersion": str(self.rv),
+            "creationTimestamp": _ts(self.uid),
+            "labels": labels or {},
+            "managedFields": [{"manager": "kube-controller-manager", "operation": "Update", "apiVersion": "v1", "time": _ts(self.uid)}],
+            **extra,
+        }
+        if namespace is not None:
+            metadata["namespace"] = namespace
+        return metadata
+
+    def _namespace(self, name: str) -> Dict[str, Any]:
+        return {
+            "apiVersion": "v1", "kind": "Namespace",
+            "metadata": self._meta(name, labels={"kubernetes.io/metadata.name": name}),
+            "spec": {"finalizers": ["kubernetes"]},
+            "status": {"phase": "Active"},
+        }
+
+    def _node(self, name: str) -> Dict[str, Any]:
+        return {
+            "apiVersion": "v1", "kind": "Node",
+            "metadata": self._meta(name, labels={"kubernetes.io/hostname": name, "kubernetes.io/os": "linux"}),
+            "spec": {"podCIDR": "10.244.0.0/24"},
+            "status": {
+                "capacity": {"cpu": "16", "memory": "65843200Ki", "pods": "110"},
+                "allocatable": {"cpu": "16", "memory": "65740800Ki", "pods": "110"},
+                "conditions": [{"type": "Ready", "status": "True", "reason": "KubeletReady", "lastTransitionTime": _ts()}],
+                "addresses": [{"type": "InternalIP", "address": f"192.168.{self.uid // 250}.{self.uid % 250 + 1}"}, {"type": "Hostname", "address": name}],
+                "nodeInfo": {"kubeletVersion": "v1.30.0", "osImage": "Ubuntu 22.04", "containerRuntimeVersion": "containerd://1.7.0", "architecture": "amd64"},
+            },
+        }
+
+    def _pod_template(self, name: str) -> Dict[str, Any]:
+        return {
+            "metadata": {"labels": {"app": name, "tier": "web"}},
+            "spec": {"containers": [{
+                "name": "app",
+                "image": f"registry.local/{name}:1.0",
+                "ports": [{"containerPort": 8080, "protocol": "TCP"}],
+                "resources": {"requests": {"cpu": "100m", "memory": "128Mi"}},
+            }]},
+        }
+
+    def _deployment(self, ns: str, name: str, replicas: int) -> Dict[str, Any]:
+        return {
+            "apiVersion": "apps/v1", "kind": "Deployment",
+            "metadata": self._meta(name, ns, {"app": name, "tier": "web"}, generation=1),
+            "spec": {"replicas": replicas, "selector": {"matchLabels": {"app": name}}, "template": self._pod_template(name)},
+            "status": self._ready_status(replicas),
+        }
+
+    def _ready_status(self, replicas: int, generation: int = 1) -> Dict[str, Any]:
+        return {
+            "observedGeneration": generation, "replicas": replicas, "updatedReplicas": replicas,
+            "readyReplicas": replicas, "availableReplicas": replicas,
+            "conditions": [{"type": "Available", "status": "True", "reason": "MinimumReplicasAvailable"}],
+        }
+
+    def _replicaset(self, ns: str, name: str, replicas: int, deploy: Dict[str, Any]) -> Dict[str, Any]:
+        owner = {"apiVersion": "apps/v1", "kind": "Deployment", "name": name, "uid": deploy["metadata"]["uid"], "controller": True}
+        return {
+            "apiVersion": "apps/v1", "kind": "ReplicaSet",
+            "metadata": self._meta(f"{name}-5d4f8c7b9", ns, {"app": name, "pod-template-hash": "5d4f8c7b9"}, ownerReferences=[owner]),
+            "spec": {"replicas": replicas, "selector": {"matchLabels": {"app": name}}, "template": self._pod_template(name)},
+            "status": {"replicas": replicas, "readyReplicas": replicas, "availableReplicas": replicas, "observedGeneration": 1},
+        }
+
+    def _pod(self, ns: str, app: str, index: int, node: str, rs: Dict[str, Any]) -> Dict[str, Any]:
+        owner = {"apiVersion": "apps/v1", "kind": "ReplicaSet", "name": rs["metadata"]["name"], "uid": rs["metadata"]["uid"], "controller": True}
+        name = f"{app}-5d4f8c7b9-{index:05d}"
+        return {
+            "apiVersion": "v1", "kind": "Pod",
+            "metadata": self._meta(name, ns, {"app": app, "tier": "web", "pod-template-hash": "5d4f8c7b9"}, ownerReferences=[owner]),
+            "spec": {
+                **self._pod_template(app)["spec"],
+                "nodeName": node,
+                "restartPolicy": "Always",
+                "volumes": [{"name": "kube-api-access", "projected": {"sources": [{"serviceAccountToken": {"path": "token"}}]}}],
+            },
+            "status": {
+                "phase": "Running",
+                "podIP": f"10.244.{self.uid // 250 % 250}.{self.uid % 250 + 1}",
+                "hostIP": "192.168.0.1",
+                "startTime": _ts(self.uid),
+                "conditions": [{"type": t, "status": "True"} for t in ("Initialized", "Ready", "ContainersReady", "PodScheduled")],
+                "containerStatuses": [{
+                    "name": "app", "ready": True, "restartCount": 0, "image": f"registry.local/{app}:1.0",
+                    "state": {"running": {"startedAt": _ts(self.uid)}},
+                }],
+            },
+        }
+
+    def _service(self, ns: str, name: str) -> Dict[str, Any]:
+        return {
+            "apiVersion": "v1", "kind": "Service",
+            "metadata": self._meta(name, ns, {"app": name, "tier": "web"}),
+            "spec": {
+                "type": "ClusterIP", "clusterIP": f"10.96.{self.uid // 250 % 250}.{self.uid % 250 + 1}",
+                "selector": {"app": name},
+                "ports": [{"name": "http", "port": 80, "targetPort": 8080, "protocol": "TCP"}],
+            },
+        }
+
+    def _event(self, ns: str, pod: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "apiVersion": "v1", "kind": "Event",
+            "metadata": self._meta(f"{pod['metadata']['name']}.started", ns),
+            "involvedObject": {"kind": "Pod", "name": pod["metadata"]["name"], "namespace": ns, "uid": pod["metadata"]["uid"]},
+            "reason": "Started", "message": "Started container app", "type": "Normal",
+            "source": {"component": "kubelet"}, "count": 1, "lastTimestamp": _ts(self.uid),
+        }
+
+    # ---------- 存储 ----------
+
+    def _put(self, resource: str, obj: Dict[str, Any], event: Optional[str] = None) -> Dict[str, Any]:
+        metadata = obj["metadata"]
+        if event is not None:
+            self.rv += 1
+            metadata["resourceVersion"] = str(self.rv)
+        entry = Entry(obj)
+        key = (metadata.get("namespace") if KINDS[resource][4] else None, metadata["name"])
+        if event == "DELETED":
+            self.stores[resource].pop(key, None)
+        else:
+            self.stores[resource][key] = entry
+        if event is not None:
+            self.events.append((self.rv, resource, entry, b'{"type":"%s","object":%s}\n' % (event.encode(), entry.data)))
+            self.lock.notify_all()
+        return obj
+
+    def select(
+        self,
+        resource: str,
+        namespace: Optional[str],
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None
+    ) -> List[Entry]:
+        return [
+            entry for (ns, _), entry in self.stores[resource].items()
+            if (namespace is None or ns == namespace)
+            and _match_labels(entry.labels, label_selector)
+            and _match_fields(entry.fields, field_selector)
+        ]
+
+    def get(self, resource: str, namespace: Optional[str], name: str) -> Optional[Entry]:
+        return self.stores[resource].get((namespace if KINDS[resource][4] else None, name))
+
+    def create(self, resource: str, namespace: Optional[str], obj: Dict[str, Any]) -> Dict[str, Any]:
+        metadata = obj.setdefault("metadata", {})
+        if KINDS[resource][4]:
+            metadata["namespace"] = metadata.get("namespace") or namespace
+        self.uid += 1
+        metadata.setdefault("uid", f"00000000-0000-0000-0000-{self.uid:012d}")
+        metadata.setdefault("creationTimestamp", _ts(self.uid))
+        metadata["generation"] = 1
+        if resource in ("deployments", "statefulsets", "replicasets"):
+            obj["status"] = self._ready_status(obj.get("spec", {}).get("replicas", 1))
+        return self._put(resource, obj, "ADDED")
+
+    def update(self, resource: str, entry: Entry, patch: Dict[str, Any], subresource: Optional[str] = None) -> Dict[str, Any]:
+        obj = entry.obj
+        if subresource == "scale":
+            patch = {"spec": {"replicas": patch.get("spec", {}).get("replicas")}}
+        _merge(obj, patch)
+        metadata = obj["metadata"]
+        if "spec" in patch:
+            metadata["generation"] = metadata.get("generation", 1) + 1
+            if resource in ("deployments", "statefulsets", "replicasets"):
+                # 控制器立即收敛，wait 选项可以马上结束
+                obj["status"] = self._ready_status(obj["spec"].get("replicas", 1), metadata["generation"])
+        return self._put(resource, obj, "MODIFIED")
+
+    def delete(self, resource: str, entry: Entry) -> Dict[str, Any]:
+        return self._put(resource, entry.obj, "DELETED")
+
+    def watch_from(self, resource: str, rv: int, namespace: Optional[str], field_selector: Optional[str], label_selector: Optional[str], deadline: float) -> Iterator[bytes]:
+        index = 0
+        while time.monotonic() < deadline:
+            with self.lock:
+                while index < len(self.events) and self.events[index][0] <= rv:
+                    index += 1
+                if index >= len(self.events):
+                    self.lock.wait(min(1.0, max(0.0, deadline - time.monotonic())))
+                    continue
+                batch, index = self.events[index:], len(self.events)
+            for event_rv, event_resource, entry, data in batch:
+                rv = event_rv
+                if event_resource != resource:
+                    continue
+                if namespace is not None and entry.fields["metadata.namespace"] != namespace:
+                    continue
+                if not (_match_labels(entry.labels, label_selector) and _match_fields(entry.fields, field_selector)):
+                    continue
+                yield data
+
+    def log_lines(self, pod: str, count: Optional[int], timestamps: bool, since_time: Optional[str] = None) -> List[str]:
+        # 第 i 行的时间戳位于 _EPOCH 之后第 i 秒内
+        total = self.log_line_count + int((time.monotonic() - self.started) * self.log_rate)
+        start = max(0, total - count) if count is not None else 0
+        if since_time:
+            since = datetime.strptime(since_time[:19], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+            start = max(start, int((since - _EPOCH).total_seconds()))
+        lines = []
+        for i in range(start, total):
+            line = f"level=info msg=\"handled request\" pod={pod} seq={i} path=/api/v1/items/{i % 97} status=200 latency_ms={i % 53}"
+            if timestamps:
+                line = f"{_ts(i)[:-1]}.{i % 1000:03d}000000Z {line}"
+            lines.append(line)
+        return lines
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # 响应头与响应体分开写出，关闭 Nagle 避免与客户端延迟 ACK 叠加出 40ms 的等待
+    disable_nagle_algorithm = True
+    cluster: SyntheticCluster
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def handle(self) -> None:
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            # 客户端提前关闭连接（如 search_logs 命中足够的匹配后停止读取日志）
+            pass
+
+    # ---------- 响应 ----------
+
+    def _send_json(self, code: int, body: Any) -> None:
+        data = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _status(self, code: int, reason: str, message: str) -> None:
+        self._send_json(code, {"kind": "Status", "apiVersion": "v1", "status": "Failure", "reason": reason, "message": message, "code": code})
+
+    def _start_chunked(self, content_type: str = "application/json") -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _chunk(self, data: bytes) -> None:
+        if data:
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def _end_chunked(self) -> None:
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _read_body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    # ---------- 路由 ----------
+
+    def _route(self) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str], Dict[str, str]]:
+        """解析为 (resource, namespace, name, subresource, query)，非资源路径时 resource 为 None"""
+        url = urllib.parse.urlparse(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        parts = [p for p in url.path.split("/") if p]
+        if parts[:2] == ["api", "v1"]:
+            parts = parts[2:]
+        elif len(parts) >= 3 and parts[0] == "apis":
+            parts = parts[3:]
+        else:
+            return None, None, None, None, query
+
+        namespace = None
+        if len(parts) >= 3 and parts[0] == "namespaces":
+            namespace, parts = parts[1], parts[2:]
+        if not parts or parts[0] not in KINDS:
+            return None, None, None, None, query
+        return parts[0], namespace, (parts[1] if len(parts) > 1 else None), (parts[2] if len(parts) > 2 else None), query
+
+    def _discovery(self) -> bool:
+        path = urllib.parse.urlparse(self.path).path.rstrip("/")
+        if path == "/version":
+            self._send_json(200, {"major": "1", "minor": "30", "gitVersion": "v1.30.0-bench"})
+        elif path == "/api":
+            self._send_json(200, {"kind": "APIVersions", "versions": ["v1"]})
+        elif path == "/apis":
+            groups = sorted({(g, v) for g, v, *_ in RESOURCES if g})
+            self._send_json(200, {"kind": "APIGroupList", "apiVersion": "v1", "groups": [
+                {"name": g, "versions": [{"groupVersion": f"{g}/{v}", "version": v}], "preferredVersion": {"groupVersion": f"{g}/{v}", "version": v}}
+                for g, v in groups
+            ]})
+        elif path == "/api/v1" or path.startswith("/apis/") and path.count("/") == 3:
+            group_version = path[len("/api/"):] if path == "/api/v1" else path[len("/apis/"):]
+            group, _, version = group_version.rpartition("/")
+            verbs = ["create", "delete", "deletecollection", "get", "list", "patch", "update", "watch"]
+            resources = []
+            for g, v, resource, kind, namespaced, short in RESOURCES:
+                if (g, v) != (group, version):
+                    continue
+                resources.append({"name": resource, "singularName": kind.lower(), "namespaced": namespaced, "kind": kind, "verbs": verbs, "shortNames": short})
+                if resource in ("deployments", "statefulsets", "replicasets"):
+                    resources.append({"name": f"{resource}/scale", "singularName": "", "namespaced": True, "kind": "Scale", "verbs": ["get", "patch", "update"]})
+                if resource == "pods":
+                    resources.append({"name": "pods/log", "singularName": "", "namespaced": True, "kind": "Pod", "verbs": ["get"]})
+            if not resources:
+                return False
+            self._send_json(200, {"kind": "APIResourceList", "apiVersion": "v1", "groupVersion": group_version, "resources": resources})
+        else:
+            return False
+        return True
+
+    def do_GET(self) -> None:
+        if self._discovery():
+            return
+        resource, namespace, name, subresource, query = self._route()
+        if resource is None:
+            return self._status(404, "NotFound", f"the server could not find the requested resource ({self.path})")
+        cluster = self.cluster
+
+        if name is None:
+            if query.get("watch") in ("true", "1"):
+                return self._watch(resource, namespace, query)
+            return self._list(resource, namespace, query)
+
+        entry = cluster.get(resource, namespace, name)
+        if entry is None:
+            return self._status(404, "NotFound", f'{resource} "{name}" not found')
+        if subresource == "log":
+            return self._log(name, query)
+        if subresource == "scale":
+            obj = entry.obj
+            return self._send_json(200, {"kind": "Scale", "apiVersion": "autoscaling/v1", "metadata": obj["metadata"], "spec": {"replicas": obj["spec"].get("replicas", 1)}, "status": {"replicas": obj.get("status", {}).get("replicas", 0)}})
+        if TABLE_MARKER in (self.headers.get("Accept") or ""):
+            return self._send_json(200, self._table(resource, [entry]))
+        self._send_json(200, entry.data)
+
+    def _list(self, resource: str, namespace: Optional[str], query: Dict[str, str]) -> None:
+        cluster = self.cluster
+        with cluster.lock:
+            entries = cluster.select(resource, namespace, query.get("labelSelector"), query.get("fieldSelector"))
+            rv = cluster.rv
+
+        offset = int(query.get("continue") or 0)
+        limit = int(query.get("limit") or 0)
+        page = entries[offset:offset + limit] if limit else entries[offset:]
+        next_offset = offset + len(page)
+        metadata: Dict[str, Any] = {"resourceVersion": str(rv)}
+        if limit and next_offset < len(entries):
+            metadata["continue"] = str(next_offset)
+            metadata["remainingItemCount"] = len(entries) - next_offset
+
+        if TABLE_MARKER in (self.headers.get("Accept") or ""):
+            return self._send_json(200, self._table(resource, page, metadata))
+
+        group, version, _, kind, *_ = KINDS[resource]
+        api_version = f"{group}/{version}" if group else version
+        head = json.dumps({"kind": f"{kind}List", "apiVersion": api_version, "metadata": metadata})[:-1].encode()
+        self._start_chunked()
+        buffer = bytearray(head + b',"items":[')
+        for i, entry in enumerate(page):
+            if i:
+                buffer += b","
+            buffer += entry.data
+            if len(buffer) >= CHUNK_SIZE:
+                self._chunk(bytes(buffer))
+                buffer.clear()
+        buffer += b"]}"
+        self._chunk(bytes(buffer))
+        self._end_chunked()
+
+    def _table(self, resource: str, entries: List[Entry], metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        rows = []
+        for entry in entries:
+            obj = entry.obj
+            status = obj.get("status", {})
+            rows.append({
+                "cells": [obj["metadata"]["name"], status.get("phase") or status.get("readyReplicas", ""), obj["metadata"].get("creationTimestamp")],
+                "object": {"kind": "PartialObjectMetadata", "apiVersion": "meta.k8s.io/v1", "metadata": {"name": obj["metadata"]["name"], "namespace": obj["metadata"].get("namespace")}},
+            })
+        return {
+            "kind": "Table", "apiVersion": "meta.k8s.io/v1", "metadata": metadata or {},
+            "columnDefinitions": [
+                {"name": "Name", "type": "string", "priority": 0},
+                {"name": "Status", "type": "string", "priority": 0},
+                {"name": "Created", "type": "string", "priority": 1},
+            ],
+            "rows": rows,
+        }
+
+    def _watch(self, resource: str, namespace: Optional[str], query: Dict[str, str]) -> None:
+        cluster = self.cluster
+        rv = int(query.get("resourceVersion") or cluster.rv)
+        deadline = time.monotonic() + float(query.get("timeoutSeconds") or 300)
+        self._start_chunked()
+        try:
+            if rv > cluster.rv:
+                # 版本来自另一个集群实例（如快照），与 etcd 压缩后的行为一致，返回 410 要求重新 list
+                self._chunk(json.dumps({"type": "ERROR", "object": {
+                    "kind": "Status", "apiVersion": "v1", "status": "Failure", "reason": "Expired", "code": 410,
+                    "message": f"too old resource version: {rv} ({cluster.rv})",
+                }}).encode() + b"\n")
+                return self._end_chunked()
+            for data in cluster.watch_from(resource, rv, namespace, query.get("fieldSelector"), query.get("labelSelector"), deadline):
+                self._chunk(data)
+                self.wfile.flush()
+            self._end_chunked()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _log(self, name: str, query: Dict[str, str]) -> None:
+        tail = int(query["tailLines"]) if query.get("tailLines") else None
+        lines = self.cluster.log_lines(name, tail, query.get("timestamps") == "true", query.get("sinceTime"))
+        data = ("\n".join(lines) + "\n").encode() if lines else b""
+        if query.get("limitBytes"):
+            data = data[:int(query["limitBytes"])]
+        self._start_chunked("text/plain")
+        for i in range(0, len(data), CHUNK_SIZE):
+            self._chunk(data[i:i + CHUNK_SIZE])
+        self._end_chunked()
+
+    def do_POST(self) -> None:
+        resource, namespace, name, _, _ = self._route()
+        if resource is None or name is not None:
+            return self._status(404, "NotFound", f"the server could not find the requested resource ({self.path})")
+        obj = self._read_body()
+        cluster = self.cluster
+        with cluster.lock:
+            if cluster.get(resource, namespace or obj.get("metadata", {}).get("namespace"), obj.get("metadata", {}).get("name", "")) is not None:
+                return self._status(409, "AlreadyExists", f'{resource} "{obj["metadata"]["name"]}" already exists')
+            created = cluster.create(resource, namespace, obj)
+        self._send_json(201, created)
+
+    def do_PATCH(self) -> None:
+        resource, namespace, name, subresource, query = self._route()
+        if resource is None or name is None:
+            return self._status(404, "NotFound", f"the server could not find the requested resource ({self.path})")
+        patch = self._read_body()
+        if not isinstance(patch, dict):
+            return self._status(415, "UnsupportedMediaType", "json patch is not supported by the bench server")
+        apply = "apply-patch" in (self.headers.get("Content-Type") or "")
+        cluster = self.cluster
+        with cluster.lock:
+            entry = cluster.get(resource, namespace, name)
+            if query.get("dryRun"):
+                return self._send_json(201 if entry is None else 200, _merge(entry.obj if entry else {}, patch))
+            if entry is None:
+                if not apply:
+                    return self._status(404, "NotFound", f'{resource} "{name}" not found')
+                return self._send_json(201, cluster.create(resource, namespace, patch))
+            updated = cluster.update(resource, entry, patch, subresource)
+        self._send_json(200, updated)
+
+    def do_DELETE(self) -> None:
+        resource, namespace, name, _, _ = self._route()
+        if resource is None or name is None:
+            return self._status(404, "NotFound", f"the server could not find the requested resource ({self.path})")
+        cluster = self.cluster
+        with cluster.lock:
+            entry = cluster.get(resource, namespace, name)
+            if entry is None:
+                return self._status(404, "NotFound", f'{resource} "{name}" not found')
+            deleted = cluster.delete(resource, entry)
+        self._send_json(200, deleted)
+
+
+def serve(cluster: SyntheticCluster, host: str = "127.0.0.1", port: int = 18080) -> ThreadingHTTPServer:
+    """在后台线程启动 API Server 替身，返回 server 对象（调用 shutdown() 停止）"""
+    handler = type("BoundHandler", (Handler,), {"cluster": cluster})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-apiserver", daemon=True).start()
+    return server
+
+
+def write_kubeconfig(path: str, host: str, port: int) -> str:
+    """生成指向 API Server 替身的 kubeconfig"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "apiVersion": "v1",
+            "kind": "Config",
+            "clusters": [{"name": "bench", "cluster": {"server": f"http://{host}:{port}"}}],
+            "users": [{"name": "bench", "user": {"token": "bench"}}],
+            "contexts": [{"name": "bench", "context": {"cluster": "bench", "user": "bench", "namespace": "default"}}],
+            "current-context": "bench",
+        }, f)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Kubernetes API server seeded with a synthetic cluster")
+    parser.add_argument("--pods", type=int, default=1000)
+    parser.add_argument("--namespaces", type=int, default=10)
+    parser.add_argument("--nodes", type=int, default=None)
+    parser.add_argument("--pods-per-deployment", type=int, default=10)
+    parser.add_argument("--log-lines", type=int, default=1000)
+    parser.add_argument("--log-rate", type=float, default=0.0, help="log lines appended per second after startup")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--kubeconfig", help="write a kubeconfig pointing at this server")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    cluster = SyntheticCluster(args.pods, args.namespaces, args.nodes, args.pods_per_deployment, args.log_lines, args.log_rate)
+    server = serve(cluster, args.host, args.port)
+    if args.kubeconfig:
+        write_kubeconfig(args.kubeconfig, args.host, args.port)
+    # 启动完成标记，bench.run 据此判断可以开始压测
+    print(f"ready {args.host}:{args.port} pods={args.pods} seeded in {time.perf_counter() - started:.1f}s", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
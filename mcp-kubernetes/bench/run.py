@@ -0,0 +1,309 @@
+"""mcp-kubernetes 工具基准测试
+
+为每个集群规模启动一个 API Server 替身（bench.fake_apiserver）和一个 server.py 进程，
+通过 MCP 客户端（streamable-http）依次调用 server.py 中的每个工具，统计每个场景的
+p50/p95/p99 延迟、响应字节数，以及 server 进程的峰值 RSS。
+
+    python -m bench.run --pods 1000,10000 --iterations 20 --output bench.json
+    python -m bench.run --pods 10000 --baseline bench.json     # 与基线对比，p95 变慢超过阈值时返回非零
+
+需要在 mcp-kubernetes 目录下运行。
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from typing import Optional, Any, Dict, List, Callable, NamedTuple
+
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Scenario(NamedTuple):
+    name: str
+    tool: str
+    args: Callable[[int], Dict[str, Any]]
+
+
+# 每个场景按迭代序号生成参数，创建与删除类场景使用各自的对象名
+SCENARIOS: List[Scenario] = [
+    Scenario("get_resources/pods-all", "get_resources", lambda i: {"resource_type": "pods", "all_namespace": True}),
+    Scenario("get_resources/pods-compact", "get_resources", lambda i: {
+        "resource_type": "pods", "all_namespace": True, "fields": "name,namespace,state,running_node", "output_type": "compact"
+    }),
+    Scenario("get_resources/pods-page", "get_resources", lambda i: {"resource_type": "pods", "all_namespace": True, "limit": 500}),
+    Scenario("get_resources/pods-selector", "get_resources", lambda i: {"resource_type": "pods", "namespace": "default", "label_selector": "app=app-00000"}),
+    Scenario("get_resources/nodes", "get_resources", lambda i: {"resource_type": "nodes"}),
+    Scenario("get_resources/deployments", "get_resources", lambda i: {"resource_type": "deployments", "all_namespace": True}),
+    Scenario("get_resources/generic", "get_resources", lambda i: {"resource_type": "replicasets", "namespace": "default"}),
+    Scenario("get_resources/table", "get_resources", lambda i: {"resource_type": "pods", "namespace": "default", "output_type": "wide"}),
+    Scenario("describe_resources/pod", "describe_resources", lambda i: {"resource_type": "pods", "name": "app-00000-5d4f8c7b9-00000", "namespace": "default"}),
+    Scenario("describe_resources/deployments", "describe_resources", lambda i: {"resource_type": "deployments", "namespace": "default"}),
+    Scenario("query_resources/image", "query_resources", lambda i: {"image": "registry.local/app-00000:1.0", "fields": "name,namespace,running_node"}),
+    Scenario("query_resources/node", "query_resources", lambda i: {"node": "node-0000", "fields": "name,namespace,state"}),
+    Scenario("query_resources/owner", "query_resources", lambda i: {"owner": "deployment/app-00000", "namespace": "default", "fields": "name,state"}),
+    Scenario("get_api_resources", "get_api_resources", lambda i: {}),
+    Scenario("get_resources_logs/pod", "get_resources_logs", lambda i: {"resource_type": "pod", "resource_name": "app-00000-5d4f8c7b9-00000", "tail": "200"}),
+    Scenario("get_resources_logs/deployment", "get_resources_logs", lambda i: {"resource_type": "deployment", "resource_name": "app-00000", "tail": "100"}),
+    Scenario("search_logs/deployment", "search_logs", lambda i: {
+        "resource_type": "deployment", "resource_name": "app-00000", "pattern": r"status=200 latency_ms=4\d", "max_matches": 5, "context_lines": 1
+    }),
+    Scenario("wait_for/pod-phase", "wait_for", lambda i: {
+        "resource_type": "pods", "condition": "phase=Running", "resource_name": "app-00000-5d4f8c7b9-00000", "timeout": 30
+    }),
+    Scenario("wait_for/selector", "wait_for", lambda i: {
+        "resource_type": "pods", "condition": "condition=Ready", "label_selector": "app=app-00000", "timeout": 30
+    }),
+    Scenario("patch_resource", "patch_resource", lambda i: {
+        "resource_type": "deployment", "resource_name": "app-00000", "patch": {"metadata": {"annotations": {"bench/iteration": str(i)}}}
+    }),
+    Scenario("scale_resources/wait", "scale_resources", lambda i: {
+        "resource_type": "deployment", "replicas": 10 + i % 2, "resource_names": ["app-00000"], "wait": True, "timeout": 30
+    }),
+    Scenario("create_resource/configmap", "create_resource", lambda i: {
+        "resource_type": "configmap", "resource_name": f"bench-cm-{i}", "configmap_data": [{"key": f"value-{i}"}]
+    }),
+    Scenario("apply_resources", "apply_resources", lambda i: {"manifest": (
+        "apiVersion: v1\nkind: ConfigMap\nmetadata:\n  name: bench-apply\n  namespace: default\n"
+        f"data:\n  iteration: \"{i}\"\n"
+    )}),
+    Scenario("delete_resources/configmap", "delete_resources", lambda i: {"resource_type": "configmaps", "names": [f"bench-cm-{i}"], "namespace": "default"}),
+    Scenario("port_forward/list", "port_forward", lambda i: {"action": "list"}),
+    Scenario("list_clusters", "list_clusters", lambda i: {}),
+]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_port(port: int, proc: subprocess.Popen, timeout: float = 120) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"process exited with code {proc.returncode} before listening on {port}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"port {port} not ready after {timeout}s")
+
+
+def rss(pid: int) -> Dict[str, int]:
+    """进程当前与峰值 RSS（KiB），读取 /proc/<pid>/status"""
+    result = {}
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    key, value = line.split(":", 1)
+                    result[key] = int(value.split()[0])
+    except OSError:
+        pass
+    return {"rss_kib": result.get("VmRSS", 0), "peak_rss_kib": result.get("VmHWM", 0)}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    low = int(k)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (k - low)
+
+
+async def run_scenario(session: ClientSession, scenario: Scenario, iterations: int, concurrency: int, warmup: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    sizes: List[int] = []
+    errors: List[str] = []
+
+    async def _call(i: int, record: bool) -> None:
+        started = time.perf_counter()
+        result = await session.call_tool(scenario.tool, scenario.args(i))
+        elapsed = time.perf_counter() - started
+        text = "".join(getattr(c, "text", "") for c in result.content)
+        if not record:
+            return
+        latencies.append(elapsed * 1000)
+        sizes.append(len(text.encode()))
+        # 工具以 "[tool] Failed: ..." 或 isError 表示失败
+        if result.isError or "] Failed: " in text[:200]:
+            errors.append(text[:200])
+
+    for i in range(warmup):
+        await _call(-1 - i, False)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _bounded(i: int) -> None:
+        async with semaphore:
+            await _call(i, True)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_bounded(i) for i in range(iterations)))
+    wall = time.perf_counter() - started
+
+    return {
+        "calls": len(latencies),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies, default=0), 2),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0,
+        "response_bytes": int(sum(sizes) / len(sizes)) if sizes else 0,
+    }
+
+
+async def bench_size(pods: int, args: argparse.Namespace, scenarios: List[Scenario]) -> Dict[str, Any]:
+    workdir = tempfile.mkdtemp(prefix=f"mcp-bench-{pods}-")
+    api_port, mcp_port = free_port(), free_port()
+    kubeconfig = os.path.join(workdir, "kubeconfig")
+
+    fake = subprocess.Popen(
+        [
+            sys.executable, "-m", "bench.fake_apiserver",
+            "--pods", str(pods), "--namespaces", str(args.namespaces),
+            "--port", str(api_port), "--kubeconfig", kubeconfig,
+        ],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True
+    )
+    server: Optional[subprocess.Popen] = None
+    try:
+        print(f"[{pods} pods] {fake.stdout.readline().strip()}", flush=True)
+
+        env = {
+            **os.environ,
+            "KUBECONFIG": kubeconfig,
+            "KUBE_BACKEND": "api",
+            "MCP_HOST": "127.0.0.1",
+            "MCP_PORT": str(mcp_port),
+            "DISCOVERY_CACHE_FILE": os.path.join(workdir, "discovery_cache.json"),
+            "PORT_FORWARD_STATE": os.path.join(workdir, "port_forwards.json"),
+            "KUBE_INFORMER": "true" if args.informer else "false",
+        }
+        # server.py 的日志文件写在工作目录下
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "server.py")],
+            cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        started = time.perf_counter()
+        wait_port(mcp_port, server)
+        startup = rss(server.pid)
+        print(f"[{pods} pods] server ready in {time.perf_counter() - started:.1f}s, rss {startup['rss_kib'] // 1024} MiB", flush=True)
+
+        results: Dict[str, Any] = {}
+        async with streamablehttp_client(f"http://127.0.0.1:{mcp_port}/mcp", timeout=args.timeout, sse_read_timeout=args.timeout) as (read, write, _):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                available = {tool.name for tool in (await session.list_tools()).tools}
+                missing = available - {s.tool for s in scenarios}
+                if missing and not args.only:
+                    print(f"[{pods} pods] tools without a scenario: {', '.join(sorted(missing))}", flush=True)
+
+                for scenario in scenarios:
+                    if scenario.tool not in available:
+                        continue
+                    result = await run_scenario(session, scenario, args.iterations, args.concurrency, args.warmup)
+                    # 峰值 RSS 单调不减，逐场景记录可以看出是哪个场景抬高了峰值
+                    result.update(rss(server.pid))
+                    results[scenario.name] = result
+                    print(
+                        f"[{pods} pods] {scenario.name:<34} p50 {result['p50_ms']:>9.1f}ms  p95 {result['p95_ms']:>9.1f}ms  "
+                        f"p99 {result['p99_ms']:>9.1f}ms  {result['response_bytes']:>10} B  "
+                        f"peak {result['peak_rss_kib'] // 1024:>5} MiB" + (f"  errors {result['errors']}" if result["errors"] else ""),
+                        flush=True
+                    )
+
+        return {"pods": pods, "startup": startup, "final": rss(server.pid), "scenarios": results}
+    finally:
+        for proc in (server, fake):
+            if proc is not None and proc.poll() is None:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """对比基线，返回 p95 延迟或响应字节数超过 (1 + tolerance) 倍的场景"""
+    previous = {run["pods"]: run for run in baseline.get("runs", [])}
+    regressions = []
+    for run in results:
+        base = previous.get(run["pods"])
+        if base is None:
+            continue
+        for name, current in run["scenarios"].items():
+            before = base["scenarios"].get(name)
+            if before is None:
+                continue
+            for metric in ("p95_ms", "response_bytes"):
+                # 小于 5ms 的抖动不计入
+                if current[metric] > before[metric] * (1 + tolerance) and (metric != "p95_ms" or current[metric] - before[metric] > 5):
+                    regressions.append(f"{run['pods']} pods {name}: {metric} {before[metric]} -> {current[metric]}")
+        if run["final"]["peak_rss_kib"] > base["final"]["peak_rss_kib"] * (1 + tolerance):
+            regressions.append(f"{run['pods']} pods: peak rss {base['final']['peak_rss_kib']} -> {run['final']['peak_rss_kib']} KiB")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark mcp-kubernetes tools against a fake API server")
+    parser.add_argument("--pods", default="1000", help="comma separated cluster sizes, e.g. 1000,10000,100000")
+    parser.add_argument("--namespaces", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=300, help="MCP client timeout in seconds")
+    parser.add_argument("--only", help="comma separated scenario name prefixes")
+    parser.add_argument("--no-informer", dest="informer", action="store_false", help="run server.py with KUBE_INFORMER=false")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="compare against a previous --output file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression ratio against the baseline")
+    args = parser.parse_args()
+
+    scenarios = SCENARIOS
+    if args.only:
+        prefixes = [p.strip() for p in args.only.split(",") if p.strip()]
+        scenarios = [s for s in SCENARIOS if s.name.startswith(tuple(prefixes))]
+
+    runs = [asyncio.run(bench_size(int(size), args, scenarios)) for size in args.pods.split(",") if size.strip()]
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "iterations": args.iterations,
+        "concurrency": args.concurrency,
+        "informer": args.informer,
+        "runs": runs,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(runs, json.load(f), args.tolerance)
+        if regressions:
+            print("regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("no regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
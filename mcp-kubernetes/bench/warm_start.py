@@ -0,0 +1,104 @@
+"""informer 快照冷/热启动对比
+
+启动 API Server 替身后，在同一进程内依次创建两个 KubernetesManager：
+  - cold：没有快照，首个 get_pods(all_namespace=True) 只能实时向 API Server 列出
+  - warm：加载 cold 阶段写入的快照，informer 直接从快照的 resourceVersion 继续 watch
+统计从创建 manager 到首个应答的耗时，以及快照的写入耗时和大小。
+
+    python -m bench.warm_start --pods 50000
+
+需要在 mcp-kubernetes 目录下运行。
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from typing import Any, Dict
+
+from bench.run import ROOT, free_port
+
+
+def first_answer(label: str) -> Dict[str, Any]:
+    from utils.kubernetes_manager import KubernetesManager
+
+    started = time.perf_counter()
+    manager = KubernetesManager()
+    created = time.perf_counter()
+    rows = manager.get.get_pods(all_namespace=True, fields="name")
+    answered = time.perf_counter()
+
+    metadata = getattr(rows, "metadata", None) or {}
+    result = {
+        "phase": label,
+        "manager_init_ms": round((created - started) * 1000, 1),
+        "first_answer_ms": round((answered - started) * 1000, 1),
+        "rows": len(rows),
+        "source": metadata.get("source", "api"),
+    }
+
+    informer = manager.cache.informer("pods")
+    informer.synced.wait(120)
+    deadline = time.monotonic() + 30
+    while not informer.connected and time.monotonic() < deadline:
+        time.sleep(0.01)
+    result["watch_connected_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return {"result": result, "manager": manager}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare cold start with warm start from an informer snapshot")
+    parser.add_argument("--pods", type=int, default=50000)
+    parser.add_argument("--namespaces", type=int, default=10)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="mcp-warm-start-")
+    kubeconfig = os.path.join(workdir, "kubeconfig")
+    snapshot_file = os.path.join(workdir, "informer_snapshot.bin")
+    os.environ.update({
+        "KUBECONFIG": kubeconfig,
+        "KUBE_BACKEND": "api",
+        "KUBE_INFORMER": "true",
+        "DISCOVERY_CACHE_FILE": os.path.join(workdir, "discovery_cache.json"),
+        "PORT_FORWARD_STATE": os.path.join(workdir, "port_forwards.json"),
+        "INFORMER_SNAPSHOT_FILE": snapshot_file,
+        # 快照只在本脚本中显式写入
+        "INFORMER_SNAPSHOT_INTERVAL": "3600",
+    })
+    os.chdir(workdir)
+    sys.path.insert(0, ROOT)
+
+    fake = subprocess.Popen(
+        [
+            sys.executable, "-m", "bench.fake_apiserver",
+            "--pods", str(args.pods), "--namespaces", str(args.namespaces),
+            "--port", str(free_port()), "--kubeconfig", kubeconfig,
+        ],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True
+    )
+    try:
+        print(fake.stdout.readline().strip(), flush=True)
+
+        cold = first_answer("cold")
+        started = time.perf_counter()
+        cold["manager"].cache.save_snapshot(force=True)
+        cold["result"]["snapshot_save_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        cold["result"]["snapshot_bytes"] = os.path.getsize(snapshot_file)
+        cold["manager"].cache.stop()
+
+        warm = first_answer("warm")
+        warm["manager"].cache.stop()
+
+        for phase in (cold["result"], warm["result"]):
+            print("  ".join(f"{k}={v}" for k, v in phase.items()), flush=True)
+        speedup = cold["result"]["first_answer_ms"] / max(warm["result"]["first_answer_ms"], 0.001)
+        print(f"first answer speedup: {speedup:.1f}x", flush=True)
+    finally:
+        fake.terminate()
+        fake.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
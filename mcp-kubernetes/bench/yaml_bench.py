@@ -0,0 +1,102 @@
+"""YAML 序列化微基准
+
+以合成集群的 pod 列表（默认 5000 个）对比三条路径：
+  - 解析：kubectl -o yaml + 纯 Python yaml.safe_load，对比 -o json + json.loads
+  - 展示：纯 Python yaml.safe_dump，对比 utils.serialization.dump_yaml（libyaml）
+  - 日志：YamlFormatter 逐条格式化，对比替换前的 yaml.dump
+
+    python -m bench.yaml_bench --pods 5000 --repeat 3
+
+需要在 mcp-kubernetes 目录下运行。
+"""
+import argparse
+import json
+import logging
+import statistics
+import time
+
+from typing import Any, Callable, Dict, List
+
+import yaml
+
+from bench.fake_apiserver import SyntheticCluster
+from utils.logger import YamlFormatter
+from utils.serialization import LIBYAML, dump_yaml
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    """返回多次运行的中位耗时（秒）"""
+    durations: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def pod_list(pods: int) -> bytes:
+    cluster = SyntheticCluster(pods=pods, log_lines=0)
+    items = b",".join(entry.data for entry in cluster.stores["pods"].values())
+    return b'{"apiVersion":"v1","kind":"List","items":[' + items + b']}'
+
+
+def run(pods: int, repeat: int, log_records: int) -> List[Dict[str, Any]]:
+    raw_json = pod_list(pods)
+    document = json.loads(raw_json)
+    raw_yaml = yaml.safe_dump(document, sort_keys=False)
+
+    records = [
+        logging.LogRecord("bench", logging.INFO, __file__, 0, f"Kubernetes operation get_pods({i}) succeeded", None, None)
+        for i in range(log_records)
+    ]
+    formatter = YamlFormatter()
+
+    def format_before() -> None:
+        for record in records:
+            yaml.dump({
+                "timestamp": formatter.formatTime(record),
+                "level": record.levelname,
+                "message": record.getMessage(),
+            }, allow_unicode=True).strip()
+
+    cases = [
+        ("parse", "yaml.safe_load(kubectl -o yaml)", lambda: yaml.safe_load(raw_yaml), "json.loads(kubectl -o json)", lambda: json.loads(raw_json)),
+        ("display", "yaml.safe_dump", lambda: yaml.safe_dump(document, sort_keys=False), "serialization.dump_yaml", lambda: dump_yaml(document)),
+        ("logging", "yaml.dump per record", format_before, "YamlFormatter.format", lambda: [formatter.format(r) for r in records]),
+    ]
+    results = []
+    for name, before_label, before, after_label, after in cases:
+        before_s = measure(before, repeat)
+        after_s = measure(after, repeat)
+        results.append({
+            "case": name,
+            "before": before_label,
+            "before_ms": round(before_s * 1000, 1),
+            "after": after_label,
+            "after_ms": round(after_s * 1000, 1),
+            "speedup": round(before_s / after_s, 1) if after_s else None,
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark YAML parse/dump paths on a synthetic pod list")
+    parser.add_argument("--pods", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--log-records", type=int, default=10000)
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.pods, args.repeat, args.log_records)
+    print(f"pods={args.pods} libyaml={LIBYAML}")
+    print(f"{'case':<10}{'before':<34}{'ms':>10}  {'after':<30}{'ms':>10}{'speedup':>10}")
+    for r in results:
+        print(f"{r['case']:<10}{r['before']:<34}{r['before_ms']:>10}  {r['after']:<30}{r['after_ms']:>10}{r['speedup']:>9}x")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"pods": args.pods, "libyaml": LIBYAML, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
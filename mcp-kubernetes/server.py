@@ -2,12 +2,19 @@ import sys
 import socket
 import netifaces
 
-from mcp.server.fastmcp import FastMCP
-from typing import List, Dict, Any, Optional, Literal
+from mcp.server.fastmcp import FastMCP, Context
+from typing import List, Dict, Any, Optional, Literal, Union
 
 from utils.functions import parse_labels
+from utils.projection import to_columns
+from utils.serialization import dump_yaml
 from utils.logger import logger, set_log_file, set_log_level
-from utils.kubernetes_manager import KubernetesManager
+from utils.clusters import ClusterRegistry, ClusterProxy
+from utils.executor import ToolExecutor, parse_timeouts
+from utils.metrics import instrument_tools, add_metrics_route
+from utils.singleflight import SingleFlight, make_key
+from utils.result_cache import ResultCache
+from utils.env_utils import get_env_var
 
 
 
@@ -15,132 +22,453 @@ set_log_level("DEBUG")
 set_log_file("server.log")
 
 # Create Kubernetes MCP Server
-host = "0.0.0.0"
-port = 8000
+host = get_env_var("MCP_HOST", "0.0.0.0")
+port = int(get_env_var("MCP_PORT", "8000"))
 mcp = FastMCP("Kubernetes Resources Manager Server", host=host, port=port, log_level="INFO", log_requests=True)
 logger.info(f"MCP '{mcp.name}' initialized on {host}:{port}")
 
-# Create Kubernetes Resources Manager object
-km = KubernetesManager()
+# Create Kubernetes Resources Manager registry，每个 kubeconfig context 一个 manager，首次使用时创建
+clusters = ClusterRegistry(
+    get_env_var("KUBECONFIG"),
+    fan_out_timeout=float(get_env_var("CLUSTER_FAN_OUT_TIMEOUT", "30"))
+)
+clusters.get()
+# 工具内通过 km 访问 cluster 参数选中的集群
+km = ClusterProxy(clusters)
+
+# 阻塞的后端调用放入有界线程池执行，避免单个慢请求阻塞其他客户端
+executor = ToolExecutor(
+    max_workers=int(get_env_var("MCP_MAX_WORKERS", "8")),
+    default_timeout=float(get_env_var("TOOL_TIMEOUT", "120")),
+    timeouts=parse_timeouts(get_env_var("TOOL_TIMEOUTS", ""))
+)
+
+# 并发的相同只读请求（get/describe/api-resources/非流式日志）共享一次后端调用
+flights = SingleFlight(enabled=get_env_var("SINGLE_FLIGHT", "true").strip().lower() == "true")
+
+def resource_plural(cluster: str, resource_type: str) -> str:
+    """通过集群的 API 发现信息将资源名、简称或 Kind 解析为复数资源名，manager 尚未创建或为 kubectl 后端时抛出 ValueError"""
+    manager = clusters.existing(cluster)
+    if manager is None or manager.api is None:
+        raise ValueError(f"No API client for cluster '{cluster}'")
+    return manager.api.resolve(resource_type).plural
+
+
+# 只读工具结果的短期缓存，写入类工具按集群、资源类型与命名空间使其失效
+result_cache = ResultCache(
+    ttl=float(get_env_var("RESULT_CACHE_TTL", "10")),
+    max_entries=int(get_env_var("RESULT_CACHE_SIZE", "256")),
+    resolver=resource_plural
+)
+
+
+
+async def single_cluster(tool_name: str, cluster: Optional[str]):
+    """异步工具取得目标集群的 manager，不支持多集群
+
+    首次使用某个 context 时需要构建 manager（写 kubeconfig、加载发现缓存与 informer 快照），放入线程池执行，不阻塞事件循环。
+    """
+    if cluster == "*" or len(clusters.targets(cluster)) > 1:
+        raise ValueError("this tool can only run against a single cluster")
+    return await executor.run(tool_name, clusters.get, cluster)
+
+
+def cluster_names(cluster: Optional[str]) -> List[str]:
+    """cluster 参数对应的 context 名称，默认集群解析为 current-context"""
+    return clusters.targets(cluster) or [clusters.current_context or ""]
+
+
+def invalidate(cluster: Optional[str], kinds: Optional[List[str]], namespace: Optional[str]) -> None:
+    """写入后使相关的只读结果缓存失效，kinds 为 None 时使该集群的全部缓存失效"""
+    result_cache.invalidate(cluster_names(cluster), kinds, namespace)
+
+
+def read_scope(arguments: Dict[str, Any]) -> Optional[tuple]:
+    """get/describe 结果依赖的资源类型与命名空间，consistent=True 时不走缓存"""
+    if arguments.get("consistent"):
+        return None
+    namespace = None if arguments.get("all_namespace") else arguments.get("namespace")
+    return [arguments["resource_type"]], namespace
+
+
+def applied_scopes(result: Any) -> Dict[Optional[str], List[str]]:
+    """按命名空间归类 apply 结果中的对象类型，对象名形如 'ns/Kind/name' 或 'Kind/name'"""
+    scopes: Dict[Optional[str], List[str]] = {}
+    for item in result if isinstance(result, list) else []:
+        parts = str(item.get("object", "")).split("/") if isinstance(item, dict) else []
+        if len(parts) >= 2:
+            namespace = parts[0] if len(parts) == 3 else None
+            scopes.setdefault(namespace, []).append(parts[-2])
+    return scopes
+
+
+async def wait_rollout(
+    tool_name: str,
+    manager: Any,
+    resource_type: str,
+    names: List[str],
+    namespace: Optional[str],
+    timeout: float,
+    ctx: Optional[Context] = None
+) -> List[Dict[str, Any]]:
+    """在单个 watch 上等待对象发布完成，进度变化时以 MCP 进度通知推送，返回每个对象的最终状态"""
+    tool_timeout = executor.timeout_for(tool_name)
+    if tool_timeout:
+        # 留出余量，保证在工具超时前返回部分结果
+        timeout = min(timeout, max(1.0, tool_timeout - 5))
+
+    final: Dict[str, Dict[str, Any]] = {}
+    async for batch in executor.iterate(tool_name, manager.rollout.wait, resource_type, names, namespace, timeout):
+        for event in batch:
+            final[event["name"]] = event
+            if ctx is not None:
+                done = sum(1 for e in final.values() if e["state"] != "progressing")
+                await ctx.report_progress(done, len(names), message=f"{event['name']}: {event['message']}")
+    return [final.get(name, {"name": name, "state": "failed", "message": "no status observed"}) for name in names]
+
 
 # Register mcp tools
 @mcp.tool()
+@result_cache.cached(read_scope, cluster_names)
+@flights.coalesce
+@executor.offload
+@clusters.scoped(fan_out=True)
 def get_resources(
     resource_type: str,
     name: Optional[str] = None,
     namespace: Optional[str] = None,
     all_namespace: Optional[bool] = False,
-    output_type: Optional[str] = "json"
-) -> List[Dict[str, Any]]:
+    output_type: Optional[str] = "json",
+    consistent: Optional[bool] = False,
+    limit: Optional[int] = None,
+    continue_token: Optional[str] = None,
+    label_selector: Optional[str] = None,
+    field_selector: Optional[str] = None,
+    fields: Optional[str] = None,
+    max_items: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    no_cache: bool = False,
+    cluster: Optional[str] = None
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     通用资源获取函数
 
     Args:
-        resource_type (str): 资源类型，如 'nodes'、'namespaces'、'pods'、'services'、'deployments'
+        resource_type (str): 资源类型，如 'nodes'、'namespaces'、'pods'、'services'、'deployments'，
+            其他类型（含 CRD，如 'certificates.cert-manager.io'）按发现缓存解析并返回原始对象
         name (Optional[str]): 资源名称（如pod名、node名等）
         namespace (Optional[str]): 命名空间（如适用）
         all_namespace (Optional[bool]): 当设定为True时，则列出所有命名空间下对应的资源，反之仅列出'default'命名空间下的资源
-        output_type (Optional[str]): 输出类型，默认为json，支持yaml、wide，当非详细查询时，建议使用wide列出少量结果
+        output_type (Optional[str]): 输出类型，默认为json，支持yaml、wide、compact，当非详细查询时，建议使用wide列出少量结果；
+            yaml 与 json 获取方式相同，仅在返回前将结果转换为 YAML 文本；
+            compact 为紧凑列式输出 {"columns": [...], "rows": [[...]]}，列名只出现一次，适合大量结果
+        consistent (Optional[bool]): 默认优先读取本地缓存；设定为True时跳过缓存，强制向API Server实时查询
+        limit (Optional[int]): 分页大小，大集群列出资源时建议设置（如 500），存在后续分页时返回 continue 游标
+        continue_token (Optional[str]): 上一次返回的 metadata.continue 游标，用于获取下一页
+        label_selector (Optional[str]): label 选择器，如 'app=nginx,tier in (web,api)'
+        field_selector (Optional[str]): field 选择器，如 'status.phase=Running,spec.nodeName=node-1'
+        fields (Optional[str]): 投影字段，逗号分隔的点分路径，如 'name,state,containers.image'，只计算并返回这些字段；
+            通用资源类型按原始对象路径投影，如 'metadata.name,status.phase'
+        max_items (Optional[int]): 最多返回的条数，超出时在 metadata 中标记 truncated
+        max_bytes (Optional[int]): 返回结果的字节预算，超出时停止解析并在 metadata 中标记 truncated
+        no_cache (bool): 跳过工具结果缓存（默认会复用短时间内相同参数的结果，本服务的写入操作会使其失效）
+        cluster (Optional[str]): 目标集群（kubeconfig context 名称），默认为 current-context；'*' 或逗号分隔的多个集群时并发查询，
+            返回 {"results": {集群: 结果}, "errors": {集群: 错误或超时}}
 
     Returns:
-        List[Dict[str, Any]]: 资源信息
+        Union[List[Dict[str, Any]], Dict[str, Any]]: 资源信息；当结果来自本地缓存或存在分页时返回 {"items": [...], "metadata": {...}}，
+            metadata 中的 stale_seconds 表示缓存与集群断开同步的时长（0 表示实时同步），continue 为下一页游标
     """
+    list_options = {
+        "limit": limit,
+        "continue_token": continue_token,
+        "label_selector": label_selector,
+        "field_selector": field_selector,
+        "fields": fields,
+        "max_items": max_items,
+        "max_bytes": max_bytes,
+    }
+    compact = output_type == "compact"
+    if compact:
+        output_type = "json"
     try:
         if resource_type == "nodes":
-            return km.get.get_nodes(
+            result = km.get.get_nodes(
                 node_name=name,
-                output_type=output_type
+                output_type=output_type,
+                consistent=consistent,
+                **list_options
             )
             
         elif resource_type == "namespaces":
-            return km.get.get_namespaces(
+            result = km.get.get_namespaces(
                 namespace=name,
-                output_type=output_type
+                output_type=output_type,
+                consistent=consistent,
+                **list_options
             )
             
         elif resource_type == "pods":
-            return km.get.get_pods(
+            result = km.get.get_pods(
                 pod_name=name,
                 namespace=namespace,
                 all_namespace=all_namespace,
-                output_type=output_type
+                output_type=output_type,
+                consistent=consistent,
+                **list_options
             )
             
         elif resource_type == "services":
-            return km.get.get_services(
+            result = km.get.get_services(
                 service=name,
                 namespace=namespace,
                 all_namespace=all_namespace,
-                output_type=output_type
+                output_type=output_type,
+                consistent=consistent,
+                **list_options
             )
             
         elif resource_type == "deployments":
-            return km.get.get_deployment_apps(
+            result = km.get.get_deployment_apps(
                 app_name=name,
                 namespace=namespace,
                 all_namespace=all_namespace,
-                output_type=output_type
+                output_type=output_type,
+                consistent=consistent,
+                **list_options
             )
             
         else:
-            raise ValueError(f"Unsupport resource type: {resource_type}")
+            result = km.get.get_resources_generic(
+                resource_type,
+                resource_name=name,
+                namespace=namespace,
+                all_namespace=all_namespace,
+                output_type=output_type,
+                consistent=consistent,
+                **list_options
+            )
+
+        failed = isinstance(result, list) and bool(result) and isinstance(result[0], Exception)
+        if compact and not failed:
+            return to_columns(result, fields)
+        if getattr(result, "metadata", None):
+            result = {"items": list(result), "metadata": result.metadata}
+        if output_type == "yaml" and isinstance(result, (list, dict)) and not failed:
+            return dump_yaml(result if isinstance(result, dict) else list(result))
+        return result
         
     except Exception as e:
         logger.error(f"[get_resources] Error: {str(e)}")
         return f"[get_resources] Failed: {str(e)}"
 
 @mcp.tool()
-def delete_resources(
-    resource_type: str,
+@result_cache.cached(lambda arguments: ([arguments["resource_type"]], arguments.get("namespace")), cluster_names)
+@flights.coalesce
+@executor.offload
+@clusters.scoped(fan_out=True)
+def query_resources(
+    resource_type: str = "pods",
+    namespace: Optional[str] = None,
+    label_selector: Optional[str] = None,
+    field_selector: Optional[str] = None,
+    node: Optional[str] = None,
+    image: Optional[str] = None,
+    owner: Optional[str] = None,
+    fields: Optional[str] = None,
+    output_type: Literal['json', 'compact'] = 'json',
+    max_items: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    no_cache: bool = False,
+    cluster: Optional[str] = None
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    在本地缓存的集群对象上查询资源，只返回匹配的对象，适合"哪些 pod 使用 nginx:1.25 镜像"、"node-3 上运行了哪些 pod"、
+    "deployment/web 的 pod 有哪些"这类问题，无需列出全部资源再逐个查找。
+
+    节点、镜像、owner、label key=value 与命名空间均有二级索引，随 watch 事件增量维护；多个条件同时给出时取交集。
+
+    Args:
+        resource_type (str): 资源类型，默认 pods，支持 get_resources 可用的所有类型
+        namespace (Optional[str]): 命名空间，为空时查询所有命名空间
+        label_selector (Optional[str]): label 选择器，如 'app=nginx,tier in (web,api),!canary'
+        field_selector (Optional[str]): field 谓词，如 'status.phase=Running,spec.nodeName!=node-1'，支持对象中的任意点分路径
+        node (Optional[str]): 所在节点名称
+        image (Optional[str]): 容器镜像（含 init 容器），如 'nginx:1.25'；不带 tag 时匹配该仓库的所有版本
+        owner (Optional[str]): 所属对象，'kind/name'（如 'deployment/web'、'cronjob/backup'，自动经过 ReplicaSet/Job 展开）或 owner uid
+        fields (Optional[str]): 投影字段，逗号分隔，如 'name,namespace,running_node'
+        output_type (str): json 或 compact（列式输出，列名只出现一次）
+        max_items (Optional[int]): 最多返回的条数
+        max_bytes (Optional[int]): 返回结果的字节预算
+        no_cache (bool): 跳过工具结果缓存
+        cluster (Optional[str]): 目标集群（kubeconfig context 名称），默认为 current-context；'*' 或逗号分隔的多个集群时并发查询，
+            返回 {"results": {集群: 结果}, "errors": {集群: 错误或超时}}
+
+    Returns:
+        Union[List[Dict[str, Any]], Dict[str, Any]]: {"items": [...], "metadata": {...}}，metadata 中 matched 为匹配数量，
+            source 为 cache（informer 本地缓存）或 api（未启用 informer 时一次性列出）
+    """
+    try:
+        result = km.query.query(
+            resource_type=resource_type,
+            namespace=namespace,
+            label_selector=label_selector,
+            field_selector=field_selector,
+            node=node,
+            image=image,
+            owner=owner,
+            fields=fields,
+            max_items=max_items,
+            max_bytes=max_bytes
+        )
+        if result is False:
+            return "[query_resources] Failed: query raised an error, see server log"
+        if result and isinstance(result[0], Exception):
+            return f"[query_resources] Failed: {result[0]}"
+        if output_type == "compact":
+            return to_columns(result, fields)
+        return {"items": list(result), "metadata": getattr(result, "metadata", None)}
+    except Exception as e:
+        logger.error(f"[query_resources] Error: {str(e)}")
+        return f"[query_resources] Failed: {str(e)}"
+
+# 单个命名对象的删除仍走各类型原有的删除方法
+LEGACY_DELETES = {
+    "namespaces": lambda manager, name, namespace: manager.delete.delete_namespaces(namespaces=name),
+    "pods": lambda manager, name, namespace: manager.delete.delete_pods(pod_name=name, namespace=namespace),
+    "services": lambda manager, name, namespace: manager.delete.delete_services(services=name, namespace=namespace),
+    "deployments": lambda manager, name, namespace: manager.delete.delete_deployment_apps(app_name=name, namespace=namespace),
+}
+
+@mcp.tool()
+async def delete_resources(
+    resource_type: Optional[str] = None,
     name: Optional[str] = None,
     namespace: Optional[str] = None,
-) -> List[Dict[str, Any]]:
+    names: Optional[List[str]] = None,
+    label_selector: Optional[str] = None,
+    field_selector: Optional[str] = None,
+    propagation_policy: Literal['Background', 'Foreground', 'Orphan'] = "Background",
+    wait: bool = False,
+    timeout: float = 300,
+    max_concurrency: int = 8,
+    cluster: Optional[str] = None,
+    ctx: Context = None,
+) -> Union[str, List[Dict[str, Any]]]:
     """
-    通用资源删除函数
+    通用资源删除函数，支持按名称列表或 label/field 选择器跨类型批量删除，可等待对象完全删除
 
     Args:
-        resource_type (str): 资源类型，如 'nodes'、'namespaces'、'pods'、'services'、'deployments'
+        resource_type (Optional[str]): 资源类型，如 'namespaces'、'pods'、'services'、'deployments'，多个类型以逗号分隔，如 'deployments,services'
         name (Optional[str]): 资源名称（如pod名、node名等）
         namespace (Optional[str]): 命名空间（如适用）
+        names (Optional[List[str]], optional): 批量删除的名称列表，作用于 resource_type 中的每个类型；'kind/name' 形式的条目直接指定类型，如 'configmap/app-config'
+        label_selector (Optional[str], optional): label 选择器，如 'app=test'，匹配 resource_type 中每个类型的对象
+        field_selector (Optional[str], optional): field 选择器，如 'status.phase=Failed'
+        propagation_policy (str, optional): 级联删除策略：Background（默认）、Foreground、Orphan
+        wait (bool, optional): 是否等待对象完全删除（含 finalizer），每种类型共用一个 watch，等待期间推送进度通知
+        timeout (float, optional): 等待超时（秒），默认 300，不超过该工具的超时配置
+        max_concurrency (int, optional): 并发删除的对象数上限，默认 8
+        cluster (Optional[str]): 目标集群（kubeconfig context 名称），默认为 current-context
 
     Returns:
-        List[Dict[str, Any]]: 删除信息
+        Union[str, List[Dict[str, Any]]]: namespaces/pods/services/deployments 的单个对象时为删除信息；其他情况为每个对象的结果（kind、name、result 或 error），wait 时附带 state（deleted/failed）与 message
     """
     try:
-        if resource_type == "namespaces":
-            return km.delete.delete_namespaces(namespaces=name)
-        
-        elif resource_type == "pods":
-            return km.delete.delete_pods(pod_name=name, namespace=namespace)
-        
-        elif resource_type == "services":
-            return km.delete.delete_services(services=name, namespace=namespace)
-        
-        elif resource_type == "deployments":
-            return km.delete.delete_deployment_apps(app_name=name, namespace=namespace)
-        
-        else:
-            raise ValueError(f"Unsupport resource type: {resource_type}")
-        
+        manager = await single_cluster("delete_resources", cluster)
+        kinds = [k.strip() for k in (resource_type or "").split(",") if k.strip()]
+
+        bulk = names or label_selector or field_selector or wait or len(kinds) != 1 or propagation_policy != "Background"
+        # 其他类型的单个对象同样走批量路径，按 resource_type 解析（含 CRD）
+        if not bulk and kinds[0] in LEGACY_DELETES:
+            try:
+                return await executor.run("delete_resources", LEGACY_DELETES[kinds[0]], manager, name, namespace)
+            finally:
+                invalidate(cluster, kinds, namespace)
+
+        targets = await executor.run(
+            "delete_resources",
+            manager.delete.select_targets,
+            kinds,
+            names=(names or []) + ([name] if name else []),
+            namespace=namespace,
+            label_selector=label_selector,
+            field_selector=field_selector
+        )
+        if not targets:
+            return []
+        deleted_kinds = sorted({kind for kind, _ in targets})
+        try:
+            results = await executor.run(
+                "delete_resources",
+                manager.delete.delete_resources,
+                targets,
+                namespace=namespace,
+                propagation_policy=propagation_policy,
+                max_concurrency=max_concurrency
+            )
+        finally:
+            invalidate(cluster, deleted_kinds, namespace)
+        if not results:
+            return "[delete_resources] Failed: no resources deleted"
+        if not wait:
+            return results
+
+        tool_timeout = executor.timeout_for("delete_resources")
+        if tool_timeout:
+            # 留出余量，保证在工具超时前返回部分结果
+            timeout = min(timeout, max(1.0, tool_timeout - 5))
+
+        deleted = [(r["kind"], r["name"]) for r in results if "result" in r]
+        final: Dict[tuple, Dict[str, Any]] = {}
+        async for batch in executor.iterate("delete_resources", manager.delete.wait_deleted, deleted, namespace, timeout):
+            for event in batch:
+                final[(event["kind"], event["name"])] = event
+                if ctx is not None:
+                    done = sum(1 for e in final.values() if e["state"] != "deleting")
+                    await ctx.report_progress(done, len(deleted), message=f"{event['kind']}/{event['name']}: {event['message']}")
+        # 等待期间对象经历 finalizer 清理直至消失，再次失效
+        invalidate(cluster, deleted_kinds, namespace)
+        for r in results:
+            status = final.get((r["kind"], r["name"]))
+            if status is not None:
+                r.update(state=status["state"], message=status["message"])
+        return results
+
+    except TimeoutError:
+        return f"[delete_resources] Failed: timed out after {executor.timeout_for('delete_resources')} seconds"
     except Exception as e:
         logger.error(f"[delete_resources] Error: {str(e)}")
         return f"[delete_resources] Failed: {str(e)}"
 
 @mcp.tool()
+@result_cache.cached(read_scope, cluster_names)
+@flights.coalesce
+@executor.offload
+@clusters.scoped(fan_out=True)
 def describe_resources(
     resource_type: str,
     name: Optional[str] = None,
     namespace: Optional[str] = None,
     all_namespace: Optional[bool] = False,
+    output_type: Literal['json', 'text'] = 'json',
+    no_cache: bool = False,
+    cluster: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """
     通用资源描述函数
 
+    默认返回结构化描述：元数据、状态、条件、容器状态及相关事件（基于本地缓存和事件索引，无需逐个调用 kubectl describe）。
+
     Args:
         resource_type (str): 资源类型，如 'nodes'、'namespaces'、'pods'、'services'、'deployments'
         name (Optional[str]): 资源名称（如pod名、node名等）
         namespace (Optional[str]): 命名空间（如适用）
         all_namespace (Optional[bool]): 当设定为True时，则列出所有命名空间下对应的资源，反之仅列出'default'命名空间下的资源
+        output_type (str): 输出类型，json 为结构化描述，text 为 kubectl describe 原始文本
+        no_cache (bool): 跳过工具结果缓存（默认会复用短时间内相同参数的结果，本服务的写入操作会使其失效）
+        cluster (Optional[str]): 目标集群（kubeconfig context 名称），默认为 current-context；'*' 或逗号分隔的多个集群时并发查询，
+            返回 {"results": {集群: 结果}, "errors": {集群: 错误或超时}}
 
     Returns:
         List[Dict[str, Any]]: 资源信息
@@ -149,11 +477,13 @@ def describe_resources(
         if resource_type == "nodes":
             return km.describe.describe_nodes(
                 node_name=name,
+                output_type=output_type,
             )
             
         elif resource_type == "namespaces":
             return km.describe.describe_namespaces(
                 namespace=name,
+                output_type=output_type,
             )
             
         elif resource_type == "pods":
@@ -161,6 +491,7 @@ def describe_resources(
                 pod_name=name,
                 namespace=namespace,
                 all_namespace=all_namespace,
+                output_type=output_type,
             )
             
         elif resource_type == "services":
@@ -168,6 +499,7 @@ def describe_resources(
                 service=name,
                 namespace=namespace,
                 all_namespace=all_namespace,
+                output_type=output_type,
             )
             
         elif resource_type == "deployments":
@@ -175,6 +507,7 @@ def describe_resources(
                 app_name=name,
                 namespace=namespace,
                 all_namespace=all_namespace,
+                output_type=output_type,
             )
             
         else:
@@ -184,10 +517,16 @@ def describe_resources(
         return f"[describe_resources] Failed: {str(e)}"
 
 @mcp.tool()
+@result_cache.cached(lambda arguments: (["apiresources"], None), cluster_names)
+@flights.coalesce
+@executor.offload
+@clusters.scoped(fan_out=True)
 def get_api_resources(
     api_group: Optional[str] = None,
     namespaced: Optional[bool] = None,
     output_type: Optional[str] = 'wide',
+    no_cache: bool = False,
+    cluster: Optional[str] = None
 ) -> Dict:
     """获取kubernetes可用api资源类型
 
@@ -195,6 +534,9 @@ def get_api_resources(
         api_group (Optional[str], optional): api资源类型
         namespaced (Optional[bool], optional): 是否支持namespace
         output_type (Optional[str], optional): 输出类型，支持wide
+        no_cache (bool, optional): 跳过工具结果缓存
+        cluster (Optional[str]): 目标集群（kubeconfig context 名称），默认为 current-context；'*' 或逗号分隔的多个集群时并发查询，
+            返回 {"results": {集群: 结果}, "errors": {集群: 错误或超时}}
 
     Raises:
         RuntimeError: 当subprocess执行错误时抛出异常
@@ -213,7 +555,7 @@ def get_api_resources(
         return f"[get_api_resources] Failed: {str(e)}"
 
 @mcp.tool()
-def get_resources_logs(
+async def get_resources_logs(
     resource_type: str,
     resource_name: str,
     namespace: str = 'default',
@@ -224,6 +566,15 @@ def get_resources_logs(
     timestamps: bool = False,
     previous: bool = False,
     label_selector: Optional[str] = None,
+    stream: bool = False,
+    follow: bool = False,
+    follow_seconds: float = 30,
+    limit_bytes: Optional[int] = None,
+    limit_lines: Optional[int] = None,
+    max_concurrency: int = 4,
+    new_only: bool = False,
+    cluster: Optional[str] = None,
+    ctx: Context = None,
 ) -> str:
     """
     获取指定 Kubernetes 资源的日志。
@@ -239,35 +590,210 @@ def get_resources_logs(
         timestamps (bool, optional): 是否显示时间戳。
         previous (bool, optional): 是否包含之前的容器日志。
         label_selector (str, optional): 用于匹配 Pod 的自定义 label。
-        kubeconfig_path (str, optional): kubeconfig 路径，默认 /root/.kube/config。
+        stream (bool, optional): 是否流式读取，日志分块通过 MCP 进度通知实时推送。
+        follow (bool, optional): 是否持续跟踪新日志（隐含 stream），最多跟踪 follow_seconds 秒。
+        follow_seconds (float, optional): follow 模式的最长跟踪时间（秒），默认 30，同时受工具超时限制。
+        limit_bytes (int, optional): 最多返回的日志字节数，流式模式下默认 256KiB。
+        limit_lines (int, optional): 流式模式下最多返回的日志行数。
+        max_concurrency (int, optional): deployment/job/cronjob 同时读取日志的容器数上限，默认 4。
+            这些资源会读取所有匹配 pod 的日志并按时间戳归并，每行以 [pod/容器] 标记来源。
+        new_only (bool, optional): 只返回同一 pod/容器上次 new_only 读取之后的新日志（以上次最后一行的时间作为
+            since_time 增量拉取并去重，忽略 tail/since/since_time）；首次调用按其他参数返回并记录读取位置。不能与 stream/follow 同时使用。
+        cluster (Optional[str], optional): 目标集群（kubeconfig context 名称），默认为 current-context
 
     Returns:
         str: 日志字符串。
     """
+    options = dict(
+        resource_type=resource_type,
+        resource_name=resource_name,
+        namespace=namespace,
+        container=container,
+        tail=tail,
+        since=since,
+        sinceTime=since_time,
+        timestamps=timestamps,
+        previous=previous,
+        labelSelector=label_selector,
+        limit_bytes=limit_bytes,
+        max_concurrency=max_concurrency
+    )
     try:
-        return km.logs.kubectl_logs(
+        manager = await single_cluster("get_resources_logs", cluster)
+
+        if new_only and (stream or follow):
+            raise ValueError("new_only cannot be combined with stream or follow")
+
+        if not (stream or follow):
+            return await flights.do(
+                "get_resources_logs",
+                make_key("get_resources_logs", cluster=cluster, new_only=new_only, **options),
+                lambda: executor.run("get_resources_logs", manager.logs.kubectl_logs, new_only=new_only, **options)
+            )
+
+        lines: List[str] = []
+        try:
+            async for batch in executor.iterate(
+                "get_resources_logs",
+                manager.logs.stream_logs,
+                follow=follow,
+                follow_seconds=follow_seconds,
+                limit_lines=limit_lines,
+                **options
+            ):
+                lines.extend(batch)
+                if ctx is not None:
+                    await ctx.report_progress(len(lines), message="\n".join(batch))
+        except TimeoutError:
+            lines.append(f"... [truncated: tool timeout {executor.timeout_for('get_resources_logs')}s reached]")
+        return "\n".join(lines)
+    except Exception as e:
+        logger.error(f"[get_resources_logs] Error: {str(e)}")
+        return f"Error retrieving logs: {str(e)}"
+
+@mcp.tool()
+@flights.coalesce
+@executor.offload
+@clusters.scoped(fan_out=True)
+def search_logs(
+    resource_type: str,
+    resource_name: str,
+    pattern: str,
+    namespace: str = 'default',
+    container: Optional[str] = None,
+    label_selector: Optional[str] = None,
+    context_lines: int = 2,
+    max_matches: int = 20,
+    ignore_case: bool = False,
+    tail: Optional[str] = None,
+    since: Optional[str] = None,
+    since_time: Optional[str] = None,
+    previous: bool = False,
+    max_concurrency: int = 4,
+    cluster: Optional[str] = None
+) -> Union[Dict[str, Any], str]:
+    """
+    在资源的日志中按正则搜索，只返回命中的行及其上下文，适合"deployment/web 有没有报 OOM/timeout"这类问题，
+    无需拉取完整日志再逐行阅读。所有匹配 pod 的容器并发流式读取，命中数达到 max_matches 后立即停止读取。
+
+    Args:
+        resource_type (str): 支持 pod, deployment, job, cronjob。
+        resource_name (str): 资源名称。
+        pattern (str): 正则表达式（Python re 语法），如 'error|panic'、'status=5\\d\\d'。
+        namespace (str, optional): 命名空间，默认为 default。
+        container (str, optional): 只搜索该容器。
+        label_selector (str, optional): 用于匹配 Pod 的自定义 label。
+        context_lines (int, optional): 每条命中前后附带的上下文行数，默认 2。
+        max_matches (int, optional): 命中条数上限，默认 20，达到后停止读取。
+        ignore_case (bool, optional): 是否忽略大小写。
+        tail (str, optional): 每个容器只搜索最后 N 行。
+        since (str, optional): 只搜索最近一段时间的日志（如 5m、1h）。
+        since_time (str, optional): 只搜索该时间（RFC3339）之后的日志。
+        previous (bool, optional): 搜索容器上一次运行的日志。
+        max_concurrency (int, optional): 同时读取日志的容器数上限，默认 4。
+        cluster (Optional[str], optional): 目标集群（kubeconfig context 名称），默认为 current-context；'*' 或逗号分隔的多个集群时并发搜索，
+            返回 {"results": {集群: 结果}, "errors": {集群: 错误或超时}}
+
+    Returns:
+        Union[Dict[str, Any], str]: {"matches": [{"pod", "container", "timestamp", "line", "before", "after"}], "metadata": {...}}，
+            命中按时间戳排序；metadata.truncated 为 true 表示达到 max_matches 后提前停止，errors 为读取失败的容器
+    """
+    try:
+        result = km.logs.search_logs(
             resource_type=resource_type,
             resource_name=resource_name,
+            pattern=pattern,
             namespace=namespace,
             container=container,
+            labelSelector=label_selector,
+            context_lines=context_lines,
+            max_matches=max_matches,
+            ignore_case=ignore_case,
             tail=tail,
             since=since,
             sinceTime=since_time,
-            timestamps=timestamps,
             previous=previous,
-            labelSelector=label_selector
+            max_concurrency=max_concurrency
         )
+        if result is False:
+            return "[search_logs] Failed: search raised an error, see server log"
+        if isinstance(result, list) and result and isinstance(result[0], Exception):
+            return f"[search_logs] Failed: {result[0]}"
+        return result
     except Exception as e:
-        logger.error(f"[get_resources_logs] Error: {str(e)}")
-        return f"Error retrieving logs: {str(e)}"
+        logger.error(f"[search_logs] Error: {str(e)}")
+        return f"[search_logs] Failed: {str(e)}"
 
 @mcp.tool()
-def patch_resource(
+@flights.coalesce
+@executor.offload
+@clusters.scoped()
+def wait_for(
+    resource_type: str,
+    condition: str,
+    resource_name: Optional[str] = None,
+    namespace: Optional[str] = 'default',
+    label_selector: Optional[str] = None,
+    timeout: float = 60,
+    cluster: Optional[str] = None
+) -> Union[Dict[str, Any], str]:
+    """
+    阻塞等待 Kubernetes 对象满足条件，条件满足时立即返回，超时返回当前状态。适合等待 pod Running、job 完成、
+    service 拿到 endpoints 等场景，替代反复调用 get_resources 轮询。
+
+    pods、deployments、jobs 等常用类型的所有等待共享一条 watch 连接，按事件即时求值，不会为每次等待重新列出资源；
+    其他类型（如 secrets、CRD）每次等待只 watch 限定命名空间、名称与 label 的对象，等待结束即关闭。
+
+    Args:
+        resource_type (str): 资源类型，如 pods、jobs、deployments、endpoints，支持 CRD。
+        condition (str): 条件表达式（与 kubectl wait --for 相近）：
+            'phase=Running'：status.phase 等于给定值；
+            'condition=Ready' 或 'condition=Complete=True'：status.conditions 中该类型的 status，默认 True；
+            'jsonpath={.status.readyReplicas}=3'：路径取值等于给定值，省略 '=值' 时要求取值非空，如 'jsonpath={.subsets[0].addresses}'；
+            'delete'：对象已删除。
+        resource_name (Optional[str]): 对象名称，与 label_selector 二选一；对象尚不存在时等待其创建。
+        namespace (Optional[str]): 命名空间，默认为 default，为空时匹配所有命名空间。
+        label_selector (Optional[str]): label 选择器，匹配的对象全部满足条件才返回（至少一个）。
+        timeout (float): 最长等待时间（秒），默认 60，受工具超时限制。
+        cluster (Optional[str], optional): 目标集群（kubeconfig context 名称），默认为 current-context
+
+    Returns:
+        Union[Dict[str, Any], str]: satisfied 表示条件是否满足，message 为说明，objects 为各对象的求值结果（observed 为观察到的取值）
+    """
+    try:
+        tool_timeout = executor.timeout_for("wait_for")
+        if tool_timeout:
+            # 留出余量，保证在工具超时前返回当前状态
+            timeout = min(timeout, max(1.0, tool_timeout - 5))
+
+        result = km.wait.wait_for(
+            resource_type=resource_type,
+            condition=condition,
+            resource_name=resource_name,
+            namespace=namespace,
+            label_selector=label_selector,
+            timeout=timeout
+        )
+        if result is False:
+            return "[wait_for] Failed: wait raised an error, see server log"
+        if isinstance(result, list) and result and isinstance(result[0], Exception):
+            return f"[wait_for] Failed: {result[0]}"
+        return result
+    except Exception as e:
+        logger.error(f"[wait_for] Error: {str(e)}")
+        return f"[wait_for] Failed: {str(e)}"
+
+@mcp.tool()
+async def patch_resource(
     resource_type: str,
     resource_name: str,
     patch: Dict,
     namespace: str = "default",
     patch_type: str = "strategic",
+    wait: bool = False,
+    timeout: float = 300,
+    cluster: Optional[str] = None,
+    ctx: Context = None,
 ) -> str:
     """
     给指定 Kubernetes 资源打补丁（patch）。
@@ -278,35 +804,124 @@ def patch_resource(
         patch (Dict): 要应用的 patch 内容（字典格式）。
         namespace (str): 命名空间。
         patch_type (str): patch 类型，默认 strategic。
-        kubeconfig_path (str): kubeconfig 路径。
+        wait (bool, optional): 是否等待发布完成（observedGeneration 与 ready 副本收敛），等待期间推送进度通知，无需轮询 get_resources。
+        timeout (float, optional): 等待超时（秒），默认 300，不超过该工具的超时配置。
+        cluster (Optional[str]): 目标集群（kubeconfig context 名称），默认为 current-context
 
     Returns:
-        str: 执行结果。
+        str: 执行结果，wait 时附带发布状态。
     """
     try:
-        return km.patch.kubectl_patch(
-            resource_type=resource_type,
-            resource_name=resource_name,
-            patch=patch,
-            namespace=namespace,
-            patch_type=patch_type
-        )
+        manager = await single_cluster("patch_resource", cluster)
+        try:
+            result = await executor.run(
+                "patch_resource",
+                manager.patch.kubectl_patch,
+                resource_type=resource_type,
+                resource_name=resource_name,
+                patch=patch,
+                namespace=namespace,
+                patch_type=patch_type
+            )
+        finally:
+            invalidate(cluster, [resource_type], namespace)
+        if not wait or not isinstance(result, str) or "patched" not in result:
+            return result
+
+        status = (await wait_rollout(
+            "patch_resource", manager, resource_type, [resource_name], namespace, timeout, ctx
+        ))[0]
+        # 发布期间控制器替换了 pod 与 replicaset
+        invalidate(cluster, [resource_type], namespace)
+        return f"{result}\nrollout {status['state']}: {status['message']}"
+    except TimeoutError:
+        return f"[patch_resource] Failed: timed out after {executor.timeout_for('patch_resource')} seconds"
     except Exception as e:
         logger.error(f"[patch_resource] Error: {str(e)}")
         return f"[patch_resource] Failed: {str(e)}"
 
 @mcp.tool()
+async def scale_resources(
+    resource_type: Literal['deployment', 'statefulset', 'replicaset'],
+    replicas: int,
+    resource_names: Optional[List[str]] = None,
+    namespace: str = "default",
+    label_selector: Optional[str] = None,
+    wait: bool = False,
+    timeout: float = 300,
+    max_concurrency: int = 8,
+    cluster: Optional[str] = None,
+    ctx: Context = None,
+) -> Union[str, List[Dict[str, Any]]]:
+    """
+    批量扩缩容 deployment/statefulset/replicaset，多个对象并发提交，可等待所有对象发布完成。
+
+    Args:
+        resource_type (str): 资源类型：deployment、statefulset、replicaset。
+        replicas (int): 目标副本数。
+        resource_names (Optional[List[str]], optional): 资源名称列表。
+        namespace (str, optional): 命名空间，默认 default。
+        label_selector (Optional[str], optional): label 选择器，如 'tier=web'，匹配的对象与 resource_names 合并。
+        wait (bool, optional): 是否等待 ready 副本收敛，所有对象共用一个 watch，等待期间推送进度通知，无需轮询 get_resources。
+        timeout (float, optional): 等待超时（秒），默认 300，不超过该工具的超时配置。
+        max_concurrency (int, optional): 并发提交的对象数上限，默认 8。
+        cluster (Optional[str], optional): 目标集群（kubeconfig context 名称），默认为 current-context
+
+    Returns:
+        Union[str, List[Dict[str, Any]]]: 每个对象的结果（name、result 或 error），wait 时附带 state（ready/failed）与 message。
+    """
+    try:
+        manager = await single_cluster("scale_resources", cluster)
+        try:
+            results = await executor.run(
+                "scale_resources",
+                manager.scale.scale_resources,
+                resource_type=resource_type,
+                replicas=replicas,
+                resource_names=resource_names,
+                namespace=namespace,
+                label_selector=label_selector,
+                max_concurrency=max_concurrency
+            )
+        finally:
+            invalidate(cluster, [resource_type], namespace)
+        if not results:
+            return "[scale_resources] Failed: no resources scaled, check resource_names/label_selector"
+        if not wait:
+            return results
+
+        scaled = [r["name"] for r in results if "result" in r]
+        statuses = {s["name"]: s for s in await wait_rollout(
+            "scale_resources", manager, resource_type, scaled, namespace, timeout, ctx
+        )} if scaled else {}
+        invalidate(cluster, [resource_type], namespace)
+        for r in results:
+            if r["name"] in statuses:
+                r.update(state=statuses[r["name"]]["state"], message=statuses[r["name"]]["message"])
+        return results
+    except TimeoutError:
+        return f"[scale_resources] Failed: timed out after {executor.timeout_for('scale_resources')} seconds"
+    except Exception as e:
+        logger.error(f"[scale_resources] Error: {str(e)}")
+        return f"[scale_resources] Failed: {str(e)}"
+
+@mcp.tool()
+@executor.offload
+@clusters.scoped()
 def port_forward(
-    action: Literal['start', 'stop'],
+    action: Literal['start', 'stop', 'list'],
     resource_type: Optional[str] = None,
     resource_name: Optional[str] = None,
     local_port: Optional[int] = None,
     remote_port: Optional[int] = None,
     proc_id: Optional[int] = None,
-    namespace: str = 'default'
-) -> str:
+    namespace: str = 'default',
+    cluster: Optional[str] = None
+) -> Union[str, List[Dict[str, Any]]]:
     """
-    启动或停止本地端口映射到 Kubernetes 资源。
+    启动、停止或列出本地端口映射到 Kubernetes 资源。
+
+    相同资源和端口的转发已在运行时直接复用；转发进程异常退出后会自动重启，服务重启后转发依然保留。
 
     Args:
         resource_type (str): 资源类型，如 pod、deployment
@@ -314,11 +929,12 @@ def port_forward(
         local_port (int): 本地端口
         remote_port (int): 容器中暴露的远程端口
         namespace (str, optional): 命名空间，默认 default
-        action (str, optional): 操作类型，start 启动，stop 停止
-        proc_id (int, optional): 若 action 为 stop，需要传入要终止的进程 ID
+        action (str, optional): 操作类型，start 启动，stop 停止，list 列出所有转发及其健康状态
+        proc_id (int, optional): 若 action 为 stop，传入要终止的进程 ID；也可改为传入资源和端口参数
+        cluster (Optional[str], optional): 目标集群（kubeconfig context 名称），默认为 current-context
 
     Returns:
-        str: 执行结果或错误信息
+        Union[str, List[Dict[str, Any]]]: 执行结果或错误信息，list 时返回转发列表
     """
     try:
         if action == "start":
@@ -341,9 +957,15 @@ def port_forward(
             ), f"Now port-forwarding {ip_list}:{local_port} to {resource_name}"
             
         elif action == "stop":
-            if proc_id is None:
-                raise ValueError("When action is 'stop', proc_id is required.")
-            return km.portforward.stop_port_forward(proc_id=proc_id)
+            if proc_id is not None:
+                return km.portforward.stop_port_forward(proc_id=proc_id)
+            if resource_type and resource_name and local_port is not None and remote_port is not None:
+                key = km.portforward._make_key(resource_type, resource_name, local_port, remote_port, namespace)
+                return km.portforward.stop_port_forward(key=key)
+            raise ValueError("When action is 'stop', proc_id or resource_type, resource_name, local_port and remote_port are required.")
+
+        elif action == "list":
+            return km.portforward.list_port_forwards()
         else:
             raise ValueError(f"Unsupported action: {action}")
         
@@ -352,6 +974,8 @@ def port_forward(
         return f"[port_forward] Failed: {str(e)}"
 
 @mcp.tool()
+@executor.offload
+@clusters.scoped()
 def create_resource(
     resource_type: Optional[str],
     resource_name: Optional[str],
@@ -376,6 +1000,7 @@ def create_resource(
     service_ports: Optional[List[Dict[str, Any]]] = None,
     namespace: Optional[str] = 'default',
     labels: Optional[Dict[str, str]] = None,
+    cluster: Optional[str] = None
 ) -> str:
     """创建 Kubernetes 资源。
 
@@ -412,6 +1037,7 @@ def create_resource(
         service_ports (Optional[List[Dict[str, Any]]], optional): 多端口定义的完整字典列表，优先于单个端口配置。
         namespace (Optional[str], optional): 所属命名空间，默认为 'default'。
         labels (Optional[str], optional): 附加标签（label），字符串格式（JSON 字符串），如 '{"app": "nginx"}'。
+        cluster (Optional[str], optional): 目标集群（kubeconfig context 名称），默认为 current-context
 
     Returns:
         str: 资源创建结果或错误信息。
@@ -511,8 +1137,86 @@ def create_resource(
     except Exception as e:
         logger.error(f"[create_resource] Error: {str(e)}")
         return f"Error creating resource: {str(e)}"
+    finally:
+        invalidate(cluster, [resource_type or ""], namespace)
     
 
+@mcp.tool()
+@executor.offload
+@clusters.scoped()
+def apply_resources(
+    manifest: str,
+    namespace: Optional[str] = None,
+    dry_run: bool = False,
+    force: bool = False,
+    field_manager: str = "mcp-kubernetes",
+    max_concurrency: int = 8,
+    cluster: Optional[str] = None
+) -> Union[str, List[Dict[str, Any]]]:
+    """
+    批量应用多文档清单（server-side apply），一次调用即可部署整套应用。
+
+    按依赖层级依次应用：命名空间/CRD -> ConfigMap/Secret/ServiceAccount/RBAC/存储 -> 工作负载 -> Service/Ingress 等，
+    同一层内的对象并发应用。
+
+    Args:
+        manifest (str): 多文档 YAML（以 --- 分隔）或 JSON 清单，支持 kind: List。
+        namespace (str, optional): 对象未指定命名空间时使用的命名空间，默认使用 kubeconfig 中的命名空间。
+        dry_run (bool, optional): 仅在服务端试运行，返回每个对象与集群现有状态的差异（diff）。
+        force (bool, optional): 字段与其他管理者冲突时是否强制接管。
+        field_manager (str, optional): server-side apply 的字段管理者名称。
+        max_concurrency (int, optional): 同一层内并发应用的对象数上限，默认 8。
+        cluster (Optional[str], optional): 目标集群（kubeconfig context 名称），默认为 current-context
+
+    Returns:
+        Union[str, List[Dict[str, Any]]]: 每个对象的结果（object、action: created/configured/unchanged/error、diff、error）。
+    """
+    try:
+        result = km.apply.apply_manifest(
+            manifest=manifest,
+            namespace=namespace,
+            field_manager=field_manager,
+            force=force,
+            dry_run=dry_run,
+            max_concurrency=max_concurrency
+        )
+        if not dry_run:
+            scopes = applied_scopes(result)
+            if not scopes:
+                # 无法确定写入了哪些对象时使该集群的全部缓存失效
+                invalidate(cluster, None, None)
+            for object_namespace, kinds in scopes.items():
+                invalidate(cluster, kinds, object_namespace)
+        return result
+    except Exception as e:
+        logger.error(f"[apply_resources] Error: {str(e)}")
+        return f"[apply_resources] Failed: {str(e)}"
+
+@mcp.tool()
+@executor.offload
+def list_clusters() -> List[Dict[str, Any]]:
+    """
+    列出 kubeconfig 中可用的集群（context），各工具通过 cluster 参数选择目标集群。
+
+    Returns:
+        List[Dict[str, Any]]: 集群列表（name、current 是否为默认集群、connected 是否已建立连接及 backend 访问后端）。
+    """
+    try:
+        current = clusters.current_context
+        result = []
+        for name in clusters.contexts():
+            manager = clusters.managers.get(None if name == current else name)
+            result.append({
+                "name": name,
+                "current": name == current,
+                "connected": manager is not None,
+                "backend": None if manager is None else ("api" if manager.api is not None else "kubectl"),
+            })
+        return result
+    except Exception as e:
+        logger.error(f"[list_clusters] Error: {str(e)}")
+        return f"[list_clusters] Failed: {str(e)}"
+
 tool_count = 0
 for tool in mcp._tool_manager.list_tools():
     logger.info(f"Registered tool: {tool.name}")
@@ -520,10 +1224,16 @@ for tool in mcp._tool_manager.list_tools():
 
 logger.info(f"Total registered tools: {tool_count}")
 
+# 工具延迟直方图，与后端调用、解析阶段的直方图一起以 Prometheus 文本格式暴露在 /metrics
+instrument_tools(mcp._tool_manager)
+add_metrics_route(mcp)
+
 
 if __name__ == "__main__":
     try:
         mcp.run(transport="streamable-http")
     except KeyboardInterrupt:
+        executor.shutdown()
+        clusters.shutdown()
         logger.info(f"Closing Libvirt Server...")
         sys.exit(0)
\ No newline at end of file
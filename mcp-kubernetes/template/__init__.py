@@ -1,4 +1,4 @@
-from .wrapper import NoAliasDumper
+from .wrapper import NoAliasDumper, Skeleton, dump_yaml
 from .template_namespaces import gen_ns_template
 from .template_deployments import gen_deployment_template
 from .template_pods import gen_pod_template
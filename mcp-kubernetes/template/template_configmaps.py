@@ -1,6 +1,7 @@
-import yaml
 from typing import Optional, Dict, Union, Any
-from template import NoAliasDumper
+from template import Skeleton
+
+_SKELETON = Skeleton("v1", "ConfigMap")
 
 def gen_configmap_template(
     name: str,
@@ -8,21 +9,9 @@ def gen_configmap_template(
     namespace: Optional[str] = None,
     template_type: str = "yaml"
 ) -> Union[str, Dict[str, Any]]:
-    configmap = {
-        "apiVersion": "v1",
-        "kind": "ConfigMap",
-        "metadata": {
-            "name": name,
-        },
-        "data": data
-    }
+    metadata = {"name": name}
 
     if namespace:
-        configmap["metadata"]["namespace"] = namespace
+        metadata["namespace"] = namespace
 
-    if template_type.lower() == "yaml":
-        return yaml.dump(configmap, sort_keys=False, Dumper=NoAliasDumper)
-    elif template_type.lower() == "json":
-        return configmap
-    else:
-        raise ValueError("template_type must be either 'yaml' or 'json'")
+    return _SKELETON.render({"metadata": metadata, "data": data}, template_type)
@@ -1,6 +1,7 @@
-import yaml
 from typing import Optional, Union, Dict, Any, List
-from template import NoAliasDumper
+from template import Skeleton
+
+_SKELETON = Skeleton("apps/v1", "Deployment")
 
 def gen_deployment_template(
     name: str,
@@ -22,9 +23,7 @@ def gen_deployment_template(
     }]
     containers = containers or default_containers
 
-    deployment = {
-        "apiVersion": "apps/v1",
-        "kind": "Deployment",
+    body = {
         "metadata": {
             "name": name,
             "labels": labels
@@ -45,9 +44,5 @@ def gen_deployment_template(
         }
     }
 
-    if template_type.lower() == 'yaml':
-        return yaml.dump(deployment, sort_keys=False, Dumper=NoAliasDumper)
-    elif template_type.lower() == 'json':
-        return deployment
-    else:
-        raise ValueError("template_type must be either 'yaml' or 'json'")
+    return _SKELETON.render(body, template_type)
+
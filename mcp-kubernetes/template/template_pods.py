@@ -1,6 +1,7 @@
-import yaml
 from typing import Optional, Union, Dict, Any, List
-from template import NoAliasDumper
+from template import Skeleton
+
+_SKELETON = Skeleton("v1", "Pod")
 
 def gen_pod_template(
     name: str,
@@ -22,9 +23,7 @@ def gen_pod_template(
     }]
     containers = containers or default_containers
 
-    pod = {
-        "apiVersion": "v1",
-        "kind": "Pod",
+    body = {
         "metadata": {
             "name": name,
             "labels": labels
@@ -34,9 +33,5 @@ def gen_pod_template(
         }
     }
 
-    if template_type.lower() == 'yaml':
-        return yaml.dump(pod, sort_keys=False, Dumper=NoAliasDumper)
-    elif template_type.lower() == 'json':
-        return pod
-    else:
-        raise ValueError("template_type must be either 'yaml' or 'json'")
+    return _SKELETON.render(body, template_type)
+
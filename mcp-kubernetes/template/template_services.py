@@ -1,6 +1,7 @@
-import yaml
 from typing import Optional, Union, Dict, Any, List
-from template import NoAliasDumper
+from template import Skeleton
+
+_SKELETON = Skeleton("v1", "Service")
 
 def gen_service_template(
     name: str,
@@ -23,9 +24,7 @@ def gen_service_template(
     }]
     ports = ports or default_ports
 
-    service = {
-        "apiVersion": "v1",
-        "kind": "Service",
+    body = {
         "metadata": {
             "name": name,
             "labels": labels
@@ -37,9 +36,5 @@ def gen_service_template(
         }
     }
 
-    if template_type.lower() == 'yaml':
-        return yaml.dump(service, sort_keys=False, Dumper=NoAliasDumper)
-    elif template_type.lower() == 'json':
-        return service
-    else:
-        raise ValueError("template_type must be either 'yaml' or 'json'")
+    return _SKELETON.render(body, template_type)
+
@@ -1,5 +1,36 @@
-import yaml
+from typing import Union, Dict, Any
 
-class NoAliasDumper(yaml.SafeDumper):
-    def ignore_aliases(self, data):
-        return True
\ No newline at end of file
+# 序列化统一由 utils.serialization 提供（libyaml C 实现，不生成别名）
+from utils.serialization import NoAliasDumper, dump_yaml
+
+
+class Skeleton:
+    """预编译的资源骨架
+
+    apiVersion/kind 等固定部分在导入时序列化一次，每次生成模板时只填充并序列化变化的字段。
+    """
+
+    def __init__(self, api_version: str, kind: str) -> None:
+        self.header = {"apiVersion": api_version, "kind": kind}
+        self._yaml_header = dump_yaml(self.header)
+
+    def render(self, body: Dict[str, Any], template_type: str = 'yaml') -> Union[str, Dict[str, Any]]:
+        """将 metadata、spec 等可变部分填入骨架
+
+        Args:
+            body (Dict[str, Any]): 除 apiVersion/kind 以外的顶层字段
+            template_type (str, optional): 输出类型，yaml 或 json
+
+        Raises:
+            ValueError: template_type 不是 yaml 或 json
+
+        Returns:
+            Union[str, Dict[str, Any]]: yaml 文本或对象字典
+        """
+        if template_type.lower() == 'yaml':
+            # 顶层为块状映射，分段序列化后拼接与整体序列化结果一致
+            return self._yaml_header + dump_yaml(body)
+        elif template_type.lower() == 'json':
+            return {**self.header, **body}
+        else:
+            raise ValueError("template_type must be either 'yaml' or 'json'")
@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+
+from utils.informer import InformerCache, namespace_index
+
+
+def make_cache(max_staleness=30.0):
+    cache = InformerCache(SimpleNamespace(), max_staleness=max_staleness)
+    informer = SimpleNamespace(resource_type="deployments", listed_at=0.0)
+    cache.informers["deployments"] = informer
+    return cache, informer
+
+
+def obj(name, resource_version, namespace="default"):
+    return {"metadata": {"name": name, "namespace": namespace, "resourceVersion": resource_version}}
+
+
+def test_fence_released_on_exact_version():
+    cache, informer = make_cache()
+    cache.written("deployments", "default", "web", "100")
+    assert not cache.caught_up(informer)
+
+    # 其他对象或其他版本（resourceVersion 不可比较大小）不解除等待
+    cache._observe("deployments", "MODIFIED", obj("api", "100"))
+    cache._observe("deployments", "MODIFIED", obj("web", "99"))
+    cache._observe("deployments", "MODIFIED", obj("web", "101"))
+    assert not cache.caught_up(informer)
+
+    cache._observe("deployments", "MODIFIED", obj("web", "100"))
+    assert cache.caught_up(informer)
+
+
+def test_event_before_write_response():
+    # watch 事件可能早于写入响应到达
+    cache, informer = make_cache()
+    cache._observe("deployments", "MODIFIED", obj("web", "100"))
+    cache.written("deployments", "default", "web", "100")
+    assert cache.caught_up(informer)
+
+
+def test_delete_waits_for_deleted_event():
+    cache, informer = make_cache()
+    cache.written("deployments", "default", "web", None, deleted=True)
+
+    cache._observe("deployments", "MODIFIED", obj("web", "100"))
+    assert not cache.caught_up(informer)
+
+    cache._observe("deployments", "DELETED", obj("web", "101"))
+    assert cache.caught_up(informer)
+
+
+def test_relist_after_write_releases_fence():
+    cache, informer = make_cache()
+    cache.written("deployments", "default", "web", "100")
+    assert not cache.caught_up(informer)
+
+    informer.listed_at = float("inf")
+    assert cache.caught_up(informer)
+    assert cache._fences["deployments"] == {}
+
+
+def test_deadline_releases_fence():
+    cache, informer = make_cache(max_staleness=0)
+    cache.written("deployments", "default", "web", "100")
+    assert cache.caught_up(informer)
+
+
+def test_private_informer_does_not_prune_fences():
+    cache, shared = make_cache()
+    private = SimpleNamespace(resource_type="deployments", listed_at=float("inf"))
+    cache.written("deployments", "default", "web", "100")
+
+    assert cache.caught_up(private)
+    assert "default/web" in cache._fences["deployments"]
+    assert not cache.caught_up(shared)
+
+
+def test_namespace_index():
+    store = {
+        "a/x": obj("x", "1", "a"),
+        "node-1": {"metadata": {"name": "node-1"}},
+        "b/y": obj("y", "1", "b"),
+        "a/z": obj("z", "1", "a"),
+    }
+    index = namespace_index(store)
+
+    assert index == {"a": {"a/x": None, "a/z": None}, "b": {"b/y": None}}
+    assert list(index["a"]) == ["a/x", "a/z"]
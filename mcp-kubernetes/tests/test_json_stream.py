@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from utils.json_stream import ListStream
+
+
+def chunked(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+DOCUMENT = {
+    "apiVersion": "v1",
+    "kind": "PodList",
+    "metadata": {"resourceVersion": "42", "continue": "token", "remainingItemCount": 7},
+    "items": [
+        {"metadata": {"name": "pod-0", "namespace": "default"}, "spec": {"replicas": 12345}},
+        {"metadata": {"name": "容器-1", "namespace": "default"}, "status": {"phase": "Running"}},
+        {"metadata": {"name": "pod-2"}, "data": [1, 2.5, True, None, "x"]},
+    ],
+}
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 1 << 16])
+def test_items_survive_any_chunk_boundary(size):
+    # 较小的块会切断数字与多字节字符
+    data = json.dumps(DOCUMENT, ensure_ascii=False).encode()
+    stream = ListStream(chunked(data, size))
+
+    assert list(stream) == DOCUMENT["items"]
+    assert stream.count == 3
+    assert stream.document == {k: v for k, v in DOCUMENT.items() if k != "items"}
+    assert stream.metadata == {"continue": "token", "remainingItemCount": 7}
+
+
+def test_metadata_after_items():
+    # kubectl 输出中 metadata 位于 items 之后
+    data = json.dumps({"items": [{"a": 1}], "kind": "List", "metadata": {"resourceVersion": ""}}).encode()
+    stream = ListStream(chunked(data, 5))
+
+    assert list(stream) == [{"a": 1}]
+    assert stream.document["kind"] == "List"
+    assert stream.metadata is None
+
+
+@pytest.mark.parametrize("text", ["{}", " { } ", '{"items": []}', '{"kind": "List", "items": [ ]}'])
+def test_empty_documents(text):
+    stream = ListStream([text.encode()])
+    assert list(stream) == []
+    assert stream.count == 0
+
+
+def test_malformed_document_raises():
+    with pytest.raises(json.JSONDecodeError):
+        list(ListStream([b'{"items": [{"a": 1}, {"b": ']))
+    with pytest.raises(json.JSONDecodeError):
+        list(ListStream([b'["not", "an", "object"]']))
+
+
+def test_on_close_runs_once_when_iteration_stops_early():
+    closed = []
+    data = json.dumps(DOCUMENT).encode()
+    stream = ListStream(chunked(data, 16), on_close=lambda: closed.append(True))
+
+    items = iter(stream)
+    assert next(items)["metadata"]["name"] == "pod-0"
+    items.close()
+    stream.close()
+
+    assert closed == [True]
+
+
+def test_on_close_runs_after_full_iteration():
+    closed = []
+    stream = ListStream([b'{"items": [1, 2]}'], on_close=lambda: closed.append(True))
+    assert list(stream) == [1, 2]
+    assert closed == [True]
@@ -0,0 +1,82 @@
+from utils.log_cursors import LogCursor, LogCursors, timestamp_key
+
+
+def test_timestamp_key_orders_mixed_precision():
+    stamps = ["2024-01-01T00:00:01Z", "2024-01-01T00:00:00.5Z", "2024-01-01T00:00:00.123456789Z", "2024-01-01T00:00:00Z"]
+    assert sorted(stamps, key=timestamp_key) == [
+        "2024-01-01T00:00:00Z",
+        "2024-01-01T00:00:00.123456789Z",
+        "2024-01-01T00:00:00.5Z",
+        "2024-01-01T00:00:01Z",
+    ]
+    assert timestamp_key("2024-01-01T00:00:00.5Z") == "2024-01-01T00:00:00.500000000"
+
+
+def test_since_time_truncates_to_seconds():
+    cursor = LogCursor(buffer_lines=10)
+    assert cursor.since_time() is None
+
+    cursor.advance([("2024-01-01T00:00:05.987654321Z", "a")])
+    assert cursor.since_time() == "2024-01-01T00:00:05Z"
+
+    cursor.advance([("2024-01-01T00:00:06Z", "b")])
+    assert cursor.since_time() == "2024-01-01T00:00:06Z"
+
+
+def test_advance_drops_overlap():
+    cursor = LogCursor(buffer_lines=10)
+    first = [
+        ("2024-01-01T00:00:05.1Z", "a"),
+        ("2024-01-01T00:00:05.2Z", "b"),
+        ("2024-01-01T00:00:05.2Z", "c"),
+    ]
+    assert cursor.advance(first) == first
+
+    # sinceTime 截断到秒，再次读取会返回同一秒内已读过的行
+    second = first + [
+        ("2024-01-01T00:00:05.2Z", "d"),
+        ("2024-01-01T00:00:06Z", "e"),
+        ("", "no timestamp"),
+    ]
+    assert cursor.advance(second) == [("2024-01-01T00:00:05.2Z", "d"), ("2024-01-01T00:00:06Z", "e")]
+    assert cursor.last_timestamp == "2024-01-01T00:00:06Z"
+
+    assert cursor.advance(second) == []
+
+
+def test_buffer_is_bounded():
+    cursor = LogCursor(buffer_lines=2)
+    cursor.advance([("2024-01-01T00:00:00Z", str(i)) for i in range(5)])
+
+    assert list(cursor.lines) == [("2024-01-01T00:00:00Z", "3"), ("2024-01-01T00:00:00Z", "4")]
+    assert sum(cursor._seen.values()) == 2
+    # 已滑出缓冲区的同一时间戳行无法再识别为重复
+    assert cursor.advance([("2024-01-01T00:00:00Z", "0"), ("2024-01-01T00:00:00Z", "4")]) == [("2024-01-01T00:00:00Z", "0")]
+
+
+def test_cursors_lru_and_hit():
+    cursors = LogCursors(ttl=600, max_entries=2, buffer_lines=10)
+
+    found, cursor = cursors.get("default", "pod-a", None)
+    assert not found
+    # 尚未读到任何行时不算命中
+    assert cursors.get("default", "pod-a", "")[0] is False
+
+    cursor.advance([("2024-01-01T00:00:00Z", "x")])
+    found, same = cursors.get("default", "pod-a", None)
+    assert found and same is cursor
+
+    cursors.get("default", "pod-b", None)
+    cursors.get("default", "pod-c", "sidecar")
+    assert len(cursors) == 2
+    assert cursors.get("default", "pod-a", None)[0] is False
+
+
+def test_cursors_expire():
+    cursors = LogCursors(ttl=0, max_entries=10)
+    _, cursor = cursors.get("default", "pod-a", None)
+    cursor.advance([("2024-01-01T00:00:00Z", "x")])
+    cursor.touched -= 1
+
+    found, fresh = cursors.get("default", "pod-a", None)
+    assert not found and fresh is not cursor
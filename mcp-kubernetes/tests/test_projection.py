@@ -0,0 +1,131 @@
+import json
+
+import pytest
+
+from utils.projection import parse_fields, project, pluck, build_rows, to_columns
+
+
+def test_parse_fields():
+    assert parse_fields(None) is None
+    assert parse_fields(" , ") is None
+    assert parse_fields("name, labels.app,labels.tier") == {"name": {}, "labels": {"app": {}, "tier": {}}}
+    assert parse_fields(["spec.containers.image"]) == {"spec": {"containers": {"image": {}}}}
+
+
+@pytest.mark.parametrize("fields", ["metadata,metadata.name", "metadata.name,metadata"])
+def test_parse_fields_whole_parent_wins(fields):
+    assert parse_fields(fields) == {"metadata": {}}
+
+
+def test_project_walks_lists_and_keeps_leaves():
+    obj = {
+        "metadata": {"name": "a", "labels": {"app": "x"}, "uid": "1"},
+        "spec": {"containers": [{"name": "c1", "image": "nginx"}, {"name": "c2", "image": "redis"}]},
+    }
+    tree = parse_fields("metadata.labels,spec.containers.image,status")
+
+    assert project(obj, tree) == {
+        "metadata": {"labels": {"app": "x"}},
+        "spec": {"containers": [{"image": "nginx"}, {"image": "redis"}]},
+    }
+    assert project(obj, None) is obj
+
+
+def test_pluck():
+    row = {"labels": {"app": "x"}, "containers": [{"image": "nginx"}, {"image": "redis"}]}
+
+    assert pluck(row, "labels.app") == "x"
+    assert pluck(row, "containers.image") == ["nginx", "redis"]
+    assert pluck(row, "labels.missing") is None
+    assert pluck(row, "labels.app.deeper") is None
+
+
+class Source(list):
+    """带分页信息与 close 的对象序列，模拟 ListStream"""
+
+    def __init__(self, items, metadata=None):
+        super().__init__(items)
+        self.metadata = metadata
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def pods(n):
+    return [
+        {"metadata": {"name": f"pod-{i}", "namespace": "default", "managedFields": [{"manager": "kubectl"}]},
+         "status": {"phase": "Running" if i % 2 == 0 else "Pending"}}
+        for i in range(n)
+    ]
+
+
+def test_build_rows_without_builders_drops_managed_fields():
+    source = pods(2)
+    rows = build_rows(source)
+
+    assert [r["metadata"] for r in rows] == [{"name": "pod-0", "namespace": "default"}, {"name": "pod-1", "namespace": "default"}]
+    # 原始对象不被修改
+    assert "managedFields" in source[0]["metadata"]
+    assert rows.metadata is None
+
+
+def test_build_rows_with_builders_only_computes_selected_fields():
+    calls = []
+    builders = {
+        "name": lambda o: o["metadata"]["name"],
+        "phase": lambda o: calls.append(o) or o["status"]["phase"],
+    }
+    rows = build_rows(pods(3), builders, fields="name")
+
+    assert rows == [{"name": "pod-0"}, {"name": "pod-1"}, {"name": "pod-2"}]
+    assert calls == []
+
+    with pytest.raises(ValueError, match="Unknown fields: age"):
+        build_rows(pods(1), builders, fields="name,age")
+
+
+def test_build_rows_keep_filter():
+    rows = build_rows(pods(4), fields="metadata.name", keep=lambda o: o["status"]["phase"] == "Running")
+    assert rows == [{"metadata": {"name": "pod-0"}}, {"metadata": {"name": "pod-2"}}]
+
+
+def test_build_rows_max_items_truncates_and_closes_source():
+    source = Source(pods(5), metadata={"continue": "token", "remainingItemCount": 10})
+    rows = build_rows(source, fields="metadata.name", max_items=2)
+
+    assert len(rows) == 2
+    assert source.closed
+    # 截断后 continue 游标不再有效
+    assert rows.metadata == {"remainingItemCount": 10, "truncated": True, "returned": 2}
+
+
+def test_build_rows_untruncated_keeps_page_metadata():
+    source = Source(pods(2), metadata={"continue": "token"})
+    rows = build_rows(source, fields="metadata.name", max_items=2)
+
+    assert not source.closed
+    assert rows.metadata == {"continue": "token"}
+
+
+def test_build_rows_max_bytes():
+    row_size = len(json.dumps({"metadata": {"name": "pod-0"}}).encode()) + 1
+    rows = build_rows(pods(10), fields="metadata.name", max_bytes=2 + row_size * 3)
+    assert len(rows) == 3
+    assert rows.metadata == {"truncated": True, "returned": 3}
+
+    # 第一行超出预算时仍然返回，避免空结果
+    rows = build_rows(pods(10), fields="metadata.name", max_bytes=1)
+    assert len(rows) == 1
+
+
+def test_to_columns():
+    rows = build_rows(Source(pods(6), metadata={"continue": "t"}), fields="metadata.name,status.phase", max_items=2)
+
+    assert to_columns(rows, "metadata.name, status.phase") == {
+        "columns": ["metadata.name", "status.phase"],
+        "rows": [["pod-0", "Running"], ["pod-1", "Pending"]],
+        "metadata": {"truncated": True, "returned": 2},
+    }
+    assert to_columns([{"a": 1, "b": 2}]) == {"columns": ["a", "b"], "rows": [[1, 2]]}
+    assert to_columns([]) == {"columns": [], "rows": []}
@@ -0,0 +1,198 @@
+import asyncio
+import time
+
+import pytest
+
+from utils.result_cache import ResultCache, canonical_kind
+
+
+@pytest.mark.parametrize("resource_type, expected", [
+    ("po", "pods"),
+    ("Pod", "pods"),
+    ("pods", "pods"),
+    (" Deployment ", "deployments"),
+    ("deployments.apps", "deployments"),
+    ("deploy", "deployments"),
+    ("apiresources", "apiresources"),
+    ("widgets", None),
+    ("", None),
+])
+def test_canonical_kind_builtin(resource_type, expected):
+    assert canonical_kind(resource_type) == expected
+
+
+def test_canonical_kind_resolver():
+    def resolve(name):
+        if name in ("widget", "widgets.example.com"):
+            return "widgets"
+        raise ValueError(name)
+
+    assert canonical_kind("Widget", resolve) == "widgets"
+    assert canonical_kind("widgets.example.com", resolve) == "widgets"
+    assert canonical_kind("gadgets", resolve) is None
+    # 内置别名不经过 resolver
+    assert canonical_kind("po", lambda name: pytest.fail("resolver called")) == "pods"
+
+
+def filled(**entries):
+    """按 key=(集群, 类型, 命名空间) 写入条目"""
+    cache = ResultCache(ttl=60, max_entries=64, resolver=lambda cluster, kind: {"widget": "widgets"}[kind])
+    for key, (cluster, kind, namespace) in entries.items():
+        cache.put(key, key, [cluster], [kind], namespace, cache._generation)
+    return cache
+
+
+def keys(cache):
+    return sorted(cache._entries)
+
+
+def test_invalidate_matches_kind_and_namespace():
+    cache = filled(
+        pods_a=("prod", "pods", "a"),
+        pods_b=("prod", "pods", "b"),
+        pods_all=("prod", "po", None),
+        svc_a=("prod", "services", "a"),
+    )
+
+    assert cache.invalidate(["prod"], ["Pod"], "a") == 2
+    assert keys(cache) == ["pods_b", "svc_a"]
+
+
+def test_invalidate_dependent_kinds():
+    cache = filled(
+        pods=("prod", "pods", "a"),
+        rs=("prod", "replicasets", "a"),
+        endpoints=("prod", "endpoints", "a"),
+        nodes=("prod", "nodes", None),
+    )
+
+    # 写入 Deployment 会改变其 ReplicaSet 与 Pod
+    assert cache.invalidate(["prod"], ["deployments.apps"], "a") == 2
+    assert keys(cache) == ["endpoints", "nodes"]
+    assert cache.invalidate(["prod"], ["svc"], "a") == 1
+    assert keys(cache) == ["nodes"]
+
+
+def test_invalidate_is_per_cluster():
+    cache = filled(prod=("prod", "pods", "a"), dev=("dev", "pods", "a"))
+
+    assert cache.invalidate(["dev"], ["pods"], "a") == 1
+    assert keys(cache) == ["prod"]
+
+
+def test_invalidate_unresolved_or_namespace_kinds_drop_everything_in_scope():
+    cache = filled(
+        pods_a=("prod", "pods", "a"),
+        svc_b=("prod", "services", "b"),
+        dev=("dev", "pods", "a"),
+    )
+
+    # 无法解析的类型：使该集群该命名空间的全部条目失效
+    assert cache.invalidate(["prod"], ["gadgets"], "a") == 1
+    assert keys(cache) == ["dev", "svc_b"]
+
+    # 写入命名空间对象：使该集群的全部条目失效
+    assert cache.invalidate(["prod"], ["ns"], None) == 1
+    assert keys(cache) == ["dev"]
+
+    assert cache.invalidate(["dev"]) == 1
+    assert len(cache) == 0
+
+
+def test_invalidate_resolves_custom_kinds():
+    cache = filled(widgets=("prod", "widgets", "a"), pods=("prod", "pods", "a"))
+
+    assert cache.invalidate(["prod"], ["Widget"], "a") == 1
+    assert keys(cache) == ["pods"]
+
+
+def test_put_after_invalidate_is_dropped():
+    cache = ResultCache(ttl=60)
+    generation = cache._generation
+
+    cache.invalidate(["prod"], ["pods"], "a")
+    cache.put("stale", "value", ["prod"], ["pods"], "a", generation)
+    assert cache.get("stale") == (False, None)
+
+    cache.put("fresh", "value", ["prod"], ["pods"], "a", cache._generation)
+    assert cache.get("fresh") == (True, "value")
+
+    generation = cache._generation
+    cache.clear()
+    cache.put("stale", "value", ["prod"], ["pods"], "a", generation)
+    assert len(cache) == 0
+
+
+def test_ttl_and_lru():
+    cache = ResultCache(ttl=0.05, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, key, ["prod"], ["pods"], None, cache._generation)
+    assert keys(cache) == ["b", "c"]
+
+    assert cache.get("b") == (True, "b")
+    cache.put("d", "d", ["prod"], ["pods"], None, cache._generation)
+    # b 刚被读取，最久未使用的 c 被淘汰
+    assert keys(cache) == ["b", "d"]
+
+    time.sleep(0.06)
+    assert cache.get("b") == (False, None)
+    assert keys(cache) == ["d"]
+
+
+def make_tool(cache, backend):
+    @cache.cached(lambda args: (["pods"], args["namespace"]), lambda cluster: [cluster or "prod"])
+    async def get_pods(namespace=None, cluster=None, no_cache=False):
+        return await backend(namespace)
+
+    return get_pods
+
+
+def test_cached_decorator_hits_and_invalidates():
+    cache = ResultCache(ttl=60)
+    calls = []
+
+    async def backend(namespace):
+        calls.append(namespace)
+        return f"pods in {namespace} #{len(calls)}"
+
+    get_pods = make_tool(cache, backend)
+
+    async def main():
+        results = [await get_pods("a"), await get_pods(namespace="a"), await get_pods("b")]
+        cache.invalidate(["prod"], ["deployments"], "a")
+        results.append(await get_pods("a"))
+        results.append(await get_pods("b"))
+        results.append(await get_pods("b", no_cache=True))
+        results.append(await get_pods("b"))
+        return results
+
+    assert asyncio.run(main()) == [
+        "pods in a #1", "pods in a #1", "pods in b #2",
+        "pods in a #3", "pods in b #2",
+        "pods in b #4", "pods in b #4",
+    ]
+
+
+def test_cached_decorator_skips_writes_during_read_and_failures():
+    cache = ResultCache(ttl=60)
+    calls = []
+
+    async def racing_backend(namespace):
+        calls.append(namespace)
+        # 读取期间发生写入，本次结果可能已过期
+        cache.invalidate(["prod"], ["pods"], namespace)
+        return "stale"
+
+    async def failing_backend(namespace):
+        calls.append(namespace)
+        return "[get_pods] Failed: connection refused"
+
+    async def main():
+        racing = make_tool(cache, racing_backend)
+        await racing("a")
+        failing = make_tool(cache, failing_backend)
+        await failing("b")
+
+    asyncio.run(main())
+    assert calls == ["a", "b"]
+    assert len(cache) == 0
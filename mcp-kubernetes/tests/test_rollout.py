@@ -0,0 +1,66 @@
+import pytest
+
+from utils.rollout import rollout_status, PROGRESSING, READY, FAILED
+
+
+def deployment(desired=3, generation=2, observed=2, conditions=(), **status):
+    return {
+        "kind": "Deployment",
+        "metadata": {"name": "web", "generation": generation},
+        "spec": {"replicas": desired},
+        "status": {"observedGeneration": observed, "conditions": list(conditions), **status},
+    }
+
+
+@pytest.mark.parametrize("obj, state, message", [
+    (deployment(observed=1, updatedReplicas=3, replicas=3, availableReplicas=3),
+     PROGRESSING, "spec update to be observed"),
+    (deployment(updatedReplicas=1, replicas=3, availableReplicas=3),
+     PROGRESSING, "1 out of 3 new replicas have been updated"),
+    (deployment(updatedReplicas=3, replicas=4, availableReplicas=3),
+     PROGRESSING, "1 old replicas are pending termination"),
+    (deployment(updatedReplicas=3, replicas=3, availableReplicas=2),
+     PROGRESSING, "2 of 3 updated replicas are available"),
+    (deployment(updatedReplicas=3, replicas=3, availableReplicas=3),
+     READY, "successfully rolled out (3/3 available)"),
+    (deployment(desired=0), READY, "successfully rolled out (0/0 available)"),
+    (deployment(conditions=[{"type": "Progressing", "reason": "ProgressDeadlineExceeded"}], updatedReplicas=1),
+     FAILED, "exceeded its progress deadline"),
+])
+def test_deployment(obj, state, message):
+    result, text = rollout_status(obj)
+    assert result == state
+    assert message in text
+
+
+def statefulset(replicas=3, partition=None, **status):
+    strategy = {"type": "RollingUpdate"}
+    if partition is not None:
+        strategy["rollingUpdate"] = {"partition": partition}
+    return {"kind": "StatefulSet", "metadata": {}, "spec": {"replicas": replicas, "updateStrategy": strategy}, "status": status}
+
+
+@pytest.mark.parametrize("obj, state", [
+    (statefulset(readyReplicas=2), PROGRESSING),
+    (statefulset(readyReplicas=3, updateRevision="r2", currentRevision="r1", updatedReplicas=1), PROGRESSING),
+    (statefulset(readyReplicas=3, updateRevision="r2", currentRevision="r2"), READY),
+    (statefulset(partition=2, readyReplicas=3, updatedReplicas=0), PROGRESSING),
+    (statefulset(partition=2, readyReplicas=3, updatedReplicas=1, updateRevision="r2", currentRevision="r1"), READY),
+])
+def test_statefulset(obj, state):
+    assert rollout_status(obj)[0] == state
+
+
+@pytest.mark.parametrize("status, state", [
+    ({"desiredNumberScheduled": 3, "updatedNumberScheduled": 2, "numberAvailable": 3}, PROGRESSING),
+    ({"desiredNumberScheduled": 3, "updatedNumberScheduled": 3, "numberAvailable": 2}, PROGRESSING),
+    ({"desiredNumberScheduled": 3, "updatedNumberScheduled": 3, "numberAvailable": 3}, READY),
+])
+def test_daemonset(status, state):
+    assert rollout_status({"kind": "DaemonSet", "status": status})[0] == state
+
+
+def test_replicaset_and_other_kinds():
+    assert rollout_status({"kind": "ReplicaSet", "spec": {"replicas": 2}, "status": {"readyReplicas": 2, "replicas": 3}})[0] == PROGRESSING
+    assert rollout_status({"kind": "ReplicaSet", "spec": {"replicas": 2}, "status": {"readyReplicas": 2, "replicas": 2}})[0] == READY
+    assert rollout_status({"kind": "ConfigMap", "metadata": {"name": "c"}}) == (READY, "updated, no rollout to wait for")
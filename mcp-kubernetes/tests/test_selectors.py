@@ -0,0 +1,86 @@
+import pytest
+
+from utils.selectors import (
+    parse_label_selector,
+    match_labels,
+    parse_field_selector,
+    match_fields,
+    match_selectors,
+)
+
+
+def test_parse_label_selector():
+    assert parse_label_selector("app=nginx, tier in (web, api),!canary,env!=prod,track,version==v1,zone notin (a)") == [
+        ("=", "app", ("nginx",)),
+        ("in", "tier", ("web", "api")),
+        ("!", "canary", ()),
+        ("!=", "env", ("prod",)),
+        ("exists", "track", ()),
+        ("=", "version", ("v1",)),
+        ("notin", "zone", ("a",)),
+    ]
+
+
+@pytest.mark.parametrize("selector", [None, "", "   "])
+def test_parse_empty_label_selector(selector):
+    assert parse_label_selector(selector) == []
+
+
+def test_parse_label_selector_empty_value():
+    assert parse_label_selector("app=") == [("=", "app", ("",))]
+
+
+@pytest.mark.parametrize("selector", ["app in web", "=nginx", "app=ng inx", "app=(x)", "!"])
+def test_parse_label_selector_rejects(selector):
+    with pytest.raises(ValueError):
+        parse_label_selector(selector)
+
+
+@pytest.mark.parametrize("selector, labels, expected", [
+    ("app=nginx", {"app": "nginx"}, True),
+    ("app=nginx", {"app": "redis"}, False),
+    ("app=nginx", {}, False),
+    ("env!=prod", {}, True),
+    ("env!=prod", {"env": "prod"}, False),
+    ("tier in (web,api)", {"tier": "api"}, True),
+    ("tier in (web,api)", {}, False),
+    ("tier notin (web)", {}, True),
+    ("tier notin (web)", {"tier": "web"}, False),
+    ("track", {"track": ""}, True),
+    ("track", {}, False),
+    ("!canary", {"canary": "true"}, False),
+    ("!canary", None, True),
+    ("app=nginx,!canary", {"app": "nginx"}, True),
+])
+def test_match_labels(selector, labels, expected):
+    assert match_labels(labels, parse_label_selector(selector)) is expected
+
+
+def test_parse_field_selector():
+    assert parse_field_selector("status.phase=Running, spec.nodeName != node-1,metadata.name==a") == [
+        (("status", "phase"), "=", "Running"),
+        (("spec", "nodeName"), "!=", "node-1"),
+        (("metadata", "name"), "=", "a"),
+    ]
+    assert parse_field_selector(None) == []
+    with pytest.raises(ValueError):
+        parse_field_selector("status.phase")
+
+
+def test_match_fields():
+    pod = {"metadata": {"name": "a"}, "spec": {"hostNetwork": True}, "status": {"phase": "Running"}}
+
+    assert match_fields(pod, parse_field_selector("status.phase=Running"))
+    assert not match_fields(pod, parse_field_selector("status.phase!=Running"))
+    # 布尔值按 kubectl 的小写形式比较，缺失字段视为空串
+    assert match_fields(pod, parse_field_selector("spec.hostNetwork=true"))
+    assert match_fields(pod, parse_field_selector("spec.nodeName="))
+    assert match_fields(pod, parse_field_selector("spec.nodeName!=node-1"))
+
+
+def test_match_selectors():
+    pod = {"metadata": {"name": "a", "labels": {"app": "nginx"}}, "status": {"phase": "Pending"}}
+
+    assert match_selectors(pod, parse_label_selector("app=nginx"), [])
+    assert not match_selectors(pod, parse_label_selector("app=nginx"), parse_field_selector("status.phase=Running"))
+    assert not match_selectors({"metadata": {}}, parse_label_selector("app"), [])
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from utils.singleflight import SingleFlight, make_key
+
+
+def test_make_key_ignores_keyword_order():
+    assert make_key("get", "pods", namespace="a", limit=5) == make_key("get", "pods", limit=5, namespace="a")
+    assert make_key("get", "pods", namespace="a") != make_key("get", "pods", namespace="b")
+    assert make_key("get", "pods") != make_key("list", "pods")
+    # 不可序列化的参数按字符串处理
+    assert make_key("get", object) == make_key("get", object)
+
+
+def test_concurrent_calls_share_one_backend_call():
+    flight = SingleFlight()
+    calls = []
+
+    @flight.coalesce
+    async def get_pods(namespace, limit=None):
+        calls.append((namespace, limit))
+        await asyncio.sleep(0.05)
+        return {"namespace": namespace}
+
+    async def main():
+        results = await asyncio.gather(
+            get_pods("a", limit=1),
+            get_pods("a", limit=1),
+            get_pods("b"),
+        )
+        return results, flight.in_flight()
+
+    results, in_flight = asyncio.run(main())
+
+    assert sorted(calls, key=str) == [("a", 1), ("b", None)]
+    assert results[0] is results[1]
+    assert results[2] == {"namespace": "b"}
+    assert in_flight == 0
+
+
+def test_calls_after_completion_run_again():
+    flight = SingleFlight()
+    calls = []
+
+    async def backend():
+        calls.append(1)
+        return len(calls)
+
+    async def main():
+        first = await flight.do("tool", "key", backend)
+        second = await flight.do("tool", "key", backend)
+        return first, second
+
+    assert asyncio.run(main()) == (1, 2)
+
+
+def test_errors_are_shared():
+    flight = SingleFlight()
+
+    async def backend():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def main():
+        return await asyncio.gather(
+            flight.do("tool", "key", backend),
+            flight.do("tool", "key", backend),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+
+
+def test_cancelling_one_waiter_keeps_the_shared_call():
+    flight = SingleFlight()
+
+    async def backend():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        first = asyncio.ensure_future(flight.do("tool", "key", backend))
+        second = asyncio.ensure_future(flight.do("tool", "key", backend))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "done"
+
+
+def test_cancelling_the_last_waiter_cancels_the_call():
+    flight = SingleFlight()
+    finished = []
+
+    async def backend():
+        await asyncio.sleep(0.05)
+        finished.append(True)
+
+    async def main():
+        waiter = asyncio.ensure_future(flight.do("tool", "key", backend))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0.1)
+        return flight.in_flight()
+
+    assert asyncio.run(main()) == 0
+    assert finished == []
+
+
+def test_disabled_runs_every_call():
+    flight = SingleFlight(enabled=False)
+    calls = []
+
+    async def backend():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*(flight.do("tool", "key", backend) for _ in range(3)))
+
+    asyncio.run(main())
+    assert len(calls) == 3
@@ -0,0 +1,61 @@
+import pytest
+
+from utils.wait import Condition, parse_condition, evaluate
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("delete", Condition("delete", "delete")),
+    ("phase=Running", Condition("phase", "phase=Running", ("status", "phase"), "Running")),
+    ("condition=Ready", Condition("condition", "condition=Ready", ("Ready",), "True")),
+    ("condition=Ready=False", Condition("condition", "condition=Ready=False", ("Ready",), "False")),
+    ("jsonpath={.status.readyReplicas}=3",
+     Condition("jsonpath", "jsonpath={.status.readyReplicas}=3", ("status", "readyReplicas"), "3")),
+    ("jsonpath={.status.containerStatuses[0].ready}",
+     Condition("jsonpath", "jsonpath={.status.containerStatuses[0].ready}", ("status", "containerStatuses", 0, "ready"), None)),
+    ("jsonpath=.status.phase=Running", Condition("jsonpath", "jsonpath=.status.phase=Running", ("status", "phase"), "Running")),
+    (" Phase = Succeeded ", Condition("phase", "Phase = Succeeded", ("status", "phase"), "Succeeded")),
+])
+def test_parse_condition(expression, expected):
+    assert parse_condition(expression) == expected
+
+
+@pytest.mark.parametrize("expression", [
+    "", "phase", "phase=", "condition=", "delete=true", "ready",
+    "jsonpath={.status", "jsonpath={.status}x", "jsonpath={}", "jsonpath={.a[b]}",
+])
+def test_parse_condition_rejects(expression):
+    with pytest.raises(ValueError):
+        parse_condition(expression)
+
+
+POD = {
+    "metadata": {"name": "a"},
+    "status": {
+        "phase": "Running",
+        "conditions": [{"type": "Ready", "status": "True"}, {"type": "PodScheduled", "status": "True"}],
+        "containerStatuses": [{"name": "app", "ready": True, "restartCount": 0}],
+    },
+}
+
+
+@pytest.mark.parametrize("expression, met, observed", [
+    ("phase=running", True, "Running"),
+    ("phase=Pending", False, "Running"),
+    ("condition=ready", True, "True"),
+    ("condition=Ready=False", False, "True"),
+    ("condition=Initialized", False, None),
+    ("jsonpath={.status.containerStatuses[0].ready}=true", True, True),
+    ("jsonpath={.status.containerStatuses[0].restartCount}=0", True, 0),
+    ("jsonpath={.status.containerStatuses[0].name}", True, "app"),
+    ("jsonpath={.status.containerStatuses[1].name}", False, None),
+    ("jsonpath={.status.podIP}=", False, None),
+    ("delete", False, "exists"),
+])
+def test_evaluate(expression, met, observed):
+    assert evaluate(parse_condition(expression), POD) == (met, observed)
+
+
+def test_evaluate_missing_fields():
+    assert evaluate(parse_condition("phase=Running"), {}) == (False, None)
+    assert evaluate(parse_condition("condition=Ready"), {"status": {"conditions": None}}) == (False, None)
+    assert evaluate(parse_condition("jsonpath={.status.loadBalancer.ingress}"), {"status": {"loadBalancer": {"ingress": []}}}) == (False, [])
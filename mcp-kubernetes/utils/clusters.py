@@ -0,0 +1,247 @@
+import functools
+import os
+import stat
+import tempfile
+import threading
+import time
+
+import yaml
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Optional, Any, Dict, List, Callable
+
+from utils.logger import logger
+from utils.executor import child_call, bind
+from utils.kubernetes_manager import KubernetesManager
+
+
+# kubeconfig 中以相对路径引用的文件字段，生成单 context 的 kubeconfig 时需改写为绝对路径
+_PATH_FIELDS = ("certificate-authority", "client-certificate", "client-key", "tokenFile")
+
+_local = threading.local()
+
+
+def write_context_kubeconfig(kubeconfig: str, context: str, directory: str) -> str:
+    """生成只包含指定 context 且 current-context 指向它的 kubeconfig，kubectl 与 API 客户端均可直接使用"""
+    with open(kubeconfig, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+    base_dir = os.path.dirname(os.path.abspath(kubeconfig))
+
+    def _pick(section: str, name: Optional[str]) -> List[Dict[str, Any]]:
+        entries = [e for e in config.get(section, []) or [] if e.get("name") == name]
+        for entry in entries:
+            body = entry.get(section[:-1], {}) or {}
+            for field in _PATH_FIELDS:
+                if body.get(field) and not os.path.isabs(body[field]):
+                    body[field] = os.path.join(base_dir, body[field])
+        return entries
+
+    contexts = _pick("contexts", context)
+    if not contexts:
+        raise ValueError(f"Context '{context}' not found in kubeconfig {kubeconfig}")
+    ctx = contexts[0].get("context", {})
+
+    pinned = {
+        "apiVersion": "v1",
+        "kind": "Config",
+        "current-context": context,
+        "contexts": contexts,
+        "clusters": _pick("clusters", ctx.get("cluster")),
+        "users": _pick("users", ctx.get("user")),
+    }
+
+    fd, path = tempfile.mkstemp(prefix="kubeconfig-", suffix=".yaml", dir=directory)
+    with os.fdopen(fd, "w") as f:
+        yaml.safe_dump(pinned, f, sort_keys=False)
+    os.chmod(path, stat.S_IRUSR | stat.S_IWUSR)
+    return path
+
+
+class ClusterRegistry:
+    """基于 kubeconfig contexts 的集群注册表
+
+    每个 context 的 KubernetesManager（API 连接池、informer、发现缓存等）在首次使用时创建并复用；
+    工具通过 cluster 参数选择集群，cluster="*" 或逗号分隔的多个集群时并发查询，单个集群超时不影响其他结果。
+    """
+
+    def __init__(
+        self,
+        kubeconfig: Optional[str],
+        fan_out_timeout: float = 30.0,
+        max_workers: int = 16
+    ) -> None:
+        self.kubeconfig = kubeconfig
+        self.fan_out_timeout = fan_out_timeout
+        self.managers: Dict[Optional[str], KubernetesManager] = {}
+        self.lock = threading.Lock()
+        # 每个 context 一把创建锁：manager 的构建（写 kubeconfig、加载发现缓存与 informer 快照）较慢，不能占用全局锁
+        self._creating: Dict[Optional[str], threading.Lock] = {}
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cluster")
+        self._dir = tempfile.mkdtemp(prefix="mcp-kubernetes-")
+        self._config_cache: tuple = (None, {})
+
+    def _config(self) -> Dict[str, Any]:
+        """读取 kubeconfig，文件未修改时复用上次的解析结果"""
+        if not self.kubeconfig or not os.path.exists(self.kubeconfig):
+            return {}
+        mtime = os.path.getmtime(self.kubeconfig)
+        if self._config_cache[0] != mtime:
+            with open(self.kubeconfig, "r", encoding="utf-8") as f:
+                self._config_cache = (mtime, yaml.safe_load(f) or {})
+        return self._config_cache[1]
+
+    @property
+    def current_context(self) -> Optional[str]:
+        return self._config().get("current-context")
+
+    def contexts(self) -> List[str]:
+        """kubeconfig 中的全部 context 名称"""
+        return [c.get("name") for c in self._config().get("contexts", []) or [] if c.get("name")]
+
+    def get(self, cluster: Optional[str] = None) -> KubernetesManager:
+        """获取（必要时创建）集群对应的 KubernetesManager，为空或为 current-context 时使用原始 kubeconfig
+
+        Raises:
+            ValueError: kubeconfig 中不存在该 context
+        """
+        context = cluster or None
+        if context is not None and context == self.current_context:
+            context = None
+
+        with self.lock:
+            manager = self.managers.get(context)
+            if manager is not None:
+                return manager
+            creating = self._creating.setdefault(context, threading.Lock())
+
+        # 同一 context 的并发请求等待同一次构建，其他 context 不受影响
+        with creating:
+            with self.lock:
+                manager = self.managers.get(context)
+            if manager is not None:
+                return manager
+            try:
+                if context is None:
+                    manager = KubernetesManager(self.kubeconfig)
+                else:
+                    path = write_context_kubeconfig(self.kubeconfig, context, self._dir)
+                    manager = KubernetesManager(path, context=context)
+                    logger.info(f"Kubernetes manager initialized for context '{context}'")
+            finally:
+                with self.lock:
+                    if manager is not None:
+                        self.managers[context] = manager
+                    self._creating.pop(context, None)
+            return manager
+
+    def existing(self, cluster: Optional[str] = None) -> Optional[KubernetesManager]:
+        """返回已创建的 KubernetesManager，不存在时返回 None，不会触发构建"""
+        context = cluster or None
+        if context is not None and context == self.current_context:
+            context = None
+        with self.lock:
+            return self.managers.get(context)
+
+    def targets(self, cluster: Optional[str]) -> List[str]:
+        """展开 cluster 参数：'*' 为全部 context，逗号分隔为多个 context"""
+        if cluster == "*":
+            return self.contexts()
+        if cluster and "," in cluster:
+            return [c.strip() for c in cluster.split(",") if c.strip()]
+        return [cluster] if cluster else []
+
+    def current(self) -> KubernetesManager:
+        """当前线程绑定的集群，未绑定时为默认集群"""
+        return self.get(getattr(_local, "cluster", None))
+
+    def _run_on(self, cluster: Optional[str], func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        previous = getattr(_local, "cluster", None)
+        _local.cluster = cluster
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.cluster = previous
+
+    def fan_out(
+        self,
+        clusters: List[str],
+        func: Callable[..., Any],
+        /,
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any
+    ) -> Dict[str, Any]:
+        """在多个集群上并发执行 func，超时或失败的集群记录到 errors，其余结果照常返回
+
+        Args:
+            clusters (List[str]): 目标 context 列表
+            func (Callable[..., Any]): 在每个集群上执行的函数，执行期间 current() 指向该集群
+            timeout (Optional[float], optional): 单个集群的超时时间（秒），默认为 fan_out_timeout
+
+        Returns:
+            Dict[str, Any]: {"results": {context: 结果}, "errors": {context: 错误信息}}
+        """
+        timeout = timeout or self.fan_out_timeout
+        calls = {cluster: child_call(f"{getattr(func, '__name__', 'fan_out')}@{cluster}") for cluster in clusters}
+        futures = {
+            cluster: self.pool.submit(bind(self._run_on, calls[cluster]), cluster, func, *args, **kwargs)
+            for cluster in clusters
+        }
+
+        started = time.monotonic()
+        wait(futures.values(), timeout=timeout)
+
+        results: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        for cluster, future in futures.items():
+            if not future.done():
+                # 终止该集群上仍在运行的子进程与流式连接
+                calls[cluster].cancel()
+                future.cancel()
+                errors[cluster] = f"timed out after {timeout} seconds"
+            elif future.exception() is not None:
+                errors[cluster] = str(future.exception())
+            else:
+                result = future.result()
+                # 工具与 get_* 方法以 "[tool] Failed: ..." 或 [Exception] 表示失败
+                if isinstance(result, str) and result.startswith("[") and "] Failed: " in result:
+                    errors[cluster] = result.split("] Failed: ", 1)[1]
+                elif isinstance(result, list) and len(result) == 1 and isinstance(result[0], Exception):
+                    errors[cluster] = str(result[0])
+                else:
+                    results[cluster] = result
+
+        logger.debug(f"[fan_out] {len(results)}/{len(clusters)} clusters answered in {time.monotonic() - started:.2f}s")
+        return {"results": results, "errors": errors}
+
+    def scoped(self, fan_out: bool = False) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """工具装饰器：按 cluster 参数绑定集群，fan_out=True 的只读工具支持多集群并发查询
+
+        工具内通过 km（ClusterProxy）访问当前集群，无需逐层传递 manager。
+        """
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                cluster = kwargs.get("cluster")
+                targets = self.targets(cluster)
+                if len(targets) <= 1 and cluster != "*":
+                    return self._run_on(targets[0] if targets else None, func, *args, **kwargs)
+
+                if not fan_out:
+                    return f"[{func.__name__}] Failed: multiple clusters are only supported by read-only tools"
+                return self.fan_out(targets, func, *args, **kwargs)
+            return wrapper
+        return decorator
+
+    def shutdown(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ClusterProxy:
+    """将属性访问转发到当前线程绑定集群的 KubernetesManager"""
+
+    def __init__(self, registry: ClusterRegistry) -> None:
+        self._registry = registry
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._registry.current(), name)
@@ -0,0 +1,239 @@
+import json
+import os
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any, Callable, Dict, List, Tuple
+
+from utils.logger import logger
+from utils.kube_api import KubeApiClient, KubeApiError, KubeApiUnavailable, ResourceInfo
+
+
+class DiscoveryCache:
+    """API 资源发现缓存
+
+    以 group/version/kind/verbs 表的形式持久化到磁盘，每个发现端点按 ETag 条件请求，
+    启动时加载并在后台按 TTL 刷新；解析资源类型时只读内存表，不产生额外的发现请求。
+    """
+
+    def __init__(
+        self,
+        api: KubeApiClient,
+        cache_file: Optional[str] = None,
+        ttl: float = 600.0,
+        miss_refresh_interval: float = 30.0,
+        max_workers: int = 8
+    ) -> None:
+        self.api = api
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.miss_refresh_interval = miss_refresh_interval
+        self.max_workers = max_workers
+
+        self.fetched_at = 0.0
+        self._attempted_at = 0.0
+        self._etags: Dict[str, str] = {}
+        self._bodies: Dict[str, Dict[str, Any]] = {}
+        self._resources: List[Dict[str, Any]] = []
+        self._index: Dict[str, List[ResourceInfo]] = {}
+        self._by_kind: Dict[Tuple[str, str], ResourceInfo] = {}
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _load(self) -> None:
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file) as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load discovery cache from {self.cache_file}: {e}")
+            return
+
+        # 不同集群的缓存不可混用
+        if state.get("server") != self.api.server:
+            return
+        self._etags = state.get("etags", {})
+        self._bodies = state.get("bodies", {})
+        self._build(self._bodies)
+        self.fetched_at = state.get("fetched_at", 0.0)
+        logger.info(f"Loaded {len(self._resources)} API resources from discovery cache {self.cache_file}")
+
+    def _save(self) -> None:
+        if not self.cache_file:
+            return
+        try:
+            tmp_path = f"{self.cache_file}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({
+                    "server": self.api.server,
+                    "fetched_at": self.fetched_at,
+                    "etags": self._etags,
+                    "bodies": self._bodies,
+                }, f)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            logger.warning(f"Failed to save discovery cache to {self.cache_file}: {e}")
+
+    def _fetch(self, path: str) -> Dict[str, Any]:
+        """条件请求单个发现端点，304 时沿用缓存的响应体"""
+        headers = {"If-None-Match": self._etags[path]} if path in self._etags and path in self._bodies else None
+        resp = self.api.request("GET", path, headers=headers)
+        if resp.status_code == 304:
+            return self._bodies[path]
+
+        body = resp.json()
+        etag = resp.headers.get("ETag")
+        if etag:
+            self._etags[path] = etag
+        else:
+            self._etags.pop(path, None)
+        return body
+
+    def refresh(self) -> None:
+        """重新拉取发现信息，并发请求各 API 组的首选版本"""
+        with self._refresh_lock:
+            self._attempted_at = time.time()
+            bodies: Dict[str, Dict[str, Any]] = {}
+            groups = self._fetch("/apis").get("groups", [])
+            bodies["/apis"] = {"groups": groups}
+
+            paths = ["/api/v1"] + [
+                f"/apis/{group['preferredVersion']['groupVersion']}"
+                for group in groups if group.get("preferredVersion")
+            ]
+
+            def fetch_one(path: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+                try:
+                    return path, self._fetch(path)
+                except KubeApiError as e:
+                    # 聚合 API（如 metrics-server）不可用时跳过该组
+                    logger.warning(f"[discovery] Skip {path}: {e}")
+                    return path, self._bodies.get(path)
+
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="discovery") as pool:
+                for path, body in pool.map(fetch_one, paths):
+                    if body is not None:
+                        bodies[path] = body
+
+            self._bodies = bodies
+            self._build(bodies)
+            self.fetched_at = time.time()
+            self._save()
+            logger.debug(f"[discovery] Refreshed {len(self._resources)} API resources")
+
+    def _build(self, bodies: Dict[str, Dict[str, Any]]) -> None:
+        resources: List[Dict[str, Any]] = []
+        index: Dict[str, List[ResourceInfo]] = {}
+        by_kind: Dict[Tuple[str, str], ResourceInfo] = {}
+
+        for path, body in bodies.items():
+            if path == "/apis":
+                continue
+            group_version = body.get("groupVersion") or path.split("/", 2)[-1]
+            group, _, version = group_version.rpartition("/")
+
+            for res in body.get("resources", []):
+                # 跳过 pods/log、deployments/scale 等子资源
+                if "/" in res["name"]:
+                    continue
+                info = ResourceInfo(group, version, res["name"], res["kind"], res.get("namespaced", False))
+                resources.append({
+                    "NAME": res["name"],
+                    "SHORTNAMES": res.get("shortNames", []),
+                    "APIVERSION": group_version,
+                    "NAMESPACED": info.namespaced,
+                    "KIND": res["kind"],
+                    "VERBS": res.get("verbs", []),
+                    "CATEGORIES": res.get("categories", []),
+                })
+                by_kind[(group_version, res["kind"])] = info
+                names = {res["name"], res.get("singularName") or "", res["kind"].lower(), *res.get("shortNames", [])}
+                for name in names:
+                    if name:
+                        index.setdefault(name.lower(), []).append(info)
+
+        with self._lock:
+            self._resources = resources
+            self._index = index
+            self._by_kind = by_kind
+
+    def _lookup(self, name: str, group: Optional[str]) -> Optional[ResourceInfo]:
+        with self._lock:
+            candidates = self._index.get(name, [])
+        if group:
+            candidates = [info for info in candidates if info.group.startswith(group)]
+        if not candidates:
+            return None
+        # 与 kubectl 一致，核心组优先，其余按组名排序取第一个
+        return min(candidates, key=lambda info: (info.group != "", info.group))
+
+    def _resolve(self, lookup: Callable[[], Optional[ResourceInfo]]) -> Optional[ResourceInfo]:
+        """执行 lookup，未命中时按最小间隔同步刷新一次后重试（如新建的 CRD）"""
+        info = lookup()
+        if info is None and not self.ready:
+            # 启动预热进行中时等待其完成，避免首个请求误判为不支持的资源类型
+            with self._refresh_lock:
+                pass
+            info = lookup()
+        if info is None and time.time() - self._attempted_at > self.miss_refresh_interval:
+            try:
+                self.refresh()
+            except (KubeApiError, KubeApiUnavailable) as e:
+                logger.warning(f"[discovery] Refresh failed: {e}")
+                return None
+            info = lookup()
+        return info
+
+    def resolve(self, name: str, group: Optional[str] = None) -> Optional[ResourceInfo]:
+        """按资源名、单数名、简称或 Kind 解析资源，未命中时按最小间隔同步刷新一次（如新建的 CRD）"""
+        return self._resolve(lambda: self._lookup(name, group))
+
+    def resolve_kind(self, api_version: str, kind: str) -> Optional[ResourceInfo]:
+        """按 apiVersion + Kind 解析资源，未命中时同样刷新一次，同一清单中先创建的 CRD 的对象因此可以解析"""
+        def _lookup() -> Optional[ResourceInfo]:
+            with self._lock:
+                return self._by_kind.get((api_version, kind))
+        return self._resolve(_lookup)
+
+    def resources(self, api_group: Optional[str] = None, namespaced: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """返回与 kubectl api-resources -o wide 字段一致的资源表"""
+        with self._lock:
+            resources = list(self._resources)
+        if api_group is not None:
+            resources = [r for r in resources if r["APIVERSION"].rpartition("/")[0] == api_group]
+        if namespaced is not None:
+            resources = [r for r in resources if r["NAMESPACED"] == namespaced]
+        return sorted(resources, key=lambda r: (r["APIVERSION"].rpartition("/")[0], r["NAME"]))
+
+    @property
+    def ready(self) -> bool:
+        return bool(self._resources)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            age = time.time() - self.fetched_at
+            if age < self.ttl:
+                wait = self.ttl - age
+            else:
+                try:
+                    self.refresh()
+                    wait = self.ttl
+                except (KubeApiError, KubeApiUnavailable) as e:
+                    logger.warning(f"[discovery] Background refresh failed: {e}")
+                    wait = min(self.ttl, self.miss_refresh_interval)
+            self._stop.wait(wait)
+
+    def start(self) -> "DiscoveryCache":
+        """加载磁盘缓存并启动后台刷新线程，缓存过期或缺失时立即在后台预热"""
+        self._load()
+        self._thread = threading.Thread(target=self._run, name="discovery", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
@@ -0,0 +1,47 @@
+import threading
+
+from typing import Optional, Any, Dict, List
+
+
+def compact_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """只保留对排查问题有用的字段"""
+    source = event.get("source") or {}
+    return {
+        "type": event.get("type"),
+        "reason": event.get("reason"),
+        "message": (event.get("message") or "").strip(),
+        "count": event.get("count") or (event.get("series") or {}).get("count") or 1,
+        "last_seen": event.get("lastTimestamp") or event.get("eventTime") or event.get("metadata", {}).get("creationTimestamp"),
+        "source": source.get("component") or event.get("reportingComponent"),
+    }
+
+
+class EventIndex:
+    """按 involvedObject.uid 索引的事件存储，作为 events informer 的回调持续更新"""
+
+    def __init__(self) -> None:
+        self._by_uid: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def handle(self, event_type: str, event: Dict[str, Any]) -> None:
+        uid = event.get("involvedObject", {}).get("uid")
+        key = event.get("metadata", {}).get("uid") or event.get("metadata", {}).get("name")
+        if not uid or not key:
+            return
+
+        with self._lock:
+            if event_type == "DELETED":
+                events = self._by_uid.get(uid)
+                if events is not None:
+                    events.pop(key, None)
+                    if not events:
+                        del self._by_uid[uid]
+            else:
+                self._by_uid.setdefault(uid, {})[key] = compact_event(event)
+
+    def for_object(self, uid: Optional[str], limit: int = 20) -> List[Dict[str, Any]]:
+        """返回对象最近的事件，按最后发生时间倒序"""
+        with self._lock:
+            events = list(self._by_uid.get(uid, {}).values()) if uid else []
+        events.sort(key=lambda e: e.get("last_seen") or "", reverse=True)
+        return events[:limit]
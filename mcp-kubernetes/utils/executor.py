@@ -0,0 +1,259 @@
+import asyncio
+import functools
+import subprocess
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any, Dict, List, Callable, Iterable, AsyncIterator
+
+from utils.logger import logger
+from utils.metrics import ENABLED as METRICS_ENABLED, observe_backend
+
+
+class ToolCancelled(RuntimeError):
+    """工具调用已被取消或超时"""
+
+
+class ToolCall:
+    """一次工具调用的上下文，记录其启动的子进程和流式连接，以便取消时统一清理"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.cancelled = threading.Event()
+        self._resources: List[Any] = []
+        self._lock = threading.Lock()
+
+    def track(self, resource: Any) -> Any:
+        with self._lock:
+            if self.cancelled.is_set():
+                self._release(resource)
+                raise ToolCancelled(f"{self.name} was cancelled")
+            self._resources.append(resource)
+        return resource
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled.set()
+            resources, self._resources = self._resources, []
+        for resource in resources:
+            self._release(resource)
+
+    # 子调用作为资源登记到父调用上，父调用取消时一并取消
+    close = cancel
+
+    @staticmethod
+    def _release(resource: Any) -> None:
+        try:
+            if isinstance(resource, subprocess.Popen):
+                if resource.poll() is None:
+                    resource.kill()
+                    logger.info(f"Killed child process {resource.pid} of cancelled tool call")
+            else:
+                resource.close()
+        except Exception as e:
+            logger.warning(f"Failed to release resource of cancelled tool call: {e}")
+
+
+_local = threading.local()
+
+
+def current_call() -> Optional[ToolCall]:
+    return getattr(_local, "call", None)
+
+
+def track(resource: Any) -> Any:
+    """将子进程或可关闭对象登记到当前工具调用，取消时自动终止/关闭"""
+    call = current_call()
+    return call.track(resource) if call is not None else resource
+
+
+def _operation(cmd: List[str]) -> str:
+    """子进程的指标标签，如 'kubectl get'，跳过 --kubeconfig 等全局参数"""
+    args = iter(cmd[1:])
+    for arg in args:
+        if arg in ("--kubeconfig", "--context", "-n", "--namespace"):
+            next(args, None)
+        elif not arg.startswith("-"):
+            return f"{cmd[0]} {arg}"
+    return cmd[0]
+
+
+class TimedPopen(subprocess.Popen):
+    """子进程退出（wait/communicate）时记录从启动到退出的耗时"""
+
+    def __init__(self, cmd: List[str], **kwargs: Any) -> None:
+        self._started = time.perf_counter()
+        self._recorded = False
+        super().__init__(cmd, **kwargs)
+        self._operation = _operation(cmd)
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        returncode = super().wait(timeout)
+        if not self._recorded:
+            self._recorded = True
+            observe_backend("subprocess", self._operation, time.perf_counter() - self._started)
+        return returncode
+
+
+def spawn(cmd: List[str], **kwargs: Any) -> subprocess.Popen:
+    """启动子进程并登记到当前工具调用"""
+    popen = TimedPopen if METRICS_ENABLED else subprocess.Popen
+    return track(popen(cmd, **kwargs))
+
+
+def child_call(name: str) -> ToolCall:
+    """创建当前工具调用的子调用，可单独取消（如扇出查询中单个集群超时），父调用取消时一并取消"""
+    return track(ToolCall(name))
+
+
+def bind(func: Callable[..., Any], call: Optional[ToolCall] = None) -> Callable[..., Any]:
+    """将 func 绑定到当前（或指定的）工具调用，用于在工具内部再开线程时继续跟踪子进程"""
+    call = call or current_call()
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        _local.call = call
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.call = None
+
+    return wrapper
+
+
+class ToolExecutor:
+    """在有界线程池中执行阻塞的工具逻辑，支持按工具配置超时和取消"""
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        default_timeout: float = 120.0,
+        timeouts: Optional[Dict[str, float]] = None
+    ) -> None:
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-tool")
+        self.default_timeout = default_timeout
+        self.timeouts = timeouts or {}
+        logger.info(f"Tool executor initialized: {max_workers} workers, default timeout {default_timeout}s")
+
+    def timeout_for(self, name: str) -> Optional[float]:
+        timeout = self.timeouts.get(name, self.default_timeout)
+        return timeout if timeout and timeout > 0 else None
+
+    async def run(self, name: str, func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        """在线程池中执行 func，超时或被取消时终止其启动的子进程
+
+        Raises:
+            asyncio.TimeoutError: 超过该工具配置的超时时间
+            asyncio.CancelledError: MCP 请求被取消
+        """
+        call = ToolCall(name)
+
+        def _target() -> Any:
+            _local.call = call
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _local.call = None
+
+        future = asyncio.get_running_loop().run_in_executor(self.pool, _target)
+        try:
+            return await asyncio.wait_for(future, self.timeout_for(name))
+        except asyncio.TimeoutError:
+            logger.error(f"[{name}] Timed out after {self.timeout_for(name)}s, cancelling")
+            call.cancel()
+            raise
+        except asyncio.CancelledError:
+            logger.warning(f"[{name}] Request cancelled")
+            call.cancel()
+            raise
+
+    async def iterate(
+        self,
+        name: str,
+        func: Callable[..., Iterable[Any]],
+        /,
+        *args: Any,
+        **kwargs: Any
+    ) -> AsyncIterator[List[Any]]:
+        """在线程池中消费同步生成器，按批异步产出结果
+
+        每次产出自上次以来生成器新产生的全部元素，消费方停止迭代、超时或被取消时终止生成器启动的子进程。
+
+        Raises:
+            asyncio.TimeoutError: 超过该工具配置的超时时间
+            asyncio.CancelledError: MCP 请求被取消
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        call = ToolCall(name)
+        done = object()
+
+        def _target() -> None:
+            _local.call = call
+            try:
+                for item in func(*args, **kwargs):
+                    if call.cancelled.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+                loop.call_soon_threadsafe(queue.put_nowait, (done, None))
+            except BaseException as e:
+                loop.call_soon_threadsafe(queue.put_nowait, (done, e))
+            finally:
+                _local.call = None
+
+        loop.run_in_executor(self.pool, _target)
+        timeout = self.timeout_for(name)
+        deadline = loop.time() + timeout if timeout else None
+        try:
+            finished = False
+            while not finished:
+                remaining = deadline - loop.time() if deadline else None
+                batch = [await asyncio.wait_for(queue.get(), remaining)]
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+
+                items = []
+                for item, error in batch:
+                    if item is done:
+                        if error is not None:
+                            raise error
+                        finished = True
+                    else:
+                        items.append(item)
+                if items:
+                    yield items
+        except asyncio.TimeoutError:
+            logger.error(f"[{name}] Timed out after {timeout}s, cancelling")
+            raise
+        except asyncio.CancelledError:
+            logger.warning(f"[{name}] Request cancelled")
+            raise
+        finally:
+            call.cancel()
+
+    def offload(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """将同步工具函数包装为异步函数，保留原函数签名供 FastMCP 生成参数 schema"""
+        name = func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await self.run(name, func, *args, **kwargs)
+            except asyncio.TimeoutError:
+                return f"[{name}] Failed: timed out after {self.timeout_for(name)} seconds"
+
+        return wrapper
+
+    def shutdown(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_timeouts(raw: Optional[str]) -> Dict[str, float]:
+    """解析按工具配置的超时，如 'get_resources=30,describe_resources=60'"""
+    timeouts: Dict[str, float] = {}
+    for item in (raw or "").split(","):
+        if "=" in item:
+            name, value = item.split("=", 1)
+            timeouts[name.strip()] = float(value)
+    return timeouts
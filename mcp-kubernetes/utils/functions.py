@@ -1,21 +1,12 @@
-import time
+import re
 import json
 import functools
 
 from typing import Callable, Any, Optional, Dict
 
 from utils.logger import logger
-
-def timeit(func):
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        start = time.time()
-        result = func(*args, **kwargs)
-        duration = time.time() - start
-        logger.info(f"{func.__name__} took {duration:.2f} seconds")
-        return result
-
-    return wrapper
+# timeit 由 metrics 提供：记录直方图，METRICS_ENABLED=false 时不做包装
+from utils.metrics import timeit
 
 def handle_kube_error(func: Callable[..., Any]) -> Callable[..., Any]:
     """统一处理 Kubernetes 操作的异常并记录日志"""
@@ -52,6 +43,12 @@ def handle_kube_error(func: Callable[..., Any]) -> Callable[..., Any]:
 
     return wrapper
 
+class ResourceItems(list):
+    """资源列表，附带来源、缓存新鲜度等元数据"""
+    def __init__(self, items=(), metadata: Optional[Dict[str, Any]] = None) -> None:
+        super().__init__(items)
+        self.metadata = metadata
+
 def parse_labels(raw: Optional[str]) -> Optional[Dict[str, str]]:
     if not raw:
         return None
@@ -59,4 +56,12 @@ def parse_labels(raw: Optional[str]) -> Optional[Dict[str, str]]:
         return json.loads(raw)
     except Exception as e:
         logger.warning(f"Invalid label format (expect JSON string): {raw}")
-        return None
\ No newline at end of file
+        return None
+
+def parse_duration(raw: str) -> int:
+    """将 kubectl 风格的时长（如 30s、5m、1h30m）转换为秒数"""
+    units = {"h": 3600, "m": 60, "s": 1}
+    parts = re.findall(r"(\d+)([hms])", raw.strip())
+    if not parts or "".join(n + u for n, u in parts) != raw.strip():
+        raise ValueError(f"Invalid duration: {raw}")
+    return sum(int(n) * units[u] for n, u in parts)
@@ -0,0 +1,121 @@
+import threading
+
+from typing import Optional, Any, Dict, List, Set, Tuple, Callable, Iterable
+
+
+IndexFunc = Callable[[Dict[str, Any]], Iterable[str]]
+
+
+def pod_spec(obj: Dict[str, Any]) -> Dict[str, Any]:
+    """对象中的 pod spec：Pod 本身、工作负载的 template、CronJob 的 jobTemplate"""
+    spec = obj.get("spec") or {}
+    if "jobTemplate" in spec:
+        spec = (spec["jobTemplate"].get("spec") or {})
+    if "template" in spec:
+        spec = (spec["template"] or {}).get("spec") or {}
+    return spec
+
+
+def normalize_image(image: str) -> str:
+    """去掉默认仓库前缀，docker.io/library/nginx:1.25 与 nginx:1.25 视为同一镜像"""
+    for prefix in ("docker.io/library/", "index.docker.io/library/", "docker.io/", "index.docker.io/"):
+        if image.startswith(prefix):
+            return image[len(prefix):]
+    return image
+
+
+def image_keys(image: Optional[str]) -> Set[str]:
+    """镜像的索引键：完整引用与不含 tag/digest 的仓库名，按仓库名查询时匹配所有版本"""
+    if not image:
+        return set()
+    image = normalize_image(image)
+    repository = image.split("@", 1)[0]
+    if ":" in repository.rsplit("/", 1)[-1]:
+        repository = repository.rsplit(":", 1)[0]
+    return {image, repository}
+
+
+def _images(obj: Dict[str, Any]) -> Set[str]:
+    spec = pod_spec(obj)
+    keys: Set[str] = set()
+    for container in (spec.get("containers") or []) + (spec.get("initContainers") or []):
+        keys |= image_keys(container.get("image"))
+    return keys
+
+
+INDEXERS: Dict[str, IndexFunc] = {
+    "namespace": lambda obj: [obj.get("metadata", {}).get("namespace") or ""],
+    "node": lambda obj: [obj.get("spec", {}).get("nodeName") or ""],
+    "image": _images,
+    "owner": lambda obj: [ref.get("uid") for ref in obj.get("metadata", {}).get("ownerReferences") or [] if ref.get("uid")],
+    "label": lambda obj: [f"{k}={v}" for k, v in (obj.get("metadata", {}).get("labels") or {}).items()],
+}
+
+
+class ObjectIndex:
+    """
+    单一资源类型的二级索引（namespace、node、image、owner uid、label key=value），
+    作为 informer 的回调按 ADDED/MODIFIED/DELETED 增量维护，对象以 metadata.uid 标识
+    """
+
+    def __init__(self, indexers: Optional[Dict[str, IndexFunc]] = None) -> None:
+        self.indexers = indexers or INDEXERS
+        self._objects: Dict[str, Dict[str, Any]] = {}
+        self._indexes: Dict[str, Dict[str, Set[str]]] = {name: {} for name in self.indexers}
+        # uid -> 各索引中的取值，更新或删除时据此移除旧条目
+        self._values: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        self._lock = threading.Lock()
+
+    def handle(self, event_type: str, obj: Dict[str, Any]) -> None:
+        uid = obj.get("metadata", {}).get("uid")
+        if not uid:
+            return
+        with self._lock:
+            self._remove(uid)
+            if event_type != "DELETED":
+                self._add(uid, obj)
+
+    def _add(self, uid: str, obj: Dict[str, Any]) -> None:
+        values: Dict[str, Tuple[str, ...]] = {}
+        for name, indexer in self.indexers.items():
+            keys = tuple(set(indexer(obj)))
+            values[name] = keys
+            index = self._indexes[name]
+            for key in keys:
+                index.setdefault(key, set()).add(uid)
+        self._objects[uid] = obj
+        self._values[uid] = values
+
+    def _remove(self, uid: str) -> None:
+        values = self._values.pop(uid, None)
+        if values is None:
+            return
+        self._objects.pop(uid, None)
+        for name, keys in values.items():
+            index = self._indexes[name]
+            for key in keys:
+                uids = index.get(key)
+                if uids is not None:
+                    uids.discard(uid)
+                    if not uids:
+                        del index[key]
+
+    def lookup(self, index: str, *keys: str) -> Set[str]:
+        """返回索引中任一键命中的对象 uid"""
+        with self._lock:
+            entries = self._indexes[index]
+            result: Set[str] = set()
+            for key in keys:
+                result |= entries.get(key, set())
+            return result
+
+    def uids(self) -> Set[str]:
+        with self._lock:
+            return set(self._objects)
+
+    def objects(self, uids: Iterable[str]) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._objects[uid] for uid in uids if uid in self._objects]
+
+    def __len__(self) -> int:
+        return len(self._objects)
@@ -0,0 +1,625 @@
+import atexit
+import functools
+import gc
+import marshal
+import os
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Optional, Any, Dict, List, Callable, Iterable, Tuple
+
+from utils.logger import logger
+from utils.functions import ResourceItems
+from utils.kube_api import KubeApiClient, KubeApiError, KubeApiUnavailable
+from utils.selectors import parse_label_selector, parse_field_selector, match_selectors
+from utils.events import EventIndex
+from utils.indexes import ObjectIndex
+
+
+EventHandler = Callable[[str, Dict[str, Any]], None]
+
+# 快照格式版本，结构变化时递增，旧快照直接忽略
+SNAPSHOT_VERSION = 1
+
+# 每个类型记录的最近观察到的对象版本数，只需覆盖 watch 事件与写入响应之间的竞争窗口
+_OBSERVED_LIMIT = 1024
+
+
+def object_key(obj: Dict[str, Any]) -> str:
+    metadata = obj.get("metadata", {})
+    namespace = metadata.get("namespace")
+    return f"{namespace}/{metadata.get('name')}" if namespace else metadata.get("name", "")
+
+
+def namespace_index(store: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, None]]:
+    """按命名空间分组存储中的对象键（以 dict 保持与存储一致的顺序），集群级对象不计入"""
+    index: Dict[str, Dict[str, None]] = {}
+    for key, obj in store.items():
+        namespace = obj.get("metadata", {}).get("namespace")
+        if namespace:
+            index.setdefault(namespace, {})[key] = None
+    return index
+
+
+class Informer:
+    """单一资源类型的本地缓存：先 list 一次，再基于 resourceVersion 持续 watch
+
+    默认覆盖所有命名空间的全部对象；给出 namespace 与选择器时只 list/watch 匹配的对象（如单次等待使用的私有 watch）。
+    """
+
+    def __init__(
+        self,
+        api: KubeApiClient,
+        resource_type: str,
+        page_size: int = 500,
+        watch_timeout: int = 300,
+        namespace: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None
+    ) -> None:
+        self.api = api
+        self.info = api.resolve(resource_type)
+        self.resource_type = self.info.plural
+        self.page_size = page_size
+        self.watch_timeout = watch_timeout
+        self.namespace = namespace if self.info.namespaced else None
+        self.selectors = {"labelSelector": label_selector, "fieldSelector": field_selector}
+
+        self.store: Dict[str, Dict[str, Any]] = {}
+        # 命名空间 -> 对象键，与 store 在同一把锁内更新，按命名空间读取时无需扫描全部对象
+        self.by_namespace: Dict[str, Dict[str, None]] = {}
+        self.resource_version: Optional[str] = None
+        self.lock = threading.RLock()
+        self.synced = threading.Event()
+        self.connected = False
+        self.disconnected_at: Optional[float] = time.monotonic()
+        # 存储的变更次数，快照据此判断是否需要重写
+        self.changes = 0
+        # 最近一次完成的 list 的发起时刻（monotonic），此前的写入都已包含在存储中
+        self.listed_at = 0.0
+        # 从快照恢复的时间（快照写入时刻），收到首个 watch 事件或重新 list 后清空
+        self.restored_from: Optional[float] = None
+
+        self._handlers: List[EventHandler] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_handler(self, handler: EventHandler) -> None:
+        """注册事件回调，回调参数为 (ADDED/MODIFIED/DELETED, object)，在 informer 线程中执行
+
+        回调与存储更新在同一把锁内执行，注册时先以 ADDED 回放现有对象，之后的事件不会早于回放到达。
+        """
+        with self.lock:
+            self._handlers.append(handler)
+            for obj in list(self.store.values()):
+                handler("ADDED", obj)
+
+    def remove_handler(self, handler: EventHandler) -> None:
+        with self.lock:
+            if handler in self._handlers:
+                self._handlers.remove(handler)
+
+    def start(self) -> "Informer":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"informer-{self.resource_type}",
+                daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def restore(self, items: List[Dict[str, Any]], resource_version: str, saved_at: float) -> None:
+        """以快照中的对象预填存储，启动后直接从快照的 resourceVersion 继续 watch，过期（410）时才重新 list"""
+        with self.lock:
+            self.store = {object_key(obj): obj for obj in items}
+            self.by_namespace = namespace_index(self.store)
+            self.resource_version = resource_version
+            self.restored_from = saved_at
+        self.synced.set()
+        logger.info(f"[informer:{self.resource_type}] Restored {len(items)} objects from snapshot at resourceVersion {resource_version}")
+
+    def snapshot(self) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+        """返回 (resourceVersion, 对象列表)，尚未同步时返回 None"""
+        with self.lock:
+            if not self.synced.is_set() or self.resource_version is None:
+                return None
+            return self.resource_version, list(self.store.values())
+
+    def _prepare(self, obj: Dict[str, Any]) -> Dict[str, Any]:
+        # 与 kubectl 默认行为一致，不保留 managedFields，节省内存
+        obj.get("metadata", {}).pop("managedFields", None)
+        obj.setdefault("kind", self.info.kind)
+        obj.setdefault("apiVersion", self.info.api_version)
+        return obj
+
+    def _dispatch(self, event_type: str, obj: Dict[str, Any]) -> None:
+        for handler in list(self._handlers):
+            try:
+                handler(event_type, obj)
+            except Exception as e:
+                logger.error(f"[informer:{self.resource_type}] Handler error: {e}")
+
+    def _relist(self) -> None:
+        started = time.monotonic()
+        items: Dict[str, Dict[str, Any]] = {}
+        params: Dict[str, Any] = {"limit": self.page_size, **self.selectors}
+
+        while True:
+            doc = self.api.get(self.resource_type, namespace=self.namespace, all_namespace=self.namespace is None, **params)
+            for obj in doc.get("items", []):
+                obj = self._prepare(obj)
+                items[object_key(obj)] = obj
+
+            metadata = doc.get("metadata", {})
+            if not metadata.get("continue"):
+                resource_version = metadata.get("resourceVersion")
+                break
+            params["continue"] = metadata["continue"]
+
+        by_namespace = namespace_index(items)
+        with self.lock:
+            previous = self.store
+            self.store = items
+            self.by_namespace = by_namespace
+            self.resource_version = resource_version
+            self.restored_from = None
+            self.listed_at = started
+            self.changes += 1
+
+            for key, obj in items.items():
+                old = previous.get(key)
+                if old is None:
+                    self._dispatch("ADDED", obj)
+                elif old.get("metadata", {}).get("resourceVersion") != obj.get("metadata", {}).get("resourceVersion"):
+                    self._dispatch("MODIFIED", obj)
+            for key, obj in previous.items():
+                if key not in items:
+                    self._dispatch("DELETED", obj)
+
+        self.synced.set()
+        logger.info(f"[informer:{self.resource_type}] Listed {len(items)} objects at resourceVersion {resource_version}")
+
+    def _connected(self) -> None:
+        self.connected = True
+        self.disconnected_at = None
+
+    def _watch(self) -> None:
+        events = self.api.watch(
+            self.resource_type,
+            namespace=self.namespace,
+            resource_version=self.resource_version,
+            timeout_seconds=self.watch_timeout,
+            on_connect=self._connected,
+            **self.selectors
+        )
+
+        for event in events:
+            if self._stop.is_set():
+                break
+            # 从快照版本续接时，服务端可能以 410 作为第一条消息拒绝，收到首个正常事件（含 BOOKMARK）后数据才视为实时
+            self.restored_from = None
+
+            event_type = event.get("type")
+            obj = event.get("object", {})
+            resource_version = obj.get("metadata", {}).get("resourceVersion")
+
+            if event_type == "BOOKMARK":
+                self.resource_version = resource_version
+                continue
+
+            obj = self._prepare(obj)
+            key = object_key(obj)
+            namespace = obj.get("metadata", {}).get("namespace")
+            with self.lock:
+                if event_type == "DELETED":
+                    self.store.pop(key, None)
+                    keys = self.by_namespace.get(namespace) if namespace else None
+                    if keys is not None:
+                        keys.pop(key, None)
+                        if not keys:
+                            del self.by_namespace[namespace]
+                else:
+                    self.store[key] = obj
+                    if namespace:
+                        self.by_namespace.setdefault(namespace, {})[key] = None
+                self.resource_version = resource_version
+                self.changes += 1
+                self._dispatch(event_type, obj)
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                if self.resource_version is None:
+                    self._relist()
+                self._watch()
+                backoff = 1.0
+                continue
+
+            except KubeApiError as e:
+                if e.status_code == 410:
+                    # resourceVersion 已过期，需要重新 list
+                    logger.info(f"[informer:{self.resource_type}] Watch expired, relisting")
+                    if self.restored_from is not None:
+                        # 快照数据可能已过期很久，重新 list 完成前不再据其应答
+                        self.synced.clear()
+                    self.resource_version = None
+                    continue
+                logger.warning(f"[informer:{self.resource_type}] Watch failed: {e}")
+
+            except (KubeApiUnavailable, ValueError) as e:
+                logger.warning(f"[informer:{self.resource_type}] Connection lost: {e}")
+
+            except Exception as e:
+                # 其他异常（流读取错误、对象格式异常等）同样退避重试，线程不能退出，否则 connected 停留在旧值
+                logger.error(f"[informer:{self.resource_type}] Unexpected error: {type(e).__name__}: {e}")
+
+            finally:
+                if self.connected:
+                    self.connected = False
+                    self.disconnected_at = time.monotonic()
+
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    def stale_seconds(self) -> float:
+        """watch 连接正常时为 0，否则为断开至今的秒数"""
+        if self.connected or self.disconnected_at is None:
+            return 0.0
+        return round(time.monotonic() - self.disconnected_at, 3)
+
+    def metadata(self) -> Dict[str, Any]:
+        metadata = {
+            "source": "cache",
+            "resource_version": self.resource_version,
+            "watch_connected": self.connected,
+            "stale_seconds": self.stale_seconds(),
+        }
+        restored_from = self.restored_from
+        if restored_from is not None:
+            # watch 尚未从快照版本接上，数据为快照写入时的状态
+            metadata.update(source="snapshot", snapshot_age_seconds=round(time.time() - restored_from, 3))
+        return metadata
+
+    def get(self, name: str, namespace: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        key = f"{namespace}/{name}" if self.info.namespaced else name
+        with self.lock:
+            return self.store.get(key)
+
+    def list(self, namespace: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self.lock:
+            if namespace is None or not self.info.namespaced:
+                return list(self.store.values())
+            keys = self.by_namespace.get(namespace, {})
+            return [self.store[key] for key in keys if key in self.store]
+
+
+class InformerCache:
+    """管理多个资源类型的 informer，并对外提供带新鲜度信息的只读查询"""
+
+    DEFAULT_KINDS = ("pods", "services", "deployments", "nodes", "namespaces")
+    # 可以创建共享（常驻、集群范围）informer 的类型：默认类型、events 与 owner 展开经过的中间层；
+    # 其他类型（secrets、CRD 等）不常驻，由调用方按次 list 或建立限定范围的私有 watch
+    SHARED_KINDS = DEFAULT_KINDS + ("events", "replicasets", "jobs")
+
+    def __init__(
+        self,
+        api: KubeApiClient,
+        max_staleness: float = 30.0,
+        snapshot_file: Optional[str] = None,
+        snapshot_interval: float = 60.0
+    ) -> None:
+        self.api = api
+        self.max_staleness = max_staleness
+        self.snapshot_file = snapshot_file
+        self.snapshot_interval = snapshot_interval
+        self.informers: Dict[str, Informer] = {}
+        self.lock = threading.Lock()
+        # 启动时加载的快照，对应类型的 informer 创建时取出
+        self._snapshot: Dict[str, Dict[str, Any]] = {}
+        self._snapshot_at = 0.0
+        self._saved_changes: Dict[str, int] = {}
+        # 周期写入与退出时的写入共用同一临时文件，需串行
+        self._snapshot_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.events = EventIndex()
+        self._events_watched = False
+        self.indexes: Dict[str, ObjectIndex] = {}
+        # 本进程写入、informer 尚未观察到的对象：{资源复数名: {对象键: (期望的 resourceVersion，None 表示等待删除, 写入时刻, 截止时间)}}
+        self._fences: Dict[str, Dict[str, Tuple[Optional[str], float, float]]] = {}
+        # 最近观察到的 (对象键, resourceVersion，删除为 None)，写入响应晚于 watch 事件到达时据此判断已观察到
+        self._observed: Dict[str, "OrderedDict[Tuple[str, Optional[str]], None]"] = {}
+        # informer 回调在 informer 锁内执行，使用独立的锁，避免与 self.lock 形成锁顺序反转
+        self._fence_lock = threading.Lock()
+        api.on_write = self.written
+
+    def shares(self, resource_type: str) -> bool:
+        """该资源类型是否使用共享 informer"""
+        try:
+            return self.api.resolve(resource_type).plural in self.SHARED_KINDS
+        except ValueError:
+            return False
+
+    def informer(self, resource_type: str) -> Informer:
+        """获取（必要时创建并启动）指定资源类型的共享 informer
+
+        Raises:
+            ValueError: 资源类型无法解析或不在 SHARED_KINDS 中
+        """
+        plural = self.api.resolve(resource_type).plural
+        if plural not in self.SHARED_KINDS:
+            raise ValueError(f"No shared informer for {plural}")
+        with self.lock:
+            informer = self.informers.get(plural)
+            if informer is None:
+                informer = Informer(self.api, plural)
+                informer.add_handler(functools.partial(self._observe, plural))
+                saved = self._snapshot.pop(plural, None)
+                if saved is not None:
+                    informer.restore(saved["items"], saved["resource_version"], self._snapshot_at)
+                    self._saved_changes[plural] = informer.changes
+                self.informers[plural] = informer.start()
+            return informer
+
+    def start(self, kinds: Iterable[str] = DEFAULT_KINDS) -> None:
+        if self.snapshot_file:
+            self.load_snapshot()
+        for kind in kinds:
+            self.informer(kind)
+        self.watch_events()
+        if self.snapshot_file:
+            threading.Thread(target=self._snapshot_loop, name="informer-snapshot", daemon=True).start()
+            atexit.register(self.save_snapshot)
+
+    def load_snapshot(self) -> None:
+        """加载磁盘快照，集群地址或格式版本不一致时忽略"""
+        if not os.path.exists(self.snapshot_file):
+            return
+        started = time.perf_counter()
+        # 一次读入后 loads，比从文件对象逐段 load 快得多；反序列化期间暂停 GC，避免对大量新建容器反复扫描
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(self.snapshot_file, "rb") as f:
+                state = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError) as e:
+            logger.warning(f"Failed to load informer snapshot from {self.snapshot_file}: {e}")
+            return
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        if not isinstance(state, dict) or state.get("version") != SNAPSHOT_VERSION or state.get("server") != self.api.server:
+            return
+        # 只恢复可写入快照的类型，忽略旧版本快照中的其他类型
+        self._snapshot = {k: v for k, v in state.get("kinds", {}).items() if k in self.DEFAULT_KINDS}
+        self._snapshot_at = state.get("saved_at", 0.0)
+        logger.info(
+            f"Loaded informer snapshot ({', '.join(f'{k}={len(v['items'])}' for k, v in self._snapshot.items())}) "
+            f"from {self.snapshot_file} in {time.perf_counter() - started:.3f}s"
+        )
+
+    def save_snapshot(self, force: bool = False) -> bool:
+        """将已同步的 informer 存储与 resourceVersion 写入快照（文件权限 0600），存储自上次写入后无变化时跳过
+
+        只写入 DEFAULT_KINDS，按需创建的 informer（如 secrets）与 events 不落盘。
+
+        Args:
+            force (bool, optional): 为True时无论是否变化都写入
+
+        Returns:
+            bool: 是否写入了快照
+        """
+        with self._snapshot_lock:
+            return self._save_snapshot(force)
+
+    def _save_snapshot(self, force: bool) -> bool:
+        with self.lock:
+            informers = {plural: informer for plural, informer in self.informers.items() if plural in self.DEFAULT_KINDS}
+        changes = {plural: informer.changes for plural, informer in informers.items()}
+        if not force and changes == self._saved_changes:
+            return False
+
+        kinds: Dict[str, Dict[str, Any]] = {}
+        for plural, informer in informers.items():
+            snapshot = informer.snapshot()
+            if snapshot is not None:
+                kinds[plural] = {"resource_version": snapshot[0], "items": snapshot[1]}
+        if not kinds:
+            return False
+
+        started = time.perf_counter()
+        tmp_path = f"{self.snapshot_file}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            # 临时文件可能是上次异常退出时遗留的，权限以此为准
+            os.fchmod(fd, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                marshal.dump({
+                    "version": SNAPSHOT_VERSION,
+                    "server": self.api.server,
+                    "saved_at": time.time(),
+                    "kinds": kinds,
+                }, f)
+            os.replace(tmp_path, self.snapshot_file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to save informer snapshot to {self.snapshot_file}: {e}")
+            return False
+
+        self._saved_changes = changes
+        logger.debug(f"Saved informer snapshot ({sum(len(k['items']) for k in kinds.values())} objects) in {time.perf_counter() - started:.3f}s")
+        return True
+
+    def _snapshot_loop(self) -> None:
+        while not self._stop.wait(self.snapshot_interval):
+            self.save_snapshot()
+
+    def stop(self) -> None:
+        self._stop.set()
+        for informer in list(self.informers.values()):
+            informer.stop()
+
+    def watch_events(self) -> None:
+        """启动 events informer，并将事件写入按 involvedObject.uid 索引的 EventIndex"""
+        with self.lock:
+            if self._events_watched:
+                return
+            self._events_watched = True
+        self.informer("events").add_handler(self.events.handle)
+
+    def events_for(self, uid: Optional[str], limit: int = 20) -> Optional[List[Dict[str, Any]]]:
+        """从事件索引读取对象相关事件，events informer 不可用时返回 None"""
+        if self._usable("events") is None:
+            return None
+        return self.events.for_object(uid, limit)
+
+    def index(self, resource_type: str, wait: float = 0) -> Optional[ObjectIndex]:
+        """获取资源类型的二级索引，首次使用时启动 informer 并注册索引回调
+
+        Args:
+            resource_type (str): 资源类型
+            wait (float, optional): informer 尚未完成首次 list 时最多等待的秒数
+
+        Returns:
+            Optional[ObjectIndex]: 索引，类型不使用共享 informer、informer 未同步或断开过久时返回 None
+        """
+        if not self.shares(resource_type):
+            return None
+        informer = self.informer(resource_type)
+        with self.lock:
+            index = self.indexes.get(informer.resource_type)
+            created = index is None
+            if created:
+                index = self.indexes[informer.resource_type] = ObjectIndex()
+        if created:
+            informer.add_handler(index.handle)
+        if wait and not informer.synced.is_set():
+            informer.synced.wait(wait)
+        return index if self._usable(resource_type) is not None else None
+
+    def written(
+        self,
+        resource_type: str,
+        namespace: Optional[str],
+        name: str,
+        resource_version: Optional[str],
+        deleted: bool = False
+    ) -> None:
+        """记录本进程写入的对象，informer 观察到该写入之前，该类型的读取回退为实时查询
+
+        Args:
+            resource_type (str): 资源复数名
+            namespace (Optional[str]): 对象命名空间，集群级资源为 None
+            name (str): 对象名称
+            resource_version (Optional[str]): 写入响应中的 resourceVersion，按原值比较，不假设版本可排序
+            deleted (bool, optional): 是否为立即删除，此时等待该对象的 DELETED 事件
+        """
+        key = f"{namespace}/{name}" if namespace else name
+        expected = None if deleted else resource_version
+        now = time.monotonic()
+        with self._fence_lock:
+            fences = self._fences.setdefault(resource_type, {})
+            if (key, expected) in self._observed.get(resource_type, ()):
+                fences.pop(key, None)
+                return
+            fences[key] = (expected, now, now + self.max_staleness)
+
+    def _observe(self, resource_type: str, event_type: str, obj: Dict[str, Any]) -> None:
+        """informer 回调：收到写入的那个版本或该对象的 DELETED 事件时解除对应的等待"""
+        key = object_key(obj)
+        version = None if event_type == "DELETED" else obj.get("metadata", {}).get("resourceVersion")
+        with self._fence_lock:
+            observed = self._observed.setdefault(resource_type, OrderedDict())
+            observed[(key, version)] = None
+            if len(observed) > _OBSERVED_LIMIT:
+                observed.popitem(last=False)
+
+            fence = self._fences.get(resource_type, {}).get(key)
+            if fence is not None and (version is None or version == fence[0]):
+                del self._fences[resource_type][key]
+
+    def caught_up(self, informer: Informer) -> bool:
+        """informer 是否已观察到本进程对该类型的全部写入
+
+        写入之后发起的 list 同样视为已观察到；超过 max_staleness 仍未观察到时放行，与断开容忍度一致。
+        """
+        fences = self._fences.get(informer.resource_type)
+        if not fences:
+            return True
+        now = time.monotonic()
+        with self._fence_lock:
+            pending = [
+                key for key, (_, written_at, deadline) in fences.items()
+                if now < deadline and informer.listed_at < written_at
+            ]
+            # 只有共享 informer 负责清理，私有 watch 的范围可能只覆盖部分对象
+            if self.informers.get(informer.resource_type) is informer:
+                for key in set(fences) - set(pending):
+                    del fences[key]
+        return not pending
+
+    def _usable(self, resource_type: str) -> Optional[Informer]:
+        try:
+            plural = self.api.resolve(resource_type).plural
+        except ValueError:
+            return None
+
+        informer = self.informers.get(plural)
+        if informer is None or not informer.synced.is_set():
+            return None
+        if informer.stale_seconds() > self.max_staleness:
+            return None
+        if not self.caught_up(informer):
+            return None
+        return informer
+
+    def read(
+        self,
+        resource_type: str,
+        resource_name: Optional[str] = None,
+        namespace: Optional[str] = None,
+        all_namespace: Optional[bool] = False,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None
+    ) -> Optional[ResourceItems]:
+        """从本地缓存读取资源
+
+        Args:
+            resource_type (str): 资源类型
+            resource_name (Optional[str], optional): 资源名称，为空时列出全部
+            namespace (Optional[str], optional): 命名空间，为空时使用 kubeconfig 默认命名空间
+            all_namespace (Optional[bool], optional): 是否列出所有命名空间
+            label_selector (Optional[str], optional): label 选择器，在本地缓存上求值
+            field_selector (Optional[str], optional): field 选择器，在本地缓存上求值
+
+        Returns:
+            Optional[ResourceItems]: 命中时返回对象列表，缓存不可用或未命中时返回 None
+        """
+        informer = self._usable(resource_type)
+        if informer is None:
+            return None
+
+        if not informer.info.namespaced or (all_namespace and not resource_name):
+            namespace = None
+        else:
+            namespace = namespace or self.api.default_namespace
+
+        if resource_name:
+            obj = informer.get(resource_name, namespace)
+            if obj is None:
+                return None
+            items = [obj]
+        else:
+            items = informer.list(namespace)
+
+        if label_selector or field_selector:
+            labels = parse_label_selector(label_selector)
+            fields = parse_field_selector(field_selector)
+            items = [obj for obj in items if match_selectors(obj, labels, fields)]
+
+        return ResourceItems(items, metadata=informer.metadata())
@@ -0,0 +1,121 @@
+import codecs
+import json
+import re
+
+from typing import Optional, Any, Dict, Iterable, Iterator, Callable
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+class _Reader:
+    """在分块输入上做增量解析的缓冲区，值的解析交给 C 实现的 raw_decode"""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        # 丢弃已消费的部分，避免缓冲区无限增长
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self.buf += text
+                return True
+        self.buf += self._decoder.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buf, self.pos)
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buf, self.pos)
+                # 数字等标量可能恰好在块边界被截断，需要确认后面还有内容
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+class ListStream:
+    """流式解析 kubectl / API Server 返回的 List 文档
+
+    逐个产出 items 中的对象而不构建完整文档，其余顶层字段（kind、metadata 等）保存在 document 中。
+    metadata 在 API Server 输出中位于 items 之前，在 kubectl 输出中位于其后，迭代结束后均可读取。
+    """
+
+    def __init__(self, chunks: Iterable[bytes], on_close: Optional[Callable[[], None]] = None) -> None:
+        self._chunks = chunks
+        self._on_close = on_close
+        self.document: Dict[str, Any] = {}
+        self.count = 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        try:
+            reader = _Reader(self._chunks)
+            reader.expect("{")
+            if reader.peek() == "}":
+                return
+
+            while True:
+                key = reader.value()
+                reader.expect(":")
+
+                if key == "items" and reader.peek() == "[":
+                    reader.expect("[")
+                    if reader.peek() != "]":
+                        while True:
+                            self.count += 1
+                            yield reader.value()
+                            if reader.peek() != ",":
+                                break
+                            reader.expect(",")
+                    reader.expect("]")
+                else:
+                    self.document[key] = reader.value()
+
+                if reader.peek() != ",":
+                    break
+                reader.expect(",")
+            reader.expect("}")
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._on_close is not None:
+            on_close, self._on_close = self._on_close, None
+            on_close()
+
+    @property
+    def metadata(self) -> Optional[Dict[str, Any]]:
+        """分页信息，存在后续分页时返回 continue 游标"""
+        meta = self.document.get("metadata", {})
+        page = {k: meta[k] for k in ("continue", "remainingItemCount") if meta.get(k)}
+        return page or None
@@ -0,0 +1,681 @@
+import base64
+import json
+import logging
+import os
+import ssl
+import tempfile
+
+import httpx
+import yaml
+
+from typing import Optional, Any, Callable, Dict, List, NamedTuple, Iterator, Tuple
+
+from utils.logger import logger
+from utils.json_stream import ListStream
+from utils.executor import track
+from utils.metrics import backend_timer, phase_timer
+
+# httpx 默认会为每个请求输出 INFO 日志，API 后端下请求频繁，这里调高级别
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+class KubeApiError(RuntimeError):
+    """API Server 返回非 2xx 状态码时抛出，语义与 kubectl 的 stderr 报错一致"""
+    def __init__(self, message: str, status_code: Optional[int] = None, reason: Optional[str] = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.reason = reason
+
+
+class KubeApiUnavailable(RuntimeError):
+    """API 后端不可用（连接失败、认证方式不支持等），调用方应回退到 kubectl"""
+
+
+class ResourceInfo(NamedTuple):
+    group: str
+    version: str
+    plural: str
+    kind: str
+    namespaced: bool
+
+    @property
+    def api_version(self) -> str:
+        return f"{self.group}/{self.version}" if self.group else self.version
+
+    def display_name(self, name: str) -> str:
+        """与 kubectl -o name 一致的输出，如 pod/nginx、deployment.apps/nginx"""
+        prefix = self.kind.lower()
+        if self.group:
+            prefix += f".{self.group}"
+        return f"{prefix}/{name}"
+
+
+# 内置资源表，不依赖 discovery 即可解析常用资源
+BUILTIN_RESOURCES: Dict[str, ResourceInfo] = {
+    "pods": ResourceInfo("", "v1", "pods", "Pod", True),
+    "services": ResourceInfo("", "v1", "services", "Service", True),
+    "namespaces": ResourceInfo("", "v1", "namespaces", "Namespace", False),
+    "nodes": ResourceInfo("", "v1", "nodes", "Node", False),
+    "configmaps": ResourceInfo("", "v1", "configmaps", "ConfigMap", True),
+    "secrets": ResourceInfo("", "v1", "secrets", "Secret", True),
+    "serviceaccounts": ResourceInfo("", "v1", "serviceaccounts", "ServiceAccount", True),
+    "events": ResourceInfo("", "v1", "events", "Event", True),
+    "endpoints": ResourceInfo("", "v1", "endpoints", "Endpoints", True),
+    "persistentvolumeclaims": ResourceInfo("", "v1", "persistentvolumeclaims", "PersistentVolumeClaim", True),
+    "persistentvolumes": ResourceInfo("", "v1", "persistentvolumes", "PersistentVolume", False),
+    "deployments": ResourceInfo("apps", "v1", "deployments", "Deployment", True),
+    "replicasets": ResourceInfo("apps", "v1", "replicasets", "ReplicaSet", True),
+    "statefulsets": ResourceInfo("apps", "v1", "statefulsets", "StatefulSet", True),
+    "daemonsets": ResourceInfo("apps", "v1", "daemonsets", "DaemonSet", True),
+    "jobs": ResourceInfo("batch", "v1", "jobs", "Job", True),
+    "cronjobs": ResourceInfo("batch", "v1", "cronjobs", "CronJob", True),
+    "limitranges": ResourceInfo("", "v1", "limitranges", "LimitRange", True),
+    "resourcequotas": ResourceInfo("", "v1", "resourcequotas", "ResourceQuota", True),
+    "ingresses": ResourceInfo("networking.k8s.io", "v1", "ingresses", "Ingress", True),
+    "networkpolicies": ResourceInfo("networking.k8s.io", "v1", "networkpolicies", "NetworkPolicy", True),
+    "roles": ResourceInfo("rbac.authorization.k8s.io", "v1", "roles", "Role", True),
+    "rolebindings": ResourceInfo("rbac.authorization.k8s.io", "v1", "rolebindings", "RoleBinding", True),
+    "clusterroles": ResourceInfo("rbac.authorization.k8s.io", "v1", "clusterroles", "ClusterRole", False),
+    "clusterrolebindings": ResourceInfo("rbac.authorization.k8s.io", "v1", "clusterrolebindings", "ClusterRoleBinding", False),
+    "horizontalpodautoscalers": ResourceInfo("autoscaling", "v2", "horizontalpodautoscalers", "HorizontalPodAutoscaler", True),
+    "poddisruptionbudgets": ResourceInfo("policy", "v1", "poddisruptionbudgets", "PodDisruptionBudget", True),
+    "storageclasses": ResourceInfo("storage.k8s.io", "v1", "storageclasses", "StorageClass", False),
+    "customresourcedefinitions": ResourceInfo("apiextensions.k8s.io", "v1", "customresourcedefinitions", "CustomResourceDefinition", False),
+}
+
+RESOURCE_ALIASES: Dict[str, str] = {
+    "po": "pods", "pod": "pods",
+    "svc": "services", "service": "services",
+    "ns": "namespaces", "namespace": "namespaces",
+    "no": "nodes", "node": "nodes",
+    "cm": "configmaps", "configmap": "configmaps",
+    "secret": "secrets",
+    "sa": "serviceaccounts", "serviceaccount": "serviceaccounts",
+    "ev": "events", "event": "events",
+    "ep": "endpoints",
+    "pvc": "persistentvolumeclaims", "persistentvolumeclaim": "persistentvolumeclaims",
+    "pv": "persistentvolumes", "persistentvolume": "persistentvolumes",
+    "deploy": "deployments", "deployment": "deployments",
+    "rs": "replicasets", "replicaset": "replicasets",
+    "sts": "statefulsets", "statefulset": "statefulsets",
+    "ds": "daemonsets", "daemonset": "daemonsets",
+    "job": "jobs",
+    "cj": "cronjobs", "cronjob": "cronjobs",
+    "limits": "limitranges", "limitrange": "limitranges",
+    "quota": "resourcequotas", "resourcequota": "resourcequotas",
+    "ing": "ingresses", "ingress": "ingresses",
+    "netpol": "networkpolicies", "networkpolicy": "networkpolicies",
+    "role": "roles", "rolebinding": "rolebindings",
+    "clusterrole": "clusterroles", "clusterrolebinding": "clusterrolebindings",
+    "hpa": "horizontalpodautoscalers", "horizontalpodautoscaler": "horizontalpodautoscalers",
+    "pdb": "poddisruptionbudgets", "poddisruptionbudget": "poddisruptionbudgets",
+    "sc": "storageclasses", "storageclass": "storageclasses",
+    "crd": "customresourcedefinitions", "crds": "customresourcedefinitions",
+    "customresourcedefinition": "customresourcedefinitions",
+}
+
+TABLE_ACCEPT = "application/json;as=Table;v=v1;g=meta.k8s.io,application/json"
+
+
+def _operation(method: str, path: str) -> str:
+    """API 请求的指标标签，如 'GET pods'、'PATCH deployments/scale'，不含命名空间与对象名"""
+    parts = path.strip("/").split("/")
+    parts = parts[2:] if parts[0] == "api" else parts[3:]
+    if len(parts) >= 3 and parts[0] == "namespaces":
+        parts = parts[2:]
+    if not parts:
+        return f"{method} discovery"
+    return f"{method} {parts[0]}/{parts[2]}" if len(parts) > 2 else f"{method} {parts[0]}"
+
+
+def _read_bytes(data: Optional[str], path: Optional[str], base_dir: str) -> Optional[bytes]:
+    if data:
+        return base64.b64decode(data)
+    if path:
+        if not os.path.isabs(path):
+            path = os.path.join(base_dir, path)
+        with open(path, "rb") as f:
+            return f.read()
+    return None
+
+
+def load_kubeconfig(path: str, context: Optional[str] = None) -> Dict[str, Any]:
+    """解析 kubeconfig，返回指定 context 的连接信息
+
+    Args:
+        path (str): kubeconfig 路径
+        context (Optional[str], optional): context 名称，默认为 current-context
+
+    Raises:
+        KubeApiUnavailable: 当 kubeconfig 使用了不支持的认证方式（exec、auth-provider）时抛出
+
+    Returns:
+        Dict[str, Any]: server、证书、token 等连接信息
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    context_name = context or config.get("current-context")
+
+    def _pick(section: str, name: str) -> Dict[str, Any]:
+        for entry in config.get(section, []) or []:
+            if entry.get("name") == name:
+                return entry.get(section[:-1], {}) or {}
+        raise KubeApiUnavailable(f"{section[:-1]} '{name}' not found in kubeconfig {path}")
+
+    ctx = _pick("contexts", context_name)
+    cluster = _pick("clusters", ctx.get("cluster"))
+    user = _pick("users", ctx.get("user")) if ctx.get("user") else {}
+
+    if "exec" in user or "auth-provider" in user:
+        raise KubeApiUnavailable(f"Unsupported auth plugin in kubeconfig user '{ctx.get('user')}'")
+
+    token = user.get("token")
+    if not token and user.get("tokenFile"):
+        with open(user["tokenFile"], "r", encoding="utf-8") as f:
+            token = f.read().strip()
+
+    return {
+        "context": context_name,
+        "server": cluster.get("server", "").rstrip("/"),
+        "namespace": ctx.get("namespace") or "default",
+        "insecure": bool(cluster.get("insecure-skip-tls-verify", False)),
+        "ca": _read_bytes(cluster.get("certificate-authority-data"), cluster.get("certificate-authority"), base_dir),
+        "cert": _read_bytes(user.get("client-certificate-data"), user.get("client-certificate"), base_dir),
+        "key": _read_bytes(user.get("client-key-data"), user.get("client-key"), base_dir),
+        "token": token,
+        "username": user.get("username"),
+        "password": user.get("password"),
+    }
+
+
+def _build_ssl_context(cfg: Dict[str, Any]) -> ssl.SSLContext:
+    if cfg["insecure"]:
+        ctx = ssl.create_default_context()
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+    elif cfg["ca"]:
+        ctx = ssl.create_default_context(cadata=cfg["ca"].decode())
+    else:
+        ctx = ssl.create_default_context()
+
+    if cfg["cert"] and cfg["key"]:
+        # ssl 模块只能从文件加载客户端证书，加载后立即删除临时文件
+        paths = []
+        try:
+            for blob in (cfg["cert"], cfg["key"]):
+                fd, tmp_path = tempfile.mkstemp(suffix=".pem")
+                paths.append(tmp_path)
+                with os.fdopen(fd, "wb") as f:
+                    f.write(blob)
+            ctx.load_cert_chain(certfile=paths[0], keyfile=paths[1])
+        finally:
+            for tmp_path in paths:
+                os.remove(tmp_path)
+    return ctx
+
+
+class KubeApiClient:
+    """进程内 Kubernetes API 客户端，基于 httpx 连接池复用 keep-alive 连接"""
+
+    def __init__(
+        self,
+        kubeconfig: str,
+        context: Optional[str] = None,
+        timeout: float = 30.0,
+        pool_size: int = 20
+    ) -> None:
+        cfg = load_kubeconfig(kubeconfig, context)
+        if not cfg["server"]:
+            raise KubeApiUnavailable(f"No server defined for context '{cfg['context']}'")
+
+        self.context = cfg["context"]
+        self.server = cfg["server"]
+        self.default_namespace = cfg["namespace"]
+        # 可选的发现缓存（utils.discovery.DiscoveryCache），用于解析内置表之外的资源（含 CRD）
+        self.discovery = None
+        # 可选的写入回调 (资源复数名, 命名空间, 对象名称, 写入后的 resourceVersion, 是否为立即删除)，informer 缓存据此保证读己之写
+        self.on_write: Optional[Callable[[str, Optional[str], str, Optional[str], bool], None]] = None
+
+        headers = {"Accept": "application/json", "User-Agent": "mcp-kubernetes"}
+        if cfg["token"]:
+            headers["Authorization"] = f"Bearer {cfg['token']}"
+
+        auth = None
+        if cfg["username"] and cfg["password"]:
+            auth = httpx.BasicAuth(cfg["username"], cfg["password"])
+
+        verify = _build_ssl_context(cfg) if self.server.startswith("https") else False
+
+        self.http = httpx.Client(
+            base_url=self.server,
+            headers=headers,
+            auth=auth,
+            verify=verify,
+            timeout=httpx.Timeout(timeout, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=60.0
+            ),
+        )
+        logger.info(f"Kubernetes API client initialized for {self.server} (context: {self.context})")
+
+    def close(self) -> None:
+        self.http.close()
+
+    def resolve(self, resource_type: str) -> ResourceInfo:
+        """将 kubectl 风格的资源名（pods、po、deployments.app 等）解析为 API 资源信息
+
+        Args:
+            resource_type (str): 资源类型
+
+        Raises:
+            ValueError: 无法识别的资源类型
+
+        Returns:
+            ResourceInfo: 资源信息
+        """
+        name = resource_type.strip().lower()
+        group = None
+        if "." in name:
+            name, group = name.split(".", 1)
+
+        plural = RESOURCE_ALIASES.get(name, name)
+        info = BUILTIN_RESOURCES.get(plural)
+        if info is not None and group and not info.group.startswith(group):
+            info = None
+
+        if info is None and self.discovery is not None:
+            info = self.discovery.resolve(name, group)
+
+        if info is None:
+            raise ValueError(f"Unsupport resource type: {resource_type}")
+        return info
+
+    def resolve_kind(self, api_version: str, kind: str) -> ResourceInfo:
+        for info in BUILTIN_RESOURCES.values():
+            if info.kind == kind and info.api_version == api_version:
+                return info
+        if self.discovery is not None:
+            info = self.discovery.resolve_kind(api_version, kind)
+            if info is not None:
+                return info
+        raise ValueError(f"Unsupport resource kind: {api_version}/{kind}")
+
+    def resource_path(
+        self,
+        info: ResourceInfo,
+        name: Optional[str] = None,
+        namespace: Optional[str] = None,
+        subresource: Optional[str] = None
+    ) -> str:
+        path = f"/apis/{info.group}/{info.version}" if info.group else f"/api/{info.version}"
+        if info.namespaced and namespace:
+            path += f"/namespaces/{namespace}"
+        path += f"/{info.plural}"
+        if name:
+            path += f"/{name}"
+        if subresource:
+            path += f"/{subresource}"
+        return path
+
+    def _namespace_for(self, info: ResourceInfo, namespace: Optional[str], all_namespace: bool = False) -> Optional[str]:
+        if not info.namespaced or all_namespace:
+            return None
+        return namespace or self.default_namespace
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Any = None,
+        content: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        """发起请求并将错误转换为 KubeApiError / KubeApiUnavailable"""
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        logger.debug(f"API request: {method} {path} {params}")
+        try:
+            with backend_timer("api", _operation(method, path)):
+                resp = self.http.request(method, path, params=params, json=body, content=content, headers=headers)
+        except httpx.TransportError as e:
+            raise KubeApiUnavailable(f"{type(e).__name__}: {e}") from e
+
+        if resp.status_code >= 400:
+            raise self._error_from(resp)
+        # 在工具调用中打开的流随调用取消一并关闭
+        return track(resp)
+
+    def _written(
+        self,
+        info: ResourceInfo,
+        resp: httpx.Response,
+        name: Optional[str] = None,
+        namespace: Optional[str] = None,
+        deleted: bool = False
+    ) -> None:
+        if self.on_write is None:
+            return
+        try:
+            metadata = resp.json().get("metadata") or {}
+        except (ValueError, AttributeError):
+            metadata = {}
+        name = metadata.get("name") or name
+        if not name:
+            return
+        namespace = (metadata.get("namespace") or namespace) if info.namespaced else None
+        # 立即删除时返回的是删除前的对象（或 Status），只能等待 DELETED 事件；优雅删除返回设置了 deletionTimestamp 的对象
+        immediate = deleted and not metadata.get("deletionTimestamp")
+        try:
+            self.on_write(info.plural, namespace, name, None if immediate else metadata.get("resourceVersion"), immediate)
+        except Exception as e:
+            logger.error(f"[kube_api] Write callback failed: {e}")
+
+    def _error_from(self, resp: httpx.Response) -> KubeApiError:
+        try:
+            status = resp.json()
+            message = status.get("message") or resp.text
+            reason = status.get("reason")
+        except ValueError:
+            message, reason = resp.text, None
+        return KubeApiError(f"Error from server ({reason or resp.status_code}): {message}", resp.status_code, reason)
+
+    def get(
+        self,
+        resource_type: str,
+        name: Optional[str] = None,
+        namespace: Optional[str] = None,
+        all_namespace: bool = False,
+        **params: Any
+    ) -> Dict[str, Any]:
+        """获取单个对象或对象列表，返回与 kubectl get -o json 相同结构的字典"""
+        info = self.resolve(resource_type)
+        ns = self._namespace_for(info, namespace, all_namespace and not name)
+        resp = self.request("GET", self.resource_path(info, name, ns), params=params)
+        with phase_timer("decode"):
+            return resp.json()
+
+    def open_stream(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> httpx.Response:
+        """发起流式请求，连接失败或服务端报错时立即抛出，调用方负责关闭响应"""
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        logger.debug(f"API stream: {method} {path} {params}")
+        options = {"timeout": httpx.Timeout(timeout, connect=5.0)} if timeout else {}
+        request = self.http.build_request(method, path, params=params, **options)
+        try:
+            # 流式请求只统计到响应头返回为止
+            with backend_timer("api", _operation(f"STREAM {method}", path)):
+                resp = self.http.send(request, stream=True)
+        except httpx.TransportError as e:
+            raise KubeApiUnavailable(f"{type(e).__name__}: {e}") from e
+
+        if resp.status_code >= 400:
+            resp.read()
+            resp.close()
+            raise self._error_from(resp)
+        return resp
+
+    def stream_list(
+        self,
+        resource_type: str,
+        namespace: Optional[str] = None,
+        all_namespace: bool = False,
+        **params: Any
+    ) -> ListStream:
+        """流式列出资源，items 边下载边解析"""
+        info = self.resolve(resource_type)
+        ns = self._namespace_for(info, namespace, all_namespace)
+        resp = self.open_stream("GET", self.resource_path(info, namespace=ns), params=params)
+        return ListStream(resp.iter_bytes(65536), on_close=resp.close)
+
+    def table(
+        self,
+        resource_type: str,
+        name: Optional[str] = None,
+        namespace: Optional[str] = None,
+        all_namespace: bool = False,
+        wide: bool = False,
+        **params: Any
+    ) -> str:
+        """以服务端 Table 格式获取资源，并渲染为与 kubectl get 类似的文本"""
+        info = self.resolve(resource_type)
+        ns = self._namespace_for(info, namespace, all_namespace and not name)
+        resp = self.request("GET", self.resource_path(info, name, ns), params=params, headers={"Accept": TABLE_ACCEPT})
+        with phase_timer("table"):
+            return format_table(resp.json(), wide=wide, with_namespace=all_namespace and info.namespaced)
+
+    def delete(
+        self,
+        resource_type: str,
+        name: str,
+        namespace: Optional[str] = None,
+        **params: Any
+    ) -> str:
+        info = self.resolve(resource_type)
+        ns = self._namespace_for(info, namespace)
+        resp = self.request("DELETE", self.resource_path(info, name, ns), params=params)
+        if not params.get("dryRun"):
+            self._written(info, resp, name, ns, deleted=True)
+        return info.display_name(name)
+
+    def patch(
+        self,
+        resource_type: str,
+        name: str,
+        patch: Any,
+        namespace: Optional[str] = None,
+        patch_type: str = "strategic",
+        subresource: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        content_types = {
+            "strategic": "application/strategic-merge-patch+json",
+            "merge": "application/merge-patch+json",
+            "json": "application/json-patch+json",
+        }
+        if patch_type not in content_types:
+            raise ValueError(f"Unsupported patch type: {patch_type}")
+
+        info = self.resolve(resource_type)
+        ns = self._namespace_for(info, namespace)
+        resp = self.request(
+            "PATCH",
+            self.resource_path(info, name, ns, subresource),
+            content=json.dumps(patch).encode(),
+            headers={"Content-Type": content_types[patch_type]},
+        )
+        self._written(info, resp, name, ns)
+        return resp.json()
+
+    def create(self, obj: Dict[str, Any], namespace: Optional[str] = None) -> str:
+        """创建单个对象，返回与 kubectl create 相同的输出，如 pod/nginx created"""
+        info = self.resolve_kind(obj.get("apiVersion", ""), obj.get("kind", ""))
+        ns = self._namespace_for(info, obj.get("metadata", {}).get("namespace") or namespace)
+        resp = self.request("POST", self.resource_path(info, namespace=ns), body=obj)
+        self._written(info, resp, namespace=ns)
+        created = resp.json()
+        return f"{info.display_name(created['metadata']['name'])} created"
+
+    def apply(
+        self,
+        obj: Dict[str, Any],
+        namespace: Optional[str] = None,
+        field_manager: str = "mcp-kubernetes",
+        force: bool = False,
+        dry_run: bool = False
+    ) -> Tuple[Dict[str, Any], bool]:
+        """服务端应用（server-side apply）单个对象
+
+        Args:
+            obj (Dict[str, Any]): 完整的对象清单
+            namespace (Optional[str], optional): 对象未指定命名空间时使用的命名空间
+            field_manager (str, optional): 字段管理者名称
+            force (bool, optional): 是否强制接管与其他管理者冲突的字段
+            dry_run (bool, optional): 仅在服务端试运行，不持久化
+
+        Raises:
+            ValueError: 对象缺少 metadata.name 或类型无法解析
+            KubeApiError: 服务端返回错误（如字段冲突 409）
+
+        Returns:
+            Tuple[Dict[str, Any], bool]: (应用后的对象, 是否为新建)
+        """
+        info = self.resolve_kind(obj.get("apiVersion", ""), obj.get("kind", ""))
+        name = obj.get("metadata", {}).get("name")
+        if not name:
+            raise ValueError(f"metadata.name is required to apply {info.kind}")
+
+        ns = self._namespace_for(info, obj.get("metadata", {}).get("namespace") or namespace)
+        resp = self.request(
+            "PATCH",
+            self.resource_path(info, name, ns),
+            params={
+                "fieldManager": field_manager,
+                "force": "true" if force else None,
+                "dryRun": "All" if dry_run else None,
+            },
+            # JSON 是合法的 YAML，可直接作为 apply patch 提交
+            content=json.dumps(obj).encode(),
+            headers={"Content-Type": "application/apply-patch+yaml"},
+        )
+        if not dry_run:
+            self._written(info, resp, name, ns)
+        return resp.json(), resp.status_code == 201
+
+    def watch(
+        self,
+        resource_type: str,
+        namespace: Optional[str] = None,
+        resource_version: Optional[str] = None,
+        timeout_seconds: int = 300,
+        on_connect: Optional[Callable[[], None]] = None,
+        **params: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """从指定 resourceVersion 开始 watch 资源，逐个产出 {type, object} 事件
+
+        Args:
+            resource_type (str): 资源类型
+            namespace (Optional[str], optional): 命名空间，为空时 watch 所有命名空间
+            resource_version (Optional[str], optional): 起始 resourceVersion
+            timeout_seconds (int, optional): 服务端关闭 watch 的超时时间
+            on_connect (Optional[Callable[[], None]], optional): 服务端接受 watch 请求（响应头到达）后调用
+
+        Raises:
+            KubeApiError: 服务端返回错误，或 watch 过程中收到 ERROR 事件（如 410 Gone）
+            KubeApiUnavailable: 连接失败或中断
+
+        Yields:
+            Iterator[Dict[str, Any]]: watch 事件
+        """
+        info = self.resolve(resource_type)
+        path = self.resource_path(info, namespace=namespace if info.namespaced else None)
+        params = {
+            "watch": "true",
+            "allowWatchBookmarks": "true",
+            "resourceVersion": resource_version,
+            "timeoutSeconds": timeout_seconds,
+            **params,
+        }
+        params = {k: v for k, v in params.items() if v is not None}
+        logger.debug(f"API watch: {path} {params}")
+
+        try:
+            with self.http.stream(
+                "GET", path, params=params,
+                timeout=httpx.Timeout(timeout_seconds + 30, connect=5.0)
+            ) as resp:
+                if resp.status_code >= 400:
+                    resp.read()
+                    raise self._error_from(resp)
+
+                # 工具调用取消时关闭 watch 连接
+                track(resp)
+                if on_connect is not None:
+                    on_connect()
+                for line in resp.iter_lines():
+                    if not line:
+                        continue
+                    event = json.loads(line)
+                    if event.get("type") == "ERROR":
+                        status = event.get("object", {})
+                        raise KubeApiError(
+                            f"Watch error ({status.get('reason')}): {status.get('message')}",
+                            status.get("code"),
+                            status.get("reason")
+                        )
+                    yield event
+        except httpx.TransportError as e:
+            raise KubeApiUnavailable(f"{type(e).__name__}: {e}") from e
+
+    def logs(self, pod_name: str, namespace: Optional[str] = None, **params: Any) -> str:
+        info = BUILTIN_RESOURCES["pods"]
+        ns = namespace or self.default_namespace
+        resp = self.request(
+            "GET",
+            self.resource_path(info, pod_name, ns, "log"),
+            params={k: (str(v).lower() if isinstance(v, bool) else v) for k, v in params.items()},
+        )
+        return resp.text
+
+    def stream_logs(
+        self,
+        pod_name: str,
+        namespace: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **params: Any
+    ) -> httpx.Response:
+        """以流的形式读取容器日志（支持 follow），调用方负责关闭响应"""
+        info = BUILTIN_RESOURCES["pods"]
+        ns = namespace or self.default_namespace
+        return self.open_stream(
+            "GET",
+            self.resource_path(info, pod_name, ns, "log"),
+            params={k: (str(v).lower() if isinstance(v, bool) else v) for k, v in params.items()},
+            timeout=timeout
+        )
+
+
+def format_table(table: Dict[str, Any], wide: bool = False, with_namespace: bool = False) -> str:
+    """将 meta.k8s.io/v1 Table 渲染为 kubectl 风格的对齐文本"""
+    columns = [
+        (i, col["name"].upper())
+        for i, col in enumerate(table.get("columnDefinitions", []))
+        if wide or col.get("priority", 0) == 0
+    ]
+    headers = [name for _, name in columns]
+    rows: List[List[str]] = []
+
+    for row in table.get("rows", []):
+        cells = row.get("cells", [])
+        values = ["<none>" if cells[i] in (None, "") else str(cells[i]) for i, _ in columns]
+        if with_namespace:
+            values.insert(0, row.get("object", {}).get("metadata", {}).get("namespace", ""))
+        rows.append(values)
+
+    if with_namespace:
+        headers.insert(0, "NAMESPACE")
+
+    if not rows:
+        return "No resources found"
+
+    widths = [max(len(headers[i]), *(len(r[i]) for r in rows)) for i in range(len(headers))]
+    lines = ["   ".join(v.ljust(widths[i]) for i, v in enumerate(line)).rstrip() for line in [headers] + rows]
+    return "\n".join(lines)
+
+
+def create_api_client(kubeconfig: Optional[str], context: Optional[str] = None) -> Optional[KubeApiClient]:
+    """尝试创建 API 客户端，失败时返回 None 以回退到 kubectl"""
+    if not kubeconfig:
+        return None
+    try:
+        return KubeApiClient(kubeconfig, context=context)
+    except (KubeApiUnavailable, OSError, ssl.SSLError, yaml.YAMLError, ValueError) as e:
+        logger.warning(f"Kubernetes API backend unavailable, fallback to kubectl: {e}")
+        return None
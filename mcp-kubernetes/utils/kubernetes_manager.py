@@ -1,3 +1,8 @@
+import os
+import re
+
+from typing import Optional
+
 from utils.resources_get_v1 import ResouecesGet
 from utils.resources_delete_v1 import ResourcesDelete
 from utils.resources_describe_v1 import ResouecesDescribe
@@ -7,22 +12,83 @@ from utils.resources_logs_v1 import ResourceLog
 from utils.resources_patch_v1 import ResourcePatch
 from utils.resources_create_v1 import ResourceCreate
 from utils.resources_apply_v1 import ResourceApply
+from utils.resources_query_v1 import ResourceQuery
+from utils.rollout import RolloutWatcher
+from utils.wait import ConditionWaiter
 
 from utils.port_forward import PortForwarder
 from utils.env_utils import get_env_var
+from utils.kube_api import create_api_client
+from utils.discovery import DiscoveryCache
+from utils.informer import InformerCache
+from utils.log_cursors import LogCursors
+
+
+def _state_file(path: str, context: Optional[str]) -> str:
+    """按 context 区分状态文件，如 port_forwards.json -> port_forwards.prod.json"""
+    if not path or not context:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{re.sub(r'[^A-Za-z0-9_.-]', '_', context)}{ext}"
 
 
 class KubernetesManager:
-    def __init__(self):
-        self.env = get_env_var("KUBECONFIG")
+    def __init__(self, kubeconfig: Optional[str] = None, context: Optional[str] = None):
+        """
+        Args:
+            kubeconfig (Optional[str], optional): kubeconfig 路径，默认读取 KUBECONFIG 环境变量
+            context (Optional[str], optional): 固定到该 context 的 kubeconfig 对应的 context 名称，用于区分状态文件
+        """
+        self.env = kubeconfig or get_env_var("KUBECONFIG")
+        self.context = context
+
+        # 后端：api（进程内 API 客户端，失败时回退 kubectl）或 kubectl
+        self.backend = get_env_var("KUBE_BACKEND", "api").strip().lower()
+        self.api = create_api_client(self.env) if self.backend == "api" else None
+
+        # 发现缓存：持久化 API 资源表，用于解析内置表之外的资源类型（含 CRD）
+        self.discovery = None
+        if self.api is not None:
+            self.discovery = DiscoveryCache(
+                self.api,
+                cache_file=_state_file(get_env_var("DISCOVERY_CACHE_FILE", "discovery_cache.json"), context),
+                ttl=float(get_env_var("DISCOVERY_CACHE_TTL", "600"))
+            ).start()
+            self.api.discovery = self.discovery
+
+        # informer 本地缓存，仅在 API 后端可用时启用
+        self.cache = None
+        if self.api is not None and get_env_var("KUBE_INFORMER", "true").strip().lower() == "true":
+            self.cache = InformerCache(
+                self.api,
+                max_staleness=float(get_env_var("KUBE_INFORMER_MAX_STALENESS", "30")),
+                snapshot_file=_state_file(get_env_var("INFORMER_SNAPSHOT_FILE", "informer_snapshot.bin"), context),
+                snapshot_interval=float(get_env_var("INFORMER_SNAPSHOT_INTERVAL", "60"))
+            )
+            self.cache.start()
         
-        self.get = ResouecesGet(self.env)
-        self.delete = ResourcesDelete(self.env)
-        self.describe = ResouecesDescribe(self.env)
-        self.list = ResourceList(self.env)
-        self.scale = ResourceScale(self.env)
-        self.logs = ResourceLog(self.env)
-        self.patch = ResourcePatch(self.env)
-        self.create = ResourceCreate(self.env)
-        self.apply = ResourceApply(self.env)
-        self.portforward = PortForwarder(self.env)
\ No newline at end of file
+        self.get = ResouecesGet(self.env, self.api, self.cache)
+        self.delete = ResourcesDelete(self.env, self.api)
+        self.describe = ResouecesDescribe(self.env, self.api, self.cache)
+        self.list = ResourceList(self.env, self.discovery)
+        self.scale = ResourceScale(self.env, self.api)
+        self.logs = ResourceLog(
+            self.env,
+            self.api,
+            cursors=LogCursors(
+                ttl=float(get_env_var("LOG_CURSOR_TTL", "600")),
+                max_entries=int(get_env_var("LOG_CURSOR_SIZE", "512")),
+                buffer_lines=int(get_env_var("LOG_CURSOR_BUFFER_LINES", "1000"))
+            )
+        )
+        self.patch = ResourcePatch(self.env, self.api)
+        self.create = ResourceCreate(self.env, self.api)
+        self.apply = ResourceApply(self.env, self.api)
+        self.query = ResourceQuery(self.env, self.api, self.cache)
+        self.rollout = RolloutWatcher(self.env, self.api)
+        self.wait = ConditionWaiter(self.env, self.api, self.cache)
+        self.portforward = PortForwarder(
+            self.env,
+            state_file=_state_file(get_env_var("PORT_FORWARD_STATE", "port_forwards.json"), context),
+            check_interval=float(get_env_var("PORT_FORWARD_CHECK_INTERVAL", "10"))
+        )
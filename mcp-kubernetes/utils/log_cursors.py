@@ -0,0 +1,137 @@
+import time
+import threading
+
+from collections import Counter, OrderedDict, deque
+from typing import Deque, List, Optional, Tuple
+
+from utils.metrics import registry
+
+
+LOG_CURSOR_REQUESTS = registry.counter(
+    "mcp_log_cursor_requests_total",
+    "new_only log reads by cursor outcome (hit, miss)",
+    ("result",)
+)
+LOG_CURSOR_LINES = registry.counter(
+    "mcp_log_cursor_lines_total",
+    "Log lines read through cursors, split into returned (new) and dropped (duplicate)",
+    ("result",)
+)
+
+# (命名空间, pod 名称, 容器名称)，容器为空串表示 pod 的默认容器
+CursorKey = Tuple[str, str, str]
+# (RFC3339Nano 时间戳, 日志内容)
+LogLine = Tuple[str, str]
+
+
+def timestamp_key(timestamp: str) -> str:
+    """将 RFC3339Nano 时间戳补齐为定长小数位，使其可按字符串排序"""
+    base, _, fraction = timestamp.rstrip("Z").partition(".")
+    return f"{base}.{fraction.ljust(9, '0')}"
+
+
+class LogCursor:
+    """单个 (pod, 容器) 的读取位置：最后一行的时间戳，以及最近若干行组成的环形缓冲区"""
+
+    def __init__(self, buffer_lines: int) -> None:
+        self.last_timestamp: Optional[str] = None
+        self.lines: Deque[LogLine] = deque()
+        self.buffer_lines = buffer_lines
+        # 环形缓冲区中各行的出现次数，用于 O(1) 判断重复
+        self._seen: Counter = Counter()
+        self.touched = time.monotonic()
+        self.lock = threading.Lock()
+
+    def since_time(self) -> Optional[str]:
+        """下次增量读取的 sinceTime：截断到秒，与 kubelet 的精度一致，重叠部分由缓冲区去重"""
+        if self.last_timestamp is None:
+            return None
+        return f"{self.last_timestamp.partition('.')[0].rstrip('Z')}Z"
+
+    def advance(self, lines: List[LogLine]) -> List[LogLine]:
+        """过滤掉已读过的行，记录新行并前移读取位置
+
+        Args:
+            lines (List[LogLine]): 本次读取到的 (时间戳, 内容)，按时间有序
+
+        Returns:
+            List[LogLine]: 上次读取之后的新行
+        """
+        with self.lock:
+            fresh = self._advance(lines)
+        LOG_CURSOR_LINES.inc("new", amount=len(fresh))
+        LOG_CURSOR_LINES.inc("duplicate", amount=len(lines) - len(fresh))
+        return fresh
+
+    def _advance(self, lines: List[LogLine]) -> List[LogLine]:
+        last_key = timestamp_key(self.last_timestamp) if self.last_timestamp else None
+        fresh: List[LogLine] = []
+        for line in lines:
+            ts = line[0]
+            if not ts:
+                continue
+            if last_key is not None:
+                key = timestamp_key(ts)
+                # 早于读取位置的行一定读过；与读取位置同一时间戳的行按内容在缓冲区中查重
+                if key < last_key or (key == last_key and self._seen[line] > 0):
+                    continue
+            fresh.append(line)
+
+        for line in fresh:
+            if len(self.lines) >= self.buffer_lines:
+                old = self.lines.popleft()
+                self._seen[old] -= 1
+                if self._seen[old] <= 0:
+                    del self._seen[old]
+            self.lines.append(line)
+            self._seen[line] += 1
+        if fresh:
+            self.last_timestamp = fresh[-1][0]
+
+        self.touched = time.monotonic()
+        return fresh
+
+
+class LogCursors:
+    """
+    按 (命名空间, pod, 容器) 保存的日志读取位置，LRU 限制条目数，超过 ttl 未使用的条目过期
+
+    new_only 读取时以上次最后一行的时间戳作为 sinceTime 只拉取增量，再由环形缓冲区去掉重叠的行。
+    """
+
+    def __init__(self, ttl: float = 600.0, max_entries: int = 512, buffer_lines: int = 1000) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.buffer_lines = buffer_lines
+        self._cursors: "OrderedDict[CursorKey, LogCursor]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, pod: str, container: Optional[str]) -> Tuple[bool, LogCursor]:
+        """返回 (是否已有读取位置, 游标)，不存在或已过期时新建"""
+        key = (namespace, pod, container or "")
+        now = time.monotonic()
+        with self._lock:
+            cursor = self._cursors.get(key)
+            if cursor is not None and now - cursor.touched > self.ttl:
+                cursor = None
+            found = cursor is not None and cursor.last_timestamp is not None
+            if cursor is None:
+                cursor = LogCursor(self.buffer_lines)
+                self._cursors[key] = cursor
+            cursor.touched = now
+            self._cursors.move_to_end(key)
+
+            while len(self._cursors) > self.max_entries:
+                self._cursors.popitem(last=False)
+            # 顺带清理过期条目，最久未使用的在前
+            while self._cursors:
+                oldest_key, oldest = next(iter(self._cursors.items()))
+                if now - oldest.touched <= self.ttl:
+                    break
+                del self._cursors[oldest_key]
+
+        LOG_CURSOR_REQUESTS.inc("hit" if found else "miss")
+        return found, cursor
+
+    def __len__(self) -> int:
+        return len(self._cursors)
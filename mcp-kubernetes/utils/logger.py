@@ -2,7 +2,7 @@ import logging
 import os
 import sys
 import json
-import yaml
+from utils.serialization import dump_yaml
 
 class JsonFormatter(logging.Formatter):
     """格式化日志为json
@@ -30,7 +30,7 @@ class YamlFormatter(logging.Formatter):
             "level": record.levelname,
             "message": record.getMessage(),
         }
-        return yaml.dump(record_dict, allow_unicode=True).strip()
+        return dump_yaml(record_dict, sort_keys=True).strip()
 
 class LogFormatter(logging.Formatter):
     """
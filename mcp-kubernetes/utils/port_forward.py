@@ -1,16 +1,48 @@
 import subprocess
 import signal
+import socket
+import tempfile
+import threading
+import json
+import time
+import re
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Set
 
 from utils.logger import logger
 from utils.functions import timeit, handle_kube_error
 
 
 class PortForwarder:
-    def __init__(self, env: Optional[str]) -> Any:
+    """端口转发管理器
+
+    每个转发对应一个脱离会话的 kubectl port-forward 进程，按 _make_key 去重复用。
+    后台线程定期检查进程存活和本地端口连通性，异常退出时按指数退避重启；
+    转发状态持久化到 state_file，服务重启后接管仍在运行的进程或重新拉起。
+    锁只保护 forwards 等内存状态，进程启动、就绪等待与端口探测都在锁外进行，单个转发缓慢不影响其他调用。
+    """
+
+    def __init__(
+        self,
+        env: Optional[str],
+        state_file: Optional[str] = None,
+        check_interval: float = 10.0,
+        max_backoff: float = 300.0
+    ) -> Any:
         self.env = env
-        self.port_forward_processes: Dict[str, int] = {}
+        self.state_file = state_file
+        self.check_interval = check_interval
+        self.max_backoff = max_backoff
+
+        self.forwards: Dict[str, Dict[str, Any]] = {}
+        self._procs: Dict[str, subprocess.Popen] = {}
+        self._lock = threading.RLock()
+        self._supervisor: Optional[threading.Thread] = None
+        # 正在启动（锁外等待就绪）的转发，健康检查与列表跳过这些条目
+        self._starting: Set[str] = set()
+        self._log_dir: Optional[str] = None
+
+        self._load_state()
 
     def _make_key(
         self,
@@ -22,6 +54,214 @@ class PortForwarder:
     ) -> str:
         return f"{namespace}/{resource_type}/{resource_name}:{local_port}->{remote_port}"
 
+    def _log_file(self, key: str) -> str:
+        """kubectl 输出的日志文件，位于 state_file 旁仅当前用户可访问的目录中，按转发标识命名"""
+        if self._log_dir is None:
+            if self.state_file:
+                log_dir = f"{os.path.splitext(self.state_file)[0]}.logs"
+                os.makedirs(log_dir, mode=0o700, exist_ok=True)
+                os.chmod(log_dir, 0o700)
+            else:
+                log_dir = tempfile.mkdtemp(prefix="kubectl-port-forward-")
+            self._log_dir = log_dir
+        return os.path.join(self._log_dir, re.sub(r"[^A-Za-z0-9_.-]", "_", key) + ".log")
+
+    def _spawn(self, record: Dict[str, Any]) -> subprocess.Popen:
+        cmd = [
+            "kubectl",
+            "--kubeconfig", self.env,
+            "-n", record["namespace"],
+            "port-forward",
+            "--address", "0.0.0.0,::",
+            f"{record['resource_type']}/{record['resource_name']}",
+            f"{record['local_port']}:{record['remote_port']}"
+        ]
+        logger.debug(f"Executing command: {cmd}")
+
+        # 保活进程：独立会话，服务退出后转发仍然保留；日志文件不跟随符号链接
+        fd = os.open(self._log_file(record["key"]), os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW, 0o600)
+        with os.fdopen(fd, "w") as log:
+            return subprocess.Popen(
+                cmd,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                preexec_fn=os.setsid,
+                close_fds=True
+            )
+
+    def _started(self, record: Dict[str, Any], proc: subprocess.Popen) -> None:
+        """记录新进程，调用方需持有锁"""
+        self._procs[record["key"]] = proc
+        record.update(pid=proc.pid, started_at=time.time(), status="starting")
+
+    def _last_error(self, key: str) -> Optional[str]:
+        try:
+            with open(self._log_file(key)) as f:
+                lines = [line.strip() for line in f if line.strip()]
+            return lines[-1] if lines else None
+        except OSError:
+            return None
+
+    def _is_alive(self, record: Dict[str, Any]) -> bool:
+        proc = self._procs.get(record["key"])
+        if proc is not None:
+            # poll 同时回收已退出的子进程
+            return proc.poll() is None
+
+        pid = record.get("pid")
+        if not pid:
+            return False
+        # 服务重启后接管的进程不是当前进程的子进程，通过 /proc 确认仍是对应的 kubectl
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                cmdline = f.read().replace(b"\0", b" ").decode(errors="replace")
+        except OSError:
+            return False
+        return "port-forward" in cmdline and f"{record['local_port']}:{record['remote_port']}" in cmdline
+
+    def _is_listening(self, local_port: int, timeout: float = 1.0) -> bool:
+        try:
+            with socket.create_connection(("127.0.0.1", local_port), timeout=timeout):
+                return True
+        except OSError:
+            return False
+
+    def _wait_ready(self, record: Dict[str, Any], timeout: float = 5.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not self._is_alive(record):
+                return False
+            if self._is_listening(record["local_port"], timeout=0.5):
+                return True
+            time.sleep(0.2)
+        return False
+
+    def _kill(self, record: Dict[str, Any]) -> None:
+        pid = record.get("pid")
+        proc = self._procs.pop(record["key"], None)
+        if not pid or (proc is None and not self._is_alive(record)):
+            return
+        try:
+            os.killpg(os.getpgid(pid), signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        if proc is not None:
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    def _terminate(self, proc: subprocess.Popen) -> None:
+        """终止尚未登记的进程（进程以 setsid 启动，pid 即进程组 id）"""
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    def _save_state(self) -> None:
+        if not self.state_file:
+            return
+        try:
+            tmp_path = f"{self.state_file}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(list(self.forwards.values()), f, indent=2)
+            os.replace(tmp_path, self.state_file)
+        except OSError as e:
+            logger.warning(f"Failed to save port-forward state to {self.state_file}: {e}")
+
+    def _load_state(self) -> None:
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file) as f:
+                records = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load port-forward state from {self.state_file}: {e}")
+            return
+
+        with self._lock:
+            for record in records:
+                self.forwards[record["key"]] = record
+                if self._is_alive(record):
+                    logger.info(f"Adopted port-forward: {record['key']}, PID: {record['pid']}")
+                else:
+                    # 下一轮健康检查时重新拉起
+                    record.update(status="restarting", next_retry=0)
+            self._save_state()
+
+        if self.forwards:
+            self._ensure_supervisor()
+
+    def _ensure_supervisor(self) -> None:
+        if self._supervisor is None:
+            self._supervisor = threading.Thread(target=self._supervise, name="port-forward-supervisor", daemon=True)
+            self._supervisor.start()
+
+    def _supervise(self) -> None:
+        while True:
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"[port_forward] Health check error: {e}")
+            time.sleep(self.check_interval)
+
+    def check(self) -> None:
+        """检查所有转发的健康状态，重启已退出的转发进程"""
+        with self._lock:
+            records = [r for r in self.forwards.values() if r["key"] not in self._starting]
+
+        for record in records:
+            key = record["key"]
+            alive = self._is_alive(record)
+            listening = alive and self._is_listening(record["local_port"])
+            now = time.time()
+
+            with self._lock:
+                if self.forwards.get(key) is not record or key in self._starting:
+                    continue
+                if alive:
+                    record["status"] = "running" if listening else "unhealthy"
+                    if listening:
+                        record["backoff"] = 0
+                    continue
+
+                if record.get("status") not in ("restarting", "backoff"):
+                    record["last_error"] = self._last_error(key)
+                    record["backoff"] = min(max(record.get("backoff") or 0, 1) * 2, self.max_backoff)
+                    record.update(status="backoff", next_retry=now + record["backoff"])
+                    logger.warning(f"Port-forward {key} exited: {record['last_error']}, retry in {record['backoff']}s")
+
+                if now < record.get("next_retry", 0):
+                    continue
+                self._procs.pop(key, None)
+                self._starting.add(key)
+
+            try:
+                proc = self._spawn(record)
+            except OSError as e:
+                with self._lock:
+                    self._starting.discard(key)
+                    record.update(status="backoff", last_error=str(e), next_retry=now + max(record.get("backoff") or 1, 1))
+                continue
+
+            with self._lock:
+                self._starting.discard(key)
+                stopped = self.forwards.get(key) is not record
+                if not stopped:
+                    self._started(record, proc)
+                    record["restarts"] = record.get("restarts", 0) + 1
+                    logger.info(f"Restarted port-forward: {key}, PID: {record['pid']}")
+            if stopped:
+                # 重启期间已被停止
+                self._terminate(proc)
+
+        with self._lock:
+            self._save_state()
+
     @handle_kube_error
     @timeit
     def start_port_forward(
@@ -32,7 +272,7 @@ class PortForwarder:
         remote_port: int,
         namespace: str = 'default'
     ) -> str:
-        """映射本地端口到指定应用的端口
+        """映射本地端口到指定应用的端口，相同转发已在运行时直接复用
 
         Args:
             resource_type (str): 资源类型
@@ -46,29 +286,68 @@ class PortForwarder:
         """
         key = self._make_key(resource_type, resource_name, local_port, remote_port, namespace)
 
-        cmd = [
-            "kubectl",
-            "--kubeconfig", self.env,
-            "-n", namespace,
-            "port-forward",
-            "--address", "0.0.0.0,::",
-            f"{resource_type}/{resource_name}",
-            f"{local_port}:{remote_port}"
-        ]
+        try:
+            # 锁内只占用转发标识与本地端口，进程启动与就绪等待在锁外进行
+            with self._lock:
+                if key in self._starting:
+                    raise ValueError(f"Port-forward {key} is already starting")
+                record = self.forwards.get(key)
+                if record is not None and self._is_alive(record):
+                    logger.info(f"Reused port-forward: {key}, PID: {record['pid']}")
+                    return f"Port-forward already running with PID {record['pid']}"
 
-        logger.debug(f"Executing command: {cmd}")
+                for other in self.forwards.values():
+                    if other["local_port"] == local_port and other["key"] != key:
+                        raise ValueError(f"Local port {local_port} is already used by port-forward {other['key']}")
 
-        try:
-            # 保活进程
-            with open(os.devnull, 'a') as devnull:
-                proc = subprocess.Popen(
-                    cmd,
-                    stdout=devnull,
-                    stderr=devnull,
-                    preexec_fn=os.setsid,
-                    close_fds=True
-                )
-            self.port_forward_processes[key] = proc.pid
+                if record is not None:
+                    self._procs.pop(key, None)
+                record = {
+                    "key": key,
+                    "resource_type": resource_type,
+                    "resource_name": resource_name,
+                    "namespace": namespace,
+                    "local_port": local_port,
+                    "remote_port": remote_port,
+                    "restarts": 0,
+                    "backoff": 0,
+                    "status": "starting",
+                }
+                self.forwards[key] = record
+                self._starting.add(key)
+
+            try:
+                proc = self._spawn(record)
+            except Exception:
+                with self._lock:
+                    self._starting.discard(key)
+                    if self.forwards.get(key) is record:
+                        del self.forwards[key]
+                raise
+
+            with self._lock:
+                self._started(record, proc)
+            ready = self._wait_ready(record)
+
+            with self._lock:
+                self._starting.discard(key)
+                stopped = self.forwards.get(key) is not record
+                if stopped:
+                    if self._procs.get(key) is proc:
+                        self._procs.pop(key)
+                elif not ready and proc.poll() is not None:
+                    error = self._last_error(key)
+                    del self.forwards[key]
+                    self._procs.pop(key, None)
+                    raise RuntimeError(error or f"kubectl exited with code {proc.returncode}")
+                else:
+                    record["status"] = "running" if ready else "unhealthy"
+                    self._save_state()
+            if stopped:
+                self._terminate(proc)
+                raise RuntimeError(f"Port-forward {key} was stopped while starting")
+
+            self._ensure_supervisor()
             logger.info(f"Started port-forward: {key}, PID: {proc.pid}")
             return f"Port-forward started in background with PID {proc.pid}"
 
@@ -77,22 +356,64 @@ class PortForwarder:
             return f"Failed to start port-forward: {str(e)}"
 
     @timeit
-    def stop_port_forward(self, proc_id: Optional[int]) -> str:
+    def stop_port_forward(self, proc_id: Optional[int] = None, key: Optional[str] = None) -> str:
         """停止端口转发进程
 
         Args:
             proc_id (Optional[int]): 进程id
+            key (Optional[str]): 转发标识，由 _make_key 生成
 
         Returns:
             str: 进程关闭情况
         """
-        if proc_id is None:
+        if proc_id is None and key is None:
             return "No PID provided to stop port-forward"
 
         try:
-            os.killpg(os.getpgid(proc_id), signal.SIGTERM)
+            with self._lock:
+                record = self.forwards.get(key) if key else next(
+                    (r for r in self.forwards.values() if r.get("pid") == proc_id), None
+                )
+                if record is not None:
+                    proc_id = record.get("pid")
+                    del self.forwards[record["key"]]
+                    self._save_state()
+
+            if record is None:
+                if key:
+                    raise ValueError(f"Port-forward {key} not found")
+                # 不在管理范围内的进程，保持原有行为直接终止
+                os.killpg(os.getpgid(proc_id), signal.SIGTERM)
+            else:
+                # 等待进程退出可能需要数秒，在锁外进行
+                self._kill(record)
+
             logger.info(f"Stopped port-forward for PID {proc_id}")
             return f"Port-forward stopped (PID {proc_id})"
         except Exception as e:
             logger.error(f"Failed to stop port-forward PID {proc_id}: {e}")
             return f"Failed to stop port-forward: {str(e)}"
+
+    def list_port_forwards(self) -> List[Dict[str, Any]]:
+        """列出所有受管理的端口转发及其健康状态"""
+        with self._lock:
+            records = [(dict(record), record["key"] in self._starting) for record in self.forwards.values()]
+
+        result = []
+        for record, starting in records:
+            if starting or not self._is_alive(record):
+                status = record.get("status")
+            elif self._is_listening(record["local_port"]):
+                status = "running"
+            else:
+                status = "unhealthy"
+            result.append({
+                "key": record["key"],
+                "pid": record.get("pid"),
+                "status": status,
+                "local_port": record["local_port"],
+                "remote_port": record["remote_port"],
+                "restarts": record.get("restarts", 0),
+                "last_error": record.get("last_error"),
+            })
+        return result
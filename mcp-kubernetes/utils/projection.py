@@ -0,0 +1,151 @@
+import json
+
+from typing import Optional, Any, Dict, List, Union, Iterable, Callable
+
+from utils.functions import ResourceItems
+from utils.metrics import phase_timer
+
+
+FieldTree = Dict[str, "FieldTree"]
+FieldBuilders = Dict[str, Callable[[Dict[str, Any]], Any]]
+
+
+def parse_fields(fields: Optional[Union[str, List[str]]]) -> Optional[FieldTree]:
+    """将 'name,labels.app,containers.image' 形式的投影字段解析为字段树，为空时返回 None（不投影）"""
+    if not fields:
+        return None
+    paths = fields.split(",") if isinstance(fields, str) else fields
+
+    tree: FieldTree = {}
+    for path in paths:
+        path = path.strip()
+        if not path:
+            continue
+        node = tree
+        parts = path.split(".")
+        for part in parts[:-1]:
+            # 已选中整个父字段时不再细分
+            if node.get(part) == {}:
+                break
+            node = node.setdefault(part, {})
+        else:
+            # 空子树表示保留完整字段
+            node[parts[-1]] = {}
+    return tree or None
+
+
+def project(value: Any, tree: Optional[FieldTree]) -> Any:
+    """按字段树裁剪对象，列表逐项裁剪，叶子节点保留完整值"""
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [project(v, tree) for v in value]
+    if isinstance(value, dict):
+        return {k: project(value[k], sub) for k, sub in tree.items() if k in value}
+    return value
+
+
+def pluck(value: Any, path: str) -> Any:
+    """按点分路径取值，途经列表时逐项取值"""
+    for part in path.split("."):
+        if isinstance(value, list):
+            return [pluck(v, part) for v in value]
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _without_managed_fields(obj: Dict[str, Any]) -> Dict[str, Any]:
+    metadata = obj.get("metadata")
+    if metadata and "managedFields" in metadata:
+        return {**obj, "metadata": {k: v for k, v in metadata.items() if k != "managedFields"}}
+    return obj
+
+
+def build_rows(
+    source: Iterable[Dict[str, Any]],
+    builders: Optional[FieldBuilders] = None,
+    fields: Optional[Union[str, List[str]]] = None,
+    max_items: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    keep: Optional[Callable[[Dict[str, Any]], bool]] = None
+) -> ResourceItems:
+    """逐个对象构建输出行：只计算被投影的字段，超出条数或字节预算时停止解析
+
+    Args:
+        source (Iterable[Dict[str, Any]]): 原始对象迭代器（流式解析结果或缓存列表）
+        builders (Optional[FieldBuilders], optional): 输出字段到构建函数的映射，为空时直接投影原始对象（去除 managedFields）
+        fields (Optional[Union[str, List[str]]], optional): 投影字段，点分路径，逗号分隔
+        max_items (Optional[int], optional): 最多返回的条数
+        max_bytes (Optional[int], optional): 返回结果序列化后的字节上限
+        keep (Optional[Callable[[Dict[str, Any]], bool]], optional): 过滤函数
+
+    Raises:
+        ValueError: 投影字段不在可选字段中
+
+    Returns:
+        ResourceItems: 输出行，截断时 metadata 中 truncated 为 True
+    """
+    tree = parse_fields(fields)
+    if builders is not None and tree:
+        unknown = [k for k in tree if k not in builders]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}; available: {', '.join(builders)}")
+        selected = {k: builders[k] for k in tree}
+    else:
+        selected = builders
+
+    rows = ResourceItems()
+    size = 2
+    truncated = False
+    # 流式解析与投影交织进行，一并计入 project 阶段
+    with phase_timer("project"):
+        for obj in source:
+            if keep is not None and not keep(obj):
+                continue
+            if max_items is not None and len(rows) >= max_items:
+                truncated = True
+                break
+
+            if selected is not None:
+                row = {k: build(obj) for k, build in selected.items()}
+                row = project(row, tree)
+            else:
+                row = project(_without_managed_fields(obj), tree)
+
+            if max_bytes is not None:
+                size += len(json.dumps(row, default=str, ensure_ascii=False).encode()) + 1
+                if size > max_bytes and rows:
+                    truncated = True
+                    break
+            rows.append(row)
+
+    metadata = getattr(source, "metadata", None)
+    if truncated:
+        # 提前结束时关闭底层流，剩余对象不再解析
+        close = getattr(source, "close", None)
+        if close is not None:
+            close()
+        metadata = {k: v for k, v in (metadata or {}).items() if k != "continue"}
+        metadata.update(truncated=True, returned=len(rows))
+    rows.metadata = metadata
+    return rows
+
+
+def to_columns(rows: List[Dict[str, Any]], fields: Optional[Union[str, List[str]]] = None) -> Dict[str, Any]:
+    """紧凑列式输出：列名只出现一次，每个对象为一行数组"""
+    if fields:
+        columns = [f.strip() for f in (fields.split(",") if isinstance(fields, str) else fields) if f.strip()]
+    else:
+        columns = list(rows[0]) if rows else []
+
+    with phase_timer("compact"):
+        result: Dict[str, Any] = {
+            "columns": columns,
+            "rows": [[pluck(row, c) for c in columns] for row in rows],
+        }
+    metadata = getattr(rows, "metadata", None)
+    if metadata:
+        result["metadata"] = metadata
+    return result
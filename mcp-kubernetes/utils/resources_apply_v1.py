@@ -1,10 +1,223 @@
 import subprocess
+import difflib
 
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any, List, Dict, Tuple
 
 from utils.logger import logger
 from utils.functions import timeit, handle_kube_error
+from utils.executor import spawn, bind
+from utils.metrics import phase_timer
+from utils.kube_api import KubeApiClient, KubeApiError, KubeApiUnavailable
+from utils.serialization import load_all_yaml, dump_yaml, dump_all_yaml
+
+
+# 应用顺序：命名空间与集群级定义 -> 配置与身份 -> 工作负载 -> 服务与流量入口，未列出的类型最后应用
+APPLY_TIERS: List[Tuple[str, ...]] = [
+    ("Namespace", "CustomResourceDefinition", "StorageClass", "PriorityClass"),
+    (
+        "ConfigMap", "Secret", "ServiceAccount", "Role", "ClusterRole", "RoleBinding", "ClusterRoleBinding",
+        "PersistentVolume", "PersistentVolumeClaim", "LimitRange", "ResourceQuota",
+    ),
+    ("Deployment", "StatefulSet", "DaemonSet", "ReplicaSet", "Job", "CronJob", "Pod"),
+    ("Service", "Ingress", "HorizontalPodAutoscaler", "PodDisruptionBudget", "NetworkPolicy"),
+]
+
+# 比较差异时忽略的服务端维护字段
+_VOLATILE_METADATA = ("managedFields", "resourceVersion", "generation", "uid", "creationTimestamp")
+
+
+def _tier_of(obj: Dict[str, Any]) -> int:
+    kind = obj.get("kind")
+    for i, kinds in enumerate(APPLY_TIERS):
+        if kind in kinds:
+            return i
+    return len(APPLY_TIERS)
+
+
+def _object_name(obj: Dict[str, Any]) -> str:
+    metadata = obj.get("metadata", {})
+    name = f"{obj.get('kind')}/{metadata.get('name')}"
+    return f"{metadata['namespace']}/{name}" if metadata.get("namespace") else name
+
+
+def _normalize(obj: Optional[Dict[str, Any]]) -> str:
+    if obj is None:
+        return ""
+    obj = dict(obj)
+    obj.pop("status", None)
+    metadata = dict(obj.get("metadata", {}))
+    for key in _VOLATILE_METADATA:
+        metadata.pop(key, None)
+    obj["metadata"] = metadata
+    return dump_yaml(obj, sort_keys=True)
+
+
+def _diff(live: Optional[Dict[str, Any]], applied: Dict[str, Any], name: str) -> str:
+    return "".join(difflib.unified_diff(
+        _normalize(live).splitlines(keepends=True),
+        _normalize(applied).splitlines(keepends=True),
+        fromfile=f"live/{name}",
+        tofile=f"applied/{name}",
+    ))
+
+
+def parse_manifest(manifest: str) -> List[Dict[str, Any]]:
+    """解析多文档清单，展开 kind: List"""
+    objects: List[Dict[str, Any]] = []
+    for doc in load_all_yaml(manifest):
+        if not doc:
+            continue
+        if not isinstance(doc, dict):
+            raise ValueError(f"Invalid manifest document: {doc!r}")
+        if doc.get("kind", "").endswith("List") and "items" in doc:
+            objects.extend(item for item in doc["items"] if item)
+        else:
+            objects.append(doc)
+    return objects
+
 
 class ResourceApply:
-    def __init__(self, env: Optional[str]) -> None:
-        self.env = env
\ No newline at end of file
+    def __init__(self, env: Optional[str], api: Optional[KubeApiClient] = None) -> None:
+        self.env = env
+        self.api = api
+
+    def _api_apply_one(
+        self,
+        obj: Dict[str, Any],
+        namespace: Optional[str],
+        field_manager: str,
+        force: bool,
+        dry_run: bool
+    ) -> Dict[str, Any]:
+        name = _object_name(obj)
+        result: Dict[str, Any] = {"object": name}
+        try:
+            live = None
+            if dry_run:
+                info = self.api.resolve_kind(obj.get("apiVersion", ""), obj.get("kind", ""))
+                try:
+                    live = self.api.get(
+                        info.plural,
+                        obj.get("metadata", {}).get("name"),
+                        namespace=obj.get("metadata", {}).get("namespace") or namespace
+                    )
+                except KubeApiError as e:
+                    if e.status_code != 404:
+                        raise
+
+            applied, created = self.api.apply(obj, namespace, field_manager, force, dry_run)
+            # 以服务端补全命名空间后的对象命名
+            name = result["object"] = _object_name(applied)
+
+            if dry_run:
+                diff = _diff(live, applied, name)
+                result["action"] = "created" if live is None else "configured" if diff else "unchanged"
+                if diff:
+                    result["diff"] = diff
+            else:
+                result["action"] = "created" if created else "configured"
+        except KubeApiUnavailable:
+            raise
+        except Exception as e:
+            result.update(action="error", error=str(e))
+        return result
+
+    def _api_apply(
+        self,
+        tiers: List[List[Dict[str, Any]]],
+        namespace: Optional[str],
+        field_manager: str,
+        force: bool,
+        dry_run: bool,
+        max_concurrency: int
+    ) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="apply") as pool:
+            apply_one = bind(self._api_apply_one)
+            for objects in tiers:
+                # 同一层内的对象互不依赖，并发应用；下一层等待本层全部完成
+                results += pool.map(
+                    lambda obj: apply_one(obj, namespace, field_manager, force, dry_run),
+                    objects
+                )
+        return results
+
+    def _kubectl_apply(
+        self,
+        tiers: List[List[Dict[str, Any]]],
+        namespace: Optional[str],
+        field_manager: str,
+        force: bool,
+        dry_run: bool
+    ) -> List[Dict[str, Any]]:
+        """API 后端不可用时，每一层通过一次 kubectl apply --server-side 完成，清单经 stdin 传入"""
+        results: List[Dict[str, Any]] = []
+        for objects in tiers:
+            action = "diff" if dry_run else "apply"
+            cmd = ["kubectl", "--kubeconfig", self.env, action, "--server-side", f"--field-manager={field_manager}", "-f", "-"]
+            if namespace:
+                cmd += ["-n", namespace]
+            if force:
+                cmd.append("--force-conflicts")
+
+            logger.debug(f"[kubectl_apply] Exec cmd: {' '.join(cmd)}")
+            proc = spawn(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            stdout, stderr = proc.communicate(dump_all_yaml(objects))
+
+            names = [_object_name(obj) for obj in objects]
+            # kubectl diff 在存在差异时返回 1
+            if proc.returncode == 0 or (dry_run and proc.returncode == 1):
+                if dry_run:
+                    results.append({"objects": names, "action": "diff", "diff": stdout})
+                else:
+                    results += [{"object": line.split(" ", 1)[0], "action": line.split(" ", 1)[-1]}
+                                for line in stdout.splitlines() if line.strip()]
+            else:
+                results.append({"objects": names, "action": "error", "error": stderr.strip()})
+        return results
+
+    @handle_kube_error
+    @timeit
+    def apply_manifest(
+        self,
+        manifest: str,
+        namespace: Optional[str] = None,
+        field_manager: str = "mcp-kubernetes",
+        force: bool = False,
+        dry_run: bool = False,
+        max_concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """按依赖层级批量服务端应用（server-side apply）多文档清单
+
+        Args:
+            manifest (str): 多文档 YAML/JSON 清单
+            namespace (Optional[str], optional): 对象未指定命名空间时使用的命名空间
+            field_manager (str, optional): 字段管理者名称
+            force (bool, optional): 是否强制接管与其他管理者冲突的字段
+            dry_run (bool, optional): 仅在服务端试运行，返回与现有对象的差异
+            max_concurrency (int, optional): 同一层内并发应用的对象数上限
+
+        Raises:
+            ValueError: 清单为空或格式错误
+
+        Returns:
+            List[Dict[str, Any]]: 每个对象的应用结果（created/configured/unchanged/error），dry_run 时附带 diff
+        """
+        with phase_timer("parse_manifest"):
+            objects = parse_manifest(manifest)
+        if not objects:
+            raise ValueError("Manifest contains no objects.")
+
+        tiers: List[List[Dict[str, Any]]] = [[] for _ in range(len(APPLY_TIERS) + 1)]
+        for obj in objects:
+            tiers[_tier_of(obj)].append(obj)
+        tiers = [tier for tier in tiers if tier]
+
+        if self.api is not None:
+            try:
+                return self._api_apply(tiers, namespace, field_manager, force, dry_run, max_concurrency)
+            except KubeApiUnavailable as e:
+                logger.warning(f"[apply_manifest] API backend unavailable, fallback to kubectl: {e}")
+
+        return self._kubectl_apply(tiers, namespace, field_manager, force, dry_run)
@@ -1,9 +1,13 @@
 import subprocess
-import tempfile
-import os
-from typing import Optional, Any, List, Dict
+import base64
+import json
+from typing import Optional, Any, List, Dict, Union
 from utils.logger import logger
 from utils.functions import timeit, handle_kube_error
+from utils.executor import spawn
+from utils.kube_api import KubeApiClient, KubeApiUnavailable
+from utils.serialization import load_all_yaml
+from utils.resources_apply_v1 import _object_name
 
 from template import (
     gen_ns_template,
@@ -15,13 +19,59 @@ from template import (
 )
 
 class ResourceCreate:
-    def __init__(self, env: Optional[str]) -> None:
+    def __init__(self, env: Optional[str], api: Optional[KubeApiClient] = None) -> None:
         self.env = env
+        self.api = api
 
-    def _exec_kubectl(self, cmd: list[str]) -> str:
+    def _api_create(
+        self,
+        manifest: Union[str, Dict[str, Any]],
+        namespace: Optional[str] = 'default'
+    ) -> Union[str, List[Dict[str, Any]]]:
+        """通过进程内 API 客户端创建对象
+
+        模板生成的对象字典直接提交，返回 kubectl create 的输出；清单中的对象逐个创建，与 apply_resources 一样
+        返回每个对象的结果（object、action: created/error、error），某个对象失败不影响其余对象。
+
+        Raises:
+            KubeApiUnavailable: 第一个对象提交前 API 后端即不可用，调用方回退到 kubectl
+        """
+        if isinstance(manifest, dict):
+            return self.api.create(manifest, namespace=namespace)
+
+        results: List[Dict[str, Any]] = []
+        unavailable: Optional[Exception] = None
+        for obj in load_all_yaml(manifest):
+            if not obj:
+                continue
+            result: Dict[str, Any] = {"object": _object_name(obj)}
+            if unavailable is not None:
+                result.update(action="error", error=f"not created: {unavailable}")
+                results.append(result)
+                continue
+            try:
+                self.api.create(obj, namespace=namespace)
+                result["action"] = "created"
+            except KubeApiUnavailable as e:
+                if not results:
+                    raise
+                # 已创建部分对象时不再回退到 kubectl，避免重复创建
+                unavailable = e
+                result.update(action="error", error=str(e))
+            except Exception as e:
+                result.update(action="error", error=str(e))
+            results.append(result)
+        return results
+
+    def _exec_kubectl(self, cmd: list[str], stdin: Optional[str] = None) -> str:
         logger.debug(f"Exec cmd: {' '.join(cmd)}")
-        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, stderr = proc.communicate()
+        proc = spawn(
+            cmd,
+            stdin=subprocess.PIPE if stdin is not None else None,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        stdout, stderr = proc.communicate(stdin.encode() if stdin is not None else None)
 
         if proc.returncode != 0:
             error_msg = stderr.decode().strip()
@@ -32,14 +82,14 @@ class ResourceCreate:
 
     def kubectl_create(
         self,
-        manifest: Optional[str] = None,
+        manifest: Optional[Union[str, Dict[str, Any]]] = None,
         filename: Optional[str] = None,
         namespace: Optional[str] = 'default',
     ) -> Any:
         """创建kubernetes资源
 
         Args:
-            manifest (Optional[str], optional): 资源创建清单
+            manifest (Optional[Union[str, Dict[str, Any]]], optional): 资源创建清单或对象字典
             filename (Optional[str], optional): 资源清单文件
             namespace (Optional[str], optional): 资源所在的命名空间，默认为default
 
@@ -47,8 +97,20 @@ class ResourceCreate:
             ValueError: 当既定文件未传入时抛出异常
 
         Returns:
-            Any: 资源对象或异常错误
+            Any: 创建结果或异常错误；API 后端创建多文档清单时为每个对象的结果列表
         """
+        if self.api is not None and (manifest or filename):
+            try:
+                if filename:
+                    with open(filename, "r", encoding="utf-8") as f:
+                        manifest = f.read()
+                return self._api_create(manifest, namespace)
+            except KubeApiUnavailable as e:
+                logger.warning(f"[kubectl_create] API backend unavailable, fallback to kubectl: {e}")
+            except Exception as e:
+                logger.error(f"[kubectl_create] Error: {e}")
+                return e
+
         try:
             cmd = [
                 "kubectl",
@@ -63,17 +125,13 @@ class ResourceCreate:
                 return self._exec_kubectl(cmd)
 
             elif manifest:
-                with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix=".yaml") as tmp:
-                    tmp.write(manifest)
-                    tmp_filename = tmp.name
-
-                try:
-                    cmd += ["-f", tmp_filename]
-                    if namespace:
-                        cmd += ["-n", namespace]
-                    return self._exec_kubectl(cmd)
-                finally:
-                    os.remove(tmp_filename)
+                # 清单经 stdin 传给 kubectl，不落临时文件；对象字典以 JSON 传入，kubectl 同样可以解析
+                cmd += ["-f", "-"]
+                if namespace:
+                    cmd += ["-n", namespace]
+                if isinstance(manifest, dict):
+                    manifest = json.dumps(manifest)
+                return self._exec_kubectl(cmd, stdin=manifest)
 
             else:
                 raise ValueError("Either manifest or filename must be provided.")
@@ -85,13 +143,13 @@ class ResourceCreate:
     @timeit
     def create_from_template(
         self,
-        manifest: str,
+        manifest: Union[str, Dict[str, Any]],
         namespace: Optional[str] = 'default'
     ) -> str:
         """传入模板创建对应资源
 
         Args:
-            manifest (str): 资源清单
+            manifest (Union[str, Dict[str, Any]]): 资源清单或模板生成的对象字典
             namespace (Optional[str], optional): 资源所在的命名空间，默认为default
 
         Returns:
@@ -127,7 +185,7 @@ class ResourceCreate:
             if manifest or filename:
                 return self.kubectl_create(manifest=manifest, filename=filename)
 
-            generated_manifest = gen_ns_template(ns_name, labels)
+            generated_manifest = gen_ns_template(ns_name, labels, template_type='json')
             return self.create_from_template(generated_manifest)
         except Exception as e:
             logger.error(f"[create_namespace] Error: {e}")
@@ -193,7 +251,8 @@ class ResourceCreate:
         generated_manifest = gen_pod_template(
             name=pod_name,
             labels=labels,
-            containers=containers
+            containers=containers,
+            template_type='json'
         )
         
         return self.create_from_template(
@@ -239,7 +298,8 @@ class ResourceCreate:
                 name=name,
                 labels=labels,
                 replicas=replicas,
-                containers=containers
+                containers=containers,
+                template_type='json'
             )
             return self.create_from_template(
                 generated_manifest,
@@ -270,6 +330,7 @@ class ResourceCreate:
                 name=map_name,
                 data=data,
                 namespace=namespace,
+                template_type='json',
             )
             return self.create_from_template(
                 generated_manifest,
@@ -310,7 +371,8 @@ class ResourceCreate:
 
             generated_manifest = gen_sa_template(
                 sa_name=sa_name,
-                labels=labels
+                labels=labels,
+                template_type='json'
             )
             return self.create_from_template(generated_manifest)
         except Exception as e:
@@ -319,17 +381,66 @@ class ResourceCreate:
 
     def run_kubectl_secret_dryrun(self, cmd: list) -> str:
         try:
-            result = subprocess.run(
-                cmd + ['--dry-run=client', '-o', 'yaml'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                check=True
-            )
-            return result.stdout.decode()
+            cmd = cmd + ['--dry-run=client', '-o', 'yaml']
+            proc = spawn(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            stdout, stderr = proc.communicate()
+            if proc.returncode != 0:
+                raise subprocess.CalledProcessError(proc.returncode, cmd, output=stdout, stderr=stderr)
+            return stdout.decode()
         except subprocess.CalledProcessError as e:
             logger.error(f"[create_secret] kubectl error: {e.stderr.decode()}")
             raise
 
+    def _build_secret(
+        self,
+        secret_type: str,
+        name: str,
+        data: Optional[Dict[str, str]] = None,
+        cert: Optional[str] = None,
+        key: Optional[str] = None,
+        docker_username: Optional[str] = None,
+        docker_password: Optional[str] = None,
+        docker_server: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """在进程内构建与 kubectl create secret --dry-run 等价的 Secret 对象"""
+        def b64(value: Any) -> str:
+            raw = value if isinstance(value, bytes) else str(value).encode()
+            return base64.b64encode(raw).decode()
+
+        if secret_type == "generic":
+            k8s_type, secret_data = "Opaque", {k: b64(v) for k, v in (data or {}).items()}
+
+        elif secret_type == "tls":
+            if not cert or not key:
+                raise ValueError("TLS secret must include cert and key file paths")
+            with open(cert, "rb") as f_cert, open(key, "rb") as f_key:
+                secret_data = {"tls.crt": b64(f_cert.read()), "tls.key": b64(f_key.read())}
+            k8s_type = "kubernetes.io/tls"
+
+        elif secret_type == "docker-registry":
+            if not docker_username or not docker_password or not docker_server:
+                raise ValueError("Docker registry secret must include username, password, and server")
+            auth = {
+                "auths": {
+                    docker_server: {
+                        "username": docker_username,
+                        "password": docker_password,
+                        "auth": b64(f"{docker_username}:{docker_password}"),
+                    }
+                }
+            }
+            k8s_type, secret_data = "kubernetes.io/dockerconfigjson", {".dockerconfigjson": b64(json.dumps(auth))}
+        else:
+            raise ValueError(f"Unsupported secret type: {secret_type}")
+
+        return {
+            "apiVersion": "v1",
+            "kind": "Secret",
+            "metadata": {"name": name},
+            "type": k8s_type,
+            "data": secret_data,
+        }
+
     @handle_kube_error
     @timeit
     def create_secret(
@@ -344,6 +455,18 @@ class ResourceCreate:
         docker_password: Optional[str] = None,
         docker_server: Optional[str] = None,
     ) -> str:
+        if self.api is not None:
+            try:
+                secret = self._build_secret(
+                    secret_type, name, data, cert, key,
+                    docker_username, docker_password, docker_server
+                )
+                output = self.api.create(secret, namespace=namespace)
+                logger.info(f"[create_secret] Created secret: {output}")
+                return output
+            except KubeApiUnavailable as e:
+                logger.warning(f"[create_secret] API backend unavailable, fallback to kubectl: {e}")
+
         cmd = [
                 "kubectl",
                 "--kubeconfig", self.env,
@@ -376,24 +499,22 @@ class ResourceCreate:
         logger.debug(f"Exec cmd: {cmd}")
         yaml_content = self.run_kubectl_secret_dryrun(cmd)
 
-        with tempfile.NamedTemporaryFile('w+', suffix='.yaml', delete=False) as tmpfile:
-            tmpfile.write(yaml_content)
-            tmpfile_path = tmpfile.name
+        create_cmd = ["kubectl", "--kubeconfig", self.env, "create", "-f", "-"]
 
-        create_cmd = ["kubectl", "create", "-f", tmpfile_path]
-        
         if namespace:
             create_cmd += ["-n", namespace]
 
         try:
-            output = subprocess.check_output(create_cmd).decode().strip()
+            proc = spawn(create_cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+            stdout, _ = proc.communicate(yaml_content.encode())
+            if proc.returncode != 0:
+                raise subprocess.CalledProcessError(proc.returncode, create_cmd, output=stdout)
+            output = stdout.decode().strip()
             logger.info(f"[create_secret] Created secret: {output}")
             return output
         except Exception as e:
             logger.error(f"[create_secret] Failed: {e}")
             return e
-        finally:
-            os.remove(tmpfile_path)
 
     def build_port(
         self,
@@ -439,7 +560,8 @@ class ResourceCreate:
             labels=labels,
             selector=selector,
             ports=ports,
-            service_type=service_type
+            service_type=service_type,
+            template_type='json'
         )
         
         return self.create_from_template(
@@ -1,20 +1,32 @@
+import queue
 import subprocess
+import threading
+import time
 
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any, Dict, List, Tuple, Iterator
 
 from utils.logger import logger
 from utils.functions import timeit, handle_kube_error
+from utils.executor import spawn, bind
+from utils.kube_api import KubeApiClient, KubeApiError, KubeApiUnavailable
+
+
+# 级联删除策略，与 kubectl delete --cascade 的取值对应
+PROPAGATION_POLICIES = {"Background": "background", "Foreground": "foreground", "Orphan": "orphan"}
 
 class ResourcesDelete:
-    def __init__(self, env: Optional[str]) -> None:
+    def __init__(self, env: Optional[str], api: Optional[KubeApiClient] = None) -> None:
         self.env = env
+        self.api = api
 
     def kubectl_delete(
         self,
         resource_type: Optional[str],
         resource_name: Optional[str] = None,
         namespace: Optional[str] = None,
-        output_type: Optional[str] = "name"
+        output_type: Optional[str] = "name",
+        propagation_policy: Optional[str] = None
     ) -> str:
         """获取特定kubernetes资源后删除
 
@@ -23,6 +35,7 @@ class ResourcesDelete:
             resource_name (Optional[str]): 资源名称
             namespace (Optional[str], optional): 资源所在的命名空间
             output_type (str, optional): 输出类型，默认为'name'
+            propagation_policy (Optional[str], optional): 级联删除策略：Background、Foreground、Orphan
 
         Raises:
             RuntimeError: 当subprocess执行错误时抛出异常
@@ -30,6 +43,12 @@ class ResourcesDelete:
         Returns:
             str: 纯文本
         """
+        if self.api is not None and resource_name and output_type == "name":
+            try:
+                return self.api.delete(resource_type, resource_name, namespace, propagationPolicy=propagation_policy)
+            except KubeApiUnavailable as e:
+                logger.warning(f"[kubectl_delete] API backend unavailable, fallback to kubectl: {e}")
+
         try:
             cmd = [
                 "kubectl",
@@ -39,13 +58,16 @@ class ResourcesDelete:
             ]
             if namespace:
                 cmd += ["-n", namespace]
+
+            if propagation_policy:
+                cmd += [f"--cascade={PROPAGATION_POLICIES[propagation_policy]}"]
                 
             if resource_name:
                 cmd += [resource_name]
                 
             logger.debug(f"Exec cmd: {cmd}")
 
-            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            proc = spawn(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             stdout, stderr = proc.communicate()
 
             if proc.returncode != 0:
@@ -59,6 +81,277 @@ class ResourcesDelete:
             logger.error(f"[kubectl_delete] Subprocess error: {str(e)}")
             raise
 
+    def _select_names(
+        self,
+        resource_type: str,
+        namespace: Optional[str],
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None
+    ) -> List[str]:
+        """按 label/field 选择器列出需要删除的对象名称"""
+        if self.api is not None:
+            try:
+                listing = self.api.get(
+                    resource_type,
+                    namespace=namespace,
+                    labelSelector=label_selector,
+                    fieldSelector=field_selector
+                )
+                return [obj["metadata"]["name"] for obj in listing.get("items", [])]
+            except KubeApiUnavailable as e:
+                logger.warning(f"[delete_resources] API backend unavailable, fallback to kubectl: {e}")
+
+        cmd = ["kubectl", "--kubeconfig", self.env, "get", resource_type, "-o", "name"]
+        if label_selector:
+            cmd += ["-l", label_selector]
+        if field_selector:
+            cmd += ["--field-selector", field_selector]
+        if namespace:
+            cmd += ["-n", namespace]
+        proc = spawn(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stdout, stderr = proc.communicate()
+        if proc.returncode != 0:
+            raise RuntimeError(stderr.decode().strip())
+        return [line.split("/", 1)[-1] for line in stdout.decode().split() if line]
+
+    def select_targets(
+        self,
+        resource_types: List[str],
+        names: Optional[List[str]] = None,
+        namespace: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
+        """展开删除目标：names 中 'kind/name' 形式的条目直接使用，其余名称与选择器作用于每个 resource_types
+
+        Raises:
+            ValueError: 未指定名称或选择器（不允许删除某类型的全部对象）
+
+        Returns:
+            List[Tuple[str, str]]: 去重后的 (资源类型, 名称) 列表
+        """
+        if not names and not label_selector and not field_selector:
+            raise ValueError("Refusing to delete without names, label_selector or field_selector")
+
+        targets: Dict[Tuple[str, str], None] = {}
+        for name in names or []:
+            if "/" in name:
+                kind, name = name.split("/", 1)
+                targets[(kind, name)] = None
+            else:
+                if not resource_types:
+                    raise ValueError(f"resource_type is required for '{name}', or use 'kind/name'")
+                for kind in resource_types:
+                    targets[(kind, name)] = None
+
+        if label_selector or field_selector:
+            if not resource_types:
+                raise ValueError("resource_type is required when using selectors")
+            for kind in resource_types:
+                for name in self._select_names(kind, namespace, label_selector, field_selector):
+                    targets[(kind, name)] = None
+        return list(targets)
+
+    @handle_kube_error
+    @timeit
+    def delete_resources(
+        self,
+        targets: List[Tuple[str, str]],
+        namespace: Optional[str] = None,
+        propagation_policy: Optional[str] = "Background",
+        max_concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """批量删除对象，多个对象并发提交
+
+        Args:
+            targets (List[Tuple[str, str]]): (资源类型, 名称) 列表，见 select_targets
+            namespace (Optional[str], optional): 对象所在的命名空间
+            propagation_policy (Optional[str], optional): 级联删除策略：Background（默认）、Foreground、Orphan
+            max_concurrency (int, optional): 并发删除的对象数上限
+
+        Raises:
+            ValueError: 级联删除策略不合法
+
+        Returns:
+            List[Dict[str, Any]]: 每个对象的结果 {"kind", "name", "result"} 或 {"kind", "name", "error"}
+        """
+        if propagation_policy and propagation_policy not in PROPAGATION_POLICIES:
+            raise ValueError(f"Unsupported propagation policy: {propagation_policy}, expected one of {', '.join(PROPAGATION_POLICIES)}")
+        if not targets:
+            return []
+
+        delete_one = bind(self.kubectl_delete)
+
+        def _delete(target: Tuple[str, str]) -> Dict[str, Any]:
+            kind, name = target
+            try:
+                result = delete_one(kind, name, namespace, propagation_policy=propagation_policy)
+                return {"kind": kind, "name": name, "result": result}
+            except Exception as e:
+                return {"kind": kind, "name": name, "error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(targets))), thread_name_prefix="delete") as pool:
+            return list(pool.map(_delete, targets))
+
+    def _api_wait_deleted(
+        self,
+        resource_type: str,
+        names: List[str],
+        namespace: Optional[str],
+        deadline: float
+    ) -> Iterator[Dict[str, Any]]:
+        """先 list 一次，再在单个 watch 上等待同类型的对象全部消失"""
+        pending: Dict[str, Optional[str]] = {}
+        # 单个对象时用 fieldSelector 只 watch 该对象
+        selector = {"fieldSelector": f"metadata.name={names[0]}"} if len(names) == 1 else {}
+
+        listing = self.api.get(resource_type, namespace=namespace, **selector)
+        present = {obj["metadata"]["name"]: obj for obj in listing.get("items", [])}
+        for name in names:
+            if name in present:
+                # 记录 uid，同名对象被重建（如 StatefulSet 的 pod）时原对象也视为已删除
+                pending[name] = present[name]["metadata"].get("uid")
+                yield {"kind": resource_type, "name": name, "state": "deleting", "message": "terminating"}
+            else:
+                yield {"kind": resource_type, "name": name, "state": "deleted", "message": "deleted"}
+
+        resource_version = listing.get("metadata", {}).get("resourceVersion")
+        while pending and time.monotonic() < deadline:
+            try:
+                for event in self.api.watch(
+                    resource_type,
+                    namespace=namespace,
+                    resource_version=resource_version,
+                    timeout_seconds=max(1, int(deadline - time.monotonic())),
+                    **selector
+                ):
+                    obj = event.get("object", {})
+                    metadata = obj.get("metadata", {})
+                    resource_version = metadata.get("resourceVersion") or resource_version
+                    name = metadata.get("name")
+                    if event.get("type") == "BOOKMARK" or name not in pending:
+                        continue
+                    if event.get("type") == "DELETED" or metadata.get("uid") != pending[name]:
+                        pending.pop(name)
+                        yield {"kind": resource_type, "name": name, "state": "deleted", "message": "deleted"}
+                    elif metadata.get("finalizers"):
+                        yield {
+                            "kind": resource_type,
+                            "name": name,
+                            "state": "deleting",
+                            "message": f"waiting for finalizers: {', '.join(metadata['finalizers'])}"
+                        }
+                    if not pending:
+                        return
+            except KubeApiError as e:
+                # resourceVersion 过期（410 Gone）时重新 list
+                if e.status_code != 410:
+                    raise
+                logger.debug(f"[wait_deleted] Watch expired, relisting: {e}")
+                listing = self.api.get(resource_type, namespace=namespace, **selector)
+                present = {obj["metadata"]["name"]: obj["metadata"].get("uid") for obj in listing.get("items", [])}
+                for name in list(pending):
+                    if present.get(name) != pending[name]:
+                        pending.pop(name)
+                        yield {"kind": resource_type, "name": name, "state": "deleted", "message": "deleted"}
+                resource_version = listing.get("metadata", {}).get("resourceVersion")
+
+        for name in pending:
+            yield {"kind": resource_type, "name": name, "state": "failed", "message": "timed out waiting for deletion"}
+
+    def _kubectl_wait_deleted(
+        self,
+        resource_type: str,
+        names: List[str],
+        namespace: Optional[str],
+        deadline: float
+    ) -> Iterator[Dict[str, Any]]:
+        """kubectl wait --for=delete，一个进程等待同类型的全部对象"""
+        cmd = [
+            "kubectl", "--kubeconfig", self.env,
+            "wait", "--for=delete",
+            f"--timeout={max(1, int(deadline - time.monotonic()))}s",
+        ] + [f"{resource_type}/{name}" for name in names]
+        if namespace:
+            cmd += ["-n", namespace]
+        logger.debug(f"Exec cmd: {cmd}")
+
+        proc = spawn(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        pending = set(names)
+        for line in proc.stdout:
+            # 输出形如 pod/nginx condition met
+            name = line.split(" ", 1)[0].split("/", 1)[-1]
+            if name in pending:
+                pending.discard(name)
+                yield {"kind": resource_type, "name": name, "state": "deleted", "message": "deleted"}
+        stderr = proc.stderr.read().strip()
+        proc.wait()
+        for name in sorted(pending):
+            # 对象在 kubectl wait 开始前已删除时输出 NotFound，同样视为已删除
+            if f'"{name}" not found' in stderr:
+                yield {"kind": resource_type, "name": name, "state": "deleted", "message": "deleted"}
+            else:
+                yield {"kind": resource_type, "name": name, "state": "failed", "message": stderr or "timed out waiting for deletion"}
+
+    def wait_deleted(
+        self,
+        targets: List[Tuple[str, str]],
+        namespace: Optional[str] = None,
+        timeout: float = 300
+    ) -> Iterator[Dict[str, Any]]:
+        """等待对象被删除（含 finalizer 与前台级联删除），状态变化时逐条产出
+
+        每种资源类型使用一个 watch（API 不可用时为一个 kubectl wait 进程），各类型并发等待。
+
+        Args:
+            targets (List[Tuple[str, str]]): (资源类型, 名称) 列表
+            namespace (Optional[str], optional): 对象所在的命名空间
+            timeout (float, optional): 等待超时（秒）
+
+        Yields:
+            Iterator[Dict[str, Any]]: {"kind", "name", "state": deleting/deleted/failed, "message"}，
+                每个对象最后一条事件的 state 为 deleted 或 failed
+        """
+        by_kind: Dict[str, List[str]] = {}
+        for kind, name in targets:
+            by_kind.setdefault(kind, []).append(name)
+        if not by_kind:
+            return
+
+        deadline = time.monotonic() + timeout
+        events: queue.Queue = queue.Queue()
+        done = object()
+
+        def _wait(kind: str, names: List[str]) -> None:
+            try:
+                if self.api is not None:
+                    try:
+                        for event in self._api_wait_deleted(kind, names, namespace, deadline):
+                            events.put(event)
+                        return
+                    except KubeApiUnavailable as e:
+                        logger.warning(f"[wait_deleted] API backend unavailable, fallback to kubectl: {e}")
+                for event in self._kubectl_wait_deleted(kind, names, namespace, deadline):
+                    events.put(event)
+            except Exception as e:
+                logger.error(f"[wait_deleted] Failed to wait for {kind}: {e}")
+                for name in names:
+                    events.put({"kind": kind, "name": name, "state": "failed", "message": str(e)})
+            finally:
+                events.put(done)
+
+        wait_kind = bind(_wait)
+        for kind, names in by_kind.items():
+            threading.Thread(target=wait_kind, args=(kind, names), name=f"wait-deleted-{kind}", daemon=True).start()
+
+        finished = 0
+        while finished < len(by_kind):
+            event = events.get()
+            if event is done:
+                finished += 1
+            else:
+                yield event
+
     @handle_kube_error
     @timeit
     def delete_namespaces(
@@ -4,11 +4,261 @@ from typing import Optional, Any, List, Dict
 
 from utils.logger import logger
 from utils.functions import timeit, handle_kube_error
+from utils.executor import spawn
+from utils.kube_api import KubeApiClient, KubeApiUnavailable
+from utils.informer import InformerCache
+from utils.events import compact_event
+
+
+def _compact(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in data.items() if v not in (None, "", [], {})}
+
+
+def _conditions(status: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        _compact({
+            "type": c.get("type"),
+            "status": c.get("status"),
+            "reason": c.get("reason"),
+            "message": c.get("message"),
+        })
+        for c in status.get("conditions") or []
+    ]
+
+
+def _container_state(state: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    for phase, detail in (state or {}).items():
+        detail = detail or {}
+        return _compact({
+            "state": phase,
+            "reason": detail.get("reason"),
+            "message": detail.get("message"),
+            "exit_code": detail.get("exitCode"),
+            "started_at": detail.get("startedAt"),
+            "finished_at": detail.get("finishedAt"),
+        })
+    return None
+
+
+def _containers(specs: List[Dict[str, Any]], statuses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    by_name = {s.get("name"): s for s in statuses or []}
+    result = []
+    for spec in specs or []:
+        status = by_name.get(spec.get("name"), {})
+        resources = spec.get("resources") or {}
+        result.append(_compact({
+            "name": spec.get("name"),
+            "image": spec.get("image"),
+            "ready": status.get("ready"),
+            "restarts": status.get("restartCount"),
+            "state": _container_state(status.get("state")),
+            "last_state": _container_state(status.get("lastState")),
+            "ports": [f"{p.get('containerPort')}/{p.get('protocol', 'TCP')}" for p in spec.get("ports") or []],
+            "requests": resources.get("requests"),
+            "limits": resources.get("limits"),
+        }))
+    return result
+
+
+def _describe_metadata(obj: Dict[str, Any]) -> Dict[str, Any]:
+    metadata = obj.get("metadata", {})
+    annotations = {
+        k: v for k, v in (metadata.get("annotations") or {}).items()
+        if k != "kubectl.kubernetes.io/last-applied-configuration"
+    }
+    return _compact({
+        "kind": obj.get("kind"),
+        "name": metadata.get("name"),
+        "namespace": metadata.get("namespace"),
+        "labels": metadata.get("labels"),
+        "annotations": annotations,
+        "created": metadata.get("creationTimestamp"),
+        "owners": [f"{o.get('kind')}/{o.get('name')}" for o in metadata.get("ownerReferences") or []],
+    })
+
+
+def _describe_pod(obj: Dict[str, Any]) -> Dict[str, Any]:
+    spec, status = obj.get("spec", {}), obj.get("status", {})
+    return {
+        "status": status.get("phase"),
+        "reason": status.get("reason"),
+        "message": status.get("message"),
+        "node": spec.get("nodeName"),
+        "pod_ip": status.get("podIP"),
+        "qos": status.get("qosClass"),
+        "conditions": _conditions(status),
+        "init_containers": _containers(spec.get("initContainers"), status.get("initContainerStatuses")),
+        "containers": _containers(spec.get("containers"), status.get("containerStatuses")),
+        "volumes": [v.get("name") for v in spec.get("volumes") or []],
+    }
+
+
+def _describe_deployment(obj: Dict[str, Any]) -> Dict[str, Any]:
+    spec, status = obj.get("spec", {}), obj.get("status", {})
+    return {
+        "replicas": _compact({
+            "desired": spec.get("replicas"),
+            "updated": status.get("updatedReplicas"),
+            "ready": status.get("readyReplicas"),
+            "available": status.get("availableReplicas"),
+            "unavailable": status.get("unavailableReplicas"),
+        }),
+        "strategy": (spec.get("strategy") or {}).get("type"),
+        "selector": (spec.get("selector") or {}).get("matchLabels"),
+        "containers": _containers((spec.get("template") or {}).get("spec", {}).get("containers"), []),
+        "conditions": _conditions(status),
+    }
+
+
+def _describe_service(obj: Dict[str, Any]) -> Dict[str, Any]:
+    spec, status = obj.get("spec", {}), obj.get("status", {})
+    ports = []
+    for p in spec.get("ports") or []:
+        port = f"{p.get('port')}->{p.get('targetPort', p.get('port'))}/{p.get('protocol', 'TCP')}"
+        if p.get("nodePort"):
+            port += f" (nodePort {p['nodePort']})"
+        ports.append(f"{p['name']}: {port}" if p.get("name") else port)
+    return {
+        "type": spec.get("type"),
+        "cluster_ip": spec.get("clusterIP"),
+        "external_ips": spec.get("externalIPs"),
+        "load_balancer": [
+            i.get("ip") or i.get("hostname") for i in (status.get("loadBalancer") or {}).get("ingress") or []
+        ],
+        "ports": ports,
+        "selector": spec.get("selector"),
+        "session_affinity": spec.get("sessionAffinity"),
+    }
+
+
+def _describe_node(obj: Dict[str, Any]) -> Dict[str, Any]:
+    spec, status = obj.get("spec", {}), obj.get("status", {})
+    info = status.get("nodeInfo") or {}
+    return {
+        "unschedulable": spec.get("unschedulable"),
+        "taints": [
+            f"{t.get('key')}={t.get('value', '')}:{t.get('effect')}" for t in spec.get("taints") or []
+        ],
+        "addresses": {a.get("type"): a.get("address") for a in status.get("addresses") or []},
+        "capacity": status.get("capacity"),
+        "allocatable": status.get("allocatable"),
+        "info": _compact({
+            "kubelet": info.get("kubeletVersion"),
+            "os_image": info.get("osImage"),
+            "kernel": info.get("kernelVersion"),
+            "runtime": info.get("containerRuntimeVersion"),
+            "arch": info.get("architecture"),
+        }),
+        "conditions": _conditions(status),
+    }
+
+
+_DESCRIBERS = {
+    "Pod": _describe_pod,
+    "Deployment": _describe_deployment,
+    "Service": _describe_service,
+    "Node": _describe_node,
+    "Namespace": lambda obj: {"status": obj.get("status", {}).get("phase")},
+}
+
+
+def describe_object(obj: Dict[str, Any], events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """将对象整理为精简的结构化描述，包含状态、条件、容器状态和相关事件"""
+    describer = _DESCRIBERS.get(obj.get("kind"), lambda o: {"conditions": _conditions(o.get("status") or {})})
+    result = _describe_metadata(obj)
+    result.update(_compact(describer(obj)))
+    result["events"] = events
+    return result
+
 
 class ResouecesDescribe:
-    def __init__(self, env: Optional[str]) -> None:
+    def __init__(
+        self,
+        env: Optional[str],
+        api: Optional[KubeApiClient] = None,
+        cache: Optional[InformerCache] = None
+    ) -> None:
         self.env = env
-        
+        self.api = api
+        self.cache = cache
+
+    def _fetch_objects(
+        self,
+        resource_type: str,
+        resource_name: Optional[str] = None,
+        namespace: Optional[str] = None,
+        all_namespace: Optional[bool] = False,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """优先从 informer 缓存读取对象，其次通过 API 获取，均不可用时返回 None"""
+        if self.cache is not None:
+            items = self.cache.read(resource_type, resource_name, namespace, all_namespace)
+            if items is not None:
+                return list(items)
+
+        if self.api is not None:
+            try:
+                doc = self.api.get(resource_type, resource_name, namespace, all_namespace)
+                objects = [doc] if resource_name else doc.get("items", [])
+                # List 中的对象不带 kind
+                kind = self.api.resolve(resource_type).kind
+                for obj in objects:
+                    obj.setdefault("kind", kind)
+                return objects
+            except KubeApiUnavailable as e:
+                logger.warning(f"[describe] API backend unavailable, fallback to kubectl: {e}")
+        return None
+
+    def _events_for(self, obj: Dict[str, Any], limit: int = 20) -> List[Dict[str, Any]]:
+        uid = obj.get("metadata", {}).get("uid")
+        if self.cache is not None:
+            events = self.cache.events_for(uid, limit)
+            if events is not None:
+                return events
+
+        try:
+            namespace = obj.get("metadata", {}).get("namespace")
+            doc = self.api.get(
+                "events",
+                namespace=namespace,
+                all_namespace=not namespace,
+                fieldSelector=f"involvedObject.uid={uid}"
+            )
+        except Exception as e:
+            logger.warning(f"[describe] Failed to list events for {uid}: {e}")
+            return []
+
+        events = [compact_event(e) for e in doc.get("items", [])]
+        events.sort(key=lambda e: e.get("last_seen") or "", reverse=True)
+        return events[:limit]
+
+    def describe(
+        self,
+        resource_type: str,
+        resource_name: Optional[str] = None,
+        namespace: Optional[str] = None,
+        all_namespace: Optional[bool] = False,
+        output_type: Optional[str] = "json",
+    ) -> List[Dict[str, Any]]:
+        """描述资源，默认返回结构化结果，output_type 为 text 时返回 kubectl describe 文本
+
+        Args:
+            resource_type (str): 资源类型
+            resource_name (Optional[str], optional): 资源名称，为空时描述全部
+            namespace (Optional[str], optional): 资源所在的命名空间
+            all_namespace (Optional[bool], optional): 是否描述所有命名空间下的资源
+            output_type (Optional[str], optional): 输出类型，json（结构化）或 text
+
+        Returns:
+            List[Dict[str, Any]]: 结构化描述列表，text 模式或 API 不可用时为 [{"raw": 文本}]
+        """
+        if output_type != "text":
+            objects = self._fetch_objects(resource_type, resource_name, namespace, all_namespace)
+            if objects is not None:
+                return [describe_object(obj, self._events_for(obj)) for obj in objects]
+
+        return [{"raw": self.kubectl_describe(resource_type, resource_name, namespace, all_namespace)}]
+
+    
     def kubectl_describe(
         self,
         resource_type: Optional[str],
@@ -48,7 +298,7 @@ class ResouecesDescribe:
 
             logger.debug(f"Exec cmd: {cmd}")
             
-            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            proc = spawn(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             stdout, stderr = proc.communicate()
 
             if proc.returncode != 0:
@@ -67,23 +317,20 @@ class ResouecesDescribe:
     def describe_nodes(
         self,
         node_name: Optional[str] = None,
+        output_type: Optional[str] = "json",
     ) -> List[Dict[str, Any]]:
         """描述nodes信息
 
         Args:
             node_name (Optional[str], optional): 节点名称，当该值为空，则列出所有
+            output_type (Optional[str], optional): 输出类型，json（结构化）或 text
 
         Returns:
             List[Dict[str, Any]]: 节点信息
         """
         try:
-            if node_name:
-                raw_result = self.kubectl_describe("nodes", resource_name=node_name)
-            else:
-                raw_result = self.kubectl_describe("nodes")
-                
-            return [{"raw": raw_result}]
-                
+            return self.describe("nodes", resource_name=node_name, output_type=output_type)
+
         except Exception as e:
             logger.error(f"[describe_nodes] Failed to describe nodes: {e}")
             return [e]
@@ -93,23 +340,20 @@ class ResouecesDescribe:
     def describe_namespaces(
         self,
         namespace: Optional[str] = None,
+        output_type: Optional[str] = "json",
     ) -> List[Dict[str, Any]]:
         """描述namespaces信息
 
         Args:
             namespaces (Optional[str], optional): 命名空间名称，当该值为空，则列出所有
+            output_type (Optional[str], optional): 输出类型，json（结构化）或 text
 
         Returns:
             List[Dict[str, Any]]: 命名空间信息
         """
         try:
-            if namespace:
-                raw_result = self.kubectl_describe("namespaces", resource_name=namespace)
-            else:
-                raw_result = self.kubectl_describe("namespaces")
-                
-            return [{"raw": raw_result}]
-                
+            return self.describe("namespaces", resource_name=namespace, output_type=output_type)
+
         except Exception as e:
             logger.error(f"[describe_namespaces] Failed to describe namespaces: {e}")
             return [e]
@@ -121,29 +365,28 @@ class ResouecesDescribe:
         service: Optional[str] = None,
         namespace: Optional[str] = None,
         all_namespace: Optional[bool] = False,
+        output_type: Optional[str] = "json",
     ) -> List[Dict[str, Any]]:
         """描述services信息
 
         Args:
             service (Optional[str], optional): services名称，当该值为空，则列出所有
+            namespace (Optional[str], optional): services所在的命名空间
             all_namespace (Optional[bool]): 当设定为True时，则列出所有命名空间下对应的资源，反之仅列出'default'命名空间下的资源
+            output_type (Optional[str], optional): 输出类型，json（结构化）或 text
 
         Returns:
             List[Dict[str, Any]]: services信息
         """
         try:
-            if service:
-                raw_result = self.kubectl_describe(
-                    "services",
-                    resource_name=service,
-                    namespace=namespace,
-                    all_namespace=all_namespace,
-                )
-            else:
-                raw_result = self.kubectl_describe("services", all_namespace=all_namespace)
-                
-            return [{"raw": raw_result}]
-                
+            return self.describe(
+                "services",
+                resource_name=service,
+                namespace=namespace,
+                all_namespace=all_namespace,
+                output_type=output_type
+            )
+
         except Exception as e:
             logger.error(f"[describe_services] Failed to describe services: {e}")
             return [e]
@@ -155,6 +398,7 @@ class ResouecesDescribe:
         pod_name: Optional[str] = None,
         namespace: Optional[str] = None,
         all_namespace: Optional[bool] = False,
+        output_type: Optional[str] = "json",
     ) -> List[Dict[str, Any]]:
         """描述pods信息
 
@@ -162,23 +406,20 @@ class ResouecesDescribe:
             pod_name (Optional[str], optional): pods名称，当该值为空，则列出所有
             namespace (Optional[str], optional): pods所在的命名空间，默认为default
             all_namespace (Optional[bool]): 当设定为True时，则列出所有命名空间下对应的资源，反之仅列出'default'命名空间下的资源
+            output_type (Optional[str], optional): 输出类型，json（结构化）或 text
 
         Returns:
             List[Dict[str, Any]]: pods信息
         """
         try:
-            if pod_name:
-                raw_result = self.kubectl_describe(
-                    "pods",
-                    resource_name=pod_name,
-                    namespace=namespace,
-                    all_namespace=all_namespace
-                )
-            else:
-                raw_result = self.kubectl_describe("pods", all_namespace=all_namespace)
-                
-            return [{"raw": raw_result}]
-                
+            return self.describe(
+                "pods",
+                resource_name=pod_name,
+                namespace=namespace,
+                all_namespace=all_namespace,
+                output_type=output_type
+            )
+
         except Exception as e:
             logger.error(f"[describe_pods] Failed to describe pods: {e}")
             return [e]
@@ -188,8 +429,9 @@ class ResouecesDescribe:
     def describe_deployments(
         self,
         app_name: Optional[str] = None,
-        namespaces: Optional[str] = None,
+        namespace: Optional[str] = None,
         all_namespace: Optional[bool] = False,
+        output_type: Optional[str] = "json",
     ) -> List[Dict[str, Any]]:
         """描述deployments信息
 
@@ -197,23 +439,20 @@ class ResouecesDescribe:
             app_name (Optional[str], optional): deployment名称，当该值为空，则列出所有
             namespace (Optional[str], optional): deployment所在的命名空间，默认为default
             all_namespace (Optional[bool]): 当设定为True时，则列出所有命名空间下对应的资源，反之仅列出'default'命名空间下的资源
+            output_type (Optional[str], optional): 输出类型，json（结构化）或 text
 
         Returns:
             List[Dict[str, Any]]: deployment信息
         """
         try:
-            if app_name:
-                raw_result = self.kubectl_describe(
-                    "deployments.app",
-                    resource_name=app_name,
-                    namespace=namespaces,
-                    all_namespace=all_namespace
-                )
-            else:
-                raw_result = self.kubectl_describe("deployments.app", all_namespace=all_namespace)
-                
-            return [{"raw": raw_result}]
-                
+            return self.describe(
+                "deployments.app",
+                resource_name=app_name,
+                namespace=namespace,
+                all_namespace=all_namespace,
+                output_type=output_type
+            )
+
         except Exception as e:
             logger.error(f"[describe_deployments] Failed to describe deployments: {e}")
             return [e]
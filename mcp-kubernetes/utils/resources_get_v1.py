@@ -1,32 +1,177 @@
 import subprocess
+import itertools
 import json
-import yaml
 
-from typing import Optional, Any, List, Dict
+from typing import Optional, Any, List, Dict, Union, Iterable, Iterator
 
 from utils.logger import logger
-from utils.functions import timeit, handle_kube_error
+from utils.functions import timeit, handle_kube_error, ResourceItems
+from utils.executor import spawn
+from utils.kube_api import KubeApiClient, KubeApiUnavailable
+from utils.informer import InformerCache
+from utils.json_stream import ListStream
+from utils.projection import FieldBuilders, build_rows
+
+
+def format_image_list(images: List[Dict]) -> Dict[str, Any]:
+    formatted = []
+
+    for image in images:
+        tag_names = [name for name in image.get("names", []) if ":" in name and "@" not in name]
+        if tag_names:
+            formatted.append({
+                "name": tag_names[0],
+                "sizeBytes": image.get("sizeBytes", 0)
+            })
+
+    return {
+        "total": len(formatted),
+        "list": formatted
+    }
+
+
+def _container_fields(c: Dict[str, Any], ports: bool = False) -> Dict[str, Any]:
+    container = {
+        "name": c.get("name"),
+        "image": c.get("image"),
+        "volume_mounts": [
+            {
+                "total": len(c.get("volumeMounts", [])),
+                "details": c.get("volumeMounts", [])
+            }
+        ],
+    }
+    if ports:
+        container["ports"] = [
+            {
+                "total": len(c.get("ports", [])),
+                "details": c.get("ports", [])
+            }
+        ]
+    return container
+
+
+def _volumes(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "total": len(spec.get("volumes", [])),
+            "details": spec.get("volumes", [])
+        }
+    ]
+
+
+# 各资源输出字段的构建函数，指定 fields 时只计算被投影的字段
+NODE_FIELDS: FieldBuilders = {
+    "name": lambda n: n.get("metadata", {}).get("name", ""),
+    "labels": lambda n: n.get("metadata", {}).get("labels", {}),
+
+    "taints": lambda n: n.get("spec", {}).get("taints", []),
+    "pod_cidr": lambda n: n.get("spec", {}).get("podCIDR"),
+    "pod_cidrs": lambda n: n.get("spec", {}).get("podCIDRs", []),
+    "addresses": lambda n: [
+        {
+            "type": addr.get("type"),
+            "address": addr.get("address")
+        } for addr in n.get("status", {}).get("addresses", [])
+    ],
+
+    "capacity": lambda n: n.get("status", {}).get("capacity", {}),
+    "allocatable": lambda n: n.get("status", {}).get("allocatable", {}),
+
+    "os_release": lambda n: n.get("status", {}).get("nodeInfo", {}).get("osImage"),
+    "kernel_version": lambda n: n.get("status", {}).get("nodeInfo", {}).get("kernelVersion"),
+    "container_runtime": lambda n: n.get("status", {}).get("nodeInfo", {}).get("containerRuntimeVersion"),
+    "kubelet_version": lambda n: n.get("status", {}).get("nodeInfo", {}).get("kubeletVersion"),
+    "kube_proxy_version": lambda n: n.get("status", {}).get("nodeInfo", {}).get("kubeProxyVersion"),
+
+    "images": lambda n: format_image_list(n.get("status", {}).get("images", [])),
+}
+
+NAMESPACE_FIELDS: FieldBuilders = {
+    "name": lambda ns: ns.get("metadata", {}).get("name"),
+    "labels": lambda ns: ns.get("metadata", {}).get("labels", {}),
+    "status": lambda ns: ns.get("status", {}).get("phase"),
+}
+
+SERVICE_FIELDS: FieldBuilders = {
+    "name": lambda svc: svc.get("metadata", {}).get("name"),
+    "namespace": lambda svc: svc.get("metadata", {}).get("namespace"),
+    "labels": lambda svc: svc.get("metadata", {}).get("labels", {}),
+    "selector": lambda svc: svc.get("spec", {}).get("selector", {}),
+    "type": lambda svc: svc.get("spec", {}).get("type"),
+    "cluster_ip": lambda svc: svc.get("spec", {}).get("clusterIP"),
+    "cluster_ips": lambda svc: svc.get("spec", {}).get("clusterIPs", {}),
+    "ports": lambda svc: [
+        {
+            "name": port.get("name"),
+            "nodePort": port.get("nodePort", {}),
+            "port": port.get("port"),
+            "protocol": port.get("protocol"),
+            "targetPort": port.get("targetPort")
+        } for port in svc.get("spec", {}).get("ports", {})
+    ],
+}
+
+POD_FIELDS: FieldBuilders = {
+    "name": lambda pod: pod.get("metadata", {}).get("name"),
+    "namespace": lambda pod: pod.get("metadata", {}).get("namespace"),
+    "labels": lambda pod: pod.get("metadata", {}).get("labels", {}),
+    "restart": lambda pod: pod.get("spec", {}).get("restartPolicy"),
+    "running_on": lambda pod: pod.get("status", {}).get("hostIP"),
+    "running_node": lambda pod: pod.get("spec", {}).get("nodeName"),
+    "state": lambda pod: pod.get("status", {}).get("phase"),
+    "pod_ip": lambda pod: pod.get("status", {}).get("podIP"),
+    "containers": lambda pod: [_container_fields(c) for c in pod.get("spec", {}).get("containers", [])],
+    "volumes": lambda pod: _volumes(pod.get("spec", {})),
+}
+
+DEPLOYMENT_FIELDS: FieldBuilders = {
+    "name": lambda app: app.get("metadata", {}).get("name"),
+    "namespace": lambda app: app.get("metadata", {}).get("namespace"),
+    "labels": lambda app: app.get("metadata", {}).get("labels", {}),
+    "replicas": lambda app: app.get("spec", {}).get("replicas"),
+    "selector": lambda app: app.get("spec", {}).get("selector"),
+    "restart": lambda app: app.get("spec", {}).get("template", {}).get("spec", {}).get("restartPolicy"),
+    "containers": lambda app: [
+        _container_fields(c, ports=True)
+        for c in app.get("spec", {}).get("template", {}).get("spec", {}).get("containers", [])
+    ],
+    "volumes": lambda app: _volumes(app.get("spec", {}).get("template", {}).get("spec", {})),
+    "available_replicas": lambda app: app.get("status", {}).get("availableReplicas"),
+    "ready_replicas": lambda app: app.get("status", {}).get("readyReplicas"),
+}
 
 
 class ResouecesGet:
-    def __init__(self, env: Optional[str]) -> None:
+    def __init__(
+        self,
+        env: Optional[str],
+        api: Optional[KubeApiClient] = None,
+        cache: Optional[InformerCache] = None
+    ) -> None:
         self.env = env
+        self.api = api
+        self.cache = cache
 
     def format_image_list(self, images: List[Dict]) -> Dict[str, any]:
-        formatted = []
-
-        for image in images:
-            tag_names = [name for name in image.get("names", []) if ":" in name and "@" not in name]
-            if tag_names:
-                formatted.append({
-                    "name": tag_names[0],
-                    "sizeBytes": image.get("sizeBytes", 0)
-                })
-
-        return {
-            "total": len(formatted),
-            "list": formatted
-        }
+        return format_image_list(images)
+
+    def _api_get(
+        self,
+        resource_type: str,
+        resource_name: Optional[str],
+        namespace: Optional[str],
+        all_namespace: Optional[bool],
+        output_type: str,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None
+    ) -> Any:
+        """通过进程内 API 客户端获取资源，输出与 kubectl get 保持一致"""
+        selectors = {"labelSelector": label_selector, "fieldSelector": field_selector}
+        if output_type == "wide":
+            return self.api.table(resource_type, resource_name, namespace, bool(all_namespace), wide=True, **selectors)
+
+        return self.api.get(resource_type, resource_name, namespace, bool(all_namespace), **selectors)
 
     def kubectl_get(
         self,
@@ -34,7 +179,9 @@ class ResouecesGet:
         resource_name: Optional[str] = None,
         namespace: Optional[str] = None,
         all_namespace: Optional[bool] = False,
-        output_type: Optional[str] = "json"
+        output_type: Optional[str] = "json",
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None
     ) -> Any:
         """获取特定kubernetes资源，并结构化输出
 
@@ -43,7 +190,9 @@ class ResouecesGet:
             resource_name (Optional[str]): 资源名称
             namespace (Optional[str], optional): 资源所在的命名空间
             all_namespace (Optional[bool]): 
-            output_type (str, optional): 输出类型，默认为'json'
+            output_type (str, optional): 输出类型，默认为'json'；yaml 时同样以 JSON 获取并返回对象
+            label_selector (Optional[str], optional): label 选择器
+            field_selector (Optional[str], optional): field 选择器
 
         Raises:
             RuntimeError: 当subprocess执行错误时抛出异常
@@ -51,25 +200,26 @@ class ResouecesGet:
         Returns:
             Any: 返回Dict或纯文本
         """
-        try:
-            cmd = [
-                "kubectl",
-                "--kubeconfig", self.env,
-                "get", resource_type,
-                "-o", output_type
-            ]
-            if namespace:
-                cmd += ["-n", namespace]
-                
-            if resource_name:
-                cmd += [resource_name]
-            
-            if all_namespace:
-                cmd += ["--all-namespaces"]
+        if output_type == "yaml":
+            output_type = "json"
+
+        if self.api is not None and output_type in ("json", "wide"):
+            try:
+                return self._api_get(
+                    resource_type, resource_name, namespace, all_namespace, output_type,
+                    label_selector, field_selector
+                )
+            except KubeApiUnavailable as e:
+                logger.warning(f"[kubectl_get] API backend unavailable, fallback to kubectl: {e}")
 
+        try:
+            cmd = self._kubectl_get_cmd(
+                resource_type, resource_name, namespace, all_namespace, output_type,
+                label_selector, field_selector
+            )
             logger.debug(f"Exec cmd: {cmd}")
             
-            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            proc = spawn(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             stdout, stderr = proc.communicate()
 
             if proc.returncode != 0:
@@ -91,84 +241,234 @@ class ResouecesGet:
             logger.error(f"[kubectl_get] Failed to parse JSON: {je}")
             raise
 
+    def _kubectl_get_cmd(
+        self,
+        resource_type: str,
+        resource_name: Optional[str],
+        namespace: Optional[str],
+        all_namespace: Optional[bool],
+        output_type: str,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None
+    ) -> List[str]:
+        cmd = [
+            "kubectl",
+            "--kubeconfig", self.env,
+            "get", resource_type,
+            "-o", output_type
+        ]
+        if namespace:
+            cmd += ["-n", namespace]
+            
+        if resource_name:
+            cmd += [resource_name]
+        
+        if all_namespace:
+            cmd += ["--all-namespaces"]
+
+        if label_selector:
+            cmd += ["-l", label_selector]
+
+        if field_selector:
+            cmd += ["--field-selector", field_selector]
+        return cmd
+
+    def kubectl_get_stream(
+        self,
+        resource_type: str,
+        namespace: Optional[str] = None,
+        all_namespace: Optional[bool] = False,
+        limit: Optional[int] = None,
+        continue_token: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None
+    ) -> Iterable[Dict[str, Any]]:
+        """流式列出资源，逐个产出对象而不在内存中构建完整的 List 文档
+
+        Args:
+            resource_type (str): 资源类型
+            namespace (Optional[str], optional): 资源所在的命名空间
+            all_namespace (Optional[bool], optional): 是否列出所有命名空间下的资源
+            limit (Optional[int], optional): 单页最多返回的数量
+            continue_token (Optional[str], optional): 上一页返回的 continue 游标
+            label_selector (Optional[str], optional): label 选择器
+            field_selector (Optional[str], optional): field 选择器
+
+        Raises:
+            RuntimeError: 当subprocess执行错误时抛出异常
+
+        Returns:
+            Iterable[Dict[str, Any]]: 对象迭代器，迭代结束后可通过 metadata 读取 continue 游标
+        """
+        if self.api is not None:
+            try:
+                return self.api.stream_list(
+                    resource_type,
+                    namespace=namespace,
+                    all_namespace=bool(all_namespace),
+                    limit=limit,
+                    labelSelector=label_selector,
+                    fieldSelector=field_selector,
+                    **{"continue": continue_token}
+                )
+            except KubeApiUnavailable as e:
+                logger.warning(f"[kubectl_get_stream] API backend unavailable, fallback to kubectl: {e}")
+
+        if continue_token:
+            raise ValueError("continue_token requires the Kubernetes API backend")
+
+        cmd = self._kubectl_get_cmd(
+            resource_type, None, namespace, all_namespace, "json",
+            label_selector, field_selector
+        )
+        logger.debug(f"Exec cmd: {cmd}")
+        proc = spawn(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        def _chunks() -> Iterator[bytes]:
+            while chunk := proc.stdout.read(65536):
+                yield chunk
+            if proc.wait() != 0:
+                error_msg = proc.stderr.read().decode().strip()
+                logger.error(f"[kubectl_get_stream] Error running: {error_msg}")
+                raise RuntimeError(error_msg)
+
+        def _close() -> None:
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+            proc.stdout.close()
+            proc.stderr.close()
+
+        stream = ListStream(_chunks(), on_close=_close)
+        if limit:
+            # kubectl 不暴露 continue 游标，只能截断结果
+            items = ResourceItems(itertools.islice(stream, limit))
+            stream.close()
+            return items
+        return stream
+
+    def _fetch_items(
+        self,
+        resource_type: str,
+        resource_name: Optional[str] = None,
+        namespace: Optional[str] = None,
+        all_namespace: Optional[bool] = False,
+        output_type: Optional[str] = "json",
+        consistent: Optional[bool] = False,
+        limit: Optional[int] = None,
+        continue_token: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None
+    ) -> Union[Iterable[Dict[str, Any]], str]:
+        """获取资源对象，优先读取 informer 本地缓存，列表查询时流式解析
+
+        Args:
+            resource_type (str): 资源类型
+            resource_name (Optional[str], optional): 资源名称，当该值为空，则列出所有
+            namespace (Optional[str], optional): 资源所在的命名空间
+            all_namespace (Optional[bool], optional): 是否列出所有命名空间下的资源
+            output_type (Optional[str], optional): 输出类型，默认为json
+            consistent (Optional[bool], optional): 为True时跳过本地缓存，强制实时查询
+            limit (Optional[int], optional): 单页最多返回的数量
+            continue_token (Optional[str], optional): 上一页返回的 continue 游标
+            label_selector (Optional[str], optional): label 选择器
+            field_selector (Optional[str], optional): field 选择器
+
+        Raises:
+            ValueError: 同时指定资源名称与选择器时抛出
+
+        Returns:
+            Union[Iterable[Dict[str, Any]], str]: 对象迭代器（迭代结束后 metadata 携带缓存新鲜度或分页游标），
+                非结构化输出时返回纯文本
+        """
+        if resource_name and (label_selector or field_selector):
+            raise ValueError("name cannot be provided when a selector is specified")
+
+        structured = output_type in ("json", "yaml")
+        paged = bool(limit or continue_token)
+
+        if self.cache is not None and structured and not consistent and not paged:
+            cached = self.cache.read(
+                resource_type, resource_name, namespace, all_namespace,
+                label_selector=label_selector,
+                field_selector=field_selector
+            )
+            if cached is not None:
+                return cached
+
+        if structured and not resource_name:
+            return self.kubectl_get_stream(
+                resource_type,
+                namespace=namespace,
+                all_namespace=all_namespace,
+                limit=limit,
+                continue_token=continue_token,
+                label_selector=label_selector,
+                field_selector=field_selector
+            )
+
+        raw_result = self.kubectl_get(
+            resource_type,
+            resource_name=resource_name,
+            namespace=namespace,
+            all_namespace=all_namespace,
+            output_type=output_type,
+            label_selector=label_selector,
+            field_selector=field_selector
+        )
+
+        if structured:
+            return ResourceItems([raw_result])
+        return raw_result
+
     @handle_kube_error
     @timeit
     def get_nodes(
         self,
         node_name: Optional[str] = None,
-        output_type: Optional[str] = "json"
+        output_type: Optional[str] = "json",
+        consistent: Optional[bool] = False,
+        limit: Optional[int] = None,
+        continue_token: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+        fields: Optional[str] = None,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """获取kubernetes节点信息
 
         Args:
             node_name (Optional[str], optional): 节点名称，当该值为空，则列出所有
             output_type (Optional[str], optional): 输出类型，默认为json
+            consistent (Optional[bool], optional): 为True时跳过本地缓存，强制实时查询
+            limit (Optional[int], optional): 单页最多返回的数量，存在后续分页时返回 continue 游标
+            continue_token (Optional[str], optional): 上一页返回的 continue 游标
+            label_selector (Optional[str], optional): label 选择器，如 app=nginx
+            field_selector (Optional[str], optional): field 选择器，如 status.phase=Running
+            fields (Optional[str], optional): 投影字段，逗号分隔的点分路径，如 name,labels.app，只计算并返回这些字段
+            max_items (Optional[int], optional): 最多返回的条数，超出时停止解析并在 metadata 中标记 truncated
+            max_bytes (Optional[int], optional): 返回结果序列化后的字节上限，超出时停止解析并在 metadata 中标记 truncated
 
         Returns:
             List[Dict[str, Any]]: 节点信息
         """
         try:
-            if node_name:
-                raw_result = self.kubectl_get("nodes", resource_name=node_name, output_type=output_type)
-            else:
-                raw_result = self.kubectl_get("nodes", output_type=output_type)
-
-            if output_type == "yaml":
-                try:
-                    result = yaml.safe_load(raw_result)
-                except yaml.YAMLError as ye:
-                    logger.error(f"[get_nodes] YAML parse error: {ye}")
-                    return []
-            elif output_type == "json":
-                result = raw_result
-            else:
-                return [{"raw": raw_result}]
-
-            if node_name:
-                result = {"items": [result]}
-                
-            items = result.get("items", [])
-            nodes = []
-            
-            for node in items:
-                metadata = node.get("metadata", {})
-                spec = node.get("spec", {})
-                status = node.get("status", {})
-
-                name = metadata.get("name", "")
-
-                addresses = status.get("addresses", [])
-                nodeinfo = status.get("nodeInfo", {})
-                images = status.get("images", [])
-
-                nodes.append({
-                    "name": name,
-                    "labels": metadata.get("labels", {}),
-
-                    "taints": spec.get("taints", []),
-                    "pod_cidr": spec.get("podCIDR"),
-                    "pod_cidrs": spec.get("podCIDRs", []),
-                    "addresses": [
-                        {
-                            "type": addr.get("type"),
-                            "address": addr.get("address")
-                        } for addr in addresses
-                    ],
-
-                    "capacity": status.get("capacity", {}),
-                    "allocatable": status.get("allocatable", {}),
-
-                    "os_release": nodeinfo.get("osImage"),
-                    "kernel_version": nodeinfo.get("kernelVersion"),
-                    "container_runtime": nodeinfo.get("containerRuntimeVersion"),
-                    "kubelet_version": nodeinfo.get("kubeletVersion"),
-                    "kube_proxy_version": nodeinfo.get("kubeProxyVersion"),
-
-                    "images": self.format_image_list(images)
-                })
-
-            return nodes
-        
+            items = self._fetch_items(
+                "nodes",
+                resource_name=node_name,
+                output_type=output_type,
+                consistent=consistent,
+                limit=limit,
+                continue_token=continue_token,
+                label_selector=label_selector,
+                field_selector=field_selector
+            )
+            if isinstance(items, str):
+                return [{"raw": items}]
+
+            return build_rows(items, NODE_FIELDS, fields, max_items, max_bytes)
+
         except Exception as e:
             logger.error(f"[get_nodes] Failed to get nodes: {e}")
             return [e]
@@ -178,55 +478,51 @@ class ResouecesGet:
     def get_namespaces(
         self,
         namespace: Optional[str] = None,
-        output_type: Optional[str] = "json"
+        output_type: Optional[str] = "json",
+        consistent: Optional[bool] = False,
+        limit: Optional[int] = None,
+        continue_token: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+        fields: Optional[str] = None,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """获取命名空间信息
 
         Args:
             namespace (Optional[str], optional): 命名空间名称，当该值为空，则列出所有
             output_type (str, optional): 输出类型，默认为json
+            consistent (Optional[bool], optional): 为True时跳过本地缓存，强制实时查询
+            limit (Optional[int], optional): 单页最多返回的数量，存在后续分页时返回 continue 游标
+            continue_token (Optional[str], optional): 上一页返回的 continue 游标
+            label_selector (Optional[str], optional): label 选择器，如 app=nginx
+            field_selector (Optional[str], optional): field 选择器，如 status.phase=Running
+            fields (Optional[str], optional): 投影字段，逗号分隔的点分路径，如 name,labels.app，只计算并返回这些字段
+            max_items (Optional[int], optional): 最多返回的条数，超出时停止解析并在 metadata 中标记 truncated
+            max_bytes (Optional[int], optional): 返回结果序列化后的字节上限，超出时停止解析并在 metadata 中标记 truncated
 
         Returns:
             List[Dict[str, Any]]: 命名空间信息
         """
         try:
-            if namespace:
-                raw_result = self.kubectl_get("namespaces", resource_name=namespace, output_type=output_type)
-            else:
-                raw_result = self.kubectl_get("namespaces", output_type=output_type)
-
-            if output_type == "yaml":
-                try:
-                    result = yaml.safe_load(raw_result)
-                except yaml.YAMLError as ye:
-                    logger.error(f"[get_namespaces] YAML parse error: {ye}")
-                    return []
-            elif output_type == "json":
-                result = raw_result
-            else:
-                return [{"raw": raw_result}]
-
-            if namespace:
-                result = {"items": [result]}
-                
-            items = result.get("items", [])
-            namespaces = []
-
-            for ns in items:
-                metadata = ns.get("metadata", {})
-                status = ns.get("status", {})
-                name = metadata.get("name", {})
-
-                if namespace and name != namespace:
-                    continue
-                
-                namespaces.append({
-                    "name": metadata.get("name"),
-                    "labels": metadata.get("labels", {}),
-                    "status": status.get("phase")
-                })
-
-            return namespaces
+            items = self._fetch_items(
+                "namespaces",
+                resource_name=namespace,
+                output_type=output_type,
+                consistent=consistent,
+                limit=limit,
+                continue_token=continue_token,
+                label_selector=label_selector,
+                field_selector=field_selector
+            )
+            if isinstance(items, str):
+                return [{"raw": items}]
+
+            return build_rows(
+                items, NAMESPACE_FIELDS, fields, max_items, max_bytes,
+                keep=lambda obj: not namespace or obj.get("metadata", {}).get("name") == namespace
+            )
 
         except Exception as e:
             logger.error(f"[get_namespaces] Failed to get namespaces: {e}")
@@ -239,7 +535,15 @@ class ResouecesGet:
         service: Optional[str] = None,
         namespace: Optional[str] = "default",
         all_namespace: Optional[bool] = False,
-        output_type: Optional[str] = "json"
+        output_type: Optional[str] = "json",
+        consistent: Optional[bool] = False,
+        limit: Optional[int] = None,
+        continue_token: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+        fields: Optional[str] = None,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """获取service信息
 
@@ -248,75 +552,38 @@ class ResouecesGet:
             namespace (Optional[str], optional): service所在的命名空间，默认为default
             all_namespace (Optional[bool]): 当设定为True时，则列出所有命名空间下对应的资源，反之仅列出'default'命名空间下的资源
             output_type (Optional[str], optional): 输出类型，默认为json
+            consistent (Optional[bool], optional): 为True时跳过本地缓存，强制实时查询
+            limit (Optional[int], optional): 单页最多返回的数量，存在后续分页时返回 continue 游标
+            continue_token (Optional[str], optional): 上一页返回的 continue 游标
+            label_selector (Optional[str], optional): label 选择器，如 app=nginx
+            field_selector (Optional[str], optional): field 选择器，如 status.phase=Running
+            fields (Optional[str], optional): 投影字段，逗号分隔的点分路径，如 name,labels.app，只计算并返回这些字段
+            max_items (Optional[int], optional): 最多返回的条数，超出时停止解析并在 metadata 中标记 truncated
+            max_bytes (Optional[int], optional): 返回结果序列化后的字节上限，超出时停止解析并在 metadata 中标记 truncated
 
         Returns:
             List[Dict[str, Any]]: service信息
         """
         try:
-            if service:
-                raw_result = self.kubectl_get(
-                    "services",
-                    namespace=namespace,
-                    resource_name=service,
-                    all_namespace=all_namespace,
-                    output_type=output_type
-                )
-            else:
-                raw_result = self.kubectl_get(
-                    "services",
-                    namespace=namespace,
-                    all_namespace=all_namespace,
-                    output_type=output_type
-                )
-
-            if output_type == "yaml":
-                try:
-                    result = yaml.safe_load(raw_result)
-                except yaml.YAMLError as ye:
-                    logger.error(f"[get_services] YAML parse error: {ye}")
-                    return []
-                
-            elif output_type == "json":
-                result = raw_result
-                
-            else:
-                return [{"raw": raw_result}]
-
-            if service:
-                result = {"items": [result]}
-                
-            items = result.get("items", [])
-            services = []
-
-            for svc in items:
-                metadata = svc.get("metadata", {})
-                spec = svc.get("spec", {})
-                ports = spec.get("ports", {})
-                name = metadata.get("name", {})
-
-                if service and name != service:
-                    continue
-                
-                services.append({
-                    "name": metadata.get("name"),
-                    "namespace": metadata.get("namespace"),
-                    "labels": metadata.get("labels", {}),
-                    "selector": spec.get("selector", {}),
-                    "type": spec.get("type"),
-                    "cluster_ip": spec.get("clusterIP"),
-                    "cluster_ips": spec.get("clusterIPs", {}),
-                    "ports": [
-                        {
-                            "name": port.get("name"),
-                            "nodePort": port.get("nodePort", {}),
-                            "port": port.get("port"),
-                            "protocol": port.get("protocol"),
-                            "targetPort": port.get("targetPort")
-                        } for port in ports
-                    ],
-                })
-
-            return services
+            items = self._fetch_items(
+                "services",
+                resource_name=service,
+                namespace=namespace,
+                all_namespace=all_namespace,
+                output_type=output_type,
+                consistent=consistent,
+                limit=limit,
+                continue_token=continue_token,
+                label_selector=label_selector,
+                field_selector=field_selector
+            )
+            if isinstance(items, str):
+                return [{"raw": items}]
+
+            return build_rows(
+                items, SERVICE_FIELDS, fields, max_items, max_bytes,
+                keep=lambda obj: not service or obj.get("metadata", {}).get("name") == service
+            )
 
         except Exception as e:
             logger.error(f"[get_services] Failed to get services: {e}")
@@ -329,7 +596,15 @@ class ResouecesGet:
         pod_name: Optional[str] = None,
         namespace: Optional[str] = "default",
         all_namespace: Optional[bool] = False,
-        output_type: Optional[str] = "json"
+        output_type: Optional[str] = "json",
+        consistent: Optional[bool] = False,
+        limit: Optional[int] = None,
+        continue_token: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+        fields: Optional[str] = None,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """获取pod信息
 
@@ -338,79 +613,35 @@ class ResouecesGet:
             namespace (Optional[str], optional): pod所在的命名空间，默认为default
             all_namespace (Optional[bool]): 当设定为True时，则列出所有命名空间下对应的资源，反之仅列出'default'命名空间下的资源
             output_type (Optional[str], optional): 输出类型，默认为json
+            consistent (Optional[bool], optional): 为True时跳过本地缓存，强制实时查询
+            limit (Optional[int], optional): 单页最多返回的数量，存在后续分页时返回 continue 游标
+            continue_token (Optional[str], optional): 上一页返回的 continue 游标
+            label_selector (Optional[str], optional): label 选择器，如 app=nginx
+            field_selector (Optional[str], optional): field 选择器，如 status.phase=Running
+            fields (Optional[str], optional): 投影字段，逗号分隔的点分路径，如 name,labels.app，只计算并返回这些字段
+            max_items (Optional[int], optional): 最多返回的条数，超出时停止解析并在 metadata 中标记 truncated
+            max_bytes (Optional[int], optional): 返回结果序列化后的字节上限，超出时停止解析并在 metadata 中标记 truncated
 
         Returns:
             List[Dict[str, Any]]: pod信息
         """
         try:
-            if pod_name:
-                raw_result = self.kubectl_get(
-                    "pods",
-                    namespace=namespace,
-                    resource_name=pod_name,
-                    all_namespace=all_namespace,
-                    output_type=output_type
-                )
-            else:
-                raw_result = self.kubectl_get(
-                    "pods",
-                    namespace=namespace,
-                    all_namespace=all_namespace,
-                    output_type=output_type
-                )
-
-            if output_type == "yaml":
-                try:
-                    result = yaml.safe_load(raw_result)
-                except yaml.YAMLError as ye:
-                    logger.error(f"[get_pods] YAML parse error: {ye}")
-                    return []
-            elif output_type == "json":
-                result = raw_result
-            else:
-                return [{"raw": raw_result}]
-
-            if pod_name:
-                result = {"items": [result]}
-                
-            items = result.get("items", [])
-            pods = []
-            
-            for pod in items:
-                metadata = pod.get("metadata", {})
-                status = pod.get("status", {})
-                spec = pod.get("spec", {})
-
-                pods.append({
-                    "name": metadata.get("name"),
-                    "namespace": metadata.get("namespace"),
-                    "labels": metadata.get("labels", {}),
-                    "restart": spec.get("restartPolicy"),
-                    "running_on": status.get("hostIP"),
-                    "running_node": spec.get("nodeName"),
-                    "state": status.get("phase"),
-                    "pod_ip": status.get("podIP"),
-                    "containers": [
-                        {
-                            "name": c.get("name"),
-                            "image": c.get("image"),
-                            "volume_mounts": [
-                                {
-                                    "total": len(c.get("volumeMounts", [])),
-                                    "details": c.get("volumeMounts", [])
-                                }    
-                            ],
-                        } for c in spec.get("containers", [])
-                    ],
-                    "volumes": [
-                        {
-                            "total": len(spec.get("volumes", [])),
-                            "details": spec.get("volumes", [])
-                        }
-                    ]
-                })
-
-            return pods
+            items = self._fetch_items(
+                "pods",
+                resource_name=pod_name,
+                namespace=namespace,
+                all_namespace=all_namespace,
+                output_type=output_type,
+                consistent=consistent,
+                limit=limit,
+                continue_token=continue_token,
+                label_selector=label_selector,
+                field_selector=field_selector
+            )
+            if isinstance(items, str):
+                return [{"raw": items}]
+
+            return build_rows(items, POD_FIELDS, fields, max_items, max_bytes)
 
         except Exception as e:
             logger.error(f"[get_pods] Failed to get pods: {e}")
@@ -423,7 +654,15 @@ class ResouecesGet:
         app_name: Optional[str] = None,
         namespace: Optional[str] = 'default',
         all_namespace: Optional[bool] = False,
-        output_type: Optional[str] = 'json'
+        output_type: Optional[str] = 'json',
+        consistent: Optional[bool] = False,
+        limit: Optional[int] = None,
+        continue_token: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+        fields: Optional[str] = None,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """获取deployment信息
 
@@ -432,89 +671,96 @@ class ResouecesGet:
             namespace (Optional[str], optional): deployment所在的命名空间
             all_namespace (Optional[bool]): 当设定为True时，则列出所有命名空间下对应的资源，反之仅列出'default'命名空间下的资源
             output_type (Optional[str], optional): 输出类型，默认为json
+            consistent (Optional[bool], optional): 为True时跳过本地缓存，强制实时查询
+            limit (Optional[int], optional): 单页最多返回的数量，存在后续分页时返回 continue 游标
+            continue_token (Optional[str], optional): 上一页返回的 continue 游标
+            label_selector (Optional[str], optional): label 选择器，如 app=nginx
+            field_selector (Optional[str], optional): field 选择器，如 status.phase=Running
+            fields (Optional[str], optional): 投影字段，逗号分隔的点分路径，如 name,labels.app，只计算并返回这些字段
+            max_items (Optional[int], optional): 最多返回的条数，超出时停止解析并在 metadata 中标记 truncated
+            max_bytes (Optional[int], optional): 返回结果序列化后的字节上限，超出时停止解析并在 metadata 中标记 truncated
 
         Returns:
             List[Dict[str, Any]]: _description_
         """
         try:
-            if app_name:
-                raw_result = self.kubectl_get(
-                    "deployments.app",
-                    namespace=namespace,
-                    resource_name=app_name,
-                    all_namespace=all_namespace,
-                    output_type=output_type
-                )
-            else:
-                raw_result = self.kubectl_get(
-                    "deployments.app",
-                    namespace=namespace,
-                    all_namespace=all_namespace,
-                    output_type=output_type
-                )
-                
-            if output_type == "yaml":
-                try:
-                    result = yaml.safe_load(raw_result)
-                except yaml.YAMLError as ye:
-                    logger.error(f"[get_deployment_apps] YAML parse error: {ye}")
-                    return []
-                
-            elif output_type == "json":
-                result = raw_result
-            
-            else:
-                return [{"raw": raw_result}]
-            
-            if app_name:
-                result = {"items": [result]}
-            
-            items = result.get("items", [])
-            apps = []
-            
-            for app in items:
-                metadata = app.get("metadata", {})
-                spec = app.get("spec", {})
-                status = app.get("status", {})
-                template = spec.get("template", {})
-                template_spec = template.get("spec", {})
-                
-                apps.append({
-                    "name": metadata.get("name"),
-                    "namespace": metadata.get("namespace"),
-                    "labels": metadata.get("labels", {}),
-                    "replicas": spec.get("replicas"),
-                    "selector": spec.get("selector"),
-                    "restart": template_spec.get("restartPolicy"),
-                    "containers": [
-                        {
-                            "name": c.get("name"),
-                            "image": c.get("image"),
-                            "volume_mounts": [
-                                {
-                                    "total": len(c.get("volumeMounts", [])),
-                                    "details": c.get("volumeMounts", [])
-                                }    
-                            ],
-                            "ports": [
-                                {
-                                    "total": len(c.get("ports", [])),
-                                    "details": c.get("ports", [])
-                                }
-                            ],
-                        } for c in template_spec.get("containers", [])
-                    ],
-                    "volumes": [
-                        {
-                            "total": len(template_spec.get("volumes", [])),
-                            "details": template_spec.get("volumes", [])
-                        }
-                    ],
-                    "available_replicas": status.get("availableReplicas"),
-                    "ready_replicas": status.get("readyReplicas")
-                })
-            return apps
-                
+            items = self._fetch_items(
+                "deployments.app",
+                resource_name=app_name,
+                namespace=namespace,
+                all_namespace=all_namespace,
+                output_type=output_type,
+                consistent=consistent,
+                limit=limit,
+                continue_token=continue_token,
+                label_selector=label_selector,
+                field_selector=field_selector
+            )
+            if isinstance(items, str):
+                return [{"raw": items}]
+
+            return build_rows(items, DEPLOYMENT_FIELDS, fields, max_items, max_bytes)
+
         except Exception as e:
             logger.error(f"[get_deployment_apps] Failed to get apps: {e}")
             return [e]
+
+    @handle_kube_error
+    @timeit
+    def get_resources_generic(
+        self,
+        resource_type: str,
+        resource_name: Optional[str] = None,
+        namespace: Optional[str] = 'default',
+        all_namespace: Optional[bool] = False,
+        output_type: Optional[str] = 'json',
+        consistent: Optional[bool] = False,
+        limit: Optional[int] = None,
+        continue_token: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+        fields: Optional[str] = None,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """获取任意资源类型（含 CRD）的对象，资源端点由发现缓存解析
+
+        Args:
+            resource_type (str): 资源类型，支持复数名、单数名、简称、Kind 以及 name.group 形式
+            resource_name (Optional[str], optional): 资源名称，当该值为空，则列出所有
+            namespace (Optional[str], optional): 资源所在的命名空间
+            all_namespace (Optional[bool], optional): 是否列出所有命名空间下的资源
+            output_type (Optional[str], optional): 输出类型，默认为json
+            consistent (Optional[bool], optional): 为True时跳过本地缓存，强制实时查询
+            limit (Optional[int], optional): 单页最多返回的数量，存在后续分页时返回 continue 游标
+            continue_token (Optional[str], optional): 上一页返回的 continue 游标
+            label_selector (Optional[str], optional): label 选择器
+            field_selector (Optional[str], optional): field 选择器
+            fields (Optional[str], optional): 投影字段，逗号分隔的点分路径，如 name,labels.app，只计算并返回这些字段
+            max_items (Optional[int], optional): 最多返回的条数，超出时停止解析并在 metadata 中标记 truncated
+            max_bytes (Optional[int], optional): 返回结果序列化后的字节上限，超出时停止解析并在 metadata 中标记 truncated
+
+        Returns:
+            List[Dict[str, Any]]: 资源对象列表（去除 managedFields，与 kubectl get -o json 一致）
+        """
+        try:
+            items = self._fetch_items(
+                resource_type,
+                resource_name=resource_name,
+                namespace=namespace,
+                all_namespace=all_namespace,
+                output_type=output_type,
+                consistent=consistent,
+                limit=limit,
+                continue_token=continue_token,
+                label_selector=label_selector,
+                field_selector=field_selector
+            )
+            if isinstance(items, str):
+                return [{"raw": items}]
+
+            return build_rows(items, None, fields, max_items, max_bytes)
+
+        except Exception as e:
+            logger.error(f"[get_resources_generic] Failed to get {resource_type}: {e}")
+            return [e]
@@ -4,10 +4,13 @@ from typing import Optional, Any, List, Dict
 
 from utils.logger import logger
 from utils.functions import timeit, handle_kube_error
+from utils.executor import spawn
+from utils.discovery import DiscoveryCache
 
 class ResourceList:
-    def __init__(self, env: Optional[str] = None) -> None:
+    def __init__(self, env: Optional[str] = None, discovery: Optional[DiscoveryCache] = None) -> None:
         self.env = env
+        self.discovery = discovery
 
     def parse_api_resources(self, raw_output: str):
         lines = raw_output.strip().splitlines()
@@ -53,6 +56,10 @@ class ResourceList:
         Returns:
             Dict: api资源类型
         """
+        # 发现缓存已预热时直接读取内存表，不再执行 kubectl api-resources
+        if self.discovery is not None and self.discovery.ready:
+            return self.discovery.resources(api_group=api_group, namespaced=namespaced)
+
         try:
             cmd = [
                 "kubectl",
@@ -69,7 +76,7 @@ class ResourceList:
                 
             logger.debug(f"Exec cmd: {cmd}")
             
-            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            proc = spawn(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             stdout, stderr = proc.communicate()
 
             if proc.returncode != 0:
@@ -1,49 +1,398 @@
 import subprocess
+import threading
+import heapq
+import json
+import queue
+import re
+import time
 
-from typing import Optional, Any, List, Dict
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any, List, Dict, Iterator, Callable, Tuple
 
 from utils.logger import logger
-from utils.functions import timeit, handle_kube_error
+from utils.functions import timeit, handle_kube_error, parse_duration
+from utils.executor import spawn, bind
+from utils.kube_api import KubeApiClient, KubeApiUnavailable
+from utils.log_cursors import LogCursors, timestamp_key
+
+# 流式读取日志时未指定字节预算的默认上限
+DEFAULT_STREAM_LIMIT_BYTES = 256 * 1024
+
+# (pod 名称, 容器名称)，容器为空时使用 pod 的默认容器
+LogTarget = Tuple[str, Optional[str]]
+
+
+def _tag(target: LogTarget) -> str:
+    pod, container = target
+    return f"[{pod}/{container}]" if container else f"[{pod}]"
+
 
 class ResourceLog:
-    def __init__(self, env: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        env: Optional[str] = None,
+        api: Optional[KubeApiClient] = None,
+        cursors: Optional[LogCursors] = None
+    ) -> None:
         self.env = env
+        self.api = api
+        self.cursors = cursors or LogCursors()
 
     def _run_command(self, cmd: List[str]) -> str:
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        if result.returncode != 0:
-            raise subprocess.SubprocessError(result.stderr.strip())
-        return result.stdout.strip()
+        proc = spawn(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        stdout, stderr = proc.communicate()
+        if proc.returncode != 0:
+            raise subprocess.SubprocessError(stderr.strip())
+        return stdout.strip()
+
+    def _list_pods(self, namespace: str, selector: str) -> List[Dict[str, Any]]:
+        if self.api is not None:
+            try:
+                return self.api.get("pods", namespace=namespace, labelSelector=selector).get("items", [])
+            except KubeApiUnavailable as e:
+                logger.warning(f"[_list_pods] API backend unavailable, fallback to kubectl: {e}")
 
-    def _get_pod_name(self, namespace: str, selector: str) -> str:
         cmd = [
             "kubectl", "--kubeconfig", self.env,
             "-n", namespace,
             "get", "pods",
             "-l", selector,
-            "-o", "jsonpath={.items[0].metadata.name}"
+            "-o", "json"
         ]
-        return self._run_command(cmd)
+        return json.loads(self._run_command(cmd)).get("items", [])
 
-    def _resolve_pod_name(self, resource_type: str, resource_name: str, namespace: str, label_selector: Optional[str]) -> str:
+    def _resolve_targets(
+        self,
+        resource_type: str,
+        resource_name: str,
+        namespace: str,
+        container: Optional[str],
+        label_selector: Optional[str]
+    ) -> List[LogTarget]:
+        """解析需要读取日志的 (pod, 容器) 列表"""
         if resource_type == "pod":
-            return resource_name
+            return [(resource_name, container)]
+
+        selector = label_selector
+        if not selector:
+            # 自动推测 labelSelector
+            label_key = {
+                "deployment": "app",
+                "job": "job-name",
+                "cronjob": "job-name"  # CronJob 创建 Job，再找 Job 的 pod
+            }.get(resource_type)
+
+            if not label_key:
+                raise ValueError(f"Unsupported resource type for pod lookup: {resource_type}")
+            selector = f"{label_key}={resource_name}"
+
+        pods = self._list_pods(namespace, selector)
+        if not pods:
+            raise subprocess.SubprocessError(f"No pods found matching selector {selector} in namespace {namespace}")
+
+        targets: List[LogTarget] = []
+        for pod in pods:
+            name = pod["metadata"]["name"]
+            containers = [container] if container else [
+                c["name"] for c in pod.get("spec", {}).get("containers", [])
+            ]
+            targets += [(name, c) for c in containers or [None]]
+        return targets
+
+    def _api_log_params(
+        self,
+        container: Optional[str],
+        tail: Optional[str],
+        since: Optional[str],
+        sinceTime: Optional[str],
+        timestamps: Optional[bool],
+        previous: Optional[bool],
+        limit_bytes: Optional[int] = None
+    ) -> Dict[str, Any]:
+        return {
+            "container": container,
+            "tailLines": tail,
+            "sinceSeconds": parse_duration(since) if since else None,
+            "sinceTime": sinceTime,
+            "timestamps": timestamps or None,
+            "previous": previous or None,
+            "limitBytes": limit_bytes,
+        }
+
+    def _kubectl_log_cmd(
+        self,
+        pod_name: str,
+        namespace: str,
+        container: Optional[str],
+        tail: Optional[str],
+        since: Optional[str],
+        sinceTime: Optional[str],
+        timestamps: Optional[bool],
+        previous: Optional[bool],
+        limit_bytes: Optional[int] = None
+    ) -> List[str]:
+        cmd = [
+            "kubectl", "--kubeconfig", self.env,
+            "-n", namespace,
+            "logs", pod_name
+        ]
+
+        if container:
+            cmd += ["-c", container]
+        if tail:
+            cmd += ["--tail", tail]
+        if since:
+            cmd += ["--since", since]
+        if sinceTime:
+            cmd += ["--since-time", sinceTime]
+        if timestamps:
+            cmd.append("--timestamps")
+        if previous:
+            cmd.append("--previous")
+        if limit_bytes:
+            cmd += ["--limit-bytes", str(limit_bytes)]
+        return cmd
+
+    def _open_log_stream(
+        self,
+        pod_name: str,
+        namespace: str,
+        follow: bool,
+        follow_seconds: float,
+        **options: Any
+    ) -> Tuple[Iterator[str], Callable[[], None]]:
+        """打开日志流，返回 (逐行迭代器, 关闭函数)"""
+        if self.api is not None:
+            try:
+                resp = self.api.stream_logs(
+                    pod_name,
+                    namespace=namespace,
+                    timeout=follow_seconds + 10 if follow else None,
+                    follow=follow or None,
+                    **self._api_log_params(**options)
+                )
+                return resp.iter_lines(), resp.close
+            except KubeApiUnavailable as e:
+                logger.warning(f"[stream_logs] API backend unavailable, fallback to kubectl: {e}")
+
+        cmd = self._kubectl_log_cmd(pod_name, namespace, **options)
+        if follow:
+            cmd.append("--follow")
+        logger.debug(f"[stream_logs] Exec cmd: {' '.join(cmd)}")
+        proc = spawn(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+        def _lines() -> Iterator[str]:
+            try:
+                for line in proc.stdout:
+                    yield line.rstrip("\n")
+            finally:
+                if proc.poll() is None:
+                    proc.kill()
+                stderr = proc.stderr.read()
+                proc.wait()
+            if proc.returncode > 0:
+                raise subprocess.SubprocessError(stderr.strip())
+
+        return _lines(), proc.kill
+
+    def _read_lines(self, target: LogTarget, namespace: str, new_only: bool, **options: Any) -> List[Tuple[str, str]]:
+        """读取单个 (pod, 容器) 带时间戳的日志，返回 (时间戳, 内容) 列表
+
+        new_only 时若已有读取位置，以其时间戳作为 sinceTime 只拉取增量（忽略 tail/since/sinceTime），
+        并去掉与上次重叠的行；首次读取按原参数拉取并建立读取位置。
+        """
+        pod, container = target
+        cursor = None
+        if new_only:
+            found, cursor = self.cursors.get(namespace, pod, container)
+            if found:
+                options = {**options, "tail": None, "since": None, "sinceTime": cursor.since_time()}
+
+        lines, close = self._open_log_stream(pod, namespace, False, 0, container=container, timestamps=True, **options)
+        try:
+            # 单个容器的日志本身按时间有序
+            rows = [(ts, message) for ts, _, message in (line.partition(" ") for line in lines if line)]
+        finally:
+            close()
+        return cursor.advance(rows) if cursor is not None else rows
+
+    def _merged_logs(
+        self,
+        targets: List[LogTarget],
+        namespace: str,
+        max_concurrency: int,
+        timestamps: Optional[bool],
+        new_only: bool = False,
+        **options: Any
+    ) -> Iterator[str]:
+        """并发读取多个 (pod, 容器) 的日志，按时间戳做 k 路归并，每行以 [pod/容器] 标记来源"""
+        def _fetch(target: LogTarget) -> List[Tuple[str, str]]:
+            pod, container = target
+            try:
+                return self._read_lines(target, namespace, new_only, **options)
+            except Exception as e:
+                logger.warning(f"[_merged_logs] Failed to read logs of {pod}/{container}: {e}")
+                return [("", f"<error: {e}>")]
+
+        workers = max(1, min(max_concurrency, len(targets)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pod-logs") as pool:
+            results = list(pool.map(bind(_fetch), targets))
+
+        streams = [
+            [(timestamp_key(ts), i, ts, message) for ts, message in rows]
+            for i, rows in enumerate(results)
+        ]
+        for _, i, ts, message in heapq.merge(*streams):
+            prefix = f"{_tag(targets[i])} {ts}" if timestamps and ts else _tag(targets[i])
+            yield f"{prefix} {message}"
+
+    def _follow_logs(
+        self,
+        targets: List[LogTarget],
+        namespace: str,
+        follow_seconds: float,
+        max_concurrency: int,
+        **options: Any
+    ) -> Tuple[Iterator[str], Callable[[], None]]:
+        """同时跟踪多个 (pod, 容器) 的日志，按到达顺序输出，返回 (逐行迭代器, 关闭函数)"""
+        lines_queue: queue.Queue = queue.Queue()
+        closers: List[Callable[[], None]] = []
+
+        def _pump(target: LogTarget, lines: Iterator[str]) -> None:
+            try:
+                for line in lines:
+                    lines_queue.put(f"{_tag(target)} {line}")
+            except Exception as e:
+                logger.debug(f"[_follow_logs] Stream of {_tag(target)} ended: {e}")
+            finally:
+                lines_queue.put(None)
+
+        followed = targets[:max_concurrency]
+        for target in followed:
+            pod, container = target
+            lines, close = self._open_log_stream(pod, namespace, True, follow_seconds, container=container, **options)
+            closers.append(close)
+            threading.Thread(target=bind(_pump), args=(target, lines), daemon=True).start()
+
+        def _lines() -> Iterator[str]:
+            if len(targets) > len(followed):
+                yield f"... [following {len(followed)} of {len(targets)} containers, max_concurrency={max_concurrency}]"
+            remaining = len(followed)
+            while remaining:
+                line = lines_queue.get()
+                if line is None:
+                    remaining -= 1
+                else:
+                    yield line
+
+        def _close() -> None:
+            for close in closers:
+                close()
+
+        return _lines(), _close
+
+    def stream_logs(
+        self,
+        resource_type: Optional[str],
+        resource_name: Optional[str] = None,
+        namespace: Optional[str] = 'default',
+        container: Optional[str] = None,
+        tail: Optional[str] = None,
+        since: Optional[str] = None,
+        sinceTime: Optional[str] = None,
+        timestamps: Optional[bool] = False,
+        previous: Optional[bool] = False,
+        labelSelector: Optional[str] = None,
+        follow: Optional[bool] = False,
+        follow_seconds: Optional[float] = 30,
+        limit_bytes: Optional[int] = None,
+        limit_lines: Optional[int] = None,
+        max_concurrency: Optional[int] = 4
+    ) -> Iterator[str]:
+        """逐行流式读取资源日志，超出字节/行数预算或 follow 时长后停止
 
-        if label_selector:
-            return self._get_pod_name(namespace, label_selector)
+        deployment/job/cronjob 会并发读取所有匹配 pod 的全部容器，按时间戳归并为一个有序流，
+        每行以 [pod/容器] 标记来源；follow 模式下按到达顺序输出。
 
-        # 自动推测 labelSelector
-        label_key = {
-            "deployment": "app",
-            "job": "job-name",
-            "cronjob": "job-name"  # CronJob 创建 Job，再找 Job 的 pod
-        }.get(resource_type)
+        Args:
+            resource_type (Optional[str]): 资源类型，支持："pod", "deployment", "job", "cronjob"
+            resource_name (Optional[str], optional): 资源名称
+            namespace (Optional[str], optional): 资源所在的命名空间
+            container (Optional[str], optional): 资源对应的容器
+            tail (Optional[str], optional): 从日志末尾输出对应的行数
+            since (Optional[str], optional): 显示自多长时间一来的信息，例如：（5s, 1m, 1h）
+            sinceTime (Optional[str], optional): 显示相对时间以来的日志（RFC3339）
+            timestamps (Optional[bool], optional): 是否显示日志时间戳
+            previous (Optional[bool], optional): 是否包含容器退出日志
+            labelSelector (Optional[str], optional): 根据标签选择器过滤资源
+            follow (Optional[bool], optional): 是否持续跟踪新日志
+            follow_seconds (Optional[float], optional): follow 模式下的最长跟踪时间（秒）
+            limit_bytes (Optional[int], optional): 最多返回的日志字节数，默认 256KiB
+            limit_lines (Optional[int], optional): 最多返回的日志行数
+            max_concurrency (Optional[int], optional): 非 pod 资源同时读取日志的容器数上限
 
-        if not label_key:
-            raise ValueError(f"Unsupported resource type for pod lookup: {resource_type}")
+        Raises:
+            ValueError: 不支持的资源类型
+            subprocess.SubprocessError: kubectl 执行失败
 
-        selector = f"{label_key}={resource_name}"
-        return self._get_pod_name(namespace, selector)
+        Yields:
+            str: 日志行，超出预算时最后产出一行截断提示
+        """
+        if resource_type not in ("pod", "deployment", "job", "cronjob"):
+            raise ValueError(f"Unsupported resource type: {resource_type}")
+
+        limit_bytes = limit_bytes or DEFAULT_STREAM_LIMIT_BYTES
+        targets = self._resolve_targets(resource_type, resource_name, namespace, container, labelSelector)
+        options = dict(tail=tail, since=since, sinceTime=sinceTime, previous=previous, limit_bytes=limit_bytes)
+
+        if resource_type == "pod":
+            pod_name, container = targets[0]
+            lines, close = self._open_log_stream(
+                pod_name,
+                namespace,
+                follow=bool(follow),
+                follow_seconds=follow_seconds,
+                container=container,
+                timestamps=timestamps,
+                **options
+            )
+        elif follow:
+            lines, close = self._follow_logs(
+                targets, namespace, follow_seconds, max_concurrency, timestamps=timestamps, **options
+            )
+        else:
+            lines, close = self._merged_logs(targets, namespace, max_concurrency, timestamps, **options), lambda: None
+
+        # follow 模式到时后关闭连接/终止进程，使阻塞中的读取结束
+        expired = threading.Event()
+        timer = None
+        if follow:
+            timer = threading.Timer(follow_seconds, lambda: (expired.set(), close()))
+            timer.daemon = True
+            timer.start()
+
+        used_bytes = 0
+        count = 0
+        try:
+            for line in lines:
+                used_bytes += len(line.encode()) + 1
+                if used_bytes > limit_bytes:
+                    yield f"... [truncated: limit_bytes={limit_bytes} reached]"
+                    break
+                yield line
+                count += 1
+                if limit_lines and count >= limit_lines:
+                    yield f"... [truncated: limit_lines={limit_lines} reached]"
+                    break
+        except Exception as e:
+            if not expired.is_set():
+                raise
+            logger.debug(f"[stream_logs] Follow window closed: {e}")
+        finally:
+            if timer is not None:
+                timer.cancel()
+            close()
 
     @handle_kube_error
     @timeit
@@ -58,7 +407,10 @@ class ResourceLog:
         sinceTime: Optional[str] = None,
         timestamps: Optional[bool] = False,
         previous: Optional[bool] = False,
-        labelSelector: Optional[str] = None
+        labelSelector: Optional[str] = None,
+        limit_bytes: Optional[int] = None,
+        max_concurrency: Optional[int] = 4,
+        new_only: Optional[bool] = False
     ) -> str:
         """获取特定资源日志
 
@@ -73,35 +425,59 @@ class ResourceLog:
             timestamps (Optional[bool], optional): 是否显示日志时间戳
             previous (Optional[bool], optional): 是否包含容器退出日志
             labelSelector (Optional[str], optional): 根据标签选择器过滤资源
+            limit_bytes (Optional[int], optional): 最多返回的日志字节数（非 pod 资源按每个容器计算）
+            max_concurrency (Optional[int], optional): 非 pod 资源同时读取日志的容器数上限
+            new_only (Optional[bool], optional): 只返回上次 new_only 读取之后的新日志，首次读取按其他参数返回并记录读取位置
 
         Returns:
-            str: 资源日志信息
+            str: 资源日志信息，非 pod 资源为所有容器按时间戳归并后的日志
         """
         try:
             if resource_type not in ("pod", "deployment", "job", "cronjob"):
                 raise ValueError(f"Unsupported resource type: {resource_type}")
 
-            pod_name = self._resolve_pod_name(resource_type, resource_name, namespace, labelSelector)
+            targets = self._resolve_targets(resource_type, resource_name, namespace, container, labelSelector)
+            if resource_type != "pod":
+                return "\n".join(self._merged_logs(
+                    targets,
+                    namespace,
+                    max_concurrency,
+                    timestamps,
+                    new_only=bool(new_only),
+                    tail=tail,
+                    since=since,
+                    sinceTime=sinceTime,
+                    previous=previous,
+                    limit_bytes=limit_bytes
+                ))
 
-            cmd = [
-                "kubectl", "--kubeconfig", self.env,
-                "-n", namespace,
-                "logs", pod_name
-            ]
+            if new_only:
+                rows = self._read_lines(
+                    targets[0],
+                    namespace,
+                    True,
+                    tail=tail,
+                    since=since,
+                    sinceTime=sinceTime,
+                    previous=previous,
+                    limit_bytes=limit_bytes
+                )
+                return "\n".join(f"{ts} {message}" if timestamps else message for ts, message in rows)
 
-            if container:
-                cmd += ["-c", container]
-            if tail:
-                cmd += ["--tail", tail]
-            if since:
-                cmd += ["--since", since]
-            if sinceTime:
-                cmd += ["--since-time", sinceTime]
-            if timestamps:
-                cmd.append("--timestamps")
-            if previous:
-                cmd.append("--previous")
+            pod_name = resource_name
+            if self.api is not None:
+                try:
+                    return self.api.logs(
+                        pod_name,
+                        namespace=namespace,
+                        **self._api_log_params(container, tail, since, sinceTime, timestamps, previous, limit_bytes)
+                    ).strip()
+                except KubeApiUnavailable as e:
+                    logger.warning(f"[kubectl_logs] API backend unavailable, fallback to kubectl: {e}")
 
+            cmd = self._kubectl_log_cmd(
+                pod_name, namespace, container, tail, since, sinceTime, timestamps, previous, limit_bytes
+            )
             logger.debug(f"[kubectl_logs] Exec cmd: {' '.join(cmd)}")
             return self._run_command(cmd)
 
@@ -111,3 +487,148 @@ class ResourceLog:
         except Exception as e:
             logger.error(f"[kubectl_logs] Error: {str(e)}")
             return str(e)
+
+    @handle_kube_error
+    @timeit
+    def search_logs(
+        self,
+        resource_type: Optional[str],
+        resource_name: Optional[str],
+        pattern: str,
+        namespace: Optional[str] = 'default',
+        container: Optional[str] = None,
+        labelSelector: Optional[str] = None,
+        context_lines: int = 0,
+        max_matches: int = 20,
+        ignore_case: bool = False,
+        tail: Optional[str] = None,
+        since: Optional[str] = None,
+        sinceTime: Optional[str] = None,
+        previous: Optional[bool] = False,
+        max_concurrency: Optional[int] = 4
+    ) -> Dict[str, Any]:
+        """在资源所有匹配 (pod, 容器) 的日志中按正则搜索，只返回命中的行及其上下文
+
+        各容器的日志并发流式读取、逐行匹配，匹配数达到 max_matches 后所有流立即停止读取并关闭连接
+        （命中最后一条的流读完其后续上下文为止），未开始读取的容器直接跳过。
+
+        Args:
+            resource_type (Optional[str]): 资源类型，支持："pod", "deployment", "job", "cronjob"
+            resource_name (Optional[str]): 资源名称
+            pattern (str): 正则表达式，按 Python re 语法对每行日志内容（不含时间戳）执行 search
+            namespace (Optional[str], optional): 资源所在的命名空间
+            container (Optional[str], optional): 只搜索该容器
+            labelSelector (Optional[str], optional): 根据标签选择器过滤 pod
+            context_lines (int, optional): 每条命中前后附带的上下文行数
+            max_matches (int, optional): 命中条数上限，达到后停止读取
+            ignore_case (bool, optional): 是否忽略大小写
+            tail (Optional[str], optional): 每个容器只搜索最后 N 行
+            since (Optional[str], optional): 只搜索最近一段时间的日志，例如：（5s, 1m, 1h）
+            sinceTime (Optional[str], optional): 只搜索该时间（RFC3339）之后的日志
+            previous (Optional[bool], optional): 搜索容器上一次运行的日志
+            max_concurrency (Optional[int], optional): 同时读取日志的容器数上限
+
+        Raises:
+            ValueError: 不支持的资源类型或正则表达式无效
+
+        Returns:
+            Dict[str, Any]: {"matches": [...], "metadata": {...}}，命中按时间戳排序，每条包含 pod、container、timestamp、
+                line、before、after；metadata 中 truncated 表示因达到 max_matches 提前停止
+        """
+        try:
+            if resource_type not in ("pod", "deployment", "job", "cronjob"):
+                raise ValueError(f"Unsupported resource type: {resource_type}")
+            try:
+                regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+            except re.error as e:
+                raise ValueError(f"Invalid pattern {pattern!r}: {e}")
+
+            started = time.perf_counter()
+            targets = self._resolve_targets(resource_type, resource_name, namespace, container, labelSelector)
+            options = dict(tail=tail, since=since, sinceTime=sinceTime, previous=previous)
+            context_lines = max(0, context_lines)
+
+            matches: List[Dict[str, Any]] = []
+            errors: Dict[str, str] = {}
+            lock = threading.Lock()
+            done = threading.Event()
+            stats = {"searched": 0, "lines_scanned": 0}
+
+            def _scan(target: LogTarget) -> None:
+                if done.is_set():
+                    return
+                pod, container = target
+                before: deque = deque(maxlen=context_lines)
+                # 尚未收齐后续上下文的命中
+                pending: List[Dict[str, Any]] = []
+                scanned = 0
+                try:
+                    lines, close = self._open_log_stream(
+                        pod, namespace, False, 0, container=container, timestamps=True, **options
+                    )
+                    try:
+                        for line in lines:
+                            if not line:
+                                continue
+                            ts, _, message = line.partition(" ")
+                            scanned += 1
+                            if pending:
+                                for match in pending:
+                                    match["after"].append(message)
+                                pending = [m for m in pending if len(m["after"]) < context_lines]
+                            if done.is_set():
+                                if not pending:
+                                    break
+                                continue
+
+                            if regex.search(message):
+                                with lock:
+                                    if len(matches) < max_matches:
+                                        match = {
+                                            "pod": pod,
+                                            "container": container,
+                                            "timestamp": ts,
+                                            "line": message,
+                                            "before": list(before),
+                                            "after": [],
+                                        }
+                                        matches.append(match)
+                                        if context_lines:
+                                            pending.append(match)
+                                    if len(matches) >= max_matches:
+                                        done.set()
+                            before.append(message)
+                    finally:
+                        # 提前结束时关闭连接，不再下载剩余日志
+                        close()
+                except Exception as e:
+                    logger.warning(f"[search_logs] Failed to read logs of {pod}/{container}: {e}")
+                    with lock:
+                        errors[f"{pod}/{container}" if container else pod] = str(e)
+                with lock:
+                    stats["searched"] += 1
+                    stats["lines_scanned"] += scanned
+
+            workers = max(1, min(max_concurrency, len(targets)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search-logs") as pool:
+                list(pool.map(bind(_scan), targets))
+
+            matches.sort(key=lambda m: timestamp_key(m["timestamp"]))
+            logger.debug(
+                f"[search_logs] {len(matches)} matches in {stats['lines_scanned']} lines from "
+                f"{stats['searched']}/{len(targets)} containers in {time.perf_counter() - started:.3f}s"
+            )
+            return {
+                "matches": matches,
+                "metadata": {
+                    "matched": len(matches),
+                    "truncated": done.is_set(),
+                    "targets": len(targets),
+                    **stats,
+                    "errors": errors,
+                },
+            }
+
+        except Exception as e:
+            logger.error(f"[search_logs] Failed to search logs of {resource_type}/{resource_name}: {e}")
+            return [e]
@@ -3,10 +3,13 @@ import json
 from typing import Optional, List
 from utils.logger import logger
 from utils.functions import handle_kube_error
+from utils.executor import spawn
+from utils.kube_api import KubeApiClient, KubeApiUnavailable
 
 class ResourcePatch:
-    def __init__(self, env: Optional[str] = None) -> None:
+    def __init__(self, env: Optional[str] = None, api: Optional[KubeApiClient] = None) -> None:
         self.env = env
+        self.api = api
         
     def kubectl_patch(
         self,
@@ -29,6 +32,13 @@ class ResourcePatch:
         Returns:
             str: patch 执行结果或错误信息。
         """
+        if self.api is not None:
+            try:
+                self.api.patch(resource_type, resource_name, patch, namespace=namespace, patch_type=patch_type)
+                return f"{self.api.resolve(resource_type).display_name(resource_name)} patched"
+            except KubeApiUnavailable as e:
+                logger.warning(f"[kubectl_patch] API backend unavailable, fallback to kubectl: {e}")
+
         try:
             patch_str = json.dumps(patch)
             cmd = [
@@ -40,7 +50,10 @@ class ResourcePatch:
             ]
 
             logger.debug(f"Executing command: {' '.join(cmd)}")
-            result = subprocess.check_output(cmd, stderr=subprocess.STDOUT, text=True)
+            proc = spawn(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+            result, _ = proc.communicate()
+            if proc.returncode != 0:
+                raise subprocess.CalledProcessError(proc.returncode, cmd, output=result)
             return result.strip()
         except subprocess.CalledProcessError as e:
             logger.error(f"[kubectl_patch] Error: {e.output}")
@@ -0,0 +1,180 @@
+from typing import Optional, Any, Dict, List, Set, Tuple
+
+from utils.logger import logger
+from utils.functions import timeit, handle_kube_error, ResourceItems
+from utils.kube_api import KubeApiClient
+from utils.informer import InformerCache
+from utils.indexes import ObjectIndex, normalize_image
+from utils.selectors import parse_label_selector, parse_field_selector, match_selectors
+from utils.projection import build_rows
+from utils.resources_get_v1 import NODE_FIELDS, NAMESPACE_FIELDS, SERVICE_FIELDS, POD_FIELDS, DEPLOYMENT_FIELDS
+
+
+# 与 get_resources 相同的输出行，其他类型投影原始对象
+ROW_FIELDS = {
+    "pods": POD_FIELDS,
+    "deployments": DEPLOYMENT_FIELDS,
+    "services": SERVICE_FIELDS,
+    "nodes": NODE_FIELDS,
+    "namespaces": NAMESPACE_FIELDS,
+}
+
+# 按 owner 查询时经过的中间层：Deployment -> ReplicaSet -> Pod，CronJob -> Job -> Pod
+OWNER_CHAIN: Dict[str, Tuple[str, ...]] = {
+    "deployments": ("replicasets",),
+    "cronjobs": ("jobs",),
+}
+
+
+class ResourceQuery:
+    def __init__(
+        self,
+        env: Optional[str],
+        api: Optional[KubeApiClient] = None,
+        cache: Optional[InformerCache] = None,
+        sync_timeout: float = 10.0
+    ) -> None:
+        self.env = env
+        self.api = api
+        self.cache = cache
+        self.sync_timeout = sync_timeout
+
+    def _list_all(self, resource_type: str, namespace: Optional[str], **params: Any) -> List[Dict[str, Any]]:
+        items: List[Dict[str, Any]] = []
+        params = {k: v for k, v in params.items() if v}
+        params["limit"] = 500
+        while True:
+            doc = self.api.get(resource_type, namespace=namespace, all_namespace=namespace is None, **params)
+            items.extend(doc.get("items", []))
+            token = doc.get("metadata", {}).get("continue")
+            if not token:
+                return items
+            params["continue"] = token
+
+    def _index(
+        self,
+        resource_type: str,
+        namespace: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None
+    ) -> Tuple[ObjectIndex, Dict[str, Any]]:
+        """获取资源类型的索引：优先使用 informer 维护的索引，不可用时按一次 list 临时建立"""
+        if self.cache is not None:
+            index = self.cache.index(resource_type, wait=self.sync_timeout)
+            if index is not None:
+                return index, self.cache.informer(resource_type).metadata()
+
+        index = ObjectIndex()
+        for obj in self._list_all(resource_type, namespace, labelSelector=label_selector, fieldSelector=field_selector):
+            index.handle("ADDED", obj)
+        return index, {"source": "api"}
+
+    def _owner_uids(self, owner: str, namespace: Optional[str]) -> Set[str]:
+        """解析 owner（uid 或 kind/name），并展开 OWNER_CHAIN 中的中间层对象"""
+        kind, _, name = owner.partition("/")
+        if not name:
+            # 只给出 uid 时无法确定类型，依次尝试所有中间层
+            uids, chain = {owner}, tuple(c for chain in OWNER_CHAIN.values() for c in chain)
+        else:
+            info = self.api.resolve(kind)
+            owner_namespace = namespace if info.namespaced else None
+            index, _ = self._index(info.plural, owner_namespace)
+            candidates = index.lookup("namespace", owner_namespace) if owner_namespace else index.uids()
+            uids = {
+                obj["metadata"]["uid"] for obj in index.objects(candidates)
+                if obj.get("metadata", {}).get("name") == name
+            }
+            if not uids:
+                raise ValueError(f"Owner not found: {owner}")
+            chain = OWNER_CHAIN.get(info.plural, ())
+
+        for intermediate in chain:
+            index, _ = self._index(intermediate, namespace)
+            uids |= index.lookup("owner", *uids)
+        return uids
+
+    @handle_kube_error
+    @timeit
+    def query(
+        self,
+        resource_type: str = "pods",
+        namespace: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+        node: Optional[str] = None,
+        image: Optional[str] = None,
+        owner: Optional[str] = None,
+        fields: Optional[str] = None,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """在本地对象存储上按索引查询资源，只返回匹配的行
+
+        各条件先通过二级索引（namespace、node、image、owner uid、label key=value）得到候选集合，
+        从最小的集合开始求交集，再对候选对象完整求值 label/field 选择器。
+
+        Args:
+            resource_type (str, optional): 资源类型，默认为 pods
+            namespace (Optional[str], optional): 命名空间，为空时查询所有命名空间
+            label_selector (Optional[str], optional): label 选择器，如 'app=nginx,tier in (web,api)'
+            field_selector (Optional[str], optional): field 选择器，如 'status.phase=Running'，支持任意点分路径
+            node (Optional[str], optional): 所在节点名称
+            image (Optional[str], optional): 容器镜像，如 'nginx:1.25'；不带 tag 时匹配该仓库的所有版本
+            owner (Optional[str], optional): 所属对象，'kind/name'（如 deployment/web，经 ReplicaSet 展开）或 owner uid
+            fields (Optional[str], optional): 投影字段，逗号分隔的点分路径
+            max_items (Optional[int], optional): 最多返回的条数
+            max_bytes (Optional[int], optional): 返回结果序列化后的字节上限
+
+        Raises:
+            ValueError: 未启用 API 后端、选择器格式错误或 owner 不存在
+
+        Returns:
+            List[Dict[str, Any]]: 匹配的行，metadata 中包含数据来源与匹配数量
+        """
+        try:
+            if self.api is None:
+                raise ValueError("query requires the Kubernetes API backend (KUBE_BACKEND=api)")
+
+            info = self.api.resolve(resource_type)
+            namespace = namespace if info.namespaced else None
+            labels = parse_label_selector(label_selector)
+            field_requirements = parse_field_selector(field_selector)
+            index, metadata = self._index(info.plural, namespace, label_selector, field_selector)
+
+            candidates: List[Set[str]] = []
+            if namespace:
+                candidates.append(index.lookup("namespace", namespace))
+            if node:
+                candidates.append(index.lookup("node", node))
+            if image:
+                candidates.append(index.lookup("image", normalize_image(image)))
+            if owner:
+                candidates.append(index.lookup("owner", *self._owner_uids(owner, namespace)))
+            for op, key, values in labels:
+                if op in ("=", "in"):
+                    candidates.append(index.lookup("label", *(f"{key}={v}" for v in values)))
+            for path, op, expected in field_requirements:
+                if op == "=" and path == ("spec", "nodeName"):
+                    candidates.append(index.lookup("node", expected))
+                elif op == "=" and path == ("metadata", "namespace"):
+                    candidates.append(index.lookup("namespace", expected))
+
+            if candidates:
+                candidates.sort(key=len)
+                uids = candidates[0].intersection(*candidates[1:])
+            else:
+                uids = index.uids()
+
+            # 索引只做预筛选，!=、notin、存在性等条件在候选对象上求值
+            items = [obj for obj in index.objects(uids) if match_selectors(obj, labels, field_requirements)]
+            items.sort(key=lambda obj: (obj.get("metadata", {}).get("namespace") or "", obj.get("metadata", {}).get("name") or ""))
+            logger.debug(f"[query] {info.plural}: {len(items)} matched, {len(uids)} candidates of {len(index)} objects")
+
+            return build_rows(
+                ResourceItems(items, metadata={**metadata, "matched": len(items)}),
+                ROW_FIELDS.get(info.plural), fields, max_items, max_bytes
+            )
+
+        except Exception as e:
+            logger.error(f"[query] Failed to query {resource_type}: {e}")
+            return [e]
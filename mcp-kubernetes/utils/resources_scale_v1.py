@@ -1,13 +1,93 @@
 import subprocess
 
-from typing import Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any, List, Dict
 
 from utils.logger import logger
 from utils.functions import timeit, handle_kube_error
+from utils.executor import spawn, bind
+from utils.kube_api import KubeApiClient, KubeApiUnavailable
+
+
+SCALABLE_KINDS = ("deployment", "replicaset", "statefulset")
 
 class ResourceScale:
-    def __init__(self, env: Optional[str] = None) -> None:
+    def __init__(self, env: Optional[str] = None, api: Optional[KubeApiClient] = None) -> None:
         self.env = env
+        self.api = api
+
+    def _normalize_type(self, resource_type: Optional[str]) -> str:
+        kind = (resource_type or "").lower().split(".", 1)[0]
+        kind = {"deploy": "deployment", "rs": "replicaset", "sts": "statefulset"}.get(kind, kind.removesuffix("s"))
+        if kind not in SCALABLE_KINDS:
+            raise ValueError(f"Unsupport resource type: {resource_type}")
+        return kind
+
+    def _scale_one(
+        self,
+        resource_type: str,
+        resource_name: str,
+        replicas: Any,
+        namespace: Optional[str] = 'default'
+    ) -> str:
+        """修改单个对象的副本数，失败时抛出异常"""
+        resource_type = self._normalize_type(resource_type)
+
+        if self.api is not None:
+            try:
+                self.api.patch(
+                    resource_type,
+                    resource_name,
+                    {"spec": {"replicas": int(replicas)}},
+                    namespace=namespace,
+                    patch_type="merge",
+                    subresource="scale"
+                )
+                return f"{self.api.resolve(resource_type).display_name(resource_name)} scaled"
+            except KubeApiUnavailable as e:
+                logger.warning(f"[kubectl_scale_resources] API backend unavailable, fallback to kubectl: {e}")
+
+        cmd = [
+            "kubectl",
+            "--kubeconfig", self.env,
+            "scale",
+            "--replicas", str(replicas),
+            resource_type,
+            resource_name
+        ]
+
+        if namespace:
+            cmd += ["-n", namespace]
+
+        logger.debug(f"Exec cmd: {cmd}")
+
+        proc = spawn(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stdout, stderr = proc.communicate()
+
+        if proc.returncode != 0:
+            error_msg = stderr.decode().strip()
+            logger.error(f"[kubectl_scale_resources] Error running: {error_msg}")
+            raise RuntimeError(error_msg)
+
+        return stdout.decode().strip()
+
+    def _select_names(self, resource_type: str, namespace: Optional[str], label_selector: str) -> List[str]:
+        """按 label 选择器列出需要扩缩容的对象名称"""
+        if self.api is not None:
+            try:
+                listing = self.api.get(resource_type, namespace=namespace, labelSelector=label_selector)
+                return [obj["metadata"]["name"] for obj in listing.get("items", [])]
+            except KubeApiUnavailable as e:
+                logger.warning(f"[scale_resources] API backend unavailable, fallback to kubectl: {e}")
+
+        cmd = ["kubectl", "--kubeconfig", self.env, "get", resource_type, "-l", label_selector, "-o", "name"]
+        if namespace:
+            cmd += ["-n", namespace]
+        proc = spawn(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stdout, stderr = proc.communicate()
+        if proc.returncode != 0:
+            raise RuntimeError(stderr.decode().strip())
+        return [line.split("/", 1)[-1] for line in stdout.decode().split() if line]
 
     @handle_kube_error
     @timeit
@@ -30,33 +110,51 @@ class ResourceScale:
             Any: 回调结果
         """
         try:
-            cmd = [
-                "kubectl",
-                "--kubeconfig", self.env,
-                "scale",
-                "--replicas", replicas,
-                resource_type,
-                resource_name
-            ]
-            
-            if namespace:
-                cmd += ["-n", namespace]
-                
-            if resource_type not in ('deployment', 'replicaset', 'statefulset'):
-                raise ValueError(f"Unsupport resource type: {resource_type}")
-            
-            logger.debug(f"Exec cmd: {cmd}")
-            
-            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            stdout, stderr = proc.communicate()
-
-            if proc.returncode != 0:
-                error_msg = stderr.decode().strip()
-                logger.error(f"[kubectl_scale_resources] Error running: {error_msg}")
-                raise RuntimeError(error_msg)
-
-            return stdout.decode().strip()
-        
+            return self._scale_one(resource_type, resource_name, replicas, namespace)
         except subprocess.SubprocessError as e:
             logger.error(f"[kubectl_scale_resources] Subprocess error: {str(e)}")
-            return [e]
\ No newline at end of file
+            return [e]
+
+    @handle_kube_error
+    @timeit
+    def scale_resources(
+        self,
+        resource_type: str,
+        replicas: int,
+        resource_names: Optional[List[str]] = None,
+        namespace: Optional[str] = 'default',
+        label_selector: Optional[str] = None,
+        max_concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """批量扩建或缩减副本，多个对象并发提交
+
+        Args:
+            resource_type (str): 资源类型，目前支持：deployment, replicaset, statefulset
+            replicas (int): 副本数量
+            resource_names (Optional[List[str]], optional): 资源名称列表
+            namespace (Optional[str], optional): 资源所在命名空间，默认为default
+            label_selector (Optional[str], optional): label 选择器，与 resource_names 合并
+            max_concurrency (int, optional): 并发提交的对象数上限
+
+        Raises:
+            ValueError: 未指定任何对象
+
+        Returns:
+            List[Dict[str, Any]]: 每个对象的结果 {"name", "result"} 或 {"name", "error"}
+        """
+        names = list(dict.fromkeys(resource_names or []))
+        if label_selector:
+            names += [n for n in self._select_names(resource_type, namespace, label_selector) if n not in names]
+        if not names:
+            raise ValueError("No resources matched: provide resource_names or label_selector")
+
+        scale_one = bind(self._scale_one)
+
+        def _scale(name: str) -> Dict[str, Any]:
+            try:
+                return {"name": name, "result": scale_one(resource_type, name, replicas, namespace)}
+            except Exception as e:
+                return {"name": name, "error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(names))), thread_name_prefix="scale") as pool:
+            return list(pool.map(_scale, names))
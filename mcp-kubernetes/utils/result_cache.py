@@ -0,0 +1,261 @@
+import time
+import inspect
+import functools
+import threading
+
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from utils.logger import logger
+from utils.metrics import registry
+from utils.kube_api import RESOURCE_ALIASES
+from utils.singleflight import make_key
+
+
+RESULT_CACHE_REQUESTS = registry.counter(
+    "mcp_result_cache_requests_total",
+    "Read tool calls by result cache outcome (hit, miss, bypass)",
+    ("tool", "result")
+)
+RESULT_CACHE_EVICTIONS = registry.counter(
+    "mcp_result_cache_evictions_total",
+    "Result cache entries dropped by reason (invalidated, expired, lru)",
+    ("reason",)
+)
+
+# 写入某类资源后，由控制器派生的资源同样视为已变化
+DEPENDENT_KINDS: Dict[str, Tuple[str, ...]] = {
+    "deployments": ("replicasets", "pods"),
+    "replicasets": ("pods",),
+    "statefulsets": ("pods",),
+    "daemonsets": ("pods",),
+    "jobs": ("pods",),
+    "cronjobs": ("jobs", "pods"),
+    "services": ("endpoints",),
+    "customresourcedefinitions": ("apiresources",),
+}
+
+# 返回 (资源类型列表, 命名空间) 表示结果依赖的范围，返回 None 表示本次调用不走缓存
+Scope = Callable[[Dict[str, Any]], Optional[Tuple[Iterable[str], Optional[str]]]]
+
+
+# 由 (集群, 资源类型或 Kind) 解析出复数资源名，无法解析时抛出异常
+Resolver = Callable[[str, str], str]
+
+
+def canonical_kind(resource_type: str, resolve: Optional[Callable[[str], str]] = None) -> Optional[str]:
+    """将 pods、po、Pod、deployments.apps 等写法统一为复数资源名
+
+    内置别名表之外的类型（如 CRD 的 Kind 与复数名）通过 resolve 查询集群的发现信息，无法解析时返回 None。
+    """
+    name = resource_type.strip().lower()
+    short = name.split(".", 1)[0]
+    if short in RESOURCE_ALIASES:
+        return RESOURCE_ALIASES[short]
+    if short in RESOURCE_ALIASES.values() or short == "apiresources":
+        return short
+    if resolve is not None and name:
+        try:
+            return resolve(name)
+        except Exception:
+            pass
+    return None
+
+
+class _Entry(NamedTuple):
+    expires: float
+    clusters: FrozenSet[str]
+    kinds: FrozenSet[str]
+    namespace: Optional[str]
+    value: Any
+
+
+def _cacheable(result: Any) -> bool:
+    """失败结果不缓存：工具的 "[tool] Failed: ..." 字符串、包含异常的列表、多集群查询中有集群出错"""
+    if result is None or result is False:
+        return False
+    if isinstance(result, str):
+        return "Failed: " not in result[:200] and not result.startswith("Error")
+    if isinstance(result, list):
+        return not any(isinstance(item, Exception) for item in result)
+    if isinstance(result, dict) and "results" in result:
+        return not result.get("errors")
+    return True
+
+
+class ResultCache:
+    """
+    只读工具结果的 TTL 缓存，按 LRU 限制条目数
+
+    每个条目记录所属集群、资源类型与命名空间；写入类工具调用 invalidate 后，同一集群中类型相同
+    （含派生类型）且命名空间重叠的条目立即失效。未指定命名空间的条目视为覆盖所有命名空间。
+    资源类型经 resolver 统一为复数资源名，写入的类型无法解析时使该命名空间的全部条目失效。
+    """
+
+    def __init__(self, ttl: float = 10.0, max_entries: int = 256, resolver: Optional[Resolver] = None) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.resolver = resolver
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # 每次失效递增，读取期间发生过写入的结果不写入缓存
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _canonical(self, cluster: str, resource_type: str) -> Optional[str]:
+        resolve = None
+        if self.resolver is not None:
+            resolve = functools.partial(self.resolver, cluster)
+        return canonical_kind(resource_type, resolve)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry.expires <= time.monotonic():
+                del self._entries[key]
+                RESULT_CACHE_EVICTIONS.inc("expired")
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry.value
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        clusters: Iterable[str],
+        kinds: Iterable[str],
+        namespace: Optional[str],
+        generation: int
+    ) -> None:
+        clusters = frozenset(clusters)
+        canonical = set()
+        for kind in kinds:
+            for cluster in clusters:
+                canonical.add(self._canonical(cluster, kind) or kind.strip().lower())
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = _Entry(
+                time.monotonic() + self.ttl,
+                clusters,
+                frozenset(canonical),
+                namespace,
+                value
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                RESULT_CACHE_EVICTIONS.inc("lru")
+
+    def invalidate(self, clusters: Iterable[str], kinds: Optional[Iterable[str]] = None, namespace: Optional[str] = None) -> int:
+        """
+        使受写入影响的条目失效
+
+        Args:
+            clusters (Iterable[str]): 发生写入的集群（kubeconfig context 名称）
+            kinds (Optional[Iterable[str]]): 写入的资源类型或 Kind，None、包含 namespaces 或无法解析时使该集群（该命名空间）的全部条目失效
+            namespace (Optional[str]): 写入的命名空间，None 表示集群级资源或不确定，匹配所有命名空间
+
+        Returns:
+            int: 失效的条目数
+        """
+        # 各集群分别解析，同一 CRD 在不同集群中可能不存在
+        affected: Dict[str, Optional[Set[str]]] = {}
+        for cluster in set(clusters):
+            affected[cluster] = None
+            if kinds is None:
+                continue
+            plurals = set()
+            for kind in kinds:
+                plural = self._canonical(cluster, kind)
+                if plural is None or plural == "namespaces":
+                    plurals = None
+                    break
+                plurals.add(plural)
+                plurals.update(DEPENDENT_KINDS.get(plural, ()))
+            affected[cluster] = plurals
+
+        with self._lock:
+            self._generation += 1
+            stale = [
+                key for key, entry in self._entries.items()
+                if any(
+                    cluster in affected and (affected[cluster] is None or entry.kinds & affected[cluster])
+                    for cluster in entry.clusters
+                )
+                and (namespace is None or entry.namespace is None or entry.namespace == namespace)
+            ]
+            for key in stale:
+                del self._entries[key]
+        if stale:
+            RESULT_CACHE_EVICTIONS.inc("invalidated", amount=len(stale))
+            logger.debug(f"[result_cache] Invalidated {len(stale)} entries for {list(kinds) if kinds is not None else 'all kinds'} in {namespace or 'all namespaces'}")
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def cached(
+        self,
+        scope: Scope,
+        targets: Callable[[Optional[str]], List[str]]
+    ) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+        """
+        缓存异步只读工具的结果，工具需声明 no_cache 参数（为 True 时跳过缓存并刷新条目）
+
+        Args:
+            scope (Scope): 由绑定后的工具参数计算结果依赖的资源类型与命名空间
+            targets (Callable[[Optional[str]], List[str]]): 将 cluster 参数解析为集群列表，如 ClusterRegistry.targets
+        """
+        def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+            name = func.__name__
+            signature = inspect.signature(func)
+
+            @functools.wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return await func(*args, **kwargs)
+
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                arguments = dict(bound.arguments)
+                no_cache = arguments.pop("no_cache", False)
+                resolved = scope(arguments)
+                if resolved is None:
+                    RESULT_CACHE_REQUESTS.inc(name, "bypass")
+                    return await func(*args, **kwargs)
+
+                try:
+                    clusters = targets(arguments.get("cluster"))
+                except Exception:
+                    # 集群参数无效时交给工具本身报错
+                    return await func(*args, **kwargs)
+                key = make_key(name, sorted(clusters), **arguments)
+
+                if not no_cache:
+                    hit, value = self.get(key)
+                    if hit:
+                        RESULT_CACHE_REQUESTS.inc(name, "hit")
+                        return value
+                RESULT_CACHE_REQUESTS.inc(name, "bypass" if no_cache else "miss")
+
+                generation = self._generation
+                result = await func(*args, **kwargs)
+                if _cacheable(result):
+                    kinds, namespace = resolved
+                    self.put(key, result, clusters, kinds, namespace, generation)
+                return result
+
+            return wrapper
+
+        return decorator
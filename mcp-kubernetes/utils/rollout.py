@@ -0,0 +1,277 @@
+import queue
+import subprocess
+import threading
+import time
+
+from typing import Optional, Any, Dict, List, Tuple, Iterator
+
+from utils.logger import logger
+from utils.executor import spawn, bind
+from utils.kube_api import KubeApiClient, KubeApiError, KubeApiUnavailable
+
+
+# 与 kubectl rollout status 一致的三种状态
+PROGRESSING, READY, FAILED = "progressing", "ready", "failed"
+
+# kubectl rollout status 支持的资源类型
+_KUBECTL_ROLLOUT_KINDS = ("deployment", "statefulset", "daemonset")
+
+
+def _observed(obj: Dict[str, Any]) -> bool:
+    generation = obj.get("metadata", {}).get("generation")
+    observed = obj.get("status", {}).get("observedGeneration")
+    return generation is None or observed is None or observed >= generation
+
+
+def rollout_status(obj: Dict[str, Any]) -> Tuple[str, str]:
+    """按 kubectl rollout status 的规则判断对象的发布进度
+
+    Args:
+        obj (Dict[str, Any]): Deployment、StatefulSet、DaemonSet、ReplicaSet 或其他对象
+
+    Returns:
+        Tuple[str, str]: (progressing/ready/failed, 进度说明)
+    """
+    kind = obj.get("kind", "")
+    spec = obj.get("spec", {})
+    status = obj.get("status", {})
+
+    if not _observed(obj):
+        return PROGRESSING, f"Waiting for {kind.lower()} spec update to be observed..."
+
+    if kind == "Deployment":
+        for cond in status.get("conditions", []):
+            if cond.get("type") == "Progressing" and cond.get("reason") == "ProgressDeadlineExceeded":
+                return FAILED, "exceeded its progress deadline"
+        desired = spec.get("replicas", 1)
+        updated = status.get("updatedReplicas", 0)
+        replicas = status.get("replicas", 0)
+        available = status.get("availableReplicas", 0)
+        if updated < desired:
+            return PROGRESSING, f"Waiting for rollout to finish: {updated} out of {desired} new replicas have been updated..."
+        if replicas > updated:
+            return PROGRESSING, f"Waiting for rollout to finish: {replicas - updated} old replicas are pending termination..."
+        if available < updated:
+            return PROGRESSING, f"Waiting for rollout to finish: {available} of {updated} updated replicas are available..."
+        return READY, f"successfully rolled out ({available}/{desired} available)"
+
+    if kind == "StatefulSet":
+        desired = spec.get("replicas", 1)
+        ready = status.get("readyReplicas", 0)
+        if ready < desired:
+            return PROGRESSING, f"Waiting for {desired - ready} pods to be ready..."
+        strategy = spec.get("updateStrategy", {})
+        partition = (strategy.get("rollingUpdate") or {}).get("partition") or 0
+        if strategy.get("type", "RollingUpdate") == "RollingUpdate":
+            if partition:
+                updated = status.get("updatedReplicas", 0)
+                if updated < desired - partition:
+                    return PROGRESSING, f"Waiting for partitioned roll out to finish: {updated} out of {desired - partition} new pods have been updated..."
+                return READY, f"partitioned roll out complete: {updated} new pods have been updated"
+            if status.get("updateRevision") != status.get("currentRevision"):
+                return PROGRESSING, (
+                    f"waiting for statefulset rolling update to complete {status.get('updatedReplicas', 0)} "
+                    f"pods at revision {status.get('updateRevision')}..."
+                )
+        return READY, f"roll out complete: {ready}/{desired} pods ready"
+
+    if kind == "DaemonSet":
+        desired = status.get("desiredNumberScheduled", 0)
+        updated = status.get("updatedNumberScheduled", 0)
+        available = status.get("numberAvailable", 0)
+        if updated < desired:
+            return PROGRESSING, f"Waiting for daemon set rollout to finish: {updated} out of {desired} new pods have been updated..."
+        if available < desired:
+            return PROGRESSING, f"Waiting for daemon set rollout to finish: {available} of {desired} updated pods are available..."
+        return READY, f"successfully rolled out ({available}/{desired} available)"
+
+    if kind == "ReplicaSet":
+        desired = spec.get("replicas", 1)
+        ready = status.get("readyReplicas", 0)
+        replicas = status.get("replicas", 0)
+        if ready < desired or replicas != desired:
+            return PROGRESSING, f"Waiting for replica set: {ready} of {desired} replicas ready, {replicas} running..."
+        return READY, f"{ready}/{desired} replicas ready"
+
+    return READY, "updated, no rollout to wait for"
+
+
+class RolloutWatcher:
+    """等待对象发布完成
+
+    API 后端先 list 一次拿到 resourceVersion，然后在同一个 watch 连接上等待所有目标对象收敛，
+    不再由调用方反复全量查询；API 不可用时并发执行 kubectl rollout status。
+    """
+
+    def __init__(self, env: Optional[str], api: Optional[KubeApiClient] = None) -> None:
+        self.env = env
+        self.api = api
+
+    def _api_wait(
+        self,
+        resource_type: str,
+        names: List[str],
+        namespace: Optional[str],
+        timeout: float
+    ) -> Iterator[Dict[str, Any]]:
+        deadline = time.monotonic() + timeout
+        pending = set(names)
+        last: Dict[str, str] = {}
+        # 单个对象时用 fieldSelector 只 watch 该对象
+        selector = {"fieldSelector": f"metadata.name={names[0]}"} if len(names) == 1 else {}
+
+        def _evaluate(obj: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            name = obj.get("metadata", {}).get("name")
+            state, message = rollout_status(obj)
+            if state != PROGRESSING:
+                pending.discard(name)
+            elif last.get(name) == message:
+                return None
+            last[name] = message
+            return {"name": name, "state": state, "message": message}
+
+        while pending:
+            listing = self.api.get(resource_type, namespace=namespace, **selector)
+            found = set()
+            for obj in listing.get("items", []):
+                name = obj.get("metadata", {}).get("name")
+                if name in pending:
+                    found.add(name)
+                    if (event := _evaluate(obj)) is not None:
+                        yield event
+            for name in pending - found:
+                pending.discard(name)
+                yield {"name": name, "state": FAILED, "message": "not found"}
+
+            remaining = deadline - time.monotonic()
+            if not pending or remaining <= 0:
+                break
+
+            try:
+                for event in self.api.watch(
+                    resource_type,
+                    namespace=namespace,
+                    resource_version=listing.get("metadata", {}).get("resourceVersion"),
+                    timeout_seconds=max(1, int(remaining)),
+                    **selector
+                ):
+                    obj = event.get("object", {})
+                    name = obj.get("metadata", {}).get("name")
+                    if event.get("type") == "BOOKMARK" or name not in pending:
+                        continue
+                    if event.get("type") == "DELETED":
+                        pending.discard(name)
+                        yield {"name": name, "state": FAILED, "message": "deleted while waiting"}
+                    elif (result := _evaluate(obj)) is not None:
+                        yield result
+                    if not pending:
+                        break
+            except KubeApiError as e:
+                # resourceVersion 过期（410 Gone）时重新 list
+                if e.status_code != 410:
+                    raise
+                logger.debug(f"[rollout] Watch expired, relisting: {e}")
+
+            if time.monotonic() >= deadline:
+                break
+
+        for name in sorted(pending):
+            yield {
+                "name": name,
+                "state": FAILED,
+                "message": f"timed out after {timeout}s: {last.get(name, 'no status observed')}"
+            }
+
+    def _kubectl_wait(
+        self,
+        resource_type: str,
+        names: List[str],
+        namespace: Optional[str],
+        timeout: float
+    ) -> Iterator[Dict[str, Any]]:
+        kind = resource_type.lower().split(".", 1)[0].removesuffix("s")
+        if kind in ("deploy", "sts", "ds"):
+            kind = {"deploy": "deployment", "sts": "statefulset", "ds": "daemonset"}[kind]
+        if kind not in _KUBECTL_ROLLOUT_KINDS:
+            for name in names:
+                yield {"name": name, "state": READY, "message": f"rollout status is not supported for {resource_type}, not waited"}
+            return
+
+        events: queue.Queue = queue.Queue()
+
+        def _watch(name: str) -> None:
+            cmd = [
+                "kubectl", "--kubeconfig", self.env,
+                "rollout", "status", f"{kind}/{name}",
+                f"--timeout={int(timeout)}s",
+            ]
+            if namespace:
+                cmd += ["-n", namespace]
+            logger.debug(f"Exec cmd: {' '.join(cmd)}")
+            try:
+                proc = spawn(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+                for line in proc.stdout:
+                    if line.strip():
+                        events.put({"name": name, "state": PROGRESSING, "message": line.strip()})
+                stderr = proc.stderr.read().strip()
+                if proc.wait() == 0:
+                    events.put({"name": name, "state": READY, "message": "successfully rolled out"})
+                else:
+                    events.put({"name": name, "state": FAILED, "message": stderr or f"exit code {proc.returncode}"})
+            except Exception as e:
+                events.put({"name": name, "state": FAILED, "message": str(e)})
+
+        watch = bind(_watch)
+        for name in names:
+            threading.Thread(target=watch, args=(name,), name=f"rollout-{name}", daemon=True).start()
+
+        finished = 0
+        while finished < len(names):
+            event = events.get()
+            if event["state"] != PROGRESSING:
+                finished += 1
+            yield event
+
+    def wait(
+        self,
+        resource_type: str,
+        names: List[str],
+        namespace: Optional[str] = "default",
+        timeout: float = 300
+    ) -> Iterator[Dict[str, Any]]:
+        """等待一个或多个同类型对象发布完成，进度变化时逐条产出
+
+        Args:
+            resource_type (str): 资源类型，如 deployment、statefulset、daemonset
+            names (List[str]): 对象名称列表
+            namespace (Optional[str], optional): 命名空间，默认为default
+            timeout (float, optional): 等待超时（秒）
+
+        Yields:
+            Iterator[Dict[str, Any]]: {"name", "state": progressing/ready/failed, "message"}，
+                每个对象最后一条事件的 state 为 ready 或 failed
+        """
+        if not names:
+            return
+        deadline = time.monotonic() + timeout
+        if self.api is not None:
+            yielded = False
+            finished = set()
+            try:
+                for event in self._api_wait(resource_type, names, namespace, timeout):
+                    yielded = True
+                    if event["state"] != PROGRESSING:
+                        finished.add(event["name"])
+                    yield event
+                return
+            except KubeApiUnavailable as e:
+                if yielded:
+                    # 已产出过进度时不再从头回退，避免重复事件与重新计时；未完成的对象报告为失败
+                    logger.warning(f"[rollout] API backend lost during wait: {e}")
+                    for name in names:
+                        if name not in finished:
+                            yield {"name": name, "state": FAILED, "message": f"API backend lost while waiting: {e}"}
+                    return
+                logger.warning(f"[rollout] API backend unavailable, fallback to kubectl: {e}")
+
+        yield from self._kubectl_wait(resource_type, names, namespace, max(1.0, deadline - time.monotonic()))
@@ -0,0 +1,111 @@
+import re
+
+from typing import Optional, Any, Dict, List, Tuple
+
+
+# 单个 label 选择条件：key=v、key==v、key!=v、key in (a,b)、key notin (a,b)、key、!key
+_LABEL_REQUIREMENT = re.compile(
+    r"\s*(?:!\s*(?P<absent>[\w./-]+)"
+    r"|(?P<key>[\w./-]+)\s*(?:(?P<op>==|=|!=)\s*(?P<value>[\w.-]*)"
+    r"|\s+(?P<set_op>in|notin)\s*\((?P<values>[^)]*)\))?)\s*(?:,|$)"
+)
+
+LabelRequirement = Tuple[str, str, Tuple[str, ...]]
+FieldRequirement = Tuple[Tuple[str, ...], str, str]
+
+
+def parse_label_selector(selector: Optional[str]) -> List[LabelRequirement]:
+    """解析 label 选择器，返回 (操作符, key, 取值) 列表
+
+    Args:
+        selector (Optional[str]): label 选择器，如 'app=nginx,tier in (web,api),!canary'
+
+    Raises:
+        ValueError: 选择器格式错误
+
+    Returns:
+        List[LabelRequirement]: 解析后的选择条件
+    """
+    requirements: List[LabelRequirement] = []
+    if not selector or not selector.strip():
+        return requirements
+
+    pos = 0
+    while pos < len(selector):
+        m = _LABEL_REQUIREMENT.match(selector, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"Invalid label selector: {selector}")
+        pos = m.end()
+
+        if m.group("absent"):
+            requirements.append(("!", m.group("absent"), ()))
+        elif m.group("op"):
+            op = "=" if m.group("op") == "==" else m.group("op")
+            requirements.append((op, m.group("key"), (m.group("value"),)))
+        elif m.group("set_op"):
+            values = tuple(v.strip() for v in m.group("values").split(",") if v.strip())
+            requirements.append((m.group("set_op"), m.group("key"), values))
+        else:
+            requirements.append(("exists", m.group("key"), ()))
+
+    return requirements
+
+
+def match_labels(labels: Optional[Dict[str, str]], requirements: List[LabelRequirement]) -> bool:
+    labels = labels or {}
+    for op, key, values in requirements:
+        present = key in labels
+        value = labels.get(key)
+        if op == "=" and value != values[0]:
+            return False
+        if op == "!=" and present and value == values[0]:
+            return False
+        if op == "in" and value not in values:
+            return False
+        if op == "notin" and present and value in values:
+            return False
+        if op == "exists" and not present:
+            return False
+        if op == "!" and present:
+            return False
+    return True
+
+
+def parse_field_selector(selector: Optional[str]) -> List[FieldRequirement]:
+    """解析 field 选择器，如 'status.phase=Running,spec.nodeName!=node-1'"""
+    requirements: List[FieldRequirement] = []
+    if not selector or not selector.strip():
+        return requirements
+
+    for part in selector.split(","):
+        m = re.fullmatch(r"\s*([\w.]+)\s*(==|=|!=)\s*(.*?)\s*", part)
+        if not m:
+            raise ValueError(f"Invalid field selector: {selector}")
+        op = "=" if m.group(2) == "==" else m.group(2)
+        requirements.append((tuple(m.group(1).split(".")), op, m.group(3)))
+    return requirements
+
+
+def get_path(obj: Any, path: Tuple[str, ...]) -> Any:
+    for key in path:
+        if not isinstance(obj, dict):
+            return None
+        obj = obj.get(key)
+    return obj
+
+
+def match_fields(obj: Dict[str, Any], requirements: List[FieldRequirement]) -> bool:
+    for path, op, expected in requirements:
+        value = get_path(obj, path)
+        value = "" if value is None else str(value).lower() if isinstance(value, bool) else str(value)
+        if (op == "=") != (value == expected):
+            return False
+    return True
+
+
+def match_selectors(
+    obj: Dict[str, Any],
+    labels: List[LabelRequirement],
+    fields: List[FieldRequirement]
+) -> bool:
+    return match_labels(obj.get("metadata", {}).get("labels"), labels) and match_fields(obj, fields)
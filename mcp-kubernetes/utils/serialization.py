@@ -0,0 +1,35 @@
+import yaml
+
+from typing import Any, Iterable, Iterator
+
+# 优先使用 libyaml 的 C 实现，未编译 libyaml 时回退到纯 Python 实现
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as _SafeDumper
+    LIBYAML = True
+except ImportError:
+    from yaml import SafeLoader, SafeDumper as _SafeDumper
+    LIBYAML = False
+
+
+class NoAliasDumper(_SafeDumper):
+    """不生成 &id001/*id001 锚点与别名，重复引用的对象按原样展开"""
+
+    def ignore_aliases(self, data: Any) -> bool:
+        return True
+
+
+def load_yaml(text: str) -> Any:
+    return yaml.load(text, Loader=SafeLoader)
+
+
+def load_all_yaml(text: str) -> Iterator[Any]:
+    return yaml.load_all(text, Loader=SafeLoader)
+
+
+def dump_yaml(data: Any, sort_keys: bool = False, **kwargs: Any) -> str:
+    return yaml.dump(data, Dumper=NoAliasDumper, sort_keys=sort_keys, allow_unicode=True, **kwargs)
+
+
+def dump_all_yaml(documents: Iterable[Any], sort_keys: bool = False, **kwargs: Any) -> str:
+    return yaml.dump_all(documents, Dumper=NoAliasDumper, sort_keys=sort_keys, allow_unicode=True, **kwargs)
+
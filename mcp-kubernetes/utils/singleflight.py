@@ -0,0 +1,93 @@
+import json
+import asyncio
+import functools
+
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from utils.logger import logger
+from utils.metrics import registry
+
+
+SINGLE_FLIGHT_REQUESTS = registry.counter(
+    "mcp_single_flight_requests_total",
+    "Read tool calls by single-flight outcome (miss: ran the backend call, hit: shared an in-flight call)",
+    ("tool", "result")
+)
+
+
+class _Flight:
+    """一次进行中的后端调用及等待它的调用方数量"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[Any]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    合并并发的相同只读请求：同一 key 在进行中时，后续调用方等待并共享第一个调用的结果，不再重复访问后端。
+
+    只合并同时进行的调用，调用完成后立即移出，不缓存结果；所有等待方都取消时才取消后端调用。
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    async def do(self, tool: str, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        执行或加入 key 对应的调用
+
+        Args:
+            tool (str): 工具名称，用于计数器标签
+            key (Hashable): 请求标识，相同 key 的并发调用共享一次执行
+            factory (Callable[[], Awaitable[Any]]): 未命中时创建后端调用的协程工厂
+
+        Returns:
+            Any: 后端调用的结果（命中时与首个调用方为同一对象）
+        """
+        if not self.enabled:
+            return await factory()
+
+        flight = self._flights.get(key)
+        if flight is None:
+            SINGLE_FLIGHT_REQUESTS.inc(tool, "miss")
+            flight = self._flights[key] = _Flight(asyncio.ensure_future(factory()))
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            SINGLE_FLIGHT_REQUESTS.inc(tool, "hit")
+            logger.debug(f"[single_flight] {tool} joined in-flight call ({flight.waiters} waiting)")
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def coalesce(self, func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """按工具名及参数合并并发的相同调用，用于 executor.offload 之上的只读工具"""
+        name = func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return await self.do(name, make_key(name, *args, **kwargs), lambda: func(*args, **kwargs))
+
+        return wrapper
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+
+def make_key(name: str, /, *args: Any, **kwargs: Any) -> str:
+    """按参数值生成请求标识，关键字参数按名称排序，保证参数顺序不同的相同请求得到相同的 key"""
+    return json.dumps([name, args, kwargs], sort_keys=True, default=str, separators=(",", ":"))
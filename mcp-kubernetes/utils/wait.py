@@ -0,0 +1,361 @@
+import re
+import subprocess
+import threading
+import time
+
+from typing import Optional, Any, Dict, List, NamedTuple, Tuple
+
+from utils.logger import logger
+from utils.functions import timeit, handle_kube_error
+from utils.executor import spawn
+from utils.kube_api import KubeApiClient, KubeApiUnavailable
+from utils.informer import Informer, InformerCache, object_key
+from utils.selectors import parse_label_selector, match_labels
+
+# 条件未变化时也定期重新求值，覆盖 watch 重连、快照数据转为实时数据等不产生事件的情况
+_RECHECK_INTERVAL = 1.0
+
+# 结果中最多列出的对象数
+_MAX_REPORTED = 20
+
+_PATH_TOKEN = re.compile(r"\[(\d+)\]|([^.\[\]]+)")
+
+
+class Condition(NamedTuple):
+    """等待条件：type 为 phase、condition、jsonpath 或 delete"""
+    type: str
+    expression: str
+    path: Tuple[Any, ...] = ()
+    expected: Optional[str] = None
+
+
+def _parse_path(expression: str) -> Tuple[Any, ...]:
+    """解析 .status.containerStatuses[0].ready 形式的路径，数组下标解析为 int"""
+    path = expression.strip().lstrip(".")
+    tokens: List[Any] = []
+    pos = 0
+    while pos < len(path):
+        if path[pos] == ".":
+            pos += 1
+            continue
+        m = _PATH_TOKEN.match(path, pos)
+        if not m:
+            raise ValueError(f"Unsupported jsonpath: {expression}")
+        tokens.append(int(m.group(1)) if m.group(1) is not None else m.group(2))
+        pos = m.end()
+    if not tokens:
+        raise ValueError(f"Empty jsonpath: {expression}")
+    return tuple(tokens)
+
+
+def parse_condition(expression: str) -> Condition:
+    """解析与 kubectl wait --for 相近的条件表达式
+
+    支持：
+      - phase=Running                         status.phase 等于给定值（不区分大小写）
+      - condition=Ready / condition=Ready=False status.conditions 中该类型的 status，默认 True
+      - jsonpath={.status.readyReplicas}=3    路径取值等于给定值；省略 =值 时要求取值非空
+      - delete                                对象不存在（已删除）
+
+    Raises:
+        ValueError: 表达式格式错误
+
+    Returns:
+        Condition: 解析后的条件
+    """
+    text = (expression or "").strip()
+    kind, _, rest = text.partition("=")
+    kind = kind.strip().lower()
+
+    if kind == "delete" and not rest:
+        return Condition("delete", text)
+    if kind == "phase" and rest.strip():
+        return Condition("phase", text, ("status", "phase"), rest.strip())
+    if kind == "condition" and rest.strip():
+        name, _, status = rest.partition("=")
+        return Condition("condition", text, (name.strip(),), (status.strip() or "True"))
+    if kind == "jsonpath" and rest.strip():
+        rest = rest.strip()
+        if rest.startswith("{"):
+            end = rest.find("}")
+            if end < 0:
+                raise ValueError(f"Unterminated jsonpath: {expression}")
+            path, remainder = rest[1:end], rest[end + 1:].strip()
+            if remainder and not remainder.startswith("="):
+                raise ValueError(f"Invalid jsonpath condition: {expression}")
+            expected = remainder[1:] if remainder else None
+        else:
+            path, sep, expected = rest.partition("=")
+            expected = expected if sep else None
+        return Condition("jsonpath", text, _parse_path(path), expected.strip() if expected is not None else None)
+
+    raise ValueError(
+        f"Invalid condition: {expression!r}, expected phase=<Phase>, condition=<Type>[=<Status>], "
+        f"jsonpath={{.path}}[=<value>] or delete"
+    )
+
+
+def _lookup(obj: Any, path: Tuple[Any, ...]) -> Any:
+    for key in path:
+        if isinstance(key, int):
+            if not isinstance(obj, list) or key >= len(obj):
+                return None
+            obj = obj[key]
+        elif isinstance(obj, dict):
+            obj = obj.get(key)
+        else:
+            return None
+    return obj
+
+
+def _text(value: Any) -> str:
+    return str(value).lower() if isinstance(value, bool) else str(value)
+
+
+def evaluate(condition: Condition, obj: Dict[str, Any]) -> Tuple[bool, Any]:
+    """对单个对象求值条件，返回 (是否满足, 观察到的取值)"""
+    if condition.type == "phase":
+        observed = _lookup(obj, condition.path)
+        return observed is not None and _text(observed).lower() == condition.expected.lower(), observed
+
+    if condition.type == "condition":
+        wanted = condition.path[0].lower()
+        for cond in obj.get("status", {}).get("conditions") or []:
+            if str(cond.get("type", "")).lower() == wanted:
+                observed = cond.get("status")
+                return _text(observed).lower() == condition.expected.lower(), observed
+        return False, None
+
+    if condition.type == "jsonpath":
+        observed = _lookup(obj, condition.path)
+        if condition.expected is None:
+            return observed not in (None, "", [], {}), observed
+        return observed is not None and _text(observed) == condition.expected, observed
+
+    # delete：对象仍然存在
+    return False, "exists"
+
+
+class _Subscription:
+    """注册到 informer 的回调：只保留名称/命名空间/label 匹配的对象，变化时唤醒等待方"""
+
+    def __init__(
+        self,
+        name: Optional[str],
+        namespace: Optional[str],
+        label_selector: Optional[str]
+    ) -> None:
+        self.name = name
+        self.namespace = namespace
+        self.labels = parse_label_selector(label_selector)
+        self.objects: Dict[str, Dict[str, Any]] = {}
+        self.changed = threading.Event()
+        self.lock = threading.Lock()
+
+    def handle(self, event_type: str, obj: Dict[str, Any]) -> None:
+        metadata = obj.get("metadata", {})
+        if self.name is not None and metadata.get("name") != self.name:
+            return
+        if self.namespace is not None and metadata.get("namespace") != self.namespace:
+            return
+        if not match_labels(metadata.get("labels"), self.labels):
+            return
+        with self.lock:
+            if event_type == "DELETED":
+                self.objects.pop(object_key(obj), None)
+            else:
+                self.objects[object_key(obj)] = obj
+        self.changed.set()
+
+    def current(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return list(self.objects.values())
+
+
+class ConditionWaiter:
+    """等待对象满足条件
+
+    InformerCache.SHARED_KINDS 中的类型，所有等待方共享该类型的 informer（一条 list + watch 连接），
+    各自注册回调、只关注匹配的对象，条件满足或超时后注销；其他类型或未启用 informer 时，本次等待单独建立一条
+    限定命名空间、名称与 label 的 watch，kubectl 后端回退为 kubectl wait。
+    """
+
+    def __init__(
+        self,
+        env: Optional[str],
+        api: Optional[KubeApiClient] = None,
+        cache: Optional[InformerCache] = None
+    ) -> None:
+        self.env = env
+        self.api = api
+        self.cache = cache
+
+    def _trusted(self, informer: Informer) -> bool:
+        """informer 已同步、不是快照数据、watch 未断开过久且已观察到本进程的写入时，才据其判断条件已满足"""
+        max_staleness = self.cache.max_staleness if self.cache is not None else 30.0
+        return (
+            informer.synced.is_set()
+            and informer.restored_from is None
+            and informer.stale_seconds() <= max_staleness
+            and (self.cache is None or self.cache.caught_up(informer))
+        )
+
+    def _watch_wait(
+        self,
+        condition: Condition,
+        resource_type: str,
+        name: Optional[str],
+        namespace: Optional[str],
+        label_selector: Optional[str],
+        timeout: float
+    ) -> Dict[str, Any]:
+        started = time.monotonic()
+        deadline = started + timeout
+        info = self.api.resolve(resource_type)
+        namespace = namespace if info.namespaced else None
+
+        if self.cache is not None and self.cache.shares(info.plural):
+            informer, shared = self.cache.informer(info.plural), True
+        else:
+            # 其他类型只为本次等待建立限定命名空间、名称与 label 的 watch，服务端超时与等待时长一致，连接随等待结束关闭
+            informer = Informer(
+                self.api,
+                info.plural,
+                watch_timeout=max(1, int(timeout) + 1),
+                namespace=namespace,
+                label_selector=label_selector,
+                field_selector=f"metadata.name={name}" if name else None
+            ).start()
+            shared = False
+
+        subscription = _Subscription(name, namespace, label_selector)
+        informer.add_handler(subscription.handle)
+        try:
+            while True:
+                subscription.changed.clear()
+                objects = subscription.current()
+                results = []
+                for obj in objects:
+                    ok, observed = evaluate(condition, obj)
+                    metadata = obj.get("metadata", {})
+                    results.append({
+                        "name": metadata.get("name"),
+                        "namespace": metadata.get("namespace"),
+                        "satisfied": ok,
+                        "observed": observed,
+                    })
+                if condition.type == "delete":
+                    satisfied = not objects
+                else:
+                    # 按名称或选择器等待时至少要有一个对象，且全部满足
+                    satisfied = bool(results) and all(r["satisfied"] for r in results)
+
+                remaining = deadline - time.monotonic()
+                if (satisfied and self._trusted(informer)) or remaining <= 0:
+                    break
+                subscription.changed.wait(min(remaining, _RECHECK_INTERVAL))
+        finally:
+            informer.remove_handler(subscription.handle)
+            if not shared:
+                informer.stop()
+
+        elapsed = round(time.monotonic() - started, 3)
+        if satisfied:
+            message = f"condition {condition.expression} met after {elapsed}s"
+        elif not results and condition.type != "delete":
+            message = f"timed out after {timeout}s: no matching {info.plural} found"
+        else:
+            pending = sum(1 for r in results if not r["satisfied"]) if condition.type != "delete" else len(results)
+            message = f"timed out after {timeout}s: {pending} of {len(results)} {info.plural} not yet {condition.expression}"
+
+        results.sort(key=lambda r: (r["namespace"] or "", r["name"] or ""))
+        return {
+            "satisfied": satisfied,
+            "message": message,
+            "resource_type": info.plural,
+            "namespace": namespace,
+            "condition": condition.expression,
+            "elapsed_seconds": elapsed,
+            "objects": results[:_MAX_REPORTED],
+            "matched": len(results),
+            "source": "shared-watch" if shared else "watch",
+        }
+
+    def _kubectl_wait(
+        self,
+        condition: Condition,
+        resource_type: str,
+        name: Optional[str],
+        namespace: Optional[str],
+        label_selector: Optional[str],
+        timeout: float
+    ) -> Dict[str, Any]:
+        if condition.type == "phase":
+            wait_for = f"jsonpath={{.status.phase}}={condition.expected}"
+        else:
+            wait_for = condition.expression
+
+        cmd = ["kubectl", "--kubeconfig", self.env, "wait", f"{resource_type}/{name}" if name else resource_type]
+        if not name:
+            cmd += ["-l", label_selector] if label_selector else ["--all"]
+        if namespace:
+            cmd += ["-n", namespace]
+        cmd += [f"--for={wait_for}", f"--timeout={max(1, int(timeout))}s"]
+        logger.debug(f"[wait_for] Exec cmd: {' '.join(cmd)}")
+
+        started = time.monotonic()
+        proc = spawn(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        stdout, stderr = proc.communicate()
+        return {
+            "satisfied": proc.returncode == 0,
+            "message": (stdout if proc.returncode == 0 else stderr or stdout).strip(),
+            "resource_type": resource_type,
+            "namespace": namespace,
+            "condition": condition.expression,
+            "elapsed_seconds": round(time.monotonic() - started, 3),
+            "source": "kubectl",
+        }
+
+    @handle_kube_error
+    @timeit
+    def wait_for(
+        self,
+        resource_type: str,
+        condition: str,
+        resource_name: Optional[str] = None,
+        namespace: Optional[str] = "default",
+        label_selector: Optional[str] = None,
+        timeout: float = 60
+    ) -> Dict[str, Any]:
+        """阻塞直到对象满足条件或超时
+
+        Args:
+            resource_type (str): 资源类型，如 pods、jobs、endpoints，支持 CRD
+            condition (str): 条件表达式，如 'phase=Running'、'condition=Complete'、'jsonpath={.subsets[0].addresses}'、'delete'
+            resource_name (Optional[str], optional): 对象名称，与 label_selector 二选一
+            namespace (Optional[str], optional): 命名空间，默认为default，为空时匹配所有命名空间
+            label_selector (Optional[str], optional): label 选择器，匹配的对象全部满足条件才返回
+            timeout (float, optional): 最长等待时间（秒）
+
+        Raises:
+            ValueError: 条件表达式错误，或未给出对象名称与选择器
+
+        Returns:
+            Dict[str, Any]: satisfied 表示条件是否满足，objects 为各对象的求值结果与观察到的取值
+        """
+        try:
+            parsed = parse_condition(condition)
+            if not resource_name and not label_selector:
+                raise ValueError("resource_name or label_selector is required")
+
+            if self.api is not None:
+                try:
+                    return self._watch_wait(parsed, resource_type, resource_name, namespace, label_selector, timeout)
+                except KubeApiUnavailable as e:
+                    logger.warning(f"[wait_for] API backend unavailable, fallback to kubectl: {e}")
+
+            return self._kubectl_wait(parsed, resource_type, resource_name, namespace, label_selector, timeout)
+
+        except Exception as e:
+            logger.error(f"[wait_for] Failed to wait for {resource_type} {condition}: {e}")
+            return [e]